@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Resolve multi-number messages locally in the Content-Based Router.
+
+PROBLEM:
+improve_answer_extraction.py only taught the LLM prompt to prefer answer
+phrases: "that's 5 steps and we get 2" → 2, not 5. The router still trusts
+whatever numeric_value the model returns, and main-answer vs scaffolding
+sub-answer is decided on that value alone.
+
+SOLUTION:
+Embed functions/answer_phrase_analyzer.js into the Content-Based Router.
+Every number in the student message is scored by context (answer cues like
+"we get", "land on", "equals"; process cues like "steps", "move") and the
+best candidate is returned with a confidence. When the analyzer is
+confident:
+  - its value replaces the extracted numeric_value
+  - a number cued as process ("5 steps", "move 5") during scaffolding is
+    routed straight to the sub-answer validator
+Low-confidence messages keep the LLM value and the existing heuristic.
+
+Once build_router.py has compiled the router into a Switch, the analyzer
+runs in Load Session1 (which exposes `answer_phrase` to the router and the
+validators); re-running this script then refreshes the analyzer there.
+
+Labeled corpus: exemplars/answer_phrases.json
+  node functions/answer_phrase_analyzer.js exemplars/answer_phrases.json
+"""
+
+from workflow_utils import (find_node, load_function_source, load_workflow,
+                            replace_marked_block, save_workflow)
+
+ANALYZER_FILE = 'functions/answer_phrase_analyzer.js'
+ANALYZER_EXPORTS = ['analyzeAnswerPhrases']
+BLOCK_MARKER = 'ANSWER_PHRASE_ANALYZER (functions/answer_phrase_analyzer.js)'
+ROUTER_NODE = 'Content-Based Router'
+# Holds the analyzer once the router is a Switch (build_router.py)
+SESSION_NODE = 'Load Session1'
+
+OLD_MESSAGE_TYPE = """  const messageType = features.message_type;"""
+NEW_MESSAGE_TYPE = """  // Local answer-phrase analysis - overrides the LLM's pick when confident
+  const ANSWER_PHRASE_MIN_CONFIDENCE = 0.7;
+  const answerPhrase = analyzeAnswerPhrases(loadSessionData.message);
+  const answerPhraseConfident = answerPhrase.value !== null &&
+    answerPhrase.confidence >= ANSWER_PHRASE_MIN_CONFIDENCE;
+  if (features.message_type === 'answer_attempt' && answerPhraseConfident) {
+    features.numeric_value = answerPhrase.value;
+  }
+
+  const messageType = features.message_type;"""
+
+OLD_SCAFFOLDING = """      // If answer is close to main problem answer, verify it
+      if (diff < Math.max(Math.abs(correctValue * 0.5), 1)) {"""
+NEW_SCAFFOLDING = """      // Process number ("5 steps", "move 5") - a sub-answer, whatever its value
+      if (answerPhraseConfident && answerPhrase.role === 'process') {
+        route = 'validate_conceptual';
+      // If answer is close to main problem answer, verify it
+      } else if (diff < Math.max(Math.abs(correctValue * 0.5), 1)) {"""
+
+OLD_RETURN = """      ...features,
+      _route: route"""
+NEW_RETURN = """      ...features,
+      answer_phrase: {
+        value: answerPhrase.value,
+        confidence: answerPhrase.confidence,
+        role: answerPhrase.role
+      },
+      _route: route"""
+
+
+def refresh_session_analyzer(workflow):
+    """Router compiled into a Switch: refresh the analyzer Load Session1 runs."""
+    node = find_node(workflow, SESSION_NODE)
+    code = node['parameters']['jsCode'] if node else ''
+    if f'// BEGIN {BLOCK_MARKER}' not in code:
+        print(f"✗ ERROR: {ROUTER_NODE} is a Switch but {SESSION_NODE} has no analyzer - run build_router.py")
+        return False
+    node['parameters']['jsCode'] = replace_marked_block(code, BLOCK_MARKER,
+                                                        load_function_source(ANALYZER_FILE, ANALYZER_EXPORTS))
+    print(f"✓ Analyzer source refreshed in {SESSION_NODE} ({ROUTER_NODE} is a compiled Switch)")
+    return True
+
+
+def add_analyzer(workflow):
+    """Embed the analyzer and use it in the Content-Based Router."""
+    node = find_node(workflow, ROUTER_NODE)
+    if not node:
+        print(f"✗ ERROR: Could not find {ROUTER_NODE}")
+        return False
+    if node['type'] == 'n8n-nodes-base.switch':
+        return refresh_session_analyzer(workflow)
+
+    code = node['parameters']['jsCode']
+    code = replace_marked_block(code, BLOCK_MARKER, load_function_source(ANALYZER_FILE, ANALYZER_EXPORTS))
+
+    if 'ANSWER_PHRASE_MIN_CONFIDENCE' in code:
+        print("✓ Analyzer source refreshed (router already patched)")
+    else:
+        for old, new in [(OLD_MESSAGE_TYPE, NEW_MESSAGE_TYPE),
+                         (OLD_SCAFFOLDING, NEW_SCAFFOLDING),
+                         (OLD_RETURN, NEW_RETURN)]:
+            if old not in code:
+                print(f"✗ ERROR: Could not find router code: {old.strip()[:60]!r}")
+                return False
+            code = code.replace(old, new, 1)
+        print("✓ Router uses local answer-phrase analysis")
+
+    node['parameters']['jsCode'] = code
+    return True
+
+
+def main():
+    print("Reading workflow...")
+    workflow = load_workflow()
+
+    if not add_analyzer(workflow):
+        print("\n✗ No changes made")
+        return 1
+
+    save_workflow(workflow)
+    print("✓ Done!")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
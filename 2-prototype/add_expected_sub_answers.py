@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Record the expected sub-answers of each scaffolding step in the session.
+
+PROBLEM:
+While scaffolding, the Content-Based Router decided whether a number was a
+main-answer attempt or a step answer by distance: within 50% of the main
+answer it went to Enhanced Numeric Verifier, otherwise to Semantic Validator.
+For -3 + 5 the tutor asks "how many steps to zero?" and the student's "3" is
+near 2, so a correct step answer was graded as a "close" main answer.
+Semantic Validator then only knew the problem operands, not what the step
+asked for.
+
+SOLUTION:
+Update Session & Format Response1 embeds the per-problem table and
+functions/sub_answers.js. Whenever scaffolding is active it stores
+`scaffolding.expected_answers` - value key → role, built from the table's
+sub_answers (narrowed by cues in the tutor's question) plus any "a op b" the
+question asks. Next turn:
+  - the router looks the number up (main / expected / unexpected) and only
+    falls back to the near/far heuristic when no set was recorded
+  - Semantic Validator accepts or rejects the number by the same lookup
+
+Run after build_problem_validators.py (table with sub_answers) and
+build_router.py (routing table and validator join).
+"""
+
+from build_problem_validators import BLOCK_MARKER as TABLE_MARKER, CATALOG_FILE, generate
+from workflow_utils import (find_node, load_function_source, load_workflow,
+                            replace_marked_block, save_workflow)
+
+SUB_ANSWERS_FILE = 'functions/sub_answers.js'
+SUB_ANSWERS_EXPORTS = ['expectedSubAnswers']
+BLOCK_MARKER = 'SUB_ANSWERS (functions/sub_answers.js)'
+UPDATE_NODE = 'Update Session & Format Response1'
+UPDATE_ANCHOR = '  const responseData = $input.first().json;'
+
+OLD_TEACH_BACK = """  // 2. TEACH-BACK STATE MANAGEMENT"""
+NEW_TEACH_BACK = """  // Expected sub-answers for the step just asked - the router tests membership next turn
+  const scaffoldingState = session.current_problem.scaffolding;
+  if (scaffoldingState && scaffoldingState.active) {
+    scaffoldingState.expected_answers = expectedSubAnswers(
+      lookupProblemValidator(session.current_problem), session.current_problem, scaffoldingState.last_question);
+  }
+
+  // 2. TEACH-BACK STATE MANAGEMENT"""
+
+OLD_PROCESS = """  // PROCESS-NUMBER VALIDATION (table lookup: operands precomputed per problem)"""
+NEW_PROCESS = """  // EXPECTED SUB-ANSWER - the set Update Session recorded for this step
+  const expectedAnswers = input.scaffolding_expected_answers;
+  if (reasoning === '' && expectedAnswers && numericValue !== null && !isNaN(numericValue)) {
+    const role = expectedAnswers[problemValueKey(numericValue)];
+    isCorrect = Boolean(role);
+    reasoning = role ? `Student gave the expected ${role} answer for this step`
+      : 'Number is not an expected answer for this step';
+  }
+
+  // PROCESS-NUMBER VALIDATION (table lookup: operands precomputed per problem)"""
+
+
+def patch_once(code, old, new, done_marker, name):
+    if done_marker in code:
+        return code
+    if old not in code:
+        raise ValueError(f'Expected code not found in {name}: {old.strip()[:60]!r}')
+    return code.replace(old, new, 1)
+
+
+def patch_update_session(workflow, table_js):
+    node = find_node(workflow, UPDATE_NODE)
+    code = node['parameters']['jsCode']
+    code = replace_marked_block(code, TABLE_MARKER, table_js, anchor=UPDATE_ANCHOR)
+    code = replace_marked_block(code, BLOCK_MARKER, load_function_source(SUB_ANSWERS_FILE, SUB_ANSWERS_EXPORTS),
+                                anchor=UPDATE_ANCHOR)
+    code = patch_once(code, OLD_TEACH_BACK, NEW_TEACH_BACK,
+                      '// Expected sub-answers for the step just asked', UPDATE_NODE)
+    node['parameters']['jsCode'] = code
+
+
+def patch_semantic_validator(workflow):
+    node = find_node(workflow, 'Semantic Validator')
+    node['parameters']['jsCode'] = patch_once(
+        node['parameters']['jsCode'], OLD_PROCESS, NEW_PROCESS,
+        '// EXPECTED SUB-ANSWER', 'Semantic Validator')
+
+
+def main():
+    workflow = load_workflow()
+    table_js, _ = generate(CATALOG_FILE)
+
+    patch_update_session(workflow, table_js)
+    print(f"✓ {UPDATE_NODE} records scaffolding.expected_answers")
+
+    patch_semantic_validator(workflow)
+    print("✓ Semantic Validator checks numbers against the step's expected set")
+
+    save_workflow(workflow)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Score teach-back explanations locally and close strong ones without the LLM.
+
+PROBLEM:
+Teach-back validator accepts any message containing a loose phrase ("it was",
+"steps", "first") or any number as an explanation. Every one of them then
+goes through Response: Unified1, which has to judge the explanation itself -
+an LLM call on one of the most frequent turn types.
+
+SOLUTION:
+Embed functions/teach_back_rubric.js (plus the answer-phrase number finder
+and the per-problem table) into Teach-back validator. The rubric checks the
+explanation against the cached problem model: operands, operation,
+direction, start/end point.
+  - strong  → teach_back_closure (template text); Route by Category1 sends
+              it to the new "Teach-back Closure" node, which answers
+              directly - no LLM call
+  - partial → Response: Unified1 as before, with the missing criteria in
+              the prompt; an explanation with a wrong keyword ("moved
+              left" for -3 + 5) is at most partial, and the prompt names
+              what it contradicts
+  - none    → the old pattern check decides
+Problems not in the table keep the old behaviour.
+"""
+
+import uuid
+
+from build_problem_validators import BLOCK_MARKER as TABLE_MARKER, CATALOG_FILE, INPUT_ANCHOR, generate
+from workflow_utils import (find_node, load_function_source, load_workflow,
+                            replace_marked_block, save_workflow)
+
+ANALYZER_FILE = 'functions/answer_phrase_analyzer.js'
+RUBRIC_FILE = 'functions/teach_back_rubric.js'
+# What the validator calls; the rubric needs findNumbers from the analyzer
+RUBRIC_EXPORTS = ['scoreTeachBack', 'teachBackClosure']
+ANALYZER_EXPORTS = ['findNumbers']
+BLOCK_MARKER = 'TEACH_BACK_RUBRIC (functions/teach_back_rubric.js)'
+CLOSURE_NODE = 'Teach-back Closure'
+
+OLD_EXPLANATION = """  // Detect explanation attempts (EXPANDED)"""
+NEW_EXPLANATION = """  // RUBRIC - score against the cached problem model
+  const problemSpec = lookupProblemValidator(input.current_problem);
+  if (problemSpec) {
+    const rubric = scoreTeachBack(studentMessage, problemSpec);
+    if (rubric.level === 'strong') {
+      return { json: { ...input, category: 'teach_back_explanation', is_main_problem_attempt: false, confidence: 0.95,
+        reasoning: `Strong explanation (rubric ${rubric.score})`, teach_back_rubric: rubric,
+        teach_back_closure: teachBackClosure(rubric, problemSpec, input.current_problem) }};
+    }
+    if (rubric.level === 'partial') {
+      return { json: { ...input, category: 'teach_back_explanation', is_main_problem_attempt: false, confidence: 0.9,
+        reasoning: `Partial explanation (missing: ${rubric.missing.join(', ')})`, teach_back_rubric: rubric }};
+    }
+  }
+
+  // Detect explanation attempts (EXPANDED)"""
+
+CLOSURE_CODE = """// Teach-back Closure - strong explanation, answered from the template (no LLM call)
+  const input = $input.first().json;
+
+  // Same shape as Response: Unified1 so Update Session & Format Response1 reads it unchanged
+  return [{
+    json: {
+      message: { role: 'assistant', content: input.teach_back_closure },
+      text: input.teach_back_closure
+    }
+  }];"""
+
+CLOSURE_RULE = {
+    "conditions": {
+        "options": {
+            "caseSensitive": True,
+            "leftValue": "",
+            "typeValidation": "strict",
+            "version": 1
+        },
+        "conditions": [
+            {
+                "id": "3c6b1e52-7f0a-4d8e-9b21-5a4f0c7d2e11",
+                "leftValue": "={{$json.category}}",
+                "rightValue": "teach_back_explanation",
+                "operator": {
+                    "type": "string",
+                    "operation": "equals",
+                    "name": "filter.operator.equals"
+                }
+            },
+            {
+                "id": "8e2f4a91-1c5d-4b7e-a3f6-0d9b2c8e4f57",
+                "leftValue": "={{ $json.teach_back_closure || '' }}",
+                "rightValue": "",
+                "operator": {
+                    "type": "string",
+                    "operation": "notEmpty",
+                    "singleValue": True
+                }
+            }
+        ],
+        "combinator": "and"
+    },
+    "renameOutput": True,
+    "outputKey": "teach_back_closure"
+}
+
+OLD_PROMPT = "'STRATEGY - ACKNOWLEDGE TEACH-BACK EXPLANATION:\\n' +\n"
+NEW_PROMPT = (OLD_PROMPT +
+              "    ($json.teach_back_rubric ? 'Explanation is missing: ' + "
+              "$json.teach_back_rubric.missing.join(', ') + ' - ask about ONE of these\\n' : '') +\n")
+
+# Wrong keywords: the LLM must correct them, not praise the explanation
+CONTRADICTED_PROMPT = ("    ($json.teach_back_rubric && ($json.teach_back_rubric.contradicted || []).length ? "
+                       "'Explanation gets the ' + $json.teach_back_rubric.contradicted.join(' and ') + "
+                       "' wrong - do not praise it, ask them to check that part\\n' : '') +\n")
+
+
+def patch_validator(workflow):
+    node = find_node(workflow, 'Teach-back validator')
+    code = node['parameters']['jsCode']
+
+    table_js, _ = generate(CATALOG_FILE)
+    code = replace_marked_block(code, TABLE_MARKER, table_js, anchor=INPUT_ANCHOR)
+
+    source = (load_function_source(ANALYZER_FILE, ANALYZER_EXPORTS) + '\n' +
+              load_function_source(RUBRIC_FILE, RUBRIC_EXPORTS))
+    code = replace_marked_block(code, BLOCK_MARKER, source, anchor=INPUT_ANCHOR)
+
+    if 'const rubric = scoreTeachBack(studentMessage, problemSpec);\n    if' not in code:
+        if OLD_EXPLANATION not in code:
+            raise ValueError('Explanation check not found in Teach-back validator')
+        code = code.replace(OLD_EXPLANATION, NEW_EXPLANATION, 1)
+    node['parameters']['jsCode'] = code
+
+
+def add_closure_route(workflow):
+    """Insert the closure rule just before teach_back_explanation and wire it."""
+    if find_node(workflow, CLOSURE_NODE):
+        return False
+
+    router = find_node(workflow, 'Route by Category1')
+    rules = router['parameters']['rules']['values']
+    index = next(i for i, rule in enumerate(rules) if rule.get('outputKey') == 'teach_back_explanation')
+    rules.insert(index, CLOSURE_RULE)
+
+    update = find_node(workflow, 'Update Session & Format Response1')
+    response = find_node(workflow, 'Response: Unified1')
+    workflow['nodes'].append({
+        "parameters": {"jsCode": CLOSURE_CODE},
+        "id": str(uuid.uuid4()),
+        "name": CLOSURE_NODE,
+        "type": "n8n-nodes-base.code",
+        "typeVersion": 2,
+        "position": [response['position'][0], response['position'][1] + 400],
+        "notes": "Strong teach-back explanation: template closure, skips the LLM"
+    })
+
+    outputs = workflow['connections']['Route by Category1']['main']
+    outputs.insert(index, [{"node": CLOSURE_NODE, "type": "main", "index": 0}])
+    workflow['connections'][CLOSURE_NODE] = {
+        "main": [[{"node": update['name'], "type": "main", "index": 0}]]
+    }
+    return True
+
+
+def patch_prompt(workflow):
+    node = find_node(workflow, 'Response: Unified1')
+    message = node['parameters']['messages']['values'][0]
+    if 'teach_back_rubric' not in message['content']:
+        if OLD_PROMPT not in message['content']:
+            raise ValueError('Teach-back strategy not found in Response: Unified1 prompt')
+        message['content'] = message['content'].replace(OLD_PROMPT, NEW_PROMPT, 1)
+    if 'teach_back_rubric.contradicted' not in message['content']:
+        if NEW_PROMPT not in message['content']:
+            raise ValueError('Rubric line not found in Response: Unified1 prompt')
+        message['content'] = message['content'].replace(NEW_PROMPT, NEW_PROMPT + CONTRADICTED_PROMPT, 1)
+
+
+def main():
+    workflow = load_workflow()
+
+    patch_validator(workflow)
+    print("✓ Embedded teach-back rubric into Teach-back validator")
+
+    if add_closure_route(workflow):
+        print(f"✓ Added {CLOSURE_NODE} node and Route by Category1 rule")
+    else:
+        print(f"  {CLOSURE_NODE} already present")
+
+    patch_prompt(workflow)
+    print("✓ Response: Unified1 asks about missing rubric criteria")
+
+    save_workflow(workflow)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
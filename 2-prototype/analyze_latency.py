@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+Static critical-path latency per route, with a latency-budget gate.
+
+PROBLEM:
+"What is the worst case of the scaffold_progress route - how many LLM calls
+in series, how long?" could only be answered by sending traffic through
+n8n. Nothing shows which nodes wait on each other only because the
+workflow is a chain: n8n runs a single-item turn node after node, even
+when a node reads nothing its predecessor produced.
+
+SOLUTION:
+Read the workflow export, enumerate every route from both triggers to
+Webhook Response1 (one per distinct node sequence, labelled with the
+Switch outputs that lead there) and add up per-node latency profiles
+(LATENCY_PROFILES: LLM time to first token + output tokens up to the
+node's maxTokens, Redis round trip, Code sandbox + compile per KB):
+
+  serial     - as n8n runs it today (expected and worst case)
+  dependency - if every node started as soon as the nodes it reads from
+               had finished: the critical path of the data dependencies
+
+Dependencies come from the field contracts in build_field_projection.py
+(fields read from $input and from $('Node')) and from what each node
+writes: a field read from $input is traced back through nodes that pass
+their input on (Switch, Redis SET, `...input` spreads) to the node that
+writes it; a node behind a Switch also depends on that Switch (it decides
+whether the node runs). A node that could start earlier is flagged with the
+nodes it could run beside; one that waits only because an intermediate node
+copies a field it read under the same name ({ field: x }, x = input.field)
+is flagged separately.
+Nodes without a contract (e.g. fused nodes of the deployment copy) are
+assumed to depend on their predecessor.
+
+The gate fails (exit 1) when a route's serial latency exceeds the budget:
+expected against the P95 target, worst case against the client timeout
+(docs/API-SPEC.md, docs/INTEGRATION.md). Profiles are estimates for
+gpt-4o-mini - replace them with measured numbers via --profiles.
+
+    python3 analyze_latency.py                          # table + generated/latency-report.json
+    python3 analyze_latency.py --route scaffold_progress
+    python3 analyze_latency.py --input generated/workflow-optimized.json --budget-ms 2000
+    python3 analyze_latency.py --profiles measured.json # same shape as LATENCY_PROFILES
+"""
+
+import argparse
+import json
+import re
+
+from build_field_projection import ALL, NODE_CONTRACTS
+from build_registry_store import REGISTRY_STORE_CONTRACTS
+from workflow_utils import WORKFLOW_FILE, load_workflow
+
+REPORT_FILE = 'generated/latency-report.json'
+SINK = 'Webhook Response1'
+
+CODE_TYPE = 'n8n-nodes-base.code'
+SWITCH_TYPE = 'n8n-nodes-base.switch'
+REDIS_TYPE = 'n8n-nodes-base.redis'
+LLM_TYPE = '@n8n/n8n-nodes-langchain.openAi'
+RESPOND_TYPE = 'n8n-nodes-base.respondToWebhook'
+
+# Milliseconds. Every node also pays n8n's per-node overhead (item copy,
+# execution bookkeeping).
+LATENCY_PROFILES = {
+    'node_overhead': {'expected': 3, 'worst': 15},
+    'llm': {
+        # Time to first token (prompt prefill included) and per output token
+        'first_token': {'expected': 200, 'worst': 1000},
+        'per_token': {'expected': 3, 'worst': 10},
+        # Typical output tokens (ARCHITECTURE.md token table); worst = maxTokens
+        'output_tokens': {'Content Feature Extractor': 50, 'Synthesis LLM1': 100, 'Response: Unified1': 200},
+        'default_output_tokens': 150,
+        'default_max_tokens': 500,
+    },
+    'redis': {'expected': 2, 'worst': 50},
+    'code': {'expected': 2, 'worst': 20, 'per_kb': {'expected': 0.1, 'worst': 0.5}},
+    'switch': {'expected': 1, 'worst': 5},
+    'respond': {'expected': 1, 'worst': 10},
+    'trigger': {'expected': 0, 'worst': 0},
+}
+
+# docs/API-SPEC.md P95 target; docs/INTEGRATION.md client timeout
+LATENCY_BUDGET = {'expected': 2500, 'worst': 10000}
+
+PASS_THROUGH_TYPES = {SWITCH_TYPE, RESPOND_TYPE}
+SPREAD = re.compile(r'\.\.\.([A-Za-z_$][\w$]*)')
+
+
+def node_map(workflow):
+    return {node['name']: node for node in workflow['nodes']}
+
+
+def is_trigger(node):
+    return 'trigger' in node['type'].lower() or node['type'] == 'n8n-nodes-base.webhook'
+
+
+# ============================================================================
+# Routes
+# ============================================================================
+
+def route_paths(workflow, sinks=(SINK,)):
+    """[(labels, path)] from every trigger to a sink; one entry per distinct node sequence."""
+    nodes = node_map(workflow)
+    routes = {}
+
+    def output_label(node, index, target):
+        rules = node['parameters'].get('rules', {}).get('values', [])
+        if node['parameters'].get('mode') == 'expression' or not rules:
+            return target
+        return rules[index].get('outputKey', str(index)) if index < len(rules) else 'fallback'
+
+    def walk(name, path, label):
+        path = path + [name]
+        outputs = workflow['connections'].get(name, {}).get('main', [])
+        if name in sinks or not any(outputs):
+            if name in sinks:
+                routes.setdefault(tuple(path), []).append(label)
+            return
+        for index, output in enumerate(outputs):
+            for connection in output or []:
+                target = connection['node']
+                branch = label
+                if nodes[name]['type'] == SWITCH_TYPE:
+                    branch = label + [(name, output_label(nodes[name], index, target))]
+                walk(target, path, branch)
+
+    for name, node in nodes.items():
+        if is_trigger(node):
+            walk(name, [], [])
+
+    result = []
+    for path, labels in routes.items():
+        # Switch → outputs that lead to this node sequence
+        merged = {}
+        for label in labels:
+            for switch, key in label:
+                keys = merged.setdefault(switch, [])
+                if key not in keys:
+                    keys.append(key)
+        result.append((merged, list(path)))
+    return result
+
+
+def route_name(path, labels, nodes):
+    """Trigger / branch target after each Switch, e.g. "Webhook Trigger1 / Semantic Validator / Synthesis Detector1"."""
+    parts = [path[0]]
+    for index, name in enumerate(path[:-1]):
+        if nodes[name]['type'] == SWITCH_TYPE:
+            parts.append(path[index + 1])
+    return ' / '.join(parts)
+
+
+# ============================================================================
+# Latency
+# ============================================================================
+
+def node_latency(node, profiles):
+    """{'expected': ms, 'worst': ms, 'llm': bool} of one node run."""
+    overhead = profiles['node_overhead']
+    kind = node['type']
+    if kind == LLM_TYPE:
+        llm = profiles['llm']
+        max_tokens = node['parameters'].get('options', {}).get('maxTokens', llm['default_max_tokens'])
+        typical = min(llm['output_tokens'].get(node['name'], llm['default_output_tokens']), max_tokens)
+        return {
+            'expected': overhead['expected'] + llm['first_token']['expected'] + typical * llm['per_token']['expected'],
+            'worst': overhead['worst'] + llm['first_token']['worst'] + max_tokens * llm['per_token']['worst'],
+            'llm': True,
+        }
+    if kind == CODE_TYPE:
+        code = profiles['code']
+        kb = len(node['parameters'].get('jsCode', '').encode('utf-8')) / 1024
+        return {
+            'expected': overhead['expected'] + code['expected'] + kb * code['per_kb']['expected'],
+            'worst': overhead['worst'] + code['worst'] + kb * code['per_kb']['worst'],
+            'llm': False,
+        }
+    profile = (profiles['trigger'] if is_trigger(node)
+               else profiles['redis'] if kind == REDIS_TYPE
+               else profiles['switch'] if kind == SWITCH_TYPE
+               else profiles['respond'] if kind == RESPOND_TYPE
+               else {'expected': 0, 'worst': 0})
+    base = {'expected': 0, 'worst': 0} if is_trigger(node) else overhead
+    return {'expected': base['expected'] + profile['expected'], 'worst': base['worst'] + profile['worst'],
+            'llm': False}
+
+
+# ============================================================================
+# Data dependencies
+# ============================================================================
+
+def passes(node, contract):
+    """Sources whose fields the node's output carries on: ['$input'], ['Load Session1'], or []."""
+    kind = node['type']
+    if kind in PASS_THROUGH_TYPES or (kind == REDIS_TYPE and not is_trigger(node)):
+        return ['$input']
+    if contract is None:
+        return []
+    return contract.get('passes', [])
+
+
+def writes_field(node, field):
+    """
+    Does this node set `field` in its output?
+
+    True when it does or might (conservative), 'copy' when it only copies the
+    value it read under the same name ({ field: x } with const x = input.field),
+    False when it passes the field on untouched.
+    """
+    kind = node['type']
+    if kind in PASS_THROUGH_TYPES:
+        return False
+    if kind == REDIS_TYPE:
+        return node['parameters'].get('operation') == 'get' and field == node['parameters'].get(
+            'propertyName', 'propertyName')
+    if kind != CODE_TYPE:
+        return True
+    code = node['parameters'].get('jsCode', '')
+    # Spread of anything not read from an input (e.g. a parsed LLM reply): unknown keys
+    for name in SPREAD.findall(code):
+        if not read_from_input(code, name):
+            return True
+    f = re.escape(field)
+    if re.search(rf"[{{,]\s*{f}\s*[,}}]|\.{f}\s*=(?!=)|\[['\"]{f}['\"]\]\s*=(?!=)", code):
+        return True
+    keys = re.findall(rf"(?<![\w$.])['\"]?{f}['\"]?\s*:(?!:)\s*([^,\n}}]*)", code)
+    if not keys:
+        return False
+    for value in keys:
+        source = re.fullmatch(r'([A-Za-z_$][\w$]*)', value.strip())
+        assignment = source and re.search(
+            rf'(?:const|let|var)\s+{re.escape(source.group(1))}\s*=\s*([A-Za-z_$][\w$]*)\.{f}\b', code)
+        if not assignment or not read_from_input(code, assignment.group(1)):
+            return True
+    return 'copy'
+
+
+def read_from_input(code, name):
+    """Is variable `name` assigned from $input, $json or $('Node')?"""
+    assignment = re.search(rf'(?:const|let|var)\s+{re.escape(name)}\s*=\s*([^;]*)', code)
+    return bool(assignment and re.search(r"\$input|\$json|\$\(", assignment.group(1)))
+
+
+def field_origin(path, index, field, nodes, contracts):
+    """
+    (nearest, source) route positions for `field` as seen by path[index]'s input.
+
+    nearest - the closest node that writes it (what path[index] waits for)
+    source  - the node the value comes from, past nodes that only copy it
+    """
+    nearest = None
+    position = index - 1
+    while position >= 0:
+        name = path[position]
+        node = nodes[name]
+        written = True if is_trigger(node) else writes_field(node, field)
+        if written and nearest is None:
+            nearest = position
+        if written is True:
+            return nearest, position
+        carried = passes(node, contracts.get(name))
+        if '$input' in carried:
+            position -= 1
+        elif carried and carried[0] in path[:position]:
+            position = path.index(carried[0])
+        else:
+            # Output built from scratch: the field is this node's, whatever the code looks like
+            return (position if nearest is None else nearest), position
+    return nearest, nearest
+
+
+def dependencies(path, nodes, contracts):
+    """
+    Per route position: {'strict': {dep position: [fields]}, 'relaxed': {...}}.
+
+    strict  - what the node waits for: the nearest writer of each field it
+              reads, nodes it reads by name, and the Switch that routed to it
+    relaxed - the same, with fields traced past nodes that only copy them
+    """
+    result = []
+    for index, name in enumerate(path):
+        strict, relaxed = {}, {}
+        result.append({'strict': strict, 'relaxed': relaxed})
+        if index == 0:
+            continue
+        # Control dependency: a Switch decides whether the node runs at all
+        switches = [position for position in range(index) if nodes[path[position]]['type'] == SWITCH_TYPE]
+        if switches:
+            strict[switches[-1]] = ['(route)']
+            relaxed[switches[-1]] = ['(route)']
+        contract = contracts.get(name)
+        if contract is None:
+            strict.setdefault(index - 1, []).append('*')
+            relaxed.setdefault(index - 1, []).append('*')
+            continue
+        for source, fields in contract['reads'].items():
+            if source != '$input':
+                if source in path[:index]:
+                    position = path.index(source)
+                    strict.setdefault(position, []).append(f'$({source})')
+                    relaxed.setdefault(position, []).append(f'$({source})')
+                continue
+            if fields == ALL:
+                strict.setdefault(index - 1, []).append('*')
+                relaxed.setdefault(index - 1, []).append('*')
+                continue
+            for field in fields:
+                nearest, origin = field_origin(path, index, field, nodes, contracts)
+                if nearest is not None:
+                    strict.setdefault(nearest, []).append(field)
+                    relaxed.setdefault(origin, []).append(field)
+    return result
+
+
+def critical_path(path, latencies, deps, key):
+    """Response time (ms) if every node started when its dependencies finished."""
+    finish = []
+    for index in range(len(path)):
+        start = max((finish[d] for d in deps[index]), default=0)
+        finish.append(start + latencies[index][key])
+    return finish[-1]
+
+
+# ============================================================================
+# Analysis
+# ============================================================================
+
+def analyze(workflow, profiles=LATENCY_PROFILES, budget=LATENCY_BUDGET):
+    nodes = node_map(workflow)
+    contracts = {**NODE_CONTRACTS, **REGISTRY_STORE_CONTRACTS}
+    routes = []
+    for labels, path in route_paths(workflow):
+        latencies = [node_latency(nodes[name], profiles) for name in path]
+        deps = dependencies(path, nodes, contracts)
+        strict = [set(d['strict']) for d in deps]
+        relaxed = [set(d['relaxed']) for d in deps]
+
+        independent, rewritten = [], []
+        for index, name in enumerate(path):
+            if index == 0:
+                continue
+            latest = max(strict[index], default=0)
+            if latest < index - 1:
+                independent.append({'node': name, 'after': path[latest],
+                                    'parallel_with': path[latest + 1:index]})
+                continue
+            earliest = max(relaxed[index], default=0)
+            if earliest < latest:
+                fields = sorted(field for position, names in deps[index]['strict'].items()
+                                if position > earliest for field in names)
+                rewritten.append({'node': name, 'waits_for': path[latest], 'fields': fields,
+                                  'available_after': path[earliest],
+                                  'parallel_with': path[earliest + 1:index]})
+
+        serial = {key: sum(latency[key] for latency in latencies) for key in ('expected', 'worst')}
+        routes.append({
+            'name': route_name(path, labels, nodes),
+            'outputs': labels,
+            'path': path,
+            'llm_calls': [name for name, latency in zip(path, latencies) if latency['llm']],
+            'serial_ms': {key: round(value) for key, value in serial.items()},
+            'dependency_ms': {key: round(critical_path(path, latencies, strict, key)) for key in serial},
+            'nodes_ms': {name: {key: round(latency[key], 1) for key in ('expected', 'worst')}
+                         for name, latency in zip(path, latencies)},
+            'independent': independent,
+            'rewritten': rewritten,
+            'over_budget': [key for key in ('expected', 'worst') if serial[key] > budget[key]],
+        })
+    routes.sort(key=lambda route: -route['serial_ms']['worst'])
+    return {'budget_ms': budget, 'profiles': profiles, 'routes': routes}
+
+
+def matches(route, pattern):
+    if not pattern:
+        return True
+    keys = [key for outputs in route['outputs'].values() for key in outputs]
+    return any(pattern in text for text in [route['name'], *route['path'], *keys])
+
+
+def print_report(report, pattern=None):
+    routes = [route for route in report['routes'] if matches(route, pattern)]
+    if not routes:
+        print(f"No route matches {pattern!r}")
+        return
+    width = max(len(route['name']) for route in routes)
+    budget = report['budget_ms']
+    print(f"{'route':<{width}}  LLM   serial exp/worst ms   dependency exp/worst ms")
+    for route in routes:
+        serial, dependency = route['serial_ms'], route['dependency_ms']
+        flag = '  ✗ over budget' if route['over_budget'] else ''
+        print(f"{route['name']:<{width}}  {len(route['llm_calls']):>3}   {serial['expected']:>6} / {serial['worst']:>6}"
+              f"      {dependency['expected']:>6} / {dependency['worst']:>6}{flag}")
+        for switch, keys in route['outputs'].items():
+            if len(keys) > 1 or keys[0] not in route['path']:
+                print(f"  {switch}: {' | '.join(keys)}")
+    print(f"\nBudget: expected ≤ {budget['expected']} ms, worst ≤ {budget['worst']} ms (serial)")
+
+    slowest = routes[0]
+    print(f"\nSlowest route: {slowest['name']}")
+    print(f"  LLM calls in series: {' → '.join(slowest['llm_calls']) or 'none'}")
+    for name, latency in slowest['nodes_ms'].items():
+        if latency['worst'] >= 100:
+            print(f"  {name:<36} {latency['expected']:>7.0f} / {latency['worst']:>7.0f} ms")
+
+    seen = set()
+    print("\nCould run in parallel (no data dependency on the nodes in between):")
+    for route in routes:
+        for entry in route['independent']:
+            key = (entry['node'], entry['after'], tuple(entry['parallel_with']))
+            if key not in seen:
+                seen.add(key)
+                print(f"  {entry['node']} needs only {entry['after']} - could run beside "
+                      f"{' → '.join(entry['parallel_with'])}")
+    if not seen:
+        print("  none")
+    seen.clear()
+    print("\nWaiting only for a copied field:")
+    for route in routes:
+        for entry in route['rewritten']:
+            key = (entry['node'], entry['waits_for'], tuple(entry['parallel_with']))
+            if key not in seen:
+                seen.add(key)
+                print(f"  {entry['node']} waits for {entry['waits_for']} only for {', '.join(entry['fields'])}, "
+                      f"which {entry['available_after']} already provides - reading it there would let it run "
+                      f"beside {' → '.join(entry['parallel_with'])}")
+    if not seen:
+        print("  none")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--input', default=WORKFLOW_FILE)
+    parser.add_argument('--route', help='only routes whose name, nodes or Switch outputs contain this text')
+    parser.add_argument('--profiles', help='JSON file with the shape of LATENCY_PROFILES')
+    parser.add_argument('--budget-ms', type=float, default=LATENCY_BUDGET['expected'],
+                        help='expected serial latency allowed per route')
+    parser.add_argument('--worst-budget-ms', type=float, default=LATENCY_BUDGET['worst'],
+                        help='worst-case serial latency allowed per route')
+    parser.add_argument('--no-report', action='store_true', help=f'do not write {REPORT_FILE}')
+    args = parser.parse_args()
+
+    profiles = LATENCY_PROFILES
+    if args.profiles:
+        with open(args.profiles) as f:
+            profiles = json.load(f)
+    budget = {'expected': args.budget_ms, 'worst': args.worst_budget_ms}
+
+    report = analyze(load_workflow(args.input), profiles, budget)
+    report['workflow'] = args.input
+    print_report(report, args.route)
+
+    if not args.no_report:
+        with open(REPORT_FILE, 'w') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"\n✓ Wrote {REPORT_FILE}")
+
+    over = [route for route in report['routes'] if route['over_budget'] and matches(route, args.route)]
+    if over:
+        print(f"✗ {len(over)} route(s) over the latency budget")
+        return 1
+    print("✓ Every route within the latency budget")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
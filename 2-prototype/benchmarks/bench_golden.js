@@ -0,0 +1,234 @@
+/**
+ * bench_golden.js
+ *
+ * Golden conversations from exemplars/questions.json: classification
+ * accuracy, confusion matrix and per-node CPU time of the workflow's
+ * routing and validation logic
+ *
+ * Every exemplar becomes turn scripts, each in a fresh session on its own
+ * problem:
+ *   - the correct answer                          → correct
+ *   - every common_errors answer                  → its category
+ *   - each help request (HELP_REQUESTS)           → stuck
+ *   - off_topic_test's samples                    → off_topic
+ *   - test_conversation, turn by turn             → expected_category
+ * Catalog categories without a route are folded the way
+ * build_problem_validators.py folds them (conceptual_gap → wrong_operation).
+ *
+ * Turns go through Webhook Trigger1 with benchmarks/workflow_walk.js; the
+ * LLM nodes are the stand-ins of stand_ins.js (rule-based feature
+ * extraction, fixed replies), so a miss is the routing and validation
+ * logic's, given those features. CPU time per node comes from
+ * workflow_walk's options.measure.
+ *
+ * --baseline FILE compares with an earlier --out report: exits 1 when a
+ * turn that matched there no longer does, or when CPU per turn grew more
+ * than --max-slowdown (default 2x). Run it after a workflow patch script:
+ *
+ * Usage:
+ *   node benchmarks/bench_golden.js [workflow.json] [--out report.json]
+ *   node benchmarks/bench_golden.js --baseline golden-before.json
+ */
+
+const fs = require('fs');
+const path = require('path');
+const { walkTurn } = require('./workflow_walk.js');
+const { MemoryRedis, localLlm } = require('./stand_ins.js');
+
+const ROOT = path.join(__dirname, '..');
+const QUESTIONS_FILE = path.join(ROOT, 'exemplars/questions.json');
+
+const HELP_REQUESTS = ["I don't know", "I'm stuck", 'I need help'];
+
+// As CATALOG_CATEGORY_MAP in build_problem_validators.py
+const CATALOG_CATEGORY_MAP = { conceptual_gap: 'wrong_operation' };
+
+// Timing repeats: the first pass warms up, CPU is the mean of the rest
+const PASSES = 4;
+
+function parseArgs(argv) {
+  const args = { workflow: path.join(ROOT, 'workflow-production-ready.json'), out: null, baseline: null, maxSlowdown: 2 };
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i] === '--out') args.out = argv[++i];
+    else if (argv[i] === '--baseline') args.baseline = argv[++i];
+    else if (argv[i] === '--max-slowdown') args.maxSlowdown = Number(argv[++i]);
+    else args.workflow = path.resolve(argv[i]);
+  }
+  return args;
+}
+
+const expected = category => CATALOG_CATEGORY_MAP[category] || category;
+
+/**
+ * Exemplars → turn scripts
+ *
+ * @param {Array} questions - questions.json `questions`
+ * @returns {Array} [{id, problem: {id, text, correct_answer}, turns: [{message, expected}]}]
+ */
+function goldenScripts(questions) {
+  // off_topic_test has no correct_answer: borrow it from the question with the same problem
+  const answers = new Map(questions.filter(q => q.correct_answer).map(q => [q.problem, q.correct_answer]));
+  const scripts = [];
+  for (const question of questions) {
+    const problem = {
+      id: question.id, text: question.problem, correct_answer: question.correct_answer || answers.get(question.problem)
+    };
+    const single = (kind, message, category) =>
+      scripts.push({ id: `${question.id}/${kind}`, problem, turns: [{ message, expected: expected(category) }] });
+
+    if (question.correct_answer) {
+      single('correct', question.correct_answer, 'correct');
+      for (const error of question.common_errors || []) single(`error:${error.answer}`, error.answer, error.category);
+      HELP_REQUESTS.forEach((message, index) => single(`help:${index + 1}`, message, 'stuck'));
+    }
+    (question.test_inputs || []).forEach((sample, index) =>
+      single(`sample:${index + 1}`, sample.student_input, sample.expected_category));
+    if (question.test_conversation) {
+      scripts.push({
+        id: `${question.id}/conversation`,
+        problem,
+        turns: question.test_conversation.map(turn => ({ message: turn.student_input, expected: expected(turn.expected_category) }))
+      });
+    }
+  }
+  return scripts;
+}
+
+async function runScripts(workflow, scripts, pass) {
+  const redis = new MemoryRedis();
+  const llm = localLlm();
+  const results = [];
+  const cpu = {};
+  for (const script of scripts) {
+    const sessionId = `golden_${pass}_${script.id}`;
+    for (const [index, turn] of script.turns.entries()) {
+      const run = await walkTurn(workflow, {
+        trigger: 'Webhook Trigger1',
+        body: { student_id: 'golden', session_id: sessionId, message: turn.message, current_problem: script.problem },
+        headers: {},
+        redis,
+        llm,
+        measure: true
+      });
+      const body = JSON.parse(run.response.body.toString('utf8'));
+      results.push({ script: script.id, turn: index + 1, message: turn.message, expected: turn.expected, actual: body.metadata.category });
+      for (const step of run.runs) {
+        if (step.cpu_us === undefined) continue;
+        const entry = cpu[step.node] || (cpu[step.node] = { runs: 0, cpu_us: 0 });
+        entry.runs++;
+        entry.cpu_us += step.cpu_us;
+      }
+    }
+  }
+  return { results, cpu };
+}
+
+function confusion(results) {
+  const labels = [...new Set(results.flatMap(r => [r.expected, r.actual]))].sort();
+  const matrix = Object.fromEntries(labels.map(row => [row, Object.fromEntries(labels.map(col => [col, 0]))]));
+  results.forEach(r => matrix[r.expected][r.actual]++);
+  return { labels, matrix };
+}
+
+function printMatrix({ labels, matrix }) {
+  const short = label => label.slice(0, 10);
+  const width = Math.max(...labels.map(label => label.length));
+  console.log(`\nConfusion matrix (rows: expected, columns: actual)`);
+  console.log(`  ${''.padEnd(width)} ${labels.map(label => short(label).padStart(10)).join(' ')}`);
+  for (const row of labels) {
+    if (!Object.values(matrix[row]).some(Boolean)) continue;
+    console.log(`  ${row.padEnd(width)} ${labels.map(col => String(matrix[row][col] || '.').padStart(10)).join(' ')}`);
+  }
+}
+
+async function main() {
+  const args = parseArgs(process.argv.slice(2));
+  const workflow = JSON.parse(fs.readFileSync(args.workflow, 'utf8'));
+  const scripts = goldenScripts(JSON.parse(fs.readFileSync(QUESTIONS_FILE, 'utf8')).questions);
+  const started = process.hrtime.bigint();
+
+  const { results } = await runScripts(workflow, scripts, 0);
+  const cpu = {};
+  for (let pass = 1; pass < PASSES; pass++) {
+    const measured = await runScripts(workflow, scripts, pass);
+    for (const [node, entry] of Object.entries(measured.cpu)) {
+      const total = cpu[node] || (cpu[node] = { runs: 0, cpu_us: 0 });
+      total.runs += entry.runs;
+      total.cpu_us += entry.cpu_us;
+    }
+  }
+  const wall = Number(process.hrtime.bigint() - started) / 1e9;
+
+  const correct = results.filter(r => r.expected === r.actual).length;
+  const turnsPerPass = results.length;
+  const nodes = Object.fromEntries(Object.entries(cpu)
+    .sort((a, b) => b[1].cpu_us - a[1].cpu_us)
+    .map(([node, entry]) => [node, {
+      runs: entry.runs / (PASSES - 1),
+      mean_us: Math.round(entry.cpu_us / entry.runs),
+      per_turn_us: Math.round(entry.cpu_us / (turnsPerPass * (PASSES - 1)))
+    }]));
+  const cpuPerTurn = Object.values(nodes).reduce((sum, node) => sum + node.per_turn_us, 0);
+  const report = {
+    workflow: path.basename(args.workflow),
+    scripts: scripts.length,
+    turns: turnsPerPass,
+    accuracy: Number((correct / turnsPerPass).toFixed(4)),
+    confusion: confusion(results).matrix,
+    misses: results.filter(r => r.expected !== r.actual),
+    cpu_us_per_turn: cpuPerTurn,
+    nodes,
+    results
+  };
+
+  console.log(`${report.workflow}: ${scripts.length} golden scripts, ${turnsPerPass} turns ` +
+    `(× ${PASSES} passes in ${wall.toFixed(1)} s)`);
+  console.log(`\nAccuracy: ${correct}/${turnsPerPass} = ${(report.accuracy * 100).toFixed(1)}%`);
+  printMatrix(confusion(results));
+  if (report.misses.length) {
+    console.log('\nMisses:');
+    for (const miss of report.misses) {
+      console.log(`  ${`${miss.script} #${miss.turn}`.padEnd(34)} "${miss.message}"  expected ${miss.expected}, got ${miss.actual}`);
+    }
+  }
+  console.log(`\nCPU per node (mean of ${PASSES - 1} passes after warm-up):`);
+  console.log(`  ${'node'.padEnd(36)} ${'runs'.padStart(5)} ${'µs/run'.padStart(8)} ${'µs/turn'.padStart(8)}`);
+  for (const [node, entry] of Object.entries(nodes)) {
+    console.log(`  ${node.padEnd(36)} ${String(entry.runs).padStart(5)} ${String(entry.mean_us).padStart(8)} ${String(entry.per_turn_us).padStart(8)}`);
+  }
+  console.log(`  ${'total'.padEnd(36)} ${''.padStart(5)} ${''.padStart(8)} ${String(cpuPerTurn).padStart(8)}`);
+
+  if (args.out) {
+    fs.writeFileSync(args.out, JSON.stringify(report, null, 2) + '\n');
+    console.log(`\n✓ Wrote ${args.out}`);
+  }
+  if (!args.baseline) return 0;
+
+  const baseline = JSON.parse(fs.readFileSync(args.baseline, 'utf8'));
+  const key = r => `${r.script} #${r.turn}`;
+  const now = new Map(results.map(r => [key(r), r]));
+  const regressed = baseline.results.filter(r => r.expected === r.actual && now.has(key(r)) &&
+    now.get(key(r)).actual !== r.actual);
+  const slowdown = cpuPerTurn / baseline.cpu_us_per_turn;
+  console.log(`\nCompared with ${args.baseline}: accuracy ${(baseline.accuracy * 100).toFixed(1)}% → ` +
+    `${(report.accuracy * 100).toFixed(1)}%, CPU per turn ${baseline.cpu_us_per_turn} → ${cpuPerTurn} µs (${slowdown.toFixed(2)}x)`);
+  for (const r of regressed) {
+    console.log(`  ✗ ${key(r)} "${r.message}": was ${r.actual}, now ${now.get(key(r)).actual}`);
+  }
+  if (slowdown > args.maxSlowdown) console.log(`  ✗ CPU per turn grew more than ${args.maxSlowdown}x`);
+  if (regressed.length || slowdown > args.maxSlowdown) return 1;
+  console.log('  ✓ no regressions');
+  return 0;
+}
+
+if (require.main === module) {
+  main().then(code => process.exit(code)).catch(error => {
+    console.error(`✗ ${error.message}`);
+    process.exit(1);
+  });
+}
+
+// For Node.js module export
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = { goldenScripts, HELP_REQUESTS };
+}
@@ -0,0 +1,85 @@
+/**
+ * bench_item_bytes.js
+ *
+ * Item bytes per hop and execution-record size, source workflow vs the
+ * deployment copy (field projection + fusion)
+ *
+ * Plays the same scripted conversation through both workflows with
+ * benchmarks/workflow_walk.js (mocked LLM and Redis). The session fills up
+ * to its 15-turn window, so the last turn is the largest. Reports:
+ *   - bytes of each node's output on the last turn
+ *   - execution-record bytes (all node outputs) per turn, mean and last
+ * and fails when the two workflows answer or save differently.
+ *
+ * Usage: node benchmarks/bench_item_bytes.js [source.json] [optimized.json]
+ *   (run python3 optimize_workflow.py first)
+ */
+
+const fs = require('fs');
+const path = require('path');
+const { walkTurn } = require('./workflow_walk.js');
+const { SCRIPT, scriptedLlm, stable } = require('./conversation_script.js');
+
+const ROOT = path.join(__dirname, '..');
+const SOURCE_FILE = process.argv[2] || path.join(ROOT, 'workflow-production-ready.json');
+const OPTIMIZED_FILE = process.argv[3] || path.join(ROOT, 'generated', 'workflow-optimized.json');
+
+const TURNS = 18;
+
+const bytes = value => Buffer.byteLength(JSON.stringify(value));
+
+async function converse(workflow) {
+  const redis = new Map();
+  const turns = [];
+  for (let turn = 0; turn < TURNS; turn++) {
+    const message = SCRIPT[turn % SCRIPT.length][0];
+    const { runs, response } = await walkTurn(workflow, { message, sessionId: 'bench', redis, llm: scriptedLlm(turn) });
+    turns.push({
+      runs: runs.map(run => ({ node: run.node, bytes: bytes(run.items) })),
+      record: runs.reduce((sum, run) => sum + bytes(run.items), 0),
+      response: stable(response),
+      saved: stable([...redis.values()].map(value => JSON.parse(value)))
+    });
+  }
+  return turns;
+}
+
+function pad(value, width) {
+  return String(value).padStart(width);
+}
+
+async function main() {
+  const source = JSON.parse(fs.readFileSync(SOURCE_FILE, 'utf8'));
+  const optimized = JSON.parse(fs.readFileSync(OPTIMIZED_FILE, 'utf8'));
+  const before = await converse(source);
+  const after = await converse(optimized);
+
+  const mismatches = before.filter((turn, i) => turn.response !== after[i].response || turn.saved !== after[i].saved);
+  if (mismatches.length > 0) {
+    console.error(`✗ Workflows differ on ${mismatches.length} of ${TURNS} turns`);
+    process.exit(1);
+  }
+  console.log(`✓ Same responses and saved sessions on ${TURNS} turns\n`);
+
+  const last = TURNS - 1;
+  const afterBytes = new Map(after[last].runs.map(run => [run.node, run.bytes]));
+  const width = Math.max(...before[last].runs.map(run => run.node.length));
+  console.log(`Output bytes per hop (turn ${TURNS}: "${SCRIPT[last % SCRIPT.length][0]}")`);
+  console.log(`  ${'node'.padEnd(width)}  ${pad('source', 8)}  ${pad('deployed', 8)}`);
+  for (const run of before[last].runs) {
+    const deployed = afterBytes.has(run.node) ? afterBytes.get(run.node) : '(fused)';
+    console.log(`  ${run.node.padEnd(width)}  ${pad(run.bytes, 8)}  ${pad(deployed, 8)}`);
+  }
+
+  const mean = turns => Math.round(turns.reduce((sum, turn) => sum + turn.record, 0) / turns.length);
+  const change = (a, b) => `${(((b - a) / a) * 100).toFixed(1)}%`;
+  console.log('\nExecution record bytes (all node outputs)');
+  console.log(`  mean per turn   ${pad(mean(before), 8)} → ${pad(mean(after), 8)}  (${change(mean(before), mean(after))})`);
+  console.log(`  last turn       ${pad(before[last].record, 8)} → ${pad(after[last].record, 8)}  ` +
+    `(${change(before[last].record, after[last].record)})`);
+}
+
+main().catch(error => {
+  console.error(error);
+  process.exit(1);
+});
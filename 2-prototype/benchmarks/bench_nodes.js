@@ -0,0 +1,294 @@
+/**
+ * bench_nodes.js
+ *
+ * Microbenchmarks of the hot Code nodes (and the Content-Based Router
+ * expression) in isolation, and of the functions/*.js entry points they
+ * embed, against a stored baseline
+ *
+ * Fixtures: the golden scripts of bench_golden.js, plus per question a
+ * scaffolding step answer and a teach-back explanation (so the Semantic
+ * and Teach-back validators run), walked once with workflow_walk's
+ * options.capture - every run of a node keeps the items it
+ * received and the outputs of the nodes that ran before it (what
+ * $('Node') returns). Each node then runs by itself over its fixtures,
+ * compiled once (compile cost per execution is bench_preload.js's subject);
+ * the functions get the golden turns' messages and problems.
+ *
+ * Per node: calls per second, mean and p99 CPU µs per call, and heap
+ * allocated per call (KB, median over batches run right after a forced GC).
+ *
+ * Baseline (bench_nodes.baseline.json): each mean is stored relative to a
+ * calibration loop run in the same process, so a baseline written on one
+ * machine still holds on another. --check exits 1 when a node's relative
+ * mean grew more than THRESHOLD times (--threshold); --update-baseline
+ * rewrites the file after an intended change.
+ *
+ * Usage:
+ *   node benchmarks/bench_nodes.js [workflow.json] [--iterations 300]
+ *   node benchmarks/bench_nodes.js --check [--threshold 2.5]
+ *   node benchmarks/bench_nodes.js --update-baseline
+ */
+
+const fs = require('fs');
+const path = require('path');
+const v8 = require('v8');
+const vm = require('vm');
+const { walkTurn, switchOutput } = require('./workflow_walk.js');
+const { MemoryRedis, localLlm } = require('./stand_ins.js');
+const { goldenScripts } = require('./bench_golden.js');
+const { verifyAnswer } = require('../functions/verify_answer.js');
+const { TYPO_DICTIONARY } = require('../generated/typo_dictionary.js');
+const { PROBLEM_VALIDATORS } = require('../generated/problem_validators.js');
+
+const ROOT = path.join(__dirname, '..');
+const BASELINE_FILE = path.join(__dirname, 'bench_nodes.baseline.json');
+const AsyncFunction = Object.getPrototypeOf(async function () {}).constructor;
+
+// A node 2.5x slower than its baseline (relative to calibration) fails --check
+const THRESHOLD = 2.5;
+const WARMUP = 30;
+const ALLOC_BATCH = 10;
+
+const NODES = [
+  'Normalize input1',
+  'Load Session1',
+  'Parse Features',
+  'Content-Based Router',
+  'Enhanced Numeric Verifier',
+  'Semantic Validator',
+  'Teach-back validator',
+  'Build Response Context1',
+  'Update Session & Format Response1'
+];
+
+// functions/*.js entry points: module, export, turn sample → arguments (null: not applicable)
+const FUNCTION_CASES = [
+  ['verify_answer.js', 'verifyAnswer', sample => [sample.message, sample.problem.correct_answer]],
+  ['classify_answer_quality.js', 'classifyAnswerQuality', sample =>
+    [verifyAnswer(sample.message, sample.problem.correct_answer), sample.message, sample.problem.correct_answer]],
+  ['answer_phrase_analyzer.js', 'analyzeAnswerPhrases', sample => [sample.message]],
+  ['typo_normalizer.js', 'normalizeTypos', sample => [sample.message.toLowerCase(), TYPO_DICTIONARY]],
+  ['teach_back_rubric.js', 'scoreTeachBack', sample =>
+    (PROBLEM_VALIDATORS[sample.problem.id] ? [sample.message.toLowerCase(), PROBLEM_VALIDATORS[sample.problem.id]] : null)]
+];
+
+// Second turns after the golden first turns: a step answer while scaffolded, an explanation after a correct answer
+const STEP_ANSWERS = ['3', 'to the right', 'I moved right'];
+const EXPLANATIONS = [
+  'I started at the first number and moved along the number line',
+  'because adding a positive number moves you to the right'
+];
+
+v8.setFlagsFromString('--expose-gc');
+const gc = vm.runInNewContext('gc');
+
+const copy = value => JSON.parse(JSON.stringify(value));
+
+function parseArgs(argv) {
+  const args = { workflow: path.join(ROOT, 'workflow-production-ready.json'), iterations: 300, check: false,
+    update: false, threshold: THRESHOLD };
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i] === '--iterations') args.iterations = Number(argv[++i]);
+    else if (argv[i] === '--check') args.check = true;
+    else if (argv[i] === '--update-baseline') args.update = true;
+    else if (argv[i] === '--threshold') args.threshold = Number(argv[++i]);
+    else args.workflow = path.resolve(argv[i]);
+  }
+  return args;
+}
+
+// ============================================================================
+// Fixtures
+// ============================================================================
+
+function followUpScripts(scripts) {
+  const extra = [];
+  for (const script of scripts) {
+    const [first] = script.turns;
+    if (script.id.endsWith('/help:1')) {
+      STEP_ANSWERS.forEach((message, index) => extra.push({ id: `${script.id}/step:${index + 1}`, problem: script.problem,
+        turns: [first, { message }] }));
+    }
+    if (script.id.endsWith('/correct')) {
+      EXPLANATIONS.forEach((message, index) => extra.push({ id: `${script.id}/explain:${index + 1}`, problem: script.problem,
+        turns: [first, { message }] }));
+    }
+  }
+  return extra;
+}
+
+async function captureFixtures(workflow, scripts) {
+  const fixtures = {};
+  const samples = [];
+  const redis = new MemoryRedis();
+  for (const script of scripts) {
+    for (const turn of script.turns) {
+      samples.push({ message: turn.message, problem: script.problem });
+      const run = await walkTurn(workflow, {
+        trigger: 'Webhook Trigger1',
+        body: { student_id: 'bench', session_id: `bench_${script.id}`, message: turn.message, current_problem: script.problem },
+        headers: {},
+        redis,
+        llm: localLlm(),
+        capture: true
+      });
+      const outputs = {};
+      for (const step of run.runs) {
+        if (step.input) (fixtures[step.node] || (fixtures[step.node] = [])).push({ input: step.input, outputs: copy(outputs) });
+        outputs[step.node] = step.items;
+      }
+    }
+  }
+  return { fixtures, samples };
+}
+
+// $input / $json / $ of one fixture, as workflow_walk binds them
+function bindings(fixture) {
+  const items = fixture.input;
+  const $ = name => {
+    const output = fixture.outputs[name];
+    if (!output) return { isExecuted: false, first: () => { throw new Error(`Node '${name}' hasn't been executed`); } };
+    return { isExecuted: true, first: () => output[0], last: () => output[output.length - 1], all: () => output };
+  };
+  const $input = { first: () => items[0], last: () => items[items.length - 1], all: () => items, item: items[0] };
+  return { $input, $json: items[0].json, $ };
+}
+
+// Node → async call(args) and a per-call argument builder
+function nodeCase(node, fixtures) {
+  if (node.type === 'n8n-nodes-base.switch') {
+    return { prepare: index => bindings(copy(fixtures[index % fixtures.length])), call: context => switchOutput(node, context) };
+  }
+  const compiled = new AsyncFunction('$input', '$json', '$', 'require', node.parameters.jsCode);
+  const noRequire = name => { throw new Error(`Cannot find module '${name}'`); };
+  return {
+    prepare: index => bindings(copy(fixtures[index % fixtures.length])),
+    call: context => compiled(context.$input, context.$json, context.$, noRequire)
+  };
+}
+
+function functionCase(file, name, argsOf, samples) {
+  const fn = require(path.join(ROOT, 'functions', file))[name];
+  const calls = samples.map(argsOf).filter(Boolean);
+  return { prepare: index => calls[index % calls.length], call: args => fn(...args) };
+}
+
+// ============================================================================
+// Measurement
+// ============================================================================
+
+async function measure(benchCase, iterations) {
+  for (let i = 0; i < WARMUP; i++) await benchCase.call(benchCase.prepare(i));
+
+  const prepared = Array.from({ length: iterations }, (_, i) => benchCase.prepare(i));
+  const cpu = [];
+  const started = process.hrtime.bigint();
+  for (const args of prepared) {
+    const before = process.cpuUsage();
+    await benchCase.call(args);
+    const used = process.cpuUsage(before);
+    cpu.push(used.user + used.system);
+  }
+  const wall = Number(process.hrtime.bigint() - started) / 1e9;
+
+  const allocations = [];
+  for (let batch = 0; batch * ALLOC_BATCH < Math.min(iterations, 200); batch++) {
+    const calls = Array.from({ length: ALLOC_BATCH }, (_, i) => benchCase.prepare(batch * ALLOC_BATCH + i));
+    gc();
+    const heap = process.memoryUsage().heapUsed;
+    for (const args of calls) await benchCase.call(args);
+    allocations.push((process.memoryUsage().heapUsed - heap) / ALLOC_BATCH);
+  }
+
+  cpu.sort((a, b) => a - b);
+  allocations.sort((a, b) => a - b);
+  return {
+    ops_per_sec: Math.round(iterations / wall),
+    mean_us: Number((cpu.reduce((sum, value) => sum + value, 0) / cpu.length).toFixed(1)),
+    p99_us: cpu[Math.min(cpu.length - 1, Math.floor(cpu.length * 0.99))],
+    alloc_kb: Number((Math.max(0, allocations[Math.floor(allocations.length / 2)]) / 1024).toFixed(1))
+  };
+}
+
+// Fixed workload in this process: the unit baseline means are stored in
+const CALIBRATION_DOC = {
+  turns: Array.from({ length: 15 }, (_, i) => ({ student: `answer ${i}`, tutor: 'How many steps is it from -3 to 0?', category: 'stuck' }))
+};
+
+async function calibrate(iterations) {
+  const text = JSON.stringify(CALIBRATION_DOC);
+  const result = await measure({
+    prepare: () => text,
+    call: source => {
+      const parsed = JSON.parse(source);
+      return parsed.turns.filter(turn => /\d+/.test(turn.student)).map(turn => turn.tutor.toLowerCase().split(' ')).length;
+    }
+  }, iterations);
+  return result.mean_us;
+}
+
+async function main() {
+  const args = parseArgs(process.argv.slice(2));
+  const workflow = JSON.parse(fs.readFileSync(args.workflow, 'utf8'));
+  const questions = JSON.parse(fs.readFileSync(path.join(ROOT, 'exemplars/questions.json'), 'utf8')).questions;
+  const scripts = goldenScripts(questions);
+  const { fixtures, samples } = await captureFixtures(workflow, scripts.concat(followUpScripts(scripts)));
+  const nodes = new Map(workflow.nodes.map(node => [node.name, node]));
+
+  const calibration = await calibrate(args.iterations * 5);
+  const results = {};
+  for (const name of NODES) {
+    if (!nodes.has(name) || !fixtures[name]) {
+      console.log(`  (${name}: not in ${path.basename(args.workflow)} or never ran - skipped)`);
+      continue;
+    }
+    results[name] = { fixtures: fixtures[name].length, ...await measure(nodeCase(nodes.get(name), fixtures[name]), args.iterations) };
+  }
+  for (const [file, name, argsOf] of FUNCTION_CASES) {
+    const benchCase = functionCase(file, name, argsOf, samples);
+    results[`${file} ${name}`] = { fixtures: samples.filter(sample => argsOf(sample)).length,
+      ...await measure(benchCase, args.iterations) };
+  }
+  for (const result of Object.values(results)) result.relative = Number((result.mean_us / calibration).toFixed(2));
+
+  console.log(`${path.basename(args.workflow)}: ${args.iterations} calls per node, calibration ${calibration.toFixed(1)} µs\n`);
+  const width = Math.max(...Object.keys(results).map(name => name.length));
+  console.log(`  ${'node / function'.padEnd(width)} ${'calls/s'.padStart(9)} ${'mean µs'.padStart(8)} ${'p99 µs'.padStart(8)} ` +
+    `${'alloc KB'.padStart(9)} ${'× calib'.padStart(8)}`);
+  for (const [name, r] of Object.entries(results)) {
+    console.log(`  ${name.padEnd(width)} ${String(r.ops_per_sec).padStart(9)} ${r.mean_us.toFixed(1).padStart(8)} ` +
+      `${String(r.p99_us).padStart(8)} ${r.alloc_kb.toFixed(1).padStart(9)} ${r.relative.toFixed(2).padStart(8)}`);
+  }
+
+  if (args.update) {
+    const baseline = { workflow: path.basename(args.workflow), calibration_us: calibration, threshold: args.threshold,
+      nodes: Object.fromEntries(Object.entries(results).map(([name, r]) => [name,
+        { relative: r.relative, mean_us: r.mean_us, alloc_kb: r.alloc_kb }])) };
+    fs.writeFileSync(BASELINE_FILE, JSON.stringify(baseline, null, 2) + '\n');
+    console.log(`\n✓ Wrote ${path.relative(ROOT, BASELINE_FILE)}`);
+    return 0;
+  }
+  if (!args.check) return 0;
+
+  const baseline = JSON.parse(fs.readFileSync(BASELINE_FILE, 'utf8'));
+  const slower = [];
+  console.log(`\nAgainst ${path.relative(ROOT, BASELINE_FILE)} (fail above ${args.threshold}x):`);
+  for (const [name, r] of Object.entries(results)) {
+    const before = baseline.nodes[name];
+    if (!before) continue;
+    const ratio = r.relative / before.relative;
+    if (ratio > args.threshold) slower.push(name);
+    console.log(`  ${ratio > args.threshold ? '✗' : '✓'} ${name.padEnd(width)} ${ratio.toFixed(2)}x`);
+  }
+  if (slower.length) {
+    console.log(`\n✗ ${slower.length} regression(s): ${slower.join(', ')}`);
+    return 1;
+  }
+  console.log('\n✓ No node slower than the baseline threshold');
+  return 0;
+}
+
+main().then(code => process.exit(code)).catch(error => {
+  console.error(`✗ ${error.stack || error.message}`);
+  process.exit(1);
+});
@@ -0,0 +1,175 @@
+/**
+ * bench_preload.js
+ *
+ * CPU time and allocation per Code node execution, blocks embedded in the
+ * node code vs preloaded once per worker (generated/tutor-runtime)
+ *
+ * Runs sustained load - many sessions, interleaved, through the scripted
+ * conversation - against the deployment copy (workflow-optimized.json) and
+ * its preloaded variant (workflow-preloaded.json), turn by turn, with
+ * benchmarks/workflow_walk.js. Like n8n, every execution compiles the node
+ * code again; the preloaded copy require()s its tables instead. Reports per
+ * Code node, after warm-up:
+ *   - CPU µs per execution (process.cpuUsage)
+ *   - heap growth per execution (GC before every turn, large young
+ *     generation so no scavenge runs inside a turn)
+ * and the one-time module load. Fails when the two copies answer or save
+ * differently, or when a turn mutates the shared module tables.
+ *
+ * Usage: node benchmarks/bench_preload.js [sessions] [turns per session]
+ *   (run python3 optimize_workflow.py and python3 optimize_workflow.py --preload first)
+ */
+
+const fs = require('fs');
+const path = require('path');
+const { spawnSync } = require('child_process');
+
+const V8_FLAGS = ['--expose-gc', '--max-semi-space-size=128'];
+if (typeof global.gc !== 'function') {
+  const result = spawnSync(process.execPath, [...V8_FLAGS, __filename, ...process.argv.slice(2)], { stdio: 'inherit' });
+  process.exit(result.status === null ? 1 : result.status);
+}
+
+const { walkTurn } = require('./workflow_walk.js');
+const { SCRIPT, scriptedLlm, stable } = require('./conversation_script.js');
+
+const ROOT = path.join(__dirname, '..');
+const INLINE_FILE = path.join(ROOT, 'generated', 'workflow-optimized.json');
+const PRELOADED_FILE = path.join(ROOT, 'generated', 'workflow-preloaded.json');
+const RUNTIME_FILE = path.join(ROOT, 'generated', 'tutor-runtime', 'index.js');
+
+const SESSIONS = Number(process.argv[2]) || 20;
+const TURNS_PER_SESSION = Number(process.argv[3]) || 15;
+const WARMUP_TURNS = 40;
+
+// Functions by source, Map/Set by entries: enough to see a table change
+function snapshot(value) {
+  return JSON.stringify(value, (key, entry) => {
+    if (typeof entry === 'function') return `fn:${entry.toString().length}:${entry.name}`;
+    if (entry instanceof Map) return { map: [...entry] };
+    if (entry instanceof Set) return { set: [...entry] };
+    if (entry instanceof RegExp) return `re:${entry}`;
+    return entry;
+  });
+}
+
+// Both copies in lockstep, alternating which goes first, so JIT warm-up and
+// GC pressure do not favour either
+async function sustain(variants) {
+  const redis = variants.map(() => new Map());
+  const turns = variants.map(() => []);
+  const codeNodes = new Set(variants.flatMap(({ workflow }) =>
+    workflow.nodes.filter(node => node.type === 'n8n-nodes-base.code').map(node => node.name)));
+  let execution = 0;
+  for (let turn = 0; turn < TURNS_PER_SESSION; turn++) {
+    for (let session = 0; session < SESSIONS; session++) {
+      const message = SCRIPT[turn % SCRIPT.length][0];
+      const order = execution++ % 2 === 0 ? [0, 1] : [1, 0];
+      for (const index of order) {
+        global.gc();
+        const { runs, response } = await walkTurn(variants[index].workflow, {
+          ...variants[index].options, message, sessionId: `load-${session}`, redis: redis[index],
+          llm: scriptedLlm(turn), measure: true
+        });
+        turns[index].push({
+          nodes: runs.filter(run => codeNodes.has(run.node))
+            .map(run => ({ node: run.node, cpu: run.cpu_us, heap: run.heap_bytes })),
+          response: stable(response),
+          saved: stable(JSON.parse(redis[index].get(`tutor_session:load-${session}`)))
+        });
+      }
+    }
+  }
+  return turns;
+}
+
+// node → {runs, cpu, heap} means over the measured turns
+function perNode(turns) {
+  const totals = new Map();
+  for (const turn of turns.slice(WARMUP_TURNS)) {
+    for (const run of turn.nodes) {
+      const entry = totals.get(run.node) || { runs: 0, cpu: 0, heap: 0 };
+      entry.runs++;
+      entry.cpu += run.cpu;
+      entry.heap += run.heap;
+      totals.set(run.node, entry);
+    }
+  }
+  for (const entry of totals.values()) {
+    entry.cpu /= entry.runs;
+    entry.heap /= entry.runs;
+  }
+  return totals;
+}
+
+function pad(value, width) {
+  return String(value).padStart(width);
+}
+
+async function main() {
+  const inline = JSON.parse(fs.readFileSync(INLINE_FILE, 'utf8'));
+  const preloaded = JSON.parse(fs.readFileSync(PRELOADED_FILE, 'utf8'));
+
+  global.gc();
+  const loadHeap = process.memoryUsage().heapUsed;
+  const loadCpu = process.cpuUsage();
+  const runtime = require(RUNTIME_FILE);
+  const loadUsed = process.cpuUsage(loadCpu);
+  const moduleHeap = process.memoryUsage().heapUsed - loadHeap;
+  const workerRequire = name => (name === 'tutor-runtime' ? runtime : require(name));
+
+  const units = Object.entries(runtime.UNITS).map(([name, entry]) => [name, runtime.unit(name, entry.hash)]);
+  const before = units.map(([name, exports]) => [name, snapshot(exports)]);
+
+  const total = SESSIONS * TURNS_PER_SESSION;
+  console.log(`${SESSIONS} sessions x ${TURNS_PER_SESSION} turns = ${total} executions per workflow ` +
+    `(first ${WARMUP_TURNS} not measured)\n`);
+  const [a, b] = await sustain([
+    { workflow: inline, options: {} },
+    { workflow: preloaded, options: { require: workerRequire } }
+  ]);
+
+  const mismatches = a.filter((turn, i) => turn.response !== b[i].response || turn.saved !== b[i].saved);
+  if (mismatches.length > 0) {
+    console.error(`✗ Workflows differ on ${mismatches.length} of ${total} turns`);
+    process.exit(1);
+  }
+  console.log(`✓ Same responses and saved sessions on ${total} turns`);
+
+  const mutated = before.filter(([name, shot], i) => snapshot(units[i][1]) !== shot).map(([name]) => name);
+  if (mutated.length > 0) {
+    console.error(`✗ Turns mutated the preloaded tables of: ${mutated.join(', ')}`);
+    process.exit(1);
+  }
+  console.log(`✓ Preloaded tables unchanged after ${total} turns (${units.length} units)\n`);
+
+  const inlineNodes = perNode(a);
+  const preloadedNodes = perNode(b);
+  const width = Math.max(...[...inlineNodes.keys()].map(name => name.length));
+  const kb = bytes => (bytes / 1024).toFixed(1);
+  console.log('Per execution (mean)        CPU µs               heap KB');
+  console.log(`  ${'node'.padEnd(width)}  ${pad('inline', 8)} ${pad('preload', 8)}  ${pad('inline', 8)} ${pad('preload', 8)}`);
+  const sum = { cpuA: 0, cpuB: 0, heapA: 0, heapB: 0 };
+  for (const [name, x] of inlineNodes) {
+    const y = preloadedNodes.get(name);
+    const weight = x.runs / (total - WARMUP_TURNS);
+    sum.cpuA += x.cpu * weight;
+    sum.cpuB += y.cpu * weight;
+    sum.heapA += x.heap * weight;
+    sum.heapB += y.heap * weight;
+    const marker = runtime.UNITS[name] ? '' : '  (no blocks)';
+    console.log(`  ${name.padEnd(width)}  ${pad(Math.round(x.cpu), 8)} ${pad(Math.round(y.cpu), 8)}  ` +
+      `${pad(kb(x.heap), 8)} ${pad(kb(y.heap), 8)}${marker}`);
+  }
+  const change = (x, y) => `${(((y - x) / x) * 100).toFixed(1)}%`;
+  console.log('\nCode nodes per turn');
+  console.log(`  CPU µs    ${pad(Math.round(sum.cpuA), 8)} → ${pad(Math.round(sum.cpuB), 8)}  (${change(sum.cpuA, sum.cpuB)})`);
+  console.log(`  heap KB   ${pad(kb(sum.heapA), 8)} → ${pad(kb(sum.heapB), 8)}  (${change(sum.heapA, sum.heapB)})`);
+  console.log(`\nOnce per worker: require('tutor-runtime') ${Math.round((loadUsed.user + loadUsed.system) / 1000)} ms CPU, ` +
+    `${kb(moduleHeap)} KB heap`);
+}
+
+main().catch(error => {
+  console.error(error);
+  process.exit(1);
+});
@@ -0,0 +1,177 @@
+/**
+ * bench_question_loop.js
+ *
+ * Turns and LLM calls per solved problem with a tutor that repeats its
+ * scaffolding questions, without and with the local loop check
+ * (functions/question_loop.js, build_question_loop.py)
+ *
+ * Simulated conversations on -3 + 5 through the source workflow with
+ * benchmarks/workflow_walk.js. The tutor LLM works through a plan of
+ * questions and, like the transcripts that motivated the check, asks some
+ * steps again in other words (or verbatim); the student is deterministic:
+ * answers a step question, answers "2" when asked to put it together, and
+ * the confused student says "I don't know" until the tutor walks through
+ * the step. The Synthesis LLM stand-in follows its prompt's criteria the
+ * way a model reliably can: two different sub-answers, or a question
+ * repeated word for word - a rephrased repeat goes unnoticed.
+ *
+ * "Without" is the same workflow with the similarity threshold set out of
+ * reach (nothing is ever flagged), so the two runs differ only in the
+ * check. These are scripted conversations: the numbers show what the check
+ * changes for these loop shapes, not production rates.
+ *
+ * Usage: node benchmarks/bench_question_loop.js [workflow.json]
+ */
+
+const fs = require('fs');
+const path = require('path');
+const { walkTurn } = require('./workflow_walk.js');
+
+const ROOT = path.join(__dirname, '..');
+const WORKFLOW_FILE = process.argv[2] || path.join(ROOT, 'workflow-production-ready.json');
+const MAX_TURNS = 12;
+const THRESHOLD = 'threshold: 0.6,';
+
+const STEP_ZERO = 'How many steps is it from -3 to 0?';
+const STEP_REST = 'Yes! How many more steps do you take after 0?';
+const REPHRASED = [
+  'Right. Can you count the steps from -3 to 0?',
+  'Good. So how many steps do we move going from -3 to 0?'
+];
+const WALKTHROUGH = 'From -3, 3 steps to the right gets you to 0, and 2 more steps gets you to 2. So what is -3 + 5?';
+const SYNTHESIS_QUESTION = 'Right! So where do you end up?';
+
+// Tutor question plans: the tutor's nth reply for the problem is plan[n]
+const PROFILES = [
+  { name: 'no repeat', student: 'steady', plan: [STEP_ZERO, STEP_REST] },
+  { name: 'rephrased once', student: 'steady', plan: [STEP_ZERO, REPHRASED[0], STEP_REST] },
+  { name: 'rephrased twice', student: 'steady', plan: [STEP_ZERO, REPHRASED[0], REPHRASED[1], STEP_REST] },
+  { name: 'repeated verbatim', student: 'steady', plan: [STEP_ZERO, STEP_ZERO, STEP_REST] },
+  { name: 'confused student', student: 'confused', plan: [STEP_ZERO, REPHRASED[0], REPHRASED[1], WALKTHROUGH] }
+];
+
+const features = (message_type, numeric_value = null) =>
+  JSON.stringify({ message_type, numeric_value, keywords: null, confidence: 1.0 });
+
+function studentReply(profile, tutor, walkedThrough) {
+  if (/end up|what is -3 \+ 5/i.test(tutor)) return '2';
+  if (profile.student === 'confused' && !walkedThrough) return 'I don\'t know';
+  if (/more steps/.test(tutor)) return '2';
+  return '3';
+}
+
+// Synthesis LLM stand-in: distinct sub-answers or a verbatim repeat, nothing subtler
+function synthesisDecision(prompt) {
+  const history = prompt.split('Recent Conversation:')[1].split('---')[0];
+  const answers = new Set((history.match(/^Student: (-?\d+)$/gm) || []));
+  const questions = (history.match(/^Tutor: .*$/gm) || []).map(line => line.split(/(?<=[.!]) /).pop());
+  const verbatim = new Set(questions).size < questions.length;
+  const action = answers.size >= 2 || verbatim ? 'synthesize' : 'continue';
+  return JSON.stringify({ action, reason: 'bench', sub_answers: [...answers],
+    synthesis_hint: action === 'synthesize' ? 'Put the steps together - where do you end up?' : '' });
+}
+
+async function solve(workflow, profile, sessionId) {
+  const redis = new Map();
+  const calls = { total: 0 };
+  let message = 'I don\'t know';
+  let replies = 0;
+  let walkedThrough = false;
+  let forced = 0;
+
+  for (let turn = 1; turn <= MAX_TURNS; turn++) {
+    let tutor = null;
+    const { runs } = await walkTurn(workflow, {
+      message, sessionId, redis,
+      llm: (nodeName, prompt, item) => {
+        calls.total++;
+        if (nodeName === 'Content Feature Extractor') {
+          return /^-?\d+$/.test(message) ? features('answer_attempt', Number(message)) : features('help_request');
+        }
+        if (nodeName === 'Synthesis LLM1') return synthesisDecision(prompt);
+        if (/Synthesis Action: synthesize/.test(prompt)) {
+          tutor = SYNTHESIS_QUESTION;
+        } else if (/Loop Check: .* times/.test(prompt)) {
+          tutor = WALKTHROUGH;
+        } else if (item.category === 'correct') {
+          tutor = 'You solved it! -3 + 5 = 2. Can you explain how you got it?';
+        } else {
+          tutor = profile.plan[Math.min(replies++, profile.plan.length - 1)];
+        }
+        return tutor;
+      }
+    });
+    // Build Response Context1, or the validator it is fused into
+    if (runs.some(run => run.items.length > 0 && run.items[0].json.loop_decision)) forced++;
+
+    const session = JSON.parse(redis.get(`tutor_session:${sessionId}`));
+    if (session.stats.problems_solved > 0) return { solved: true, turns: turn, calls: calls.total, forced };
+    const last = session.recent_turns[session.recent_turns.length - 1].tutor_response;
+    walkedThrough = walkedThrough || last === WALKTHROUGH;
+    message = studentReply(profile, last, walkedThrough);
+  }
+  return { solved: false, turns: MAX_TURNS, calls: calls.total, forced };
+}
+
+function withoutCheck(workflow) {
+  const ablated = JSON.parse(JSON.stringify(workflow));
+  let patched = 0;
+  for (const node of ablated.nodes) {
+    const code = node.parameters.jsCode;
+    if (code && code.includes(THRESHOLD)) {
+      node.parameters.jsCode = code.replace(THRESHOLD, 'threshold: 2,');
+      patched++;
+    }
+  }
+  if (patched === 0) throw new Error(`"${THRESHOLD}" not found - run python3 build_question_loop.py`);
+  return ablated;
+}
+
+const pad = (value, width) => String(value).padStart(width);
+
+async function main() {
+  const workflow = JSON.parse(fs.readFileSync(WORKFLOW_FILE, 'utf8'));
+  const variants = [['without', withoutCheck(workflow)], ['with', workflow]];
+  const totals = { without: { solved: 0, turns: 0, calls: 0 }, with: { solved: 0, turns: 0, calls: 0 } };
+
+  console.log(`${path.basename(WORKFLOW_FILE)}, -3 + 5, at most ${MAX_TURNS} turns per problem\n`);
+  console.log(`  ${'tutor'.padEnd(18)}  turns to solve     LLM calls      loop decisions`);
+  console.log(`  ${''.padEnd(18)}  ${pad('without', 7)} ${pad('with', 6)}  ${pad('without', 7)} ${pad('with', 6)}`);
+  let index = 0;
+  for (const profile of PROFILES) {
+    const results = {};
+    for (const [label, variant] of variants) {
+      results[label] = await solve(variant, profile, `loop-${label}-${index}`);
+      const total = totals[label];
+      if (results[label].solved) {
+        total.solved++;
+        total.turns += results[label].turns;
+        total.calls += results[label].calls;
+      }
+    }
+    index++;
+    const turns = result => (result.solved ? result.turns : `${MAX_TURNS}+`);
+    console.log(`  ${profile.name.padEnd(18)}  ${pad(turns(results.without), 7)} ${pad(turns(results.with), 6)}  ` +
+      `${pad(results.without.calls, 7)} ${pad(results.with.calls, 6)}  ${pad(results.with.forced, 8)}`);
+    if (results.without.forced > 0) {
+      console.error(`✗ ${profile.name}: loop decision without the check`);
+      process.exit(1);
+    }
+    if (profile.name === 'no repeat' && (results.with.forced > 0 || results.with.turns !== results.without.turns)) {
+      console.error('✗ The check changed a conversation without repeats');
+      process.exit(1);
+    }
+  }
+
+  const per = (total, key) => (total.solved ? (total[key] / total.solved).toFixed(2) : '-');
+  console.log('\nPer solved problem        without     with');
+  console.log(`  solved                 ${pad(`${totals.without.solved}/${PROFILES.length}`, 7)} ` +
+    `${pad(`${totals.with.solved}/${PROFILES.length}`, 8)}`);
+  console.log(`  turns                  ${pad(per(totals.without, 'turns'), 7)} ${pad(per(totals.with, 'turns'), 8)}`);
+  console.log(`  LLM calls              ${pad(per(totals.without, 'calls'), 7)} ${pad(per(totals.with, 'calls'), 8)}`);
+}
+
+main().catch(error => {
+  console.error(error);
+  process.exit(1);
+});
@@ -0,0 +1,175 @@
+/**
+ * bench_registry_store.js
+ *
+ * Registry versions from Redis in the preloaded deployment copy: hot reload,
+ * version pins, and what the version check costs per turn
+ *
+ * Plays sustained load through generated/workflow-preloaded.json with
+ * benchmarks/workflow_walk.js, one fresh tutor-runtime per phase (a new
+ * worker):
+ *   1. nothing published      - tables built into the module
+ *   2. current = the document - same answers; the document is fetched and
+ *                               compiled once, the pointer read once per session
+ *                               (later turns take the version saved with it)
+ *   3. current = v2           - a detector added without redeploy (adding the
+ *                               operands' product as a misconception); one more fetch.
+ *                               A running session keeps v1 until its recheck is due
+ *   4. pinned to v1           - the request gets v1's verdict while current is v2
+ *   5. pinned to an unknown version fails with a clear error
+ *
+ * Usage: node benchmarks/bench_registry_store.js [turns]
+ *   (run python3 optimize_workflow.py --preload and python3 build_registry_store.py first)
+ */
+
+const fs = require('fs');
+const path = require('path');
+const { walkTurn } = require('./workflow_walk.js');
+const { SCRIPT, scriptedLlm, stable } = require('./conversation_script.js');
+
+const ROOT = path.join(__dirname, '..');
+const PRELOADED_FILE = path.join(ROOT, 'generated', 'workflow-preloaded.json');
+const RUNTIME_FILE = path.join(ROOT, 'generated', 'tutor-runtime', 'index.js');
+const DOCUMENT_FILE = path.join(ROOT, 'generated', 'registry-document.json');
+
+const TURNS = Number(process.argv[2]) || 200;
+const SESSIONS = 10;
+const FETCH_NODE = 'Redis: Get Registries1';
+const VERSION_NODE = 'Redis: Get Registry Version1';
+const REGISTRIES_MARKER = 'REGISTRIES (generated by build_registries.py)';
+
+// 7 + 4 answered with 28: a plain wrong answer, unless a detector expects it
+const PROBE_PROBLEM = { id: 'bench_probe', text: 'What is 7 + 4?', correct_answer: '11' };
+const PROBE_FEATURES = JSON.stringify({ message_type: 'answer_attempt', numeric_value: 28, keywords: null, confidence: 1.0 });
+
+function freshWorker() {
+  delete require.cache[require.resolve(RUNTIME_FILE)];
+  const runtime = require(RUNTIME_FILE);
+  return name => (name === 'tutor-runtime' ? runtime : require(name));
+}
+
+async function conversation(workflow, redis, workerRequire) {
+  const turns = [];
+  for (let turn = 0; turn < TURNS; turn++) {
+    const cpu = process.cpuUsage();
+    const { runs, response } = await walkTurn(workflow, {
+      message: SCRIPT[Math.floor(turn / SESSIONS) % SCRIPT.length][0],
+      sessionId: `store-${turn % SESSIONS}`,
+      redis,
+      llm: scriptedLlm(Math.floor(turn / SESSIONS)),
+      require: workerRequire,
+      measure: true
+    });
+    const used = process.cpuUsage(cpu);
+    turns.push({
+      response: stable(response),
+      fetched: runs.some(run => run.node === FETCH_NODE),
+      pointer: runs.some(run => run.node === VERSION_NODE),
+      cpu: used.user + used.system,
+      check: runs.filter(run => run.node === 'Load Session1').reduce((sum, run) => sum + run.cpu_us, 0)
+    });
+  }
+  return turns;
+}
+
+let probes = 0;
+
+// First attempt of a new session, so only the tables decide the verdict
+async function probe(workflow, redis, workerRequire, pin, sessionId = `probe-${probes++}`) {
+  const body = { session_id: sessionId, student_id: 'bench', message: '28', current_problem: PROBE_PROBLEM };
+  if (pin) body.registry_version = pin;
+  const { runs, response } = await walkTurn(workflow, {
+    trigger: 'Webhook Trigger1', body, headers: {}, redis, require: workerRequire,
+    llm: nodeName => (nodeName === 'Content Feature Extractor' ? PROBE_FEATURES : 'Not quite.')
+  });
+  return {
+    category: JSON.parse(response.body).metadata.category,
+    fetched: runs.some(run => run.node === FETCH_NODE),
+    pointer: runs.some(run => run.node === VERSION_NODE)
+  };
+}
+
+const pad = (value, width) => String(value).padStart(width);
+const mean = values => values.reduce((sum, value) => sum + value, 0) / values.length;
+
+function fail(message) {
+  console.error(`✗ ${message}`);
+  process.exit(1);
+}
+
+async function main() {
+  const workflow = JSON.parse(fs.readFileSync(PRELOADED_FILE, 'utf8'));
+  const v1 = JSON.parse(fs.readFileSync(DOCUMENT_FILE, 'utf8'));
+  const v2 = JSON.parse(JSON.stringify(v1));
+  v2.version = `${v1.version}-v2`;
+  v2.blocks[REGISTRIES_MARKER] = v2.blocks[REGISTRIES_MARKER].replace(
+    '"math_arithmetic_addition":(num1,num2,operation)=>{return[', '$&num1*num2,');
+  if (v2.blocks[REGISTRIES_MARKER] === v1.blocks[REGISTRIES_MARKER]) fail('addition detector not found in the document');
+
+  // 1. Nothing published
+  const builtin = await conversation(workflow, new Map(), freshWorker());
+
+  // 2. Current = the document built from the same config
+  const redis = new Map([[`tutor_registries:${v1.version}`, JSON.stringify(v1)], ['tutor_registries:current', v1.version]]);
+  const worker = freshWorker();
+  const published = await conversation(workflow, redis, worker);
+  const differing = published.filter((turn, i) => turn.response !== builtin[i].response).length;
+  if (differing > 0) fail(`Published tables answer differently on ${differing} of ${TURNS} turns`);
+  const fetches = published.filter(turn => turn.fetched).length;
+  if (fetches !== 1) fail(`Document fetched on ${fetches} turns, expected 1`);
+  console.log(`✓ ${v1.version}: same responses as the built-in tables on ${TURNS} turns, document fetched once`);
+  const pointerReads = published.filter(turn => turn.pointer).length;
+  if (pointerReads !== SESSIONS) fail(`Version pointer read on ${pointerReads} turns, expected ${SESSIONS} (once per session)`);
+  console.log(`✓ Version pointer read on ${pointerReads} of ${TURNS} turns - once per session, then saved with it`);
+
+  const before = await probe(workflow, redis, worker, null);
+  await probe(workflow, redis, worker, null, 'running');
+
+  // 3. Hot reload: publish v2, same worker
+  redis.set(`tutor_registries:${v2.version}`, JSON.stringify(v2));
+  redis.set('tutor_registries:current', v2.version);
+  const after = await probe(workflow, redis, worker, null);
+  const afterAgain = await probe(workflow, redis, worker, null);
+  if (before.category === after.category) fail(`v2 did not change the verdict (${after.category})`);
+  if (!after.fetched || afterAgain.fetched) fail('v2 should be fetched exactly once');
+  console.log(`✓ ${v2.version}: "28" for 7 + 4 is ${before.category} → ${after.category} without redeploy, fetched once`);
+
+  // A running session keeps the version it read until its recheck is due
+  const sessionVersion = () => JSON.parse(redis.get('tutor_session:running')).registry_version;
+  const kept = await probe(workflow, redis, worker, null, 'running');
+  if (kept.pointer || sessionVersion() !== v1.version) fail(`running session switched early (${sessionVersion()})`);
+  const saved = JSON.parse(redis.get('tutor_session:running'));
+  saved.registry_checked_at = 0;
+  redis.set('tutor_session:running', JSON.stringify(saved));
+  const rechecked = await probe(workflow, redis, worker, null, 'running');
+  if (!rechecked.pointer || sessionVersion() !== v2.version) fail(`recheck did not pick up ${v2.version} (${sessionVersion()})`);
+  console.log(`✓ Running session: stays on ${v1.version} until its recheck is due, then ${v2.version}`);
+
+  // 4. Pin v1 while current is v2
+  const pinned = await probe(workflow, redis, worker, v1.version);
+  if (pinned.category !== before.category || pinned.fetched) fail(`pinned request got ${pinned.category}`);
+  console.log(`✓ registry_version: "${v1.version}" → ${pinned.category} (cached, no fetch)`);
+
+  // 5. Unknown pin
+  try {
+    await probe(workflow, redis, worker, 'unpublished');
+    fail('an unknown pinned version was accepted');
+  } catch (error) {
+    console.log(`✓ Unknown pin fails: ${error.message}`);
+  }
+
+  const cached = published.filter(turn => !turn.fetched);
+  const cold = published.find(turn => turn.fetched);
+  const builtinTurns = builtin.slice(1);
+  console.log(`\nPer turn (mean of ${cached.length} turns)   whole turn   Load Session1 (picks the version)`);
+  console.log(`  built-in tables        ${pad(Math.round(mean(builtinTurns.map(turn => turn.cpu))), 7)} µs  ` +
+    `${pad(Math.round(mean(builtinTurns.map(turn => turn.check))), 7)} µs`);
+  console.log(`  published, cached      ${pad(Math.round(mean(cached.map(turn => turn.cpu))), 7)} µs  ` +
+    `${pad(Math.round(mean(cached.map(turn => turn.check))), 7)} µs`);
+  console.log(`  version change (cold)  ${Math.round(cold.cpu)} µs CPU, once per worker and version ` +
+    `(${(Buffer.byteLength(JSON.stringify(v1)) / 1024).toFixed(1)} KB document)`);
+}
+
+main().catch(error => {
+  console.error(error);
+  process.exit(1);
+});
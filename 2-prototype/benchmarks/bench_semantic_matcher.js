@@ -0,0 +1,124 @@
+/**
+ * bench_semantic_matcher.js
+ *
+ * Per-turn cost of the Semantic Validator's pattern matching as the
+ * SEMANTIC_PATTERNS registry grows
+ *
+ * Compares the original nested loop (every group × every questionPattern ×
+ * every keyword, String.includes) with the compiled matcher from
+ * functions/semantic_matcher.js, scanning by indexOf per phrase and by the
+ * Aho–Corasick automaton, on the real registry (3 groups) and synthetic
+ * registries of up to 5000 groups. Worst case for the loop: the question
+ * triggers the last group. The crossover sets AUTOMATON_MIN_PHRASES.
+ *
+ * Usage: node benchmarks/bench_semantic_matcher.js [iterations]
+ */
+
+const {
+  compileSemanticPatterns, AUTOMATON_MIN_PHRASES, scanPhrases, markNegation, triggeredGroups, selectGenericSets,
+  judgeKeywords
+} = require('../functions/semantic_matcher.js');
+const { SEMANTIC_PATTERNS } = require('../config_registries.js');
+
+const ITERATIONS = parseInt(process.argv[2] || '2000', 10);
+const SIZES = [3, 10, 30, 60, 100, 300, 1000, 5000];
+
+// Unique pronounceable words so synthetic phrases never collide
+function word(n) {
+  const syllables = ['ka', 'lo', 'mi', 'nu', 'pe', 'ra', 'si', 'tu', 'vo', 'ze'];
+  let result = '';
+  do {
+    result += syllables[n % 10];
+    n = Math.floor(n / 10);
+  } while (n > 0);
+  return result + 'x';
+}
+
+// Registry with `size` groups: the real ones plus synthetic operation groups
+function syntheticRegistry(size) {
+  const registry = JSON.parse(JSON.stringify(SEMANTIC_PATTERNS));
+  const synthetic = { patterns: [] };
+  for (let g = 0; g < size - 3; g++) {
+    synthetic.patterns.push({
+      questionPatterns: [`${word(g * 7)} or ${word(g * 7 + 1)}`, `which ${word(g * 7 + 2)}`],
+      expectedKeywords: {
+        '+': [word(g * 7 + 3), word(g * 7 + 4)],
+        '-': [word(g * 7 + 5), word(g * 7 + 6)]
+      },
+      wrongKeywords: {
+        '+': [word(g * 7 + 5), word(g * 7 + 6)],
+        '-': [word(g * 7 + 3), word(g * 7 + 4)]
+      }
+    });
+  }
+  // Put the synthetic groups first so the real question hits the last group
+  return { synthetic_operations: synthetic, ...registry };
+}
+
+// The loop Semantic Validator ran before the matcher was compiled
+function naiveMatch(registry, question, message, problemText) {
+  const keywords = message.split(/\s+/);
+  for (const [patternType, patternConfig] of Object.entries(registry)) {
+    for (const pattern of patternConfig.patterns) {
+      if (!pattern.questionPatterns.some(qp => question.includes(qp.toLowerCase()))) continue;
+      if (Array.isArray(pattern.expectedKeywords)) continue;
+      const key = Object.keys(pattern.expectedKeywords).includes('+')
+        ? (problemText.includes('+') ? '+' : '-')
+        : (problemText.match(/\+\s*\d/) ? 'positive' : 'negative');
+      const expectedSet = pattern.expectedKeywords[key] || [];
+      const wrongSet = pattern.wrongKeywords[key] || [];
+      if (expectedSet.length === 0) continue;
+      const hasCorrect = keywords.some(kw => expectedSet.includes(kw));
+      const hasWrong = keywords.some(kw => wrongSet.includes(kw));
+      return hasCorrect && !hasWrong ? 'correct' : hasWrong ? 'wrong' : 'ambiguous';
+    }
+  }
+  return null;
+}
+
+function compiledMatch(matcher, question, message, problemText) {
+  const hits = markNegation(message, scanPhrases(matcher, message));
+  for (const group of triggeredGroups(matcher, question)) {
+    const sets = selectGenericSets(group, problemText, question);
+    if (sets) return judgeKeywords(hits, sets, []);
+  }
+  return null;
+}
+
+function time(fn) {
+  for (let i = 0; i < ITERATIONS; i++) fn(); // warm up the JIT
+  const start = process.hrtime.bigint();
+  for (let i = 0; i < ITERATIONS; i++) fn();
+  return Number(process.hrtime.bigint() - start) / 1000 / ITERATIONS;
+}
+
+const question = 'which direction do we move on the number line, left or right?';
+const message = "we move right, not left";
+const problemText = '3 + 5';
+
+console.log(`Semantic pattern matching, ${ITERATIONS} iterations per cell\n`);
+console.log('groups  phrases  states  compile ms  table KB  loop µs/turn  indexOf µs/turn  automaton µs/turn');
+let crossover = null;
+for (const size of SIZES) {
+  const registry = syntheticRegistry(size);
+
+  const compileStart = process.hrtime.bigint();
+  const automaton = compileSemanticPatterns(registry, 0);
+  const compileMs = Number(process.hrtime.bigint() - compileStart) / 1e6;
+  const tableKb = JSON.stringify(automaton).length / 1024;
+  const byIndex = compileSemanticPatterns(registry, Infinity);
+
+  const naive = time(() => naiveMatch(registry, question, message, problemText));
+  const indexed = time(() => compiledMatch(byIndex, question, message, problemText));
+  const scanned = time(() => compiledMatch(automaton, question, message, problemText));
+  if (crossover === null && scanned < indexed) crossover = automaton.phrases.length;
+
+  console.log(
+    `${String(size).padStart(6)}  ${String(automaton.phrases.length).padStart(7)}  ` +
+    `${String(automaton.goto.length).padStart(6)}  ${compileMs.toFixed(1).padStart(10)}  ` +
+    `${tableKb.toFixed(1).padStart(8)}  ${naive.toFixed(2).padStart(12)}  ` +
+    `${indexed.toFixed(2).padStart(15)}  ${scanned.toFixed(2).padStart(17)}`
+  );
+}
+console.log(`\nAutomaton faster from ${crossover === null ? '-' : `~${crossover}`} phrases ` +
+  `(AUTOMATON_MIN_PHRASES = ${AUTOMATON_MIN_PHRASES}; the real registry has ${compileSemanticPatterns(SEMANTIC_PATTERNS).phrases.length})`);
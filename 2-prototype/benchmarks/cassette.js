@@ -0,0 +1,433 @@
+/**
+ * cassette.js
+ *
+ * Record LLM calls once, replay them deterministically - benchmarks with
+ * real model output that give the same answer every run
+ *
+ * A cassette is a JSON file of interactions, one per chat completion:
+ *   {node, kind, fingerprint, prompt_sha256, prompt, params: {model,
+ *    max_tokens, temperature}, output, finish_reason, usage, latency_ms}
+ * kind is the prompt's fingerprint name from mock_openai.js (extractor,
+ * synthesis, response). Lookups are keyed by `fingerprint`: a hash of the
+ * prompt with whitespace normalized (indentation, blank lines, runs of
+ * spaces), so re-indenting a prompt still hits. Several recordings of one
+ * prompt are served in recorded order, cycling - the same run replays the
+ * same way every time.
+ *
+ * A replay that finds no recording is a miss: reported with the node, the
+ * prompt's estimated tokens and the closest recorded prompt of the same kind
+ * (share of identical lines, token delta). A prompt refactor
+ * (create_unified_response.py and friends) shows up as misses on exactly
+ * the prompts it changed; `--on-miss mock` answers those from
+ * mock_openai.js so the run completes. To judge a refactor with the model,
+ * record the same scripted run before and after it and compare:
+ * `diff` reports per kind the prompt and completion tokens and how many
+ * outputs are identical (JSON outputs compared parsed).
+ *
+ * Servers (point n8n's OpenAI credential Base URL, or headless_run.js
+ * --llm-url, at http://<host>:8788/v1):
+ *   record  --upstream URL --cassette FILE   proxy to the real API, saved on exit
+ *           (Authorization is passed through, or OPENAI_API_KEY)
+ *   replay  --cassette FILE [--latency recorded|none] [--on-miss error|mock]
+ *           GET /stats → hits, misses, parameter changes
+ * In-process (walkTurn): recordLlm(llm, cassette), replayLlm(cassette, options);
+ * headless_run.js --record FILE / --replay FILE.
+ *
+ * Usage:
+ *   node benchmarks/cassette.js record --upstream https://api.openai.com/v1 --cassette before.json
+ *   node benchmarks/cassette.js replay --cassette before.json --latency recorded
+ *   node benchmarks/cassette.js diff before.json after.json
+ */
+
+const crypto = require('crypto');
+const fs = require('fs');
+const http = require('http');
+const { FINGERPRINTS, createMock } = require('./mock_openai.js');
+
+const PORT = 8788;
+const CASSETTE_VERSION = 1;
+
+const sha256 = text => crypto.createHash('sha256').update(text).digest('hex');
+const countTokens = text => Math.max(1, Math.ceil(String(text).length / 4));
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+function normalizePrompt(prompt) {
+  return String(prompt).split(/\r?\n/).map(line => line.trim().replace(/\s+/g, ' ')).filter(Boolean).join('\n');
+}
+
+const promptFingerprint = prompt => sha256(normalizePrompt(prompt)).slice(0, 16);
+
+function promptKind(prompt) {
+  const found = FINGERPRINTS.find(entry => entry.match.test(prompt));
+  return found ? found.name : 'other';
+}
+
+// Share of the prompt's lines that the other prompt has too
+function lineOverlap(a, b) {
+  const lines = new Set(normalizePrompt(b).split('\n'));
+  const own = normalizePrompt(a).split('\n');
+  return own.filter(line => lines.has(line)).length / own.length;
+}
+
+class Cassette {
+  /**
+   * @param {object} data - Parsed cassette file ({interactions}), or nothing for a new one
+   */
+  constructor(data = {}) {
+    this.meta = { version: CASSETTE_VERSION, recorded_at: data.recorded_at || new Date().toISOString(), upstream: data.upstream || null };
+    this.interactions = data.interactions || [];
+    this.byFingerprint = new Map();
+    this.interactions.forEach(entry => this.index(entry));
+    this.cursors = new Map();
+    this.stats = { hits: 0, misses: [], param_changes: [] };
+  }
+
+  static load(file) {
+    return new Cassette(JSON.parse(fs.readFileSync(file, 'utf8')));
+  }
+
+  save(file) {
+    fs.writeFileSync(file, JSON.stringify({ ...this.meta, interactions: this.interactions }, null, 2) + '\n');
+  }
+
+  index(entry) {
+    const entries = this.byFingerprint.get(entry.fingerprint) || [];
+    entries.push(entry);
+    this.byFingerprint.set(entry.fingerprint, entries);
+  }
+
+  /**
+   * Add one completion
+   *
+   * @param {object} call - {node, prompt, params, output, finish_reason, usage, latency_ms}
+   */
+  record(call) {
+    const entry = {
+      node: call.node || promptKind(call.prompt),
+      kind: promptKind(call.prompt),
+      fingerprint: promptFingerprint(call.prompt),
+      prompt_sha256: sha256(call.prompt),
+      prompt: call.prompt,
+      params: call.params || {},
+      output: call.output,
+      finish_reason: call.finish_reason || 'stop',
+      usage: call.usage || { prompt_tokens: countTokens(call.prompt), completion_tokens: countTokens(call.output) },
+      latency_ms: Math.round(call.latency_ms || 0)
+    };
+    this.interactions.push(entry);
+    this.index(entry);
+    return entry;
+  }
+
+  /**
+   * Recorded completion for a prompt (null on a miss, which is counted)
+   *
+   * @param {string} prompt - Prompt text as sent
+   * @param {object} params - {model, max_tokens, temperature} of this call, checked against the recording
+   * @param {string} node - Node name for the report
+   * @returns {object|null} interaction
+   */
+  lookup(prompt, params = {}, node = null) {
+    const fingerprint = promptFingerprint(prompt);
+    const entries = this.byFingerprint.get(fingerprint);
+    if (!entries) {
+      this.stats.misses.push(this.describeMiss(prompt, node));
+      return null;
+    }
+    const cursor = this.cursors.get(fingerprint) || 0;
+    this.cursors.set(fingerprint, cursor + 1);
+    const entry = entries[cursor % entries.length];
+    this.stats.hits++;
+    for (const [key, value] of Object.entries(params)) {
+      if (value !== undefined && entry.params[key] !== undefined && entry.params[key] !== value) {
+        this.stats.param_changes.push({ node: entry.node, param: key, recorded: entry.params[key], now: value });
+      }
+    }
+    return entry;
+  }
+
+  describeMiss(prompt, node) {
+    const kind = promptKind(prompt);
+    let nearest = null;
+    let best = -1;
+    for (const entry of this.interactions) {
+      if (entry.kind !== kind) continue;
+      const overlap = lineOverlap(prompt, entry.prompt);
+      if (overlap > best) {
+        best = overlap;
+        nearest = entry;
+      }
+    }
+    const tokens = countTokens(prompt);
+    return {
+      node: node || kind,
+      kind,
+      fingerprint: promptFingerprint(prompt),
+      prompt_tokens: tokens,
+      nearest: nearest && {
+        fingerprint: nearest.fingerprint,
+        same_lines: Number(best.toFixed(2)),
+        token_delta: tokens - countTokens(nearest.prompt)
+      }
+    };
+  }
+
+  report() {
+    const misses = {};
+    for (const miss of this.stats.misses) {
+      const entry = misses[miss.node] || (misses[miss.node] = { count: 0, token_delta: [] });
+      entry.count++;
+      if (miss.nearest) entry.token_delta.push(miss.nearest.token_delta);
+    }
+    for (const entry of Object.values(misses)) {
+      const deltas = entry.token_delta;
+      entry.token_delta = deltas.length ? Math.round(deltas.reduce((sum, d) => sum + d, 0) / deltas.length) : null;
+    }
+    return {
+      interactions: this.interactions.length,
+      hits: this.stats.hits,
+      misses: this.stats.misses.length,
+      misses_by_node: misses,
+      param_changes: this.stats.param_changes
+    };
+  }
+}
+
+/**
+ * walkTurn() LLM callback that records another callback's completions
+ *
+ * @param {Function} llm - (nodeName, prompt, item) → content, sync or async
+ * @param {Cassette} cassette - Appended to; save() it after the run
+ * @returns {Function} async (nodeName, prompt, item) → content
+ */
+function recordLlm(llm, cassette) {
+  return async (nodeName, prompt, item) => {
+    const started = process.hrtime.bigint();
+    const output = await llm(nodeName, prompt, item);
+    cassette.record({ node: nodeName, prompt, output, latency_ms: Number(process.hrtime.bigint() - started) / 1e6 });
+    return output;
+  };
+}
+
+/**
+ * walkTurn() LLM callback that answers from a cassette
+ *
+ * @param {Cassette} cassette
+ * @param {object} options - {latency: 'recorded' | 'none', onMiss: 'error' | 'mock'}
+ * @returns {Function} async (nodeName, prompt) → content; a miss throws unless onMiss is 'mock'
+ */
+function replayLlm(cassette, options = {}) {
+  const mock = options.onMiss === 'mock' ? createMock({ latency: 'none' }) : null;
+  const callback = async (nodeName, prompt) => {
+    const entry = cassette.lookup(prompt, {}, nodeName);
+    if (!entry) {
+      if (mock) return mock.complete(prompt).content;
+      throw Object.assign(new Error(`no recording for prompt ${promptFingerprint(prompt)}`), { status: 404 });
+    }
+    if (options.latency === 'recorded') await sleep(entry.latency_ms);
+    return entry.output;
+  };
+  callback.report = () => cassette.report();
+  return callback;
+}
+
+// ============================================================================
+// Servers
+// ============================================================================
+
+function readJson(request) {
+  return new Promise((resolve, reject) => {
+    const chunks = [];
+    request.on('data', chunk => chunks.push(chunk));
+    request.on('end', () => {
+      try {
+        resolve(JSON.parse(Buffer.concat(chunks).toString('utf8')));
+      } catch (error) {
+        reject(error);
+      }
+    });
+  });
+}
+
+const promptOf = body => (body.messages || []).map(message =>
+  (typeof message.content === 'string' ? message.content : JSON.stringify(message.content))).join('\n');
+
+const paramsOf = body => ({
+  model: body.model, max_tokens: body.max_tokens || body.max_completion_tokens, temperature: body.temperature
+});
+
+/**
+ * Chat-completions server that records (options.upstream) or replays a cassette
+ *
+ * @param {Cassette} cassette
+ * @param {object} options - {upstream: base URL to record from, latency, onMiss}
+ */
+function createServer(cassette, options = {}) {
+  const mock = options.onMiss === 'mock' ? createMock({ latency: 'none' }) : null;
+  let id = 0;
+  return http.createServer(async (request, response) => {
+    const send = (status, body) => {
+      response.writeHead(status, { 'Content-Type': 'application/json' });
+      response.end(JSON.stringify(body));
+    };
+    if (request.method === 'GET' && request.url === '/stats') return send(200, cassette.report());
+    if (request.method !== 'POST' || !/\/chat\/completions$/.test(request.url)) {
+      return send(404, { error: { message: `No route ${request.method} ${request.url}`, type: 'invalid_request_error' } });
+    }
+    let body;
+    try {
+      body = await readJson(request);
+    } catch (error) {
+      return send(400, { error: { message: 'Invalid JSON body', type: 'invalid_request_error' } });
+    }
+    const prompt = promptOf(body);
+
+    if (options.upstream) {
+      const started = process.hrtime.bigint();
+      const upstream = await fetch(`${options.upstream.replace(/\/$/, '')}/chat/completions`, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          Authorization: request.headers.authorization || `Bearer ${process.env.OPENAI_API_KEY || ''}`
+        },
+        body: JSON.stringify(body)
+      });
+      const text = await upstream.text();
+      if (upstream.ok) {
+        const completion = JSON.parse(text);
+        cassette.record({
+          prompt, params: paramsOf(body), output: completion.choices[0].message.content,
+          finish_reason: completion.choices[0].finish_reason, usage: completion.usage,
+          latency_ms: Number(process.hrtime.bigint() - started) / 1e6
+        });
+      }
+      response.writeHead(upstream.status, { 'Content-Type': 'application/json' });
+      return response.end(text);
+    }
+
+    const entry = cassette.lookup(prompt, paramsOf(body));
+    if (!entry && !mock) {
+      return send(404, { error: { message: `No recording for prompt ${promptFingerprint(prompt)}`, type: 'cassette_miss' } });
+    }
+    let reply = entry;
+    if (entry && options.latency === 'recorded') await sleep(entry.latency_ms);
+    if (!entry) {
+      const result = mock.complete(prompt, paramsOf(body).max_tokens);
+      reply = { output: result.content, finish_reason: result.finish_reason, usage: result.usage };
+    }
+    send(200, {
+      id: `chatcmpl-cassette-${++id}`,
+      object: 'chat.completion',
+      created: Math.floor(Date.now() / 1000),
+      model: body.model || 'gpt-4o-mini',
+      choices: [{ index: 0, message: { role: 'assistant', content: reply.output }, logprobs: null,
+        finish_reason: reply.finish_reason }],
+      usage: reply.usage
+    });
+  });
+}
+
+// ============================================================================
+// Diff
+// ============================================================================
+
+function sameOutput(a, b) {
+  if (a === b) return true;
+  try {
+    return JSON.stringify(JSON.parse(a)) === JSON.stringify(JSON.parse(b));
+  } catch (error) {
+    return false;
+  }
+}
+
+/**
+ * Two recordings of the same scripted run, paired by order within each kind
+ *
+ * @returns {object} {kind: {calls: [before, after], prompt_tokens: [before, after],
+ *                    completion_tokens: [before, after], identical_outputs: share of pairs}}
+ */
+function diffCassettes(before, after) {
+  const kinds = [...new Set([...before.interactions, ...after.interactions].map(entry => entry.kind))];
+  const result = {};
+  for (const kind of kinds) {
+    const a = before.interactions.filter(entry => entry.kind === kind);
+    const b = after.interactions.filter(entry => entry.kind === kind);
+    const mean = (entries, field) => (entries.length
+      ? Math.round(entries.reduce((sum, entry) => sum + entry.usage[field], 0) / entries.length) : null);
+    const pairs = Math.min(a.length, b.length);
+    let identical = 0;
+    for (let i = 0; i < pairs; i++) if (sameOutput(a[i].output, b[i].output)) identical++;
+    result[kind] = {
+      calls: [a.length, b.length],
+      prompt_tokens: [mean(a, 'prompt_tokens'), mean(b, 'prompt_tokens')],
+      completion_tokens: [mean(a, 'completion_tokens'), mean(b, 'completion_tokens')],
+      identical_outputs: pairs ? Number((identical / pairs).toFixed(3)) : null
+    };
+  }
+  return result;
+}
+
+function printDiff(diff) {
+  console.log(`  ${'kind'.padEnd(10)} ${'calls'.padStart(11)} ${'prompt tok/call'.padStart(17)} ` +
+    `${'completion tok/call'.padStart(21)} ${'identical'.padStart(10)}`);
+  for (const [kind, entry] of Object.entries(diff)) {
+    const pair = ([x, y]) => `${x ?? '-'} → ${y ?? '-'}`;
+    const share = entry.identical_outputs === null ? '-' : `${(entry.identical_outputs * 100).toFixed(0)}%`;
+    console.log(`  ${kind.padEnd(10)} ${pair(entry.calls).padStart(11)} ${pair(entry.prompt_tokens).padStart(17)} ` +
+      `${pair(entry.completion_tokens).padStart(21)} ${share.padStart(10)}`);
+  }
+}
+
+function parseArgs(argv) {
+  const args = { command: argv[0], files: [], port: PORT, upstream: null, cassette: null, latency: 'none', onMiss: 'error' };
+  for (let i = 1; i < argv.length; i++) {
+    if (argv[i] === '--port') args.port = Number(argv[++i]);
+    else if (argv[i] === '--upstream') args.upstream = argv[++i];
+    else if (argv[i] === '--cassette') args.cassette = argv[++i];
+    else if (argv[i] === '--latency') args.latency = argv[++i];
+    else if (argv[i] === '--on-miss') args.onMiss = argv[++i];
+    else args.files.push(argv[i]);
+  }
+  return args;
+}
+
+function main() {
+  const args = parseArgs(process.argv.slice(2));
+  if (args.command === 'diff' && args.files.length === 2) {
+    const [before, after] = args.files.map(file => Cassette.load(file));
+    console.log(`${args.files[0]} → ${args.files[1]}`);
+    printDiff(diffCassettes(before, after));
+    return;
+  }
+  if (!['record', 'replay'].includes(args.command) || !args.cassette || (args.command === 'record' && !args.upstream)) {
+    console.error('Usage: node benchmarks/cassette.js record --upstream URL --cassette FILE [--port 8788]\n' +
+      '       node benchmarks/cassette.js replay --cassette FILE [--latency recorded|none] [--on-miss error|mock]\n' +
+      '       node benchmarks/cassette.js diff BEFORE.json AFTER.json');
+    process.exit(2);
+  }
+  const recording = args.command === 'record';
+  const cassette = recording && !fs.existsSync(args.cassette) ? new Cassette({ upstream: args.upstream }) : Cassette.load(args.cassette);
+  const server = createServer(cassette, recording ? { upstream: args.upstream } : args);
+  server.listen(args.port, () => {
+    console.log(`✓ ${recording ? `Recording ${args.upstream}` : `Replaying ${cassette.interactions.length} interactions`} ` +
+      `on http://localhost:${args.port}/v1 (${args.cassette})`);
+  });
+  const stop = () => {
+    if (recording) {
+      cassette.save(args.cassette);
+      console.log(`✓ Wrote ${cassette.interactions.length} interactions to ${args.cassette}`);
+    } else {
+      console.log(JSON.stringify(cassette.report(), null, 2));
+    }
+    process.exit(0);
+  };
+  process.on('SIGINT', stop);
+  process.on('SIGTERM', stop);
+}
+
+if (require.main === module) main();
+
+// For Node.js module export
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = { Cassette, normalizePrompt, promptFingerprint, recordLlm, replayLlm, createServer, diffCassettes };
+}
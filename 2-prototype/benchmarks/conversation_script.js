@@ -0,0 +1,54 @@
+/**
+ * conversation_script.js
+ *
+ * Scripted student conversation for the workflow benchmarks
+ *
+ * Ten student messages on the default problem (-3 + 5), cycled: help
+ * request, sub-answers, the answer, a teach-back explanation, a question,
+ * off-topic. Each comes with what the Content Feature Extractor and the
+ * tutor LLM answer, so walkTurn() needs no OpenAI key.
+ *
+ * Usage:
+ *   const { SCRIPT, scriptedLlm } = require('./conversation_script.js');
+ *   await walkTurn(workflow, { message: SCRIPT[i][0], ..., llm: scriptedLlm(i) });
+ */
+
+const features = (message_type, numeric_value = null, keywords = null) =>
+  JSON.stringify({ message_type, numeric_value, keywords, confidence: 1.0 });
+
+// [student message, extractor output, tutor reply]
+const SCRIPT = [
+  ['I don\'t know', features('help_request'), 'Let\'s use a number line. How many steps is it from -3 to 0?'],
+  ['3', features('answer_attempt', 3), 'Yes, 3 steps! How many steps are left after you reach 0?'],
+  ['2', features('answer_attempt', 2), 'That\'s it, -3 + 5 = 2! Can you explain how you got it?'],
+  ['I moved 3 steps right to zero and then 2 more steps to get 2',
+    features('conceptual_response', null, ['moved', 'right', 'zero']), 'Great explanation!'],
+  ['what is a number line?', features('question'), 'A number line is a line with numbers in order.'],
+  ['ok', features('conceptual_response', null, ['ok']), 'Want to try another one?'],
+  ['is 2 right', features('answer_attempt', 2), 'Yes, 2 is right!'],
+  ['why do we go right', features('question'), 'Adding a positive number moves right.'],
+  ['I like pizza', features('off_topic'), 'Pizza is tasty! Let\'s get back to math.'],
+  ['help', features('help_request'), 'Start at -3 and count 5 steps to the right.']
+];
+
+const SYNTHESIS = JSON.stringify({ action: 'continue', reason: 'one sub-answer so far', sub_answers: ['3'], synthesis_hint: '' });
+
+/**
+ * LLM callback for walkTurn() on scripted turn `turn`
+ *
+ * @param {number} turn - Turn index (cycles through SCRIPT)
+ * @returns {Function} (nodeName) → completion text
+ */
+function scriptedLlm(turn) {
+  const [, extracted, reply] = SCRIPT[turn % SCRIPT.length];
+  return nodeName => (nodeName === 'Content Feature Extractor' ? extracted
+    : nodeName === 'Synthesis LLM1' ? SYNTHESIS : reply);
+}
+
+// Timestamps and latency differ between runs; compare everything else
+const stable = value => JSON.stringify(value).replace(/"\d{4}-\d\d-\d\dT[\d:.]+Z"/g, '"<time>"');
+
+// For Node.js module export
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = { SCRIPT, scriptedLlm, stable };
+}
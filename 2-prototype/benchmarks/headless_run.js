@@ -0,0 +1,230 @@
+/**
+ * headless_run.js
+ *
+ * Run conversations through a workflow export offline - no n8n, no OpenAI,
+ * no Redis server
+ *
+ * Executes the workflow with benchmarks/workflow_walk.js (Code nodes with
+ * $input / $json / $('Node'), Switch rules, the response node) and the
+ * local stand-ins of benchmarks/stand_ins.js for Redis and the LLM nodes.
+ *
+ * Conversation mode - the offline counterpart of test-scaffolding.sh: each
+ * argument is one student message of the same session; prints the category,
+ * the Switch branches taken, the tutor reply and the workflow's own time
+ * (stand-in time excluded). --webhook sends them through Webhook Trigger1
+ * with the request body test-scaffolding.sh posts, and prints the response
+ * body.
+ *
+ * Throughput mode (--conversations N): N sessions of the scripted
+ * conversation (benchmarks/conversation_script.js), one after the other;
+ * reports turns per minute and workflow ms per turn (p50 / p95 / max).
+ *
+ * Server mode (--serve PORT): answers POSTs with the workflow's webhook
+ * response, run through Webhook Trigger1 - a local target for load_test.py.
+ * The LLM nodes use mock_openai.js in-process (--mock-latency SPEC, default
+ * none) or an OpenAI-compatible endpoint (--llm-url). A failed turn answers
+ * 500 with the failing node.
+ *
+ * Conversation and server mode: --record FILE saves the LLM calls to a
+ * cassette (benchmarks/cassette.js), --replay FILE answers them from one
+ * (--replay-latency recorded sleeps the recorded time); replay misses are
+ * printed at the end.
+ *
+ * Usage:
+ *   node benchmarks/headless_run.js "I don't know" 3 2
+ *   node benchmarks/headless_run.js -- -8 -6 "I'm stuck" 2
+ *   node benchmarks/headless_run.js --webhook --workflow generated/workflow-optimized.json "I don't know" 3
+ *   node benchmarks/headless_run.js --conversations 500
+ *   node benchmarks/headless_run.js --serve 5679 --mock-latency ttft:250,0.4,4
+ *   node benchmarks/headless_run.js --llm-url http://localhost:8787/v1 --record run.json "I don't know" 3
+ *   node benchmarks/headless_run.js --replay run.json "I don't know" 3
+ */
+
+const fs = require('fs');
+const path = require('path');
+const http = require('http');
+const { walkTurn } = require('./workflow_walk.js');
+const { MemoryRedis, httpLlm, localLlm } = require('./stand_ins.js');
+const { mockLlm } = require('./mock_openai.js');
+const { Cassette, recordLlm, replayLlm } = require('./cassette.js');
+const { SCRIPT, scriptedLlm } = require('./conversation_script.js');
+
+const ROOT = path.join(__dirname, '..');
+const DEFAULT_PROBLEM = { id: 'neg_add_1', text: 'What is -3 + 5?', correct_answer: '2' };
+
+function parseArgs(argv) {
+  const args = {
+    workflow: path.join(ROOT, 'workflow-production-ready.json'), webhook: false, conversations: 0, messages: [],
+    serve: 0, mockLatency: 'none', llmUrl: null, record: null, replay: null, replayLatency: 'none'
+  };
+  for (let i = 0; i < argv.length; i++) {
+    // Messages that start with "-" ("-8") go after --
+    if (argv[i] === '--') {
+      args.messages.push(...argv.slice(i + 1));
+      break;
+    }
+    if (argv[i] === '--workflow') args.workflow = path.resolve(argv[++i]);
+    else if (argv[i] === '--webhook') args.webhook = true;
+    else if (argv[i] === '--conversations') args.conversations = Number(argv[++i]);
+    else if (argv[i] === '--serve') args.serve = Number(argv[++i]);
+    else if (argv[i] === '--mock-latency') args.mockLatency = argv[++i];
+    else if (argv[i] === '--llm-url') args.llmUrl = argv[++i];
+    else if (argv[i] === '--record') args.record = argv[++i];
+    else if (argv[i] === '--replay') args.replay = argv[++i];
+    else if (argv[i] === '--replay-latency') args.replayLatency = argv[++i];
+    else args.messages.push(argv[i]);
+  }
+  return args;
+}
+
+// Webhook request body, as test-scaffolding.sh posts it
+function webhookBody(message, sessionId) {
+  return { student_id: 'headless_student', session_id: sessionId, message, current_problem: DEFAULT_PROBLEM };
+}
+
+function turnOptions(args, message, sessionId, redis, llm) {
+  const options = { message, sessionId, redis, llm };
+  if (args.webhook) {
+    options.trigger = 'Webhook Trigger1';
+    options.body = webhookBody(message, sessionId);
+    options.headers = { 'content-type': 'application/json' };
+  }
+  return options;
+}
+
+// Switch node → the node it sent the item to
+function branches(workflow, runs) {
+  const types = new Map(workflow.nodes.map(node => [node.name, node.type]));
+  const taken = [];
+  runs.forEach((run, index) => {
+    if (types.get(run.node) === 'n8n-nodes-base.switch' && runs[index + 1]) taken.push(runs[index + 1].node);
+  });
+  return taken;
+}
+
+function responseBody(response) {
+  if (!response) return null;
+  return JSON.parse(response.body.toString('utf8'));
+}
+
+// LLM callback of conversation / server mode, with the cassette wrapped around it
+function cassetteLlm(args, llm) {
+  if (args.replay) {
+    args.cassette = Cassette.load(args.replay);
+    return replayLlm(args.cassette, { latency: args.replayLatency });
+  }
+  if (args.record) {
+    args.cassette = fs.existsSync(args.record) ? Cassette.load(args.record) : new Cassette({ upstream: args.llmUrl });
+    return recordLlm(llm, args.cassette);
+  }
+  return llm;
+}
+
+function closeCassette(args) {
+  if (!args.cassette) return;
+  if (args.record) {
+    args.cassette.save(args.record);
+    console.log(`✓ Recorded ${args.cassette.interactions.length} LLM calls in ${args.record}`);
+  } else {
+    const report = args.cassette.report();
+    console.log(`Replay: ${report.hits} hits, ${report.misses} misses` +
+      `${report.misses ? ` ${JSON.stringify(report.misses_by_node)}` : ''}`);
+  }
+}
+
+async function conversation(workflow, args) {
+  const redis = new MemoryRedis();
+  const sessionId = `headless_${Date.now()}`;
+  const llm = cassetteLlm(args, args.llmUrl ? httpLlm(args.llmUrl) : localLlm());
+  try {
+    for (const [index, message] of args.messages.entries()) {
+      const { runs, response, timing } = await walkTurn(workflow, turnOptions(args, message, sessionId, redis, llm));
+      const session = JSON.parse(await redis.get(`tutor_session:${sessionId}`));
+      const turn = session.recent_turns[session.recent_turns.length - 1];
+      const own = timing.total_ms - timing.llm_ms - timing.redis_ms;
+      console.log(`Turn ${index + 1}: "${message}"`);
+      console.log(`  category: ${turn.category}   route: ${branches(workflow, runs).join(' → ')}   ${own.toFixed(1)} ms`);
+      console.log(`  tutor:    ${turn.tutor_response}`);
+      if (args.webhook) console.log(`  body:     ${JSON.stringify(responseBody(response))}`);
+    }
+  } finally {
+    closeCassette(args);
+  }
+}
+
+const percentile = (sorted, p) => sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))];
+
+async function throughput(workflow, args) {
+  const redis = new MemoryRedis();
+  const times = [];
+  const started = process.hrtime.bigint();
+  for (let session = 0; session < args.conversations; session++) {
+    for (let turn = 0; turn < SCRIPT.length; turn++) {
+      const options = turnOptions(args, SCRIPT[turn][0], `headless-${session}`, redis, scriptedLlm(turn));
+      const { timing } = await walkTurn(workflow, options);
+      times.push(timing.total_ms - timing.llm_ms - timing.redis_ms);
+    }
+  }
+  const wall = Number(process.hrtime.bigint() - started) / 1e6;
+  times.sort((a, b) => a - b);
+  console.log(`${path.basename(args.workflow)}: ${args.conversations} conversations, ${times.length} turns ` +
+    `in ${(wall / 1000).toFixed(1)} s`);
+  console.log(`  ${Math.round(times.length / (wall / 60000))} turns/min, ` +
+    `${Math.round(args.conversations / (wall / 60000))} conversations/min`);
+  console.log(`  workflow ms per turn: p50 ${percentile(times, 0.5).toFixed(2)}  ` +
+    `p95 ${percentile(times, 0.95).toFixed(2)}  max ${times[times.length - 1].toFixed(2)}`);
+}
+
+function serve(workflow, args) {
+  const redis = new MemoryRedis();
+  const llm = cassetteLlm(args, args.llmUrl ? httpLlm(args.llmUrl) : mockLlm({ latency: args.mockLatency }));
+  const server = http.createServer((request, response) => {
+    const chunks = [];
+    request.on('data', chunk => chunks.push(chunk));
+    request.on('end', async () => {
+      try {
+        const body = JSON.parse(Buffer.concat(chunks).toString('utf8') || '{}');
+        const run = await walkTurn(workflow, {
+          trigger: 'Webhook Trigger1', body, headers: request.headers, redis, llm
+        });
+        response.writeHead(200, run.response.headers);
+        response.end(run.response.body);
+      } catch (error) {
+        response.writeHead(error.status === 429 ? 429 : 500, { 'content-type': 'application/json' });
+        response.end(JSON.stringify({ error: error.message, node: error.node || null }));
+      }
+    });
+  });
+  server.listen(args.serve, () => {
+    console.log(`✓ ${path.basename(args.workflow)} on http://localhost:${args.serve}/webhook/tutor/message ` +
+      `(LLM: ${args.replay ? `replay ${args.replay}` : args.llmUrl || `mock, latency ${args.mockLatency}`})`);
+  });
+  const stop = () => {
+    closeCassette(args);
+    process.exit(0);
+  };
+  process.on('SIGINT', stop);
+  process.on('SIGTERM', stop);
+}
+
+async function main() {
+  const args = parseArgs(process.argv.slice(2));
+  const workflow = JSON.parse(fs.readFileSync(args.workflow, 'utf8'));
+  if (args.serve > 0) {
+    serve(workflow, args);
+  } else if (args.conversations > 0) {
+    await throughput(workflow, args);
+  } else if (args.messages.length > 0) {
+    await conversation(workflow, args);
+  } else {
+    console.error('Usage: node benchmarks/headless_run.js [--workflow FILE] [--webhook] ' +
+      '(MESSAGE... | --conversations N | --serve PORT [--mock-latency SPEC | --llm-url URL]) ' +
+      '[--record FILE | --replay FILE [--replay-latency recorded]]');
+    process.exit(2);
+  }
+}
+
+main().catch(error => {
+  console.error(`✗ ${error.node ? 'Node failed' : 'Run failed'}: ${error.message}`);
+  process.exit(1);
+});
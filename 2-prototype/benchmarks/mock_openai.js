@@ -0,0 +1,359 @@
+/**
+ * mock_openai.js
+ *
+ * Local OpenAI-compatible chat-completions server with scripted replies and
+ * injected latency - load and tail-latency tests without the API
+ *
+ * POST /v1/chat/completions answers the workflow's three prompts, told
+ * apart by fingerprint (a phrase only that prompt contains):
+ *   extractor  - "Extract these features": stand_ins.js extractFeatures() of
+ *                the Student Message line
+ *   synthesis  - "scaffolding progress analyzer": synthesize once two
+ *                different numeric student answers are in Recent Conversation
+ *   response   - "STRATEGY - ...": a fixed reply per strategy (category)
+ * Rules from --script come first: {"rules": [{"match": "regex", "reply":
+ * "text" or ["cycled", "texts"]}]}. The same prompt always gets the same
+ * reply (per rule, cycles advance per match).
+ *
+ * Latency per request, from a seeded generator (--seed):
+ *   none                        answer at once
+ *   lognormal:MEDIAN,SIGMA      whole request, ms
+ *   ttft:MEDIAN,SIGMA,PER_TOKEN time to first token (lognormal) + ms per
+ *                               completion token (default, ttft:250,0.4,4)
+ *   --stall RATE:MS             that share of requests hangs MS ms more
+ *   --rate-limit RATE           that share gets 429 with Retry-After: 1
+ * usage (prompt/completion tokens, ~4 chars per token) is in every reply;
+ * max_tokens truncates with finish_reason "length". GET /stats returns
+ * requests, tokens, 429s, stalls and injected latency (whole request and
+ * first token) per fingerprint; the same summary is printed on exit.
+ *
+ * "stream": true answers with server-sent chat.completion.chunk events, one
+ * per ~4-char token: the first after the time to first token, the rest
+ * PER_TOKEN ms apart, then "data: [DONE]" (usage in a last chunk when
+ * stream_options.include_usage). With lognormal the whole delay comes
+ * before the first token; a stall delays the first token.
+ *
+ * n8n: point the OpenAI credential's Base URL at http://<host>:8787/v1.
+ * walkTurn: llm: httpLlm('http://localhost:8787/v1') (stand_ins.js), or
+ * mockLlm(options) in-process with the same replies and latency.
+ *
+ * Usage:
+ *   node benchmarks/mock_openai.js [--port 8787] [--seed 1] [--latency ttft:250,0.4,4]
+ *                                  [--stall 0.01:8000] [--rate-limit 0.02] [--script rules.json]
+ */
+
+const fs = require('fs');
+const http = require('http');
+const { extractFeatures } = require('./stand_ins.js');
+
+const DEFAULTS = {
+  port: 8787,
+  seed: 1,
+  latency: 'ttft:250,0.4,4',
+  stall: null,
+  rateLimit: 0,
+  script: null
+};
+
+const FINGERPRINTS = [
+  { name: 'extractor', match: /Extract these features/ },
+  { name: 'synthesis', match: /scaffolding progress analyzer/ },
+  { name: 'response', match: /STRATEGY - / }
+];
+
+// Response: Unified1 strategy header → category
+const STRATEGIES = [
+  ['ACKNOWLEDGE TEACH-BACK EXPLANATION', 'teach_back_explanation'],
+  ['SCAFFOLD PROGRESS', 'scaffold_progress'],
+  ['CLARIFY MISCONCEPTION', 'wrong_operation'],
+  ['GENTLE PROBE', 'close'],
+  ['TEACH CONCEPT', 'conceptual_question'],
+  ['TEACH-BACK', 'correct'],
+  ['SCAFFOLD', 'stuck'],
+  ['REDIRECT', 'off_topic']
+];
+
+const REPLIES = {
+  correct: 'Yes, that\'s right! Can you explain how you got it?',
+  close: 'So close! Check your counting again. Where do you land?',
+  wrong_operation: 'Let\'s look at the sign again. Are we adding or subtracting here?',
+  conceptual_question: 'Good question! Adding a positive number moves right on the number line. What do you get?',
+  teach_back_explanation: 'Great explanation! You really understand it.',
+  stuck: 'Let\'s use a number line. How many steps is it from {start} to 0?',
+  off_topic: 'That sounds fun! Let\'s get back to our problem. What do you think the answer is?',
+  scaffold_progress: 'Yes! How many more steps do you take after 0?',
+  unknown: 'Let\'s keep going. What is your next step?'
+};
+
+// mulberry32: small seeded generator, so a run can be repeated exactly
+function seededRandom(seed) {
+  let state = seed >>> 0;
+  return () => {
+    state = (state + 0x6D2B79F5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+function lognormal(random, median, sigma) {
+  const u = Math.max(random(), 1e-12);
+  const normal = Math.sqrt(-2 * Math.log(u)) * Math.cos(2 * Math.PI * random());
+  return median * Math.exp(sigma * normal);
+}
+
+function parseLatency(spec) {
+  const [model, values = ''] = String(spec).split(':');
+  const numbers = values.split(',').filter(Boolean).map(Number);
+  if (model === 'none') return { model };
+  if (model === 'lognormal') return { model, median: numbers[0] ?? 400, sigma: numbers[1] ?? 0.5 };
+  if (model === 'ttft') return { model, median: numbers[0] ?? 250, sigma: numbers[1] ?? 0.4, perToken: numbers[2] ?? 4 };
+  throw new Error(`Unknown latency model "${spec}" (none, lognormal:MEDIAN,SIGMA, ttft:MEDIAN,SIGMA,PER_TOKEN)`);
+}
+
+const countTokens = text => Math.max(1, Math.ceil(String(text).length / 4));
+
+function fingerprint(prompt) {
+  const found = FINGERPRINTS.find(entry => entry.match.test(prompt));
+  return found ? found.name : 'other';
+}
+
+function synthesisReply(prompt) {
+  const history = (prompt.split('Recent Conversation:')[1] || '').split('---')[0];
+  const latest = prompt.match(/Student's Latest Response: "([^"]*)"/);
+  const answers = new Set((history.match(/^Student: (-?\d+(?:\.\d+)?)\s*$/gm) || []).map(line => line.slice(9).trim()));
+  if (latest && /^-?\d+(?:\.\d+)?$/.test(latest[1].trim())) answers.add(latest[1].trim());
+  const action = answers.size >= 2 ? 'synthesize' : 'continue';
+  return JSON.stringify({
+    action,
+    reason: action === 'synthesize' ? 'two sub-answers collected' : 'one sub-answer so far',
+    sub_answers: [...answers],
+    synthesis_hint: action === 'synthesize' ? 'Put your steps together - where do you end up?' : ''
+  });
+}
+
+function responseReply(prompt) {
+  const strategy = STRATEGIES.find(([header]) => prompt.includes(`STRATEGY - ${header}:`));
+  const problem = (prompt.match(/Problem: (.*)/) || [])[1] || '';
+  const start = (problem.match(/-?\d+/) || ['the start'])[0];
+  return REPLIES[strategy ? strategy[1] : 'unknown'].replace('{start}', start);
+}
+
+/**
+ * Mock completions: scripted rules, then the built-in reply per fingerprint
+ *
+ * @param {object} options - {seed, latency: spec string, stall: "RATE:MS", rateLimit: share, script: {rules}}
+ * @returns {object} {complete(prompt, maxTokens) → {status, content?, usage?, finish_reason?, delay_ms,
+ *   first_token_ms, per_token_ms, kind}, stats()}
+ */
+function createMock(options = {}) {
+  const settings = { ...DEFAULTS, ...options };
+  const random = seededRandom(settings.seed);
+  const latency = parseLatency(settings.latency);
+  const [stallRate, stallMs] = settings.stall ? String(settings.stall).split(':').map(Number) : [0, 0];
+  const rules = ((settings.script && settings.script.rules) || []).map(rule => ({ ...rule, pattern: new RegExp(rule.match), next: 0 }));
+  const totals = {};
+
+  function reply(kind, prompt) {
+    for (const rule of rules) {
+      if (!rule.pattern.test(prompt)) continue;
+      if (!Array.isArray(rule.reply)) return rule.reply;
+      return rule.reply[rule.next++ % rule.reply.length];
+    }
+    if (kind === 'extractor') {
+      const message = (prompt.match(/Student Message: "([^\n]*)"/) || [])[1] || '';
+      return JSON.stringify(extractFeatures(message));
+    }
+    if (kind === 'synthesis') return synthesisReply(prompt);
+    return responseReply(prompt);
+  }
+
+  function complete(prompt, maxTokens) {
+    const kind = fingerprint(prompt);
+    const total = totals[kind] || (totals[kind] = {
+      requests: 0, rate_limited: 0, stalled: 0, prompt_tokens: 0, completion_tokens: 0, delays: [], firstTokens: []
+    });
+    total.requests++;
+    if (random() < settings.rateLimit) {
+      total.rate_limited++;
+      return { status: 429, delay_ms: 0, first_token_ms: 0, per_token_ms: 0, kind };
+    }
+    let content = reply(kind, prompt);
+    let finish = 'stop';
+    if (maxTokens && countTokens(content) > maxTokens) {
+      content = content.slice(0, maxTokens * 4);
+      finish = 'length';
+    }
+    const usage = { prompt_tokens: countTokens(prompt), completion_tokens: countTokens(content) };
+    usage.total_tokens = usage.prompt_tokens + usage.completion_tokens;
+    let firstToken = latency.model === 'none' ? 0 : lognormal(random, latency.median, latency.sigma);
+    const perToken = latency.model === 'ttft' ? latency.perToken : 0;
+    if (random() < stallRate) {
+      total.stalled++;
+      firstToken += stallMs;
+    }
+    const delay = firstToken + (usage.completion_tokens - 1) * perToken;
+    total.prompt_tokens += usage.prompt_tokens;
+    total.completion_tokens += usage.completion_tokens;
+    total.delays.push(delay);
+    total.firstTokens.push(firstToken);
+    return {
+      status: 200, content, usage, finish_reason: finish, delay_ms: delay,
+      first_token_ms: firstToken, per_token_ms: perToken, kind
+    };
+  }
+
+  function stats() {
+    const result = {};
+    for (const [kind, total] of Object.entries(totals)) {
+      const percentiles = values => {
+        const sorted = [...values].sort((a, b) => a - b);
+        const at = p => (sorted.length ? Math.round(sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))]) : null);
+        return { p50: at(0.5), p95: at(0.95), p99: at(0.99), max: at(1) };
+      };
+      const { delays, firstTokens, ...counts } = total;
+      result[kind] = { ...counts, delay_ms: percentiles(delays), first_token_ms: percentiles(firstTokens) };
+    }
+    return result;
+  }
+
+  return { complete, stats };
+}
+
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+/**
+ * In-process walkTurn() LLM callback with the mock's replies and latency
+ *
+ * @param {object} options - createMock() options; {maxTokens: {nodeName: n}} optional
+ * @returns {Function} async (nodeName, prompt) → content; throws {status: 429} when rate limited
+ */
+function mockLlm(options = {}) {
+  const mock = createMock(options);
+  const callback = async (nodeName, prompt) => {
+    const result = mock.complete(prompt, (options.maxTokens || {})[nodeName]);
+    await sleep(result.delay_ms);
+    if (result.status !== 200) {
+      throw Object.assign(new Error(`${nodeName}: 429 Rate limit reached`), { status: result.status });
+    }
+    return result.content;
+  };
+  callback.stats = mock.stats;
+  return callback;
+}
+
+// ~4-char pieces, the unit countTokens() charges for
+const tokenPieces = text => String(text).match(/[\s\S]{1,4}/g) || [''];
+
+/**
+ * Write a completion as server-sent chat.completion.chunk events
+ *
+ * @param {http.ServerResponse} response
+ * @param {object} result - createMock().complete() result
+ * @param {object} base - {id, object, created, model} shared by the chunks
+ * @param {boolean} includeUsage - stream_options.include_usage
+ */
+async function streamCompletion(response, result, base, includeUsage) {
+  response.writeHead(200, { 'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache', Connection: 'keep-alive' });
+  const event = (choices, extra = {}) => response.write(`data: ${JSON.stringify({ ...base, choices, ...extra })}\n\n`);
+  await sleep(result.first_token_ms);
+  const pieces = tokenPieces(result.content);
+  for (let i = 0; i < pieces.length; i++) {
+    if (i > 0) await sleep(result.per_token_ms);
+    const delta = i === 0 ? { role: 'assistant', content: pieces[i] } : { content: pieces[i] };
+    event([{ index: 0, delta, logprobs: null, finish_reason: null }]);
+  }
+  event([{ index: 0, delta: {}, logprobs: null, finish_reason: result.finish_reason }]);
+  if (includeUsage) event([], { usage: result.usage });
+  response.end('data: [DONE]\n\n');
+}
+
+function createServer(options = {}) {
+  const mock = createMock(options);
+  let id = 0;
+  const server = http.createServer((request, response) => {
+    const send = (status, body, headers = {}) => {
+      response.writeHead(status, { 'Content-Type': 'application/json', ...headers });
+      response.end(JSON.stringify(body));
+    };
+    if (request.method === 'GET' && request.url === '/stats') return send(200, mock.stats());
+    if (request.method === 'GET' && /\/models$/.test(request.url)) {
+      return send(200, { object: 'list', data: [{ id: 'gpt-4o-mini', object: 'model', owned_by: 'mock' }] });
+    }
+    if (request.method !== 'POST' || !/\/chat\/completions$/.test(request.url)) {
+      return send(404, { error: { message: `No route ${request.method} ${request.url}`, type: 'invalid_request_error' } });
+    }
+    const chunks = [];
+    request.on('data', chunk => chunks.push(chunk));
+    request.on('end', async () => {
+      let body;
+      try {
+        body = JSON.parse(Buffer.concat(chunks).toString('utf8'));
+      } catch (error) {
+        return send(400, { error: { message: 'Invalid JSON body', type: 'invalid_request_error' } });
+      }
+      const prompt = (body.messages || []).map(message =>
+        (typeof message.content === 'string' ? message.content : JSON.stringify(message.content))).join('\n');
+      const result = mock.complete(prompt, body.max_tokens || body.max_completion_tokens);
+      if (result.status === 429) {
+        return send(429, { error: { message: 'Rate limit reached (mock)', type: 'requests', code: 'rate_limit_exceeded' } },
+          { 'Retry-After': '1' });
+      }
+      const base = { id: `chatcmpl-mock-${++id}`, created: Math.floor(Date.now() / 1000), model: body.model || 'gpt-4o-mini' };
+      if (body.stream) {
+        const includeUsage = Boolean(body.stream_options && body.stream_options.include_usage);
+        return streamCompletion(response, result, { ...base, object: 'chat.completion.chunk' }, includeUsage);
+      }
+      await sleep(result.delay_ms);
+      send(200, {
+        id: base.id,
+        object: 'chat.completion',
+        created: base.created,
+        model: base.model,
+        choices: [{ index: 0, message: { role: 'assistant', content: result.content }, logprobs: null,
+          finish_reason: result.finish_reason }],
+        usage: result.usage
+      });
+    });
+  });
+  server.stats = mock.stats;
+  return server;
+}
+
+function parseArgs(argv) {
+  const args = { ...DEFAULTS };
+  for (let i = 0; i < argv.length; i++) {
+    const value = argv[i + 1];
+    if (argv[i] === '--port') args.port = Number(value);
+    else if (argv[i] === '--seed') args.seed = Number(value);
+    else if (argv[i] === '--latency') args.latency = value;
+    else if (argv[i] === '--stall') args.stall = value;
+    else if (argv[i] === '--rate-limit') args.rateLimit = Number(value);
+    else if (argv[i] === '--script') args.script = JSON.parse(fs.readFileSync(value, 'utf8'));
+    else throw new Error(`Unknown option ${argv[i]}`);
+    i++;
+  }
+  parseLatency(args.latency);
+  return args;
+}
+
+if (require.main === module) {
+  const args = parseArgs(process.argv.slice(2));
+  const server = createServer(args);
+  server.listen(args.port, () => {
+    console.log(`✓ Mock OpenAI on http://localhost:${args.port}/v1 (latency ${args.latency}, ` +
+      `stall ${args.stall || 'off'}, 429 rate ${args.rateLimit}, seed ${args.seed})`);
+  });
+  const stop = () => {
+    console.log(JSON.stringify(server.stats(), null, 2));
+    process.exit(0);
+  };
+  process.on('SIGINT', stop);
+  process.on('SIGTERM', stop);
+}
+
+// For Node.js module export
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = { FINGERPRINTS, createMock, mockLlm, createServer, parseLatency };
+}
@@ -0,0 +1,153 @@
+/**
+ * stand_ins.js
+ *
+ * Local stand-ins for the Redis and OpenAI nodes of workflow_walk.js
+ *
+ * MemoryRedis keeps keys in a Map with the SET's ttl honoured, and counts
+ * GETs, hits and SETs. localLlm() answers the three prompts without a model:
+ * the Content Feature Extractor classifies the student message with a few
+ * rules (a number is an answer attempt, "?" a question, "I don't know" a
+ * help request), Synthesis LLM1 says "continue", and Response: Unified1
+ * returns a short reply naming the category and ending in a question.
+ * Good enough to drive any message through the workflow offline; scripted
+ * conversations (conversation_script.js) pass their own callback instead.
+ * httpLlm() sends the prompts to an OpenAI-compatible endpoint instead
+ * (benchmarks/mock_openai.js).
+ *
+ * Usage:
+ *   const { MemoryRedis, localLlm } = require('./stand_ins.js');
+ *   const redis = new MemoryRedis();
+ *   await walkTurn(workflow, { message: '3', sessionId: 's1', redis, llm: localLlm() });
+ *   redis.stats  // { gets, hits, sets }
+ */
+
+const WORD_NUMBERS = {
+  zero: 0, one: 1, two: 2, three: 3, four: 4, five: 5, six: 6, seven: 7, eight: 8, nine: 9, ten: 10
+};
+
+class MemoryRedis {
+  /**
+   * @param {object} options - {now: () → ms} clock for ttl expiry (default Date.now)
+   */
+  constructor(options = {}) {
+    this.now = options.now || Date.now;
+    this.entries = new Map();
+    this.stats = { gets: 0, hits: 0, sets: 0 };
+  }
+
+  get(key) {
+    this.stats.gets++;
+    const entry = this.entries.get(key);
+    if (!entry) return null;
+    if (entry.expires !== null && entry.expires <= this.now()) {
+      this.entries.delete(key);
+      return null;
+    }
+    this.stats.hits++;
+    return entry.value;
+  }
+
+  set(key, value, ttlSeconds) {
+    this.stats.sets++;
+    const expires = ttlSeconds ? this.now() + ttlSeconds * 1000 : null;
+    this.entries.set(key, { value, expires });
+  }
+
+  has(key) {
+    return this.get(key) !== null;
+  }
+
+  get size() {
+    return this.entries.size;
+  }
+}
+
+/**
+ * Content Feature Extractor stand-in: the features a model would extract from a plain message
+ *
+ * @param {string} message - Student message
+ * @returns {object} {message_type, numeric_value, keywords, confidence}
+ */
+function extractFeatures(message) {
+  const text = String(message || '').trim().toLowerCase().replace(/−/g, '-');
+  const digits = text.match(/-?\d+(?:\.\d+)?/g);
+  const words = text.match(new RegExp(`\\b(negative |minus )?(${Object.keys(WORD_NUMBERS).join('|')})\\b`));
+  let numeric = null;
+  if (digits) {
+    numeric = Number(digits[digits.length - 1]);
+  } else if (words) {
+    numeric = (words[1] ? -1 : 1) * WORD_NUMBERS[words[2]];
+  }
+  const keywords = text.match(/\b(add|adding|subtract|right|left|zero|steps?|number line|negative|positive)\b/g);
+  let type;
+  if (/\b(i don'?t know|help|stuck|confused|no idea)\b/.test(text)) {
+    type = 'help_request';
+  } else if (numeric !== null && !text.endsWith('?')) {
+    type = 'answer_attempt';
+  } else if (text.endsWith('?') || /^(what|why|how|is|can|do)\b/.test(text)) {
+    type = 'question';
+  } else if (keywords) {
+    type = 'conceptual_response';
+  } else {
+    type = 'off_topic';
+  }
+  return {
+    message_type: type,
+    numeric_value: type === 'answer_attempt' ? numeric : null,
+    keywords: keywords ? [...new Set(keywords)] : null,
+    confidence: 0.9
+  };
+}
+
+/**
+ * LLM callback for walkTurn() that needs no model
+ *
+ * @param {object} options - {replies: {category: text}} fixed tutor replies per category
+ * @returns {Function} (nodeName, prompt, item) → completion text
+ */
+function localLlm(options = {}) {
+  const replies = options.replies || {};
+  return (nodeName, prompt, item) => {
+    if (nodeName === 'Content Feature Extractor') {
+      return JSON.stringify(extractFeatures(item.message));
+    }
+    if (nodeName === 'Synthesis LLM1') {
+      return JSON.stringify({ action: 'continue', reason: 'local stand-in', sub_answers: [], synthesis_hint: '' });
+    }
+    const category = item.category || 'unknown';
+    if (replies[category]) return replies[category];
+    const problem = (item.current_problem && item.current_problem.text) || 'the problem';
+    return `(${category}) Let's keep working on "${problem}". What is your next step?`;
+  };
+}
+
+/**
+ * LLM callback for walkTurn() that calls an OpenAI-compatible endpoint (mock_openai.js)
+ *
+ * @param {string} baseUrl - e.g. 'http://localhost:8787/v1'
+ * @param {object} options - {model, apiKey, maxTokens: {nodeName: n}}
+ * @returns {Function} async (nodeName, prompt) → content; errors carry the HTTP status
+ */
+function httpLlm(baseUrl, options = {}) {
+  return async (nodeName, prompt) => {
+    const response = await fetch(`${baseUrl.replace(/\/$/, '')}/chat/completions`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', Authorization: `Bearer ${options.apiKey || 'mock'}` },
+      body: JSON.stringify({
+        model: options.model || 'gpt-4o-mini',
+        messages: [{ role: 'user', content: prompt }],
+        max_tokens: (options.maxTokens || {})[nodeName]
+      })
+    });
+    if (!response.ok) {
+      throw Object.assign(new Error(`${nodeName}: ${response.status} ${await response.text()}`), { status: response.status });
+    }
+    const body = await response.json();
+    return body.choices[0].message.content;
+  };
+}
+
+// For Node.js module export
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = { MemoryRedis, extractFeatures, localLlm, httpLlm };
+}
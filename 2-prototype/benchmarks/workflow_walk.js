@@ -0,0 +1,270 @@
+/**
+ * workflow_walk.js
+ *
+ * Run one conversation turn through a workflow export without n8n
+ *
+ * Walks the connections from a trigger depth-first, outputs in order (n8n's
+ * v1 execution order for single-item turns). Code nodes run as async
+ * functions with $input / $json / $('Node') bound; Switch nodes evaluate
+ * their rules or output expression; Redis get/set go to options.redis (a
+ * Map, or any object with get(key) and set(key, value, ttlSeconds), sync or
+ * async - see stand_ins.js); OpenAI nodes answer from a callback. Items are
+ * copied between nodes as n8n does, and every node's output is kept - that
+ * is what n8n stores in the execution record. A node that throws fails the
+ * turn with the node's name in the message and error.node, as n8n reports it.
+ *
+ * Covers the node types this workflow uses, not n8n in general. Code nodes
+ * get `require` only when options.require is given (n8n's
+ * NODE_FUNCTION_ALLOW_EXTERNAL); options.measure adds CPU time and heap
+ * growth per node run, options.capture the items each run received.
+ *
+ * Usage:
+ *   const { walkTurn } = require('./workflow_walk.js');
+ *   const run = await walkTurn(workflow, {
+ *     message: '3', sessionId: 's1', redis: new Map(),
+ *     llm: (nodeName, prompt, item) => '...'
+ *   });
+ *   run.runs      // [{ node, items, input?, cpu_us?, heap_bytes? }] in execution order
+ *   run.response  // {headers, body} Webhook Response1 would send
+ *   run.timing    // {total_ms, llm_ms, redis_ms} - workflow time is total - llm - redis
+ */
+
+const AsyncFunction = Object.getPrototypeOf(async function () {}).constructor;
+
+const copy = value => (value === undefined ? undefined : JSON.parse(JSON.stringify(value)));
+
+// "{{ expr }}" segments of an n8n parameter; braces inside the expression are balanced
+function expressionSegments(template) {
+  const segments = [];
+  let text = '';
+  let i = 0;
+  while (i < template.length) {
+    if (template.startsWith('{{', i)) {
+      let j = i + 2;
+      let depth = 0;
+      while (j < template.length) {
+        const char = template[j];
+        if (char === '"' || char === "'" || char === '`') {
+          j++;
+          while (j < template.length && template[j] !== char) j += template[j] === '\\' ? 2 : 1;
+        } else if (char === '{') {
+          depth++;
+        } else if (char === '}') {
+          if (depth === 0 && template[j + 1] === '}') break;
+          depth--;
+        }
+        j++;
+      }
+      if (text) segments.push({ text });
+      segments.push({ expression: template.slice(i + 2, j) });
+      text = '';
+      i = j + 2;
+    } else {
+      text += template[i++];
+    }
+  }
+  if (text) segments.push({ text });
+  return segments;
+}
+
+function evaluateParameter(value, context) {
+  if (typeof value !== 'string' || !value.startsWith('=')) return value;
+  const evaluate = expression =>
+    new Function('$json', '$input', '$', `return (${expression});`)(context.$json, context.$input, context.$);
+  const segments = expressionSegments(value.slice(1));
+  if (segments.length === 1 && segments[0].expression !== undefined) {
+    return evaluate(segments[0].expression);
+  }
+  return segments.map(segment => {
+    if (segment.text !== undefined) return segment.text;
+    const result = evaluate(segment.expression);
+    return typeof result === 'object' && result !== null ? JSON.stringify(result) : String(result ?? '');
+  }).join('');
+}
+
+const OPERATIONS = {
+  equals: (left, right) => left === right,
+  notEquals: (left, right) => left !== right,
+  contains: (left, right) => String(left).includes(right),
+  empty: left => left === undefined || left === null || left === '',
+  notEmpty: left => left !== undefined && left !== null && left !== '',
+  true: left => left === true,
+  false: left => left === false
+};
+
+function switchOutput(node, context) {
+  const parameters = node.parameters;
+  if (parameters.mode === 'expression') {
+    return evaluateParameter(parameters.output, context);
+  }
+  const rules = parameters.rules.values;
+  for (let index = 0; index < rules.length; index++) {
+    const { conditions, combinator } = rules[index].conditions;
+    const results = conditions.map(condition => {
+      const operation = OPERATIONS[condition.operator.operation];
+      if (!operation) throw new Error(`${node.name}: unsupported operation ${condition.operator.operation}`);
+      return operation(evaluateParameter(condition.leftValue, context),
+        evaluateParameter(condition.rightValue, context));
+    });
+    if (combinator === 'or' ? results.some(Boolean) : results.every(Boolean)) return index;
+  }
+  const fallback = (parameters.options || {}).fallbackOutput;
+  return fallback === 'extra' ? rules.length : typeof fallback === 'number' ? fallback : null;
+}
+
+function inputProxy(items) {
+  return {
+    first: () => items[0],
+    last: () => items[items.length - 1],
+    all: () => items,
+    item: items[0]
+  };
+}
+
+/**
+ * Execute one turn
+ *
+ * @param {object} workflow - n8n workflow export
+ * @param {object} options - {message, sessionId, redis: Map, llm(nodeName, prompt, item) → string,
+ *                            trigger: trigger node name (default: chat trigger),
+ *                            body, headers: webhook request (Webhook Trigger1 only),
+ *                            require: require() for Code nodes, measure: per-node cpu_us/heap_bytes,
+ *                            capture: per-node input items}
+ * @returns {Promise<object>} {runs: [{node, items}], response: {headers, body: Buffer} | null,
+ *                             timing: {total_ms, llm_ms, redis_ms}}
+ */
+async function walkTurn(workflow, options) {
+  const nodes = new Map(workflow.nodes.map(node => [node.name, node]));
+  const outputs = new Map();
+  const runs = [];
+  const timing = { total_ms: 0, llm_ms: 0, redis_ms: 0 };
+  const started = process.hrtime.bigint();
+  let response = null;
+
+  // Time spent in a stand-in, so callers can report the workflow's own time
+  async function timed(key, call) {
+    const start = process.hrtime.bigint();
+    try {
+      return await call();
+    } finally {
+      timing[key] += Number(process.hrtime.bigint() - start) / 1e6;
+    }
+  }
+
+  const $ = name => {
+    const items = outputs.get(name);
+    if (!items) {
+      return { isExecuted: false, first: () => { throw new Error(`Node '${name}' hasn't been executed`); } };
+    }
+    const copies = copy(items);
+    return { isExecuted: true, first: () => copies[0], last: () => copies[copies.length - 1], all: () => copies };
+  };
+
+  const requireModule = options.require || (name => {
+    throw new Error(`Cannot find module '${name}' (not allowed in this Code node sandbox)`);
+  });
+
+  async function execute(node, items) {
+    const item = items[0];
+    const context = { $json: item.json, $input: inputProxy(items), $ };
+
+    if (node.type === 'n8n-nodes-base.code') {
+      const result = await new AsyncFunction('$input', '$json', '$', 'require', node.parameters.jsCode)(
+        context.$input, context.$json, $, requireModule);
+      return [(Array.isArray(result) ? result : [result]).map(entry => {
+        if (!entry || entry.json === undefined) return { json: entry };
+        return entry.binary ? { json: entry.json, binary: entry.binary } : { json: entry.json };
+      })];
+    }
+    if (node.type === 'n8n-nodes-base.switch') {
+      const index = switchOutput(node, context);
+      const routed = [];
+      if (index !== null && index !== undefined) routed[index] = items;
+      return routed;
+    }
+    if (node.type === 'n8n-nodes-base.redis') {
+      const key = evaluateParameter(node.parameters.key, context);
+      if (node.parameters.operation === 'get') {
+        const property = node.parameters.propertyName || 'propertyName';
+        const value = await timed('redis_ms', () => options.redis.get(key));
+        return [[{ json: { ...item.json, [property]: value === undefined ? null : value } }]];
+      }
+      const ttl = node.parameters.expire ? node.parameters.ttl : undefined;
+      const value = evaluateParameter(node.parameters.value, context);
+      await timed('redis_ms', () => options.redis.set(key, value, ttl));
+      return [items];
+    }
+    if (node.type === '@n8n/n8n-nodes-langchain.openAi') {
+      const prompt = node.parameters.messages.values
+        .map(message => evaluateParameter(message.content, context)).join('\n');
+      const content = await timed('llm_ms', () => options.llm(node.name, prompt, item.json));
+      return [[{ json: { index: 0, message: { role: 'assistant', content }, logprobs: null, finish_reason: 'stop' } }]];
+    }
+    if (node.type === 'n8n-nodes-base.respondToWebhook') {
+      const parameters = node.parameters;
+      const headers = {};
+      for (const entry of ((parameters.options || {}).responseHeaders || {}).entries || []) {
+        headers[entry.name.toLowerCase()] = evaluateParameter(entry.value, context);
+      }
+      const body = parameters.respondWith === 'binary'
+        ? Buffer.from(item.binary[parameters.inputFieldName || 'data'].data, 'base64')
+        : Buffer.from(JSON.stringify(evaluateParameter(parameters.responseBody, context)));
+      response = { headers, body };
+      return [items];
+    }
+    throw new Error(`${node.name}: node type ${node.type} is not supported by workflow_walk.js`);
+  }
+
+  async function visit(name, items) {
+    const node = nodes.get(name);
+    const input = copy(items);
+    const heap = options.measure && process.memoryUsage().heapUsed;
+    const cpu = options.measure && process.cpuUsage();
+    let produced;
+    try {
+      produced = await execute(node, input);
+    } catch (error) {
+      if (!error.node) {
+        error.message = `${name}: ${error.message}`;
+        error.node = name;
+      }
+      throw error;
+    }
+    const run = { node: name };
+    if (options.capture) run.input = copy(items);
+    if (options.measure) {
+      const used = process.cpuUsage(cpu);
+      run.cpu_us = used.user + used.system;
+      run.heap_bytes = process.memoryUsage().heapUsed - heap;
+    }
+    const emitted = produced.filter(Boolean).flat();
+    outputs.set(name, emitted);
+    run.items = copy(emitted);
+    runs.push(run);
+
+    const connections = (workflow.connections[name] || {}).main || [];
+    for (let index = 0; index < connections.length; index++) {
+      if (!produced[index] || produced[index].length === 0) continue;
+      for (const target of connections[index] || []) {
+        await visit(target.node, produced[index]);
+      }
+    }
+  }
+
+  const trigger = options.trigger || 'When chat message received';
+  const triggerItem = trigger === 'When chat message received'
+    ? { sessionId: options.sessionId, action: 'sendMessage', chatInput: options.message }
+    : { headers: options.headers || {}, params: {}, query: {}, body: options.body };
+  outputs.set(trigger, [{ json: triggerItem }]);
+  runs.push({ node: trigger, items: [{ json: triggerItem }] });
+  for (const target of workflow.connections[trigger].main[0]) {
+    await visit(target.node, [{ json: triggerItem }]);
+  }
+  timing.total_ms = Number(process.hrtime.bigint() - started) / 1e6;
+  return { runs, response, timing };
+}
+
+// For Node.js module export
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = { walkTurn, evaluateParameter, switchOutput };
+}
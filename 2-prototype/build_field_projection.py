@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Declared field contracts per node, and the projection they allow.
+
+PROBLEM:
+Nearly every Code node returns `{...input, ...}`, so the item grows along
+the graph: "Normalize input1" carries `_original_payload` to the end,
+Load Session1's whole output (session with up to 15 turns included) is
+spread into the validators, and "Build Response Context1" stores the
+session twice (`session` and `_session`). n8n copies every node's output
+into the execution record, so each hop persists the whole context again.
+
+SOLUTION:
+NODE_CONTRACTS declares, for every node, the top-level fields it reads -
+from the item that arrives ($input) and from other nodes by reference
+($('Load Session1')) - and which sources its output passes through
+(`{...input}` spreads). From that we compute, for every Code node, the
+fields anything downstream can still read, and the deployment build
+(optimize_workflow.py) wraps the node so only those fields leave it.
+Source workflow code is not edited.
+
+A node without a contract makes the build fail: a new node has to declare
+what it reads before its producers can be trimmed. `'*'` means "every
+field" (no projection upstream of it).
+
+    python3 build_field_projection.py   # show contracts and projected fields
+    node benchmarks/bench_item_bytes.js # item bytes per hop, before/after
+"""
+
+import json
+
+from workflow_utils import WORKFLOW_FILE, find_node, load_workflow
+
+CODE_TYPE = 'n8n-nodes-base.code'
+
+ALL = '*'
+
+# Validators read the item Parse Features joined and spread it into their output
+VALIDATOR_CONTRACT = {
+    'reads': {
+        '$input': ['answer_phrase', 'session', 'current_problem', 'message', 'student_message', 'message_type',
+                   'numeric_value', 'keywords', 'confidence', 'scaffolding_last_question',
+                   'scaffolding_expected_answers'],
+    },
+    'passes': ['$input'],
+}
+
+NODE_CONTRACTS = {
+    'When chat message received': {'reads': {}},
+    'Webhook Trigger1': {'reads': {}},
+    'Normalize input1': {'reads': {'$input': ALL}},
+    'Redis: Get Session1': {'reads': {'$input': ['session_id']}, 'passes': ['$input']},
+    'Load Session1': {
+        'reads': {
+            'Normalize input1': ['session_id', 'student_id', 'message', 'current_problem'],
+            'Redis: Get Session1': ['value', 'propertyName'],
+        },
+        'passes': ['Normalize input1'],
+    },
+    'Content Feature Extractor': {'reads': {'$input': ['message', 'current_problem']}},
+    'Parse Features': {
+        'reads': {'$input': ['message'], 'Load Session1': ['answer_phrase', 'session']},
+        'passes': ['Load Session1'],
+    },
+    'Content-Based Router': {
+        'reads': {'$input': ['message_type', 'numeric_value', 'answer_phrase', 'tutor_state',
+                             'scaffolding_expected_answers', 'current_problem']},
+        'passes': ['$input'],
+    },
+    'Enhanced Numeric Verifier': VALIDATOR_CONTRACT,
+    'Semantic Validator': VALIDATOR_CONTRACT,
+    'Classify Stuck': VALIDATOR_CONTRACT,
+    'Teach-back validator': VALIDATOR_CONTRACT,
+    'Build Response Context1': {
+        'reads': {'$input': ['session', '_session_id', 'session_id', 'tutor_state', 'category']},
+        'passes': ['$input'],
+    },
+    'Route by Category1': {
+        'reads': {'$input': ['category', 'teach_back_closure', 'loop_decision']},
+        'passes': ['$input'],
+    },
+    'Response: Unified1': {
+        'reads': {'$input': ['attempt_count', 'category', 'chat_history', 'current_problem',
+                             'is_scaffolding_active', 'is_teach_back_active', 'message', 'question_loop',
+                             'synthesis_action', 'synthesis_hint', 'teach_back_rubric']},
+    },
+    'Synthesis Detector1': {'reads': {'$input': ['current_problem', 'message', 'chat_history']}},
+    'Synthesis LLM1': {'reads': {'$input': ['prompt']}},
+    'Parse Synthesis Decision1': {
+        'reads': {'$input': ['message', 'text', 'response'], 'Build Response Context1': []},
+        'passes': ['Build Response Context1'],
+    },
+    'Teach-back Closure': {'reads': {'$input': ['teach_back_closure']}},
+    'Update Session & Format Response1': {
+        'reads': {
+            '$input': ['message', 'text'],
+            'Build Response Context1': ['_session', '_session_id', 'category', 'is_main_problem_attempt',
+                                        'student_message', 'message', '_start_time', 'response_options'],
+        },
+    },
+    'Redis: Save Session1': {
+        'reads': {'$input': ['_session_id', '_session_for_redis']},
+        'passes': ['$input'],
+    },
+    'Webhook Response1': {'reads': {'$input': ['response_body']}},
+}
+
+
+def predecessors(workflow, name):
+    names = []
+    for source, outputs in workflow['connections'].items():
+        for output in outputs.get('main', []):
+            if any(c['node'] == name for c in output or []) and source not in names:
+                names.append(source)
+    return names
+
+
+def union(a, b):
+    if a == ALL or b == ALL:
+        return ALL
+    return a | set(b)
+
+
+def needed_fields(workflow, contracts=NODE_CONTRACTS):
+    """Fields of each node's output that something downstream can read."""
+    missing = [n['name'] for n in workflow['nodes'] if n['name'] not in contracts]
+    if missing:
+        raise ValueError(f'Nodes without a field contract: {missing}')
+
+    # (source, consumer, fields, passes) for every read
+    edges = []
+    for node in workflow['nodes']:
+        contract = contracts[node['name']]
+        passes = contract.get('passes', [])
+        for source, fields in contract['reads'].items():
+            sources = predecessors(workflow, node['name']) if source == '$input' else [source]
+            for producer in sources:
+                edges.append((producer, node['name'], fields, source in passes))
+
+    memo = {}
+
+    def needed(name, stack=()):
+        if name in memo:
+            return memo[name]
+        if name in stack:
+            raise ValueError(f'Pass-through cycle at {name}')
+        fields = set()
+        for producer, consumer, read, passes in edges:
+            if producer != name:
+                continue
+            fields = union(fields, read)
+            if passes:
+                fields = union(fields, needed(consumer, stack + (name,)))
+        memo[name] = fields
+        return fields
+
+    return {node['name']: needed(node['name']) for node in workflow['nodes']}
+
+
+PROJECTION = """// Field projection (build_field_projection.py): only fields read downstream leave this node
+const __projected = await (async function () {{
+{code}
+}})();
+const __fields = {fields};
+return (Array.isArray(__projected) ? __projected : [__projected]).map(item => {{
+  const json = item && item.json !== undefined ? item.json : item;
+  const kept = {{}};
+  for (const field of __fields) {{
+    if (json[field] !== undefined) kept[field] = json[field];
+  }}
+  return item && item.binary ? {{ json: kept, binary: item.binary }} : {{ json: kept }};
+}});"""
+
+
+def project_workflow(workflow, contracts=NODE_CONTRACTS):
+    """Wrap every Code node so it only outputs the fields read downstream. Edits in place."""
+    report = {}
+    for name, fields in needed_fields(workflow, contracts).items():
+        node = find_node(workflow, name)
+        if node['type'] != CODE_TYPE or fields == ALL:
+            continue
+        keep = sorted(fields)
+        node['parameters']['jsCode'] = PROJECTION.format(
+            code=node['parameters']['jsCode'], fields=json.dumps(keep))
+        report[name] = keep
+    return report
+
+
+def main():
+    workflow = load_workflow(WORKFLOW_FILE)
+    needed = needed_fields(workflow)
+    print(f"Field contracts: {len(NODE_CONTRACTS)} nodes")
+    for node in workflow['nodes']:
+        fields = needed[node['name']]
+        shown = 'all fields (no projection)' if fields == ALL else ', '.join(sorted(fields)) or '(none)'
+        marker = '→' if node['type'] == CODE_TYPE and fields != ALL else ' '
+        print(f"  {marker} {node['name']:<36} {shown}")
+    print("\n→ = Code node projected by optimize_workflow.py")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
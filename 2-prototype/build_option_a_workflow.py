@@ -12,6 +12,8 @@ This script:
 import json
 import uuid
 
+from build_registries import registry_declarations
+
 def generate_uuid():
     """Generate n8n-compatible UUID"""
     return str(uuid.uuid4())
@@ -164,14 +166,8 @@ return {
 def create_enhanced_numeric_verifier_node():
     """Create Enhanced Numeric Verifier (Code) node"""
 
-    # Read the config file to embed it (since n8n Code nodes can't require external files in cloud)
-    with open('config_registries.js', 'r') as f:
-        config_code = f.read()
-
-    # Extract just the ERROR_DETECTORS object
-    start = config_code.find('const ERROR_DETECTORS = {')
-    end = config_code.find('// ============================================================================', start + 1)
-    error_detectors_code = config_code[start:end].strip()
+    # Compiled and validated registry (n8n Code nodes can't require external files in cloud)
+    error_detectors_code = registry_declarations(['ERROR_DETECTORS', 'ERROR_DETECTOR_BY_OPERATION'])
 
     js_code = f"""// Enhanced Numeric Verifier with Configurable Error Detection
 
@@ -310,13 +306,7 @@ return {{
 def create_semantic_validator_node():
     """Create Semantic Validator (Code) node"""
 
-    # Read config to extract SEMANTIC_PATTERNS
-    with open('config_registries.js', 'r') as f:
-        config_code = f.read()
-
-    start = config_code.find('const SEMANTIC_PATTERNS = {')
-    end = config_code.find('// ============================================================================\n// SUBJECT CONFIGURATION')
-    patterns_code = config_code[start:end].strip()
+    patterns_code = registry_declarations(['SEMANTIC_PATTERNS'])
 
     js_code = f"""// Semantic Validator - Configurable Pattern Matching
 
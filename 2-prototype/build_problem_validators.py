@@ -0,0 +1,709 @@
+#!/usr/bin/env python3
+"""
+Build per-problem validator tables from the problem catalog.
+
+PROBLEM:
+"Enhanced Numeric Verifier" and "Semantic Validator" re-derive everything
+about the problem on every turn: they regex-parse the problem text, run the
+ERROR_DETECTORS closures, and pick keyword sets with string checks like
+problemText.includes('+'). The regex also gets some problems wrong
+("5 - (-3)" moves right, "3/4" parses as 34).
+
+SOLUTION:
+Do that interpretation once, at build time. For every problem in
+exemplars/questions.json we emit a table entry with the constants inlined:
+  - correct value and close threshold
+  - verdicts: value -> category (catalog errors + ERROR_DETECTORS output)
+  - surface_verdicts: written fraction -> category, for catalog answers the
+    value key would merge with another one ("3/6" is close, 0.5 correct);
+    looked up before the value
+  - operands / operation of the problem expression
+  - resolved expected/wrong keyword sets per SEMANTIC_PATTERNS group
+  - an answer-phrase regex ("we get 2", "land on two")
+  - expected sub-answers for scaffolding steps, grouped by role (start
+    point, steps, intermediate result, common denominator, given numbers)
+The two nodes then do a direct table lookup by problem id and only fall back
+to the generic logic for problems that are not in the catalog.
+
+The build is incremental: each problem is hashed, and only problems whose
+catalog entry (or the registries) changed are regenerated.
+
+Usage:
+  python3 build_problem_validators.py            # regenerate + embed
+  python3 build_problem_validators.py --force    # ignore the manifest
+  python3 build_problem_validators.py --no-embed # only write generated/
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+
+from workflow_utils import (REGISTRY_FILE, find_node, load_workflow,
+                            replace_marked_block, run_node, save_workflow)
+
+GENERATOR_VERSION = 3
+
+CATALOG_FILE = 'exemplars/questions.json'
+OUTPUT_FILE = 'generated/problem_validators.js'
+MANIFEST_FILE = 'generated/problem_validators.manifest.json'
+
+BLOCK_MARKER = 'PROBLEM_VALIDATORS (generated by build_problem_validators.py)'
+
+# Same mapping the verifier uses at runtime
+OPERATION_DETECTORS = {
+    '+': 'math_arithmetic_addition',
+    '-': 'math_arithmetic_subtraction',
+    '*': 'math_arithmetic_multiplication',
+    '/': 'math_arithmetic_division',
+}
+
+# Catalog categories that have no output on "Route by Category1" are folded
+# into the category the verifier already uses for misconception answers.
+CATALOG_CATEGORY_MAP = {
+    'correct': 'correct',
+    'close': 'close',
+    'wrong_operation': 'wrong_operation',
+    'conceptual_gap': 'wrong_operation',
+}
+
+# Cues from improve_answer_extraction.py that introduce an answer, not a process
+ANSWER_CUES = [
+    'we get', 'get', 'got', 'land on', 'landed on', 'lands on', "it's", 'its',
+    'it is', "that's", 'thats', 'equals', 'equal', 'is', 'think', 'reach',
+    'reached', 'answer is',
+    'end up at', 'end up on',
+]
+
+NUMBER_WORDS = {
+    'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11,
+    'twelve': 12, 'thirteen': 13, 'fourteen': 14, 'fifteen': 15,
+    'sixteen': 16, 'seventeen': 17, 'eighteen': 18, 'nineteen': 19,
+    'twenty': 20,
+}
+NUMBER_NAMES = {value: word for word, value in NUMBER_WORDS.items()}
+
+
+# ============================================================================
+# Problem parsing
+# ============================================================================
+
+EXPRESSION_RE = re.compile(r'[-−(]?\s*\d[\d\s+\-−×÷*/().]*')
+TOKEN_RE = re.compile(r'\d+(?:\.\d+)?/\d+(?:\.\d+)?|\d+(?:\.\d+)?|[-+*/()]')
+
+
+def parse_number(text):
+    """Parse '3', '-0.5' or '3/4' (a fraction literal, no spaces)."""
+    if '/' in text:
+        numerator, denominator = text.split('/')
+        return float(numerator) / float(denominator)
+    return float(text)
+
+
+def tokenize(expression):
+    expression = (expression.replace('−', '-').replace('×', '*')
+                  .replace('÷', '/'))
+    # A slash with spaces around it is division, without spaces a fraction
+    expression = re.sub(r'\s+/\s+', ' ÷ ', expression)
+    tokens = []
+    for raw in re.findall(r'÷|' + TOKEN_RE.pattern, expression):
+        tokens.append('/' if raw == '÷' else raw)
+    return tokens
+
+
+def parse_expression(tokens):
+    """
+    Recursive-descent parse with precedence. Returns an AST of
+    ('num', value) / ('op', symbol, left, right), or None.
+    """
+    position = [0]
+
+    def peek():
+        return tokens[position[0]] if position[0] < len(tokens) else None
+
+    def take():
+        token = peek()
+        position[0] += 1
+        return token
+
+    def atom():
+        token = take()
+        if token is None:
+            raise ValueError('unexpected end')
+        if token == '-':
+            inner = atom()
+            if inner[0] == 'num':
+                return ('num', -inner[1])
+            return ('op', '*', ('num', -1.0), inner)
+        if token == '(':
+            node = additive()
+            if take() != ')':
+                raise ValueError('unbalanced parentheses')
+            return node
+        return ('num', parse_number(token))
+
+    def multiplicative():
+        node = atom()
+        while peek() in ('*', '/'):
+            node = ('op', take(), node, atom())
+        return node
+
+    def additive():
+        node = multiplicative()
+        while peek() in ('+', '-'):
+            node = ('op', take(), node, multiplicative())
+        return node
+
+    try:
+        tree = additive()
+    except (ValueError, ZeroDivisionError):
+        return None
+    return tree if position[0] == len(tokens) else None
+
+
+def evaluate(tree):
+    if tree[0] == 'num':
+        return tree[1]
+    _, symbol, left, right = tree
+    a, b = evaluate(left), evaluate(right)
+    return {'+': a + b, '-': a - b, '*': a * b, '/': a / b if b else math.nan}[symbol]
+
+
+def leaves(tree):
+    if tree[0] == 'num':
+        return [tree[1]]
+    return leaves(tree[2]) + leaves(tree[3])
+
+
+def parse_problem(text):
+    """Find the arithmetic expression in a problem statement, if any."""
+    best = None
+    for candidate in EXPRESSION_RE.findall(text):
+        candidate = candidate.strip().rstrip('.')
+        tokens = tokenize(candidate)
+        if not any(t in '+-*/' for t in tokens[1:]):
+            continue
+        tree = parse_expression(tokens)
+        if tree and tree[0] == 'op' and (best is None or len(tokens) > best[0]):
+            best = (len(tokens), tree)
+    return best[1] if best else None
+
+
+def parse_answer(text):
+    """Parse a catalog answer: '-8', '3/4', '0.75', 'negative three degrees'."""
+    cleaned = str(text).strip().lower().replace('−', '-')
+    sign = 1
+    for prefix in ('negative ', 'minus '):
+        if cleaned.startswith(prefix):
+            sign, cleaned = -1, cleaned[len(prefix):]
+    match = re.match(r'-?\d+(?:\.\d+)?(?:/\d+)?', cleaned)
+    if match:
+        return sign * parse_number(match.group(0))
+    word = cleaned.split(' ')[0]
+    if word in NUMBER_WORDS:
+        return sign * float(NUMBER_WORDS[word])
+    return None
+
+
+def value_key(value):
+    """Same key as problemValueKey() in the generated JavaScript."""
+    rounded = math.floor(value * 1000 + 0.5) / 1000
+    if rounded == int(rounded):
+        return str(int(rounded))
+    return repr(rounded)
+
+
+def surface_key(text):
+    """Written fraction of an answer, the way problemSurfaceKey() reads it ('3 / 6' → '3/6'), or None."""
+    fractions = re.findall(r'-?\d+\s*/\s*\d+', str(text))
+    return re.sub(r'\s+', '', fractions[-1]) if fractions else None
+
+
+def plain(value):
+    """Emit integral floats as ints so the generated JS stays readable."""
+    return int(value) if value == int(value) else round(value, 6)
+
+
+# ============================================================================
+# Table entry generation
+# ============================================================================
+
+def answer_forms(value):
+    """Ways a student might write `value` after an answer cue."""
+    forms = [value_key(value)]
+    magnitude = abs(value)
+    if value != int(value):
+        for denominator in range(2, 13):
+            numerator = magnitude * denominator
+            if abs(numerator - round(numerator)) < 1e-9:
+                forms.append(f'{int(round(numerator))}/{denominator}')
+                break
+        if magnitude < 1:
+            forms.append(value_key(magnitude).lstrip('0'))
+    elif int(magnitude) in NUMBER_NAMES and value >= 0:
+        forms.append(NUMBER_NAMES[int(magnitude)])
+    if value < 0:
+        positive = [value_key(magnitude)] + [f for f in forms if not f.startswith('-')]
+        if magnitude == int(magnitude) and int(magnitude) in NUMBER_NAMES:
+            positive.append(NUMBER_NAMES[int(magnitude)])
+        forms += [f'{word} {form}' for word in ('negative', 'minus')
+                  for form in dict.fromkeys(positive)]
+    elif value > 0:
+        forms += ['+' + value_key(value), 'positive ' + value_key(value)]
+    return list(dict.fromkeys(forms))
+
+
+def js_escape(text):
+    """Escape regex metacharacters for a JavaScript RegExp source."""
+    return re.sub(r'([.*+?^${}()|[\]\\/-])', r'\\\1', text)
+
+
+def answer_phrase_pattern(value):
+    cues = '|'.join(js_escape(c) for c in sorted(ANSWER_CUES, key=len, reverse=True))
+    forms = '|'.join(js_escape(f) for f in sorted(answer_forms(value), key=len, reverse=True))
+    return rf"(?:^|\b)(?:{cues})\s+(?:{forms})(?![\d./])"
+
+
+def resolve_keyword_sets(operation, operands, semantic_patterns):
+    """
+    Resolve the conditional expectedKeywords of each SEMANTIC_PATTERNS group
+    for this problem, so the validator doesn't have to sniff the problem text.
+    """
+    if operation not in ('+', '-') or len(operands) != 2:
+        return {}
+    second = operands[1]
+    sets = {}
+    for pattern_type, config in semantic_patterns.items():
+        for pattern in config['patterns']:
+            expected = pattern.get('expectedKeywords')
+            wrong = pattern.get('wrongKeywords') or {}
+            if not isinstance(expected, dict):
+                continue
+            if operation in expected:
+                # "5 - (-3)": the literal sign and the movement disagree, let
+                # the LLM fallback judge it (same as the generic '+ -' check)
+                if second < 0:
+                    continue
+                sets[pattern_type] = {
+                    'expected': expected[operation],
+                    'wrong': wrong.get(operation, []),
+                }
+            elif 'positive' in expected and 'negative' in expected:
+                moves_right = (second > 0) == (operation == '+')
+                key = 'positive' if moves_right else 'negative'
+                sets[pattern_type] = {
+                    'expected': expected[key],
+                    'wrong': wrong.get(key, []),
+                    # Tutor asked about a specific sign: keep the generic rule
+                    'unless_question': ['positive', 'negative'],
+                }
+            break
+    return sets
+
+
+def build_entry(question, semantic_patterns, detector_values):
+    """Build the table entry for one catalog question."""
+    correct_value = parse_answer(question['correct_answer'])
+    if correct_value is None:
+        return None
+
+    tree = parse_problem(question['problem'])
+    if tree and abs(evaluate(tree) - correct_value) >= 0.001:
+        print(f"  WARNING: {question['id']}: catalog answer {question['correct_answer']} "
+              f"!= expression value {evaluate(tree):g}")
+    operation = tree[1] if tree else None
+    operands = leaves(tree) if tree else []
+    close_threshold = max(abs(correct_value * 0.2), 0.3)
+
+    verdicts = {}
+    surfaces = {}
+    # Misconceptions from ERROR_DETECTORS (only for a single binary operation)
+    for error_value in detector_values:
+        if abs(error_value - correct_value) <= close_threshold:
+            continue  # generic order: "close" wins over operation errors
+        verdicts[value_key(error_value)] = 'wrong_operation'
+    # Catalog knowledge is more specific than the detectors
+    for error in question.get('common_errors', []):
+        value = parse_answer(error['answer'])
+        category = CATALOG_CATEGORY_MAP.get(error.get('category'))
+        if value is None or category is None:
+            continue
+        if category == 'correct' and abs(value - correct_value) >= 0.001:
+            continue
+        verdicts[value_key(value)] = category
+        surface = surface_key(error['answer'])
+        if surface:
+            surfaces[surface] = category
+    verdicts[value_key(correct_value)] = 'correct'
+    # Only written forms whose value would be judged otherwise
+    surface_verdicts = {surface: category for surface, category in surfaces.items()
+                        if verdicts[value_key(parse_answer(surface))] != category}
+
+    return {
+        'id': question['id'],
+        'text_key': question['problem'].strip().lower(),
+        'correct_value': plain(correct_value),
+        'close_threshold': plain(close_threshold),
+        'operation': operation,
+        'operands': [plain(v) for v in operands],
+        'verdicts': dict(sorted(verdicts.items())),
+        'surface_verdicts': dict(sorted(surface_verdicts.items())),
+        'keyword_sets': resolve_keyword_sets(operation, operands, semantic_patterns),
+        'answer_phrase': answer_phrase_pattern(correct_value),
+        'sub_answers': sub_answer_sets(question['problem'], tree, correct_value),
+    }
+
+
+def internal_values(tree):
+    """Values of the operation nodes below the root (2 + 3 × 4 → [12])."""
+    values = []
+    for child in (tree[2], tree[3]):
+        if child[0] == 'op':
+            values += internal_values(child) + [evaluate(child)]
+    return values
+
+
+def fraction_denominators(problem):
+    denominators = []
+    for token in tokenize(problem):
+        if '/' in token and len(token) > 1:
+            denominators.append(int(float(token.split('/')[1])))
+    return denominators
+
+
+def sub_answer_sets(problem, tree, correct_value):
+    """
+    Numbers a student can correctly give on the way to the answer, by role.
+    The main answer itself is excluded: the router checks it separately.
+    """
+    sets = {}
+    if tree:
+        operands = leaves(tree)
+        sets['start'] = [operands[0]]
+        sets['operands'] = operands
+        sets['intermediate'] = internal_values(tree)
+        _, symbol, left, right = tree
+        if symbol in ('+', '-') and left[0] == 'num' and right[0] == 'num':
+            steps = [abs(right[1])]
+            # Crossing zero: steps to zero, then steps from zero
+            if left[1] != 0 and (left[1] < 0) != (correct_value < 0) and correct_value != 0:
+                steps += [abs(left[1]), abs(correct_value)]
+            sets['steps'] = steps
+        denominators = fraction_denominators(problem)
+        if len(denominators) > 1:
+            sets['denominator'] = [math.lcm(*denominators)]
+    else:
+        # Word problems: the given numbers ("had 3 apples", "gave away 5")
+        givens = [parse_number(n) for n in re.findall(r'\d+(?:\.\d+)?', problem)]
+        if givens:
+            sets['start'] = givens[:1]
+            sets['givens'] = givens
+
+    correct_key = value_key(correct_value)
+    result = {}
+    for role, values in sets.items():
+        kept = list(dict.fromkeys(plain(v) for v in values if value_key(v) != correct_key))
+        if kept:
+            result[role] = kept
+    return result
+
+
+def simple_binary(question):
+    """(detector_key, num1, num2) when the problem is a single binary op."""
+    tree = parse_problem(question['problem'])
+    if not tree or tree[2][0] != 'num' or tree[3][0] != 'num':
+        return None
+    return OPERATION_DETECTORS.get(tree[1]), tree[2][1], tree[3][1]
+
+
+# ============================================================================
+# Registries (read through Node - they are CommonJS)
+# ============================================================================
+
+REGISTRY_SCRIPT = r"""
+const registries = require('./config_registries.js');
+const calls = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const detectorValues = {};
+for (const [id, [key, num1, num2, operation]] of Object.entries(calls)) {
+  const detector = registries.ERROR_DETECTORS[key];
+  detectorValues[id] = detector ? detector(num1, num2, operation).filter(Number.isFinite) : [];
+}
+process.stdout.write(JSON.stringify({
+  semantic_patterns: registries.SEMANTIC_PATTERNS,
+  detector_values: detectorValues
+}));
+"""
+
+SYMBOLS = {v: k for k, v in OPERATION_DETECTORS.items()}
+
+
+def load_registry_data(questions):
+    calls = {}
+    for question in questions:
+        binary = simple_binary(question)
+        if binary and binary[0]:
+            key, num1, num2 = binary
+            calls[question['id']] = [key, num1, num2, SYMBOLS[key]]
+    return run_node(REGISTRY_SCRIPT, calls)
+
+
+def file_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def question_digest(question, registry_hash):
+    payload = json.dumps([GENERATOR_VERSION, registry_hash, question], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+# ============================================================================
+# Output
+# ============================================================================
+
+RUNTIME_JS = """
+function problemValueKey(value) {
+  const rounded = Math.round(value * 1000) / 1000;
+  return String(rounded === 0 ? 0 : rounded);
+}
+
+function problemSurfaceKey(text) {
+  const fractions = String(text || '').match(/-?\d+\s*\/\s*\d+/g);
+  return fractions ? fractions[fractions.length - 1].replace(/\s+/g, '') : null;
+}
+
+// Written form first ("3/6" unsimplified), then the value
+function problemVerdict(spec, value, text) {
+  const surface = problemSurfaceKey(text);
+  return (surface && spec.surface_verdicts[surface]) || spec.verdicts[problemValueKey(value)];
+}
+
+function lookupProblemValidator(problem) {
+  if (!problem) return null;
+  const textKey = String(problem.text || '').trim().toLowerCase();
+  const byId = PROBLEM_VALIDATORS[problem.id];
+  if (byId && (!textKey || byId.text_key === textKey)) return byId;
+  const byText = PROBLEM_TEXT_INDEX[textKey];
+  return byText ? PROBLEM_VALIDATORS[byText] : null;
+}
+"""
+
+
+def render_table(entries):
+    lines = ['// Generated from exemplars/questions.json - do not edit by hand',
+             'const PROBLEM_VALIDATORS = {']
+    ids = sorted(entries)
+    for i, problem_id in enumerate(ids):
+        comma = ',' if i < len(ids) - 1 else ''
+        lines.append(f'  {json.dumps(problem_id)}: {json.dumps(entries[problem_id], sort_keys=True)}{comma}')
+    lines.append('};')
+
+    text_index = {}
+    for problem_id in ids:
+        text_index.setdefault(entries[problem_id]['text_key'], problem_id)
+    lines.append(f'const PROBLEM_TEXT_INDEX = {json.dumps(text_index, indent=2)};')
+    return '\n'.join(lines) + '\n' + RUNTIME_JS
+
+
+def render_module(table_js):
+    return (table_js +
+            "\nif (typeof module !== 'undefined' && module.exports) {\n"
+            "  module.exports = { PROBLEM_VALIDATORS, PROBLEM_TEXT_INDEX, "
+            "problemValueKey, problemSurfaceKey, problemVerdict, lookupProblemValidator };\n}\n")
+
+
+def load_manifest(force):
+    if force or not os.path.exists(MANIFEST_FILE):
+        return {'generator': GENERATOR_VERSION, 'problems': {}}
+    with open(MANIFEST_FILE, 'r') as f:
+        manifest = json.load(f)
+    if manifest.get('generator') != GENERATOR_VERSION:
+        return {'generator': GENERATOR_VERSION, 'problems': {}}
+    return manifest
+
+
+def write_if_changed(path, content):
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            if f.read() == content:
+                return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+    return True
+
+
+def generate(catalog_file, force=False):
+    """Regenerate changed entries. Returns (table_js, stats)."""
+    with open(catalog_file, 'r') as f:
+        catalog = json.load(f)
+    questions = [q for q in catalog['questions'] if q.get('correct_answer') is not None]
+
+    manifest = load_manifest(force)
+    registry_hash = file_digest(REGISTRY_FILE)
+    cached = manifest['problems']
+
+    digests = {q['id']: question_digest(q, registry_hash) for q in questions}
+    changed = [q for q in questions
+               if cached.get(q['id'], {}).get('hash') != digests[q['id']]]
+
+    stats = {'regenerated': [], 'reused': [], 'removed': [], 'skipped': []}
+    problems = {}
+    if changed:
+        registry = load_registry_data(changed)
+    for question in questions:
+        problem_id = question['id']
+        if question in changed:
+            entry = build_entry(question, registry['semantic_patterns'],
+                                registry['detector_values'].get(problem_id, []))
+            stats['regenerated'].append(problem_id)
+        else:
+            entry = cached[problem_id]['entry']
+            stats['reused'].append(problem_id)
+        if entry is None:
+            stats['skipped'].append(problem_id)
+        problems[problem_id] = {'hash': digests[problem_id], 'entry': entry}
+    stats['removed'] = sorted(set(cached) - set(problems))
+
+    manifest = {'generator': GENERATOR_VERSION, 'problems': problems}
+    write_if_changed(MANIFEST_FILE, json.dumps(manifest, indent=2, sort_keys=True) + '\n')
+
+    entries = {pid: p['entry'] for pid, p in problems.items() if p['entry']}
+    table_js = render_table(entries)
+    write_if_changed(OUTPUT_FILE, render_module(table_js))
+    return table_js, stats
+
+
+# ============================================================================
+# Embedding into the workflow
+# ============================================================================
+
+INPUT_ANCHOR = '  const input = $input.first().json;'
+
+VERIFIER_LOOKUP = """  // Per-problem table lookup (constants precomputed by build_problem_validators.py)
+  const VERDICT_CONFIDENCE = { correct: 1.0, close: 0.9, wrong_operation: 0.95, stuck: 0.85 };
+  const problemSpec = lookupProblemValidator(input.current_problem);
+  if (problemSpec && studentValue !== null && !isNaN(studentValue)) {
+    const verdict = problemVerdict(problemSpec, studentValue, input.student_message || input.message) ||
+      (Math.abs(studentValue - problemSpec.correct_value) <= problemSpec.close_threshold ? 'close' : 'stuck');
+    return {
+      json: {
+        ...input,
+        category: verdict,
+        is_main_problem_attempt: true,
+        confidence: VERDICT_CONFIDENCE[verdict],
+        reasoning: `Student answered ${studentValue}, ${verdict} for ${problemSpec.id} (table lookup)`
+      }
+    };
+  }
+
+  // Parse correct answer"""
+
+SEMANTIC_LOOKUP = """  const numericValue = input.numeric_value;
+  const problemSpec = lookupProblemValidator(input.current_problem);"""
+
+SEMANTIC_SETS_OLD = """        if (patternType === 'math_operation_identification') {"""
+SEMANTIC_SETS_NEW = """        const problemSets = problemSpec && problemSpec.keyword_sets[patternType];
+        if (problemSets && !(problemSets.unless_question || []).some(w => scaffoldingQuestion.includes(w))) {
+          expectedSet = problemSets.expected;
+          wrongSet = problemSets.wrong;
+        } else if (patternType === 'math_operation_identification') {"""
+
+SEMANTIC_PROCESS_OLD = """  // PROCESS-NUMBER VALIDATION (CORRECTED)
+  // If student mentions an exact operand from the problem, treat as partial understanding
+  if (reasoning === '' && numericValue !== null && !isNaN(numericValue)) {"""
+SEMANTIC_PROCESS_NEW = """  // MAIN-ANSWER PHRASE ("so we land on 2") - precomputed per problem
+  if (reasoning === '' && problemSpec && new RegExp(problemSpec.answer_phrase, 'i').test(studentMessage)) {
+    isCorrect = true;
+    reasoning = 'Student stated the main answer';
+  }
+
+  // PROCESS-NUMBER VALIDATION (table lookup: operands precomputed per problem)
+  if (reasoning === '' && problemSpec && numericValue !== null && !isNaN(numericValue)) {
+    if (problemSpec.operands.some(operand => Math.abs(numericValue - operand) < 0.001)) {
+      isCorrect = true;
+      reasoning = 'Student identified process number from problem';
+    }
+  }
+
+  // PROCESS-NUMBER VALIDATION (CORRECTED)
+  // If student mentions an exact operand from the problem, treat as partial understanding
+  if (reasoning === '' && !problemSpec && numericValue !== null && !isNaN(numericValue)) {"""
+
+
+# Earlier builds looked the value up only
+VALUE_VERDICT = "    const verdict = problemSpec.verdicts[problemValueKey(studentValue)] ||"
+SURFACE_VERDICT = "    const verdict = problemVerdict(problemSpec, studentValue, input.student_message || input.message) ||"
+
+
+def patch_once(code, old, new, done_marker):
+    """Apply a one-time code edit; skip if it was applied on a previous run."""
+    if done_marker in code:
+        return code
+    if old not in code:
+        raise ValueError(f'Expected code not found: {old.strip()[:60]!r}')
+    return code.replace(old, new, 1)
+
+
+def embed(workflow, table_js):
+    verifier = find_node(workflow, 'Enhanced Numeric Verifier')
+    semantic = find_node(workflow, 'Semantic Validator')
+    if not verifier or not semantic:
+        raise ValueError('Enhanced Numeric Verifier / Semantic Validator not found')
+
+    code = verifier['parameters']['jsCode']
+    code = replace_marked_block(code, BLOCK_MARKER, table_js, anchor=INPUT_ANCHOR)
+    code = patch_once(code, '  // Parse correct answer', VERIFIER_LOOKUP,
+                      'lookupProblemValidator(input.current_problem)')
+    code = code.replace(VALUE_VERDICT, SURFACE_VERDICT, 1)
+    verifier['parameters']['jsCode'] = code
+
+    code = semantic['parameters']['jsCode']
+    code = replace_marked_block(code, BLOCK_MARKER, table_js, anchor=INPUT_ANCHOR)
+    code = patch_once(code, '  const numericValue = input.numeric_value;', SEMANTIC_LOOKUP,
+                      'lookupProblemValidator(input.current_problem)')
+    code = patch_once(code, SEMANTIC_SETS_OLD, SEMANTIC_SETS_NEW, 'const problemSets')
+    code = patch_once(code, SEMANTIC_PROCESS_OLD, SEMANTIC_PROCESS_NEW, 'MAIN-ANSWER PHRASE')
+    semantic['parameters']['jsCode'] = code
+
+    # Other nodes that embed the same table (Teach-back validator for the
+    # rubric, Update Session for expected sub-answers) are kept in sync
+    for node in workflow['nodes']:
+        code = node['parameters'].get('jsCode', '')
+        if node not in (verifier, semantic) and BLOCK_MARKER in code:
+            node['parameters']['jsCode'] = replace_marked_block(code, BLOCK_MARKER, table_js)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--catalog', default=CATALOG_FILE)
+    parser.add_argument('--force', action='store_true', help='ignore the manifest')
+    parser.add_argument('--no-embed', action='store_true', help='do not touch the workflow')
+    args = parser.parse_args()
+
+    print(f"Reading problem catalog from {args.catalog}...")
+    table_js, stats = generate(args.catalog, force=args.force)
+
+    print(f"  Regenerated: {len(stats['regenerated'])} {stats['regenerated']}")
+    print(f"  Reused:      {len(stats['reused'])}")
+    if stats['removed']:
+        print(f"  Removed:     {stats['removed']}")
+    if stats['skipped']:
+        print(f"  Skipped (unparseable answer): {stats['skipped']}")
+    print(f"  Wrote {OUTPUT_FILE}")
+
+    if args.no_embed:
+        return 0
+
+    workflow = load_workflow()
+    embed(workflow, table_js)
+    save_workflow(workflow)
+    print("✓ Embedded table into Enhanced Numeric Verifier and Semantic Validator")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
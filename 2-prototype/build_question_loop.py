@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Detect repeated tutor questions locally and break scaffolding loops.
+
+PROBLEM:
+The only guard against scaffolding loops - the tutor asking "How many steps
+from -3 to 0?", then "Can you count the steps from -3 to 0?" after the
+student already answered - is the Synthesis Detector LLM. It runs only on
+scaffold_progress turns, costs a second LLM call each time, and often
+answers "continue" on a repeat. A stuck student gets no loop check at all:
+the prompt only says "Read chat history to avoid repeating same question".
+
+SOLUTION:
+Embed functions/question_loop.js into Update Session & Format Response1.
+When it records a scaffolding question it keeps the question's signature in
+`scaffolding.question_signatures` (computed once, reset with the episode)
+and compares it with the earlier ones (token-set Jaccard). A repeat is
+stored as `scaffolding.question_loop`. Next turn Build Response Context1
+(no block - it stays small enough to be copied into the validators) maps
+it to loop_decision:
+  scaffold_progress → synthesize, with the hint built from the step
+                      answers; Route by Category1 sends it straight to
+                      Response: Unified1 (no Synthesis Detector1/LLM1)
+  stuck             → escalate: walk through the step instead of asking
+                      it again
+Response: Unified1 shows the repeated question as a "Loop Check:" line in
+both strategies. Without a repeat nothing changes.
+
+Run after add_expected_sub_answers.py and build_state_machine.py.
+
+    node benchmarks/bench_question_loop.js   # turns and LLM calls per solved problem
+"""
+
+from workflow_utils import (find_node, load_function_source, load_workflow,
+                            replace_marked_block, save_workflow)
+
+LOOP_FILE = 'functions/question_loop.js'
+LOOP_EXPORTS = ['trackQuestionLoop']
+BLOCK_MARKER = 'QUESTION_LOOP (functions/question_loop.js)'
+CONTEXT_NODE = 'Build Response Context1'
+UPDATE_NODE = 'Update Session & Format Response1'
+UPDATE_ANCHOR = '  const responseData = $input.first().json;'
+LOOP_OUTPUT = 'loop_synthesis'
+
+OLD_ASK = """      expected_answers: expectedSubAnswers(lookupProblemValidator(problem), problem, response)
+    };
+"""
+NEW_ASK = """      expected_answers: expectedSubAnswers(lookupProblemValidator(problem), problem, response),
+      // Same question as earlier in this episode? Build Response Context1 acts on it next turn
+      ...trackQuestionLoop(problem.scaffolding, response, session.recent_turns,
+        contextData.student_message || contextData.message, problem)
+    };
+"""
+
+OLD_CONTEXT_STATE = """  const attemptCount = session.current_problem?.attempt_count || 0;
+"""
+NEW_CONTEXT_STATE = """  const attemptCount = session.current_problem?.attempt_count || 0;
+
+  // Repeated scaffolding question, flagged by Update Session when it was asked (functions/question_loop.js)
+  const questionLoop = scaffoldingActive ? (session.current_problem.scaffolding.question_loop || null) : null;
+  const loopDecision = questionLoop ? ({ scaffold_progress: 'synthesize', stuck: 'escalate' }[input.category] || null) : null;
+"""
+
+OLD_CONTEXT_RETURN = """      attempt_count: attemptCount,
+"""
+NEW_CONTEXT_RETURN = """      attempt_count: attemptCount,
+      question_loop: questionLoop,
+      loop_decision: loopDecision,
+      // Forced synthesis skips Synthesis Detector1 (Route by Category1)
+      ...(loopDecision === 'synthesize' ? { synthesis_action: 'synthesize', synthesis_hint: questionLoop.synthesis_hint } : {}),
+"""
+
+PROMPT_PATCHES = [
+    # scaffold_progress strategy
+    ("    ($json.synthesis_hint ? 'Synthesis Hint: ' + $json.synthesis_hint + '\\n' : '') +\n",
+     "    ($json.question_loop ? 'Loop Check: you already asked \"' + $json.question_loop.question + "
+     "'\" - the student answered it, do not ask it again\\n' : '') +\n"),
+    # stuck strategy (the only branch that shows Teach-Back Active)
+    ("    'Teach-Back Active: ' + $json.is_teach_back_active + '\\n' +\n",
+     "    ($json.question_loop ? 'Loop Check: you already asked \"' + $json.question_loop.question + '\" ' + "
+     "($json.question_loop.repeats + 1) + ' times - do not rephrase it again. Walk through that step yourself "
+     "with the problem numbers, then ask the main question\\n' : '') +\n"),
+]
+
+LOOP_RULE = {
+    "conditions": {
+        "options": {
+            "caseSensitive": True,
+            "leftValue": "",
+            "typeValidation": "strict",
+            "version": 1
+        },
+        "conditions": [
+            {
+                "id": "b7d1e0c4-5a2f-4e93-8c16-2f0a9d4b7e58",
+                "leftValue": "={{$json.category}}",
+                "rightValue": "scaffold_progress",
+                "operator": {
+                    "type": "string",
+                    "operation": "equals",
+                    "name": "filter.operator.equals"
+                }
+            },
+            {
+                "id": "4e9a2c71-0d3b-4f58-a6e2-91c5b8d03f2a",
+                "leftValue": "={{ $json.loop_decision || '' }}",
+                "rightValue": "synthesize",
+                "operator": {
+                    "type": "string",
+                    "operation": "equals",
+                    "name": "filter.operator.equals"
+                }
+            }
+        ],
+        "combinator": "and"
+    },
+    "renameOutput": True,
+    "outputKey": LOOP_OUTPUT
+}
+
+
+def patch_once(code, old, new, done_marker, name):
+    if done_marker in code:
+        return code
+    if old not in code:
+        raise ValueError(f'Expected code not found in {name}: {old.strip()[:60]!r}')
+    return code.replace(old, new, 1)
+
+
+def patch_context(workflow):
+    node = find_node(workflow, CONTEXT_NODE)
+    code = node['parameters']['jsCode']
+    code = patch_once(code, OLD_CONTEXT_STATE, NEW_CONTEXT_STATE, '// Repeated scaffolding question', CONTEXT_NODE)
+    code = patch_once(code, OLD_CONTEXT_RETURN, NEW_CONTEXT_RETURN, 'loop_decision: loopDecision', CONTEXT_NODE)
+    node['parameters']['jsCode'] = code
+
+
+def patch_update_session(workflow):
+    node = find_node(workflow, UPDATE_NODE)
+    code = replace_marked_block(node['parameters']['jsCode'], BLOCK_MARKER,
+                                load_function_source(LOOP_FILE, LOOP_EXPORTS), anchor=UPDATE_ANCHOR)
+    code = patch_once(code, OLD_ASK, NEW_ASK, '...trackQuestionLoop(', UPDATE_NODE)
+    node['parameters']['jsCode'] = code
+
+
+def add_loop_route(workflow):
+    """Insert the forced-synthesis rule just before scaffold_progress, wired to Response: Unified1."""
+    router = find_node(workflow, 'Route by Category1')
+    rules = router['parameters']['rules']['values']
+    if any(rule.get('outputKey') == LOOP_OUTPUT for rule in rules):
+        return False
+    index = next(i for i, rule in enumerate(rules) if rule.get('outputKey') == 'scaffold_progress')
+    rules.insert(index, LOOP_RULE)
+
+    outputs = workflow['connections']['Route by Category1']['main']
+    outputs.insert(index, [{"node": 'Response: Unified1', "type": "main", "index": 0}])
+    return True
+
+
+def patch_prompt(workflow):
+    node = find_node(workflow, 'Response: Unified1')
+    message = node['parameters']['messages']['values'][0]
+    content = message['content']
+    for anchor, line in PROMPT_PATCHES:
+        if anchor + line in content:
+            continue
+        if content.count(anchor) != 1:
+            raise ValueError(f'Context line not found once in Response: Unified1 prompt: {anchor.strip()[:50]!r}')
+        content = content.replace(anchor, anchor + line, 1)
+    message['content'] = content
+
+
+def main():
+    workflow = load_workflow()
+
+    patch_update_session(workflow)
+    print(f"✓ {UPDATE_NODE} flags repeated scaffolding questions")
+
+    patch_context(workflow)
+    print(f"✓ {CONTEXT_NODE} sets loop_decision")
+
+    if add_loop_route(workflow):
+        print(f"✓ Added Route by Category1 rule '{LOOP_OUTPUT}' → Response: Unified1")
+    else:
+        print(f"  Route by Category1 rule '{LOOP_OUTPUT}' already present")
+
+    patch_prompt(workflow)
+    print("✓ Response: Unified1 shows the loop check (scaffold_progress, stuck)")
+
+    save_workflow(workflow)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
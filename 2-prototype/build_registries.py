@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+Compile config_registries.js into validated, minified JavaScript for Code nodes.
+
+PROBLEM:
+The workflow builders copied ERROR_DETECTORS and SEMANTIC_PATTERNS into node
+code by slicing config_registries.js between `const X = {` and the next
+comment banner (str.find). Editing a comment moved the cut: the "complete"
+builder already cut SEMANTIC_PATTERNS before its closing brace. Enhanced
+Numeric Verifier carried a hand-made copy plus its own operator → detector
+map, and nothing checked the registries themselves.
+
+SOLUTION:
+Load the registries as what they are - a CommonJS module - through Node and
+compile them:
+  1. Validate
+       errors:   detector is not a function / throws / returns non-numbers,
+                 SUBJECT_CONFIG names a missing detector, a keyword is both
+                 expected and wrong for the same condition, a pattern has no
+                 question phrases or no expected keywords
+       warnings: duplicate keywords in a list, detectors no operation maps
+                 to, question phrases claimed by an earlier group, patterns
+                 every question of which an earlier group catches first
+  2. Emit minified declarations with precomputed tables:
+       ERROR_DETECTORS               key → detector (comments/whitespace stripped,
+                                     checked against the original on sample operands)
+       ERROR_DETECTOR_BY_OPERATION   problem type → operator → detector key
+                                     (SUBJECT_CONFIG.errorDetector evaluated once)
+       SEMANTIC_PATTERNS             as data
+  3. Content-hash every block: a block whose hash is already in the node is
+     not re-embedded, so comment-only registry edits leave the workflow alone.
+  4. Write generated/registries.js and generated/registries.report.json
+     (sizes, hashes, issues).
+
+The verifier resolves a problem type by its longest configured prefix:
+math_arithmetic_subtraction uses the math_arithmetic map. After embedding
+(and with --check) the verifier node runs VERIFIER_CASES - typed and untyped
+problems outside exemplars/questions.json, so the operator detectors decide.
+
+    python3 build_registries.py           # validate, write, embed
+    python3 build_registries.py --check   # validate only; exit 1 on errors
+"""
+
+import argparse
+import hashlib
+import json
+import os
+
+from workflow_utils import (REGISTRY_FILE, find_node, load_workflow,
+                            replace_marked_block, run_node, save_workflow)
+
+OUTPUT_FILE = 'generated/registries.js'
+REPORT_FILE = 'generated/registries.report.json'
+BLOCK_MARKER = 'REGISTRIES (generated by build_registries.py)'
+VERIFIER_NODE = 'Enhanced Numeric Verifier'
+VALIDATORS_MARKER = '// BEGIN PROBLEM_VALIDATORS'
+
+# Operand pairs every detector is run on (validation and minifier check)
+SAMPLE_OPERANDS = [[-3, 5], [7, 2], [0.5, 0.25], [6, 0], [-4, -2]]
+OPERATORS = ['+', '-', '*', '/']
+
+LOAD_SCRIPT = r"""
+const registries = require('./config_registries.js');
+const { samples, operators } = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const run = (fn, [a, b]) => {
+  try {
+    const result = fn(a, b, null);
+    return Array.isArray(result) ? result.map(v => (typeof v === 'number' ? v : String(v))) : { returned: typeof result };
+  } catch (error) {
+    return { throws: error.message };
+  }
+};
+const detectors = {};
+for (const [key, fn] of Object.entries(registries.ERROR_DETECTORS)) {
+  detectors[key] = typeof fn === 'function'
+    ? { source: fn.toString(), results: samples.map(pair => run(fn, pair)) }
+    : { source: null, results: [] };
+}
+const byOperation = {};
+for (const [type, config] of Object.entries(registries.SUBJECT_CONFIG)) {
+  if (typeof config.errorDetector !== 'function') continue;
+  byOperation[type] = {};
+  for (const operator of operators) {
+    const key = config.errorDetector(`1 ${operator} 2`);
+    if (key) byOperation[type][operator] = key;
+  }
+}
+process.stdout.write(JSON.stringify({
+  detectors,
+  by_operation: byOperation,
+  semantic_patterns: registries.SEMANTIC_PATTERNS
+}));
+"""
+
+# Re-evaluate minified detectors; results must match the original ones
+MINIFIED_CHECK_SCRIPT = r"""
+const { sources, samples } = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const results = {};
+for (const [key, source] of Object.entries(sources)) {
+  try {
+    const fn = new Function(`return (${source});`)();
+    results[key] = samples.map(([a, b]) => {
+      try {
+        const result = fn(a, b, null);
+        return Array.isArray(result) ? result.map(v => (typeof v === 'number' ? v : String(v))) : { returned: typeof result };
+      } catch (error) {
+        return { throws: error.message };
+      }
+    });
+  } catch (error) {
+    results[key] = { syntax: error.message };
+  }
+}
+process.stdout.write(JSON.stringify(results));
+"""
+
+
+# ============================================================================
+# Minifier (enough for registry functions: no regex literals)
+# ============================================================================
+
+def _word(char):
+    return char.isalnum() or char in '_$'
+
+
+def minify_js(source):
+    """Strip comments and whitespace outside string literals."""
+    out = []
+    i = 0
+    pending_space = False
+    while i < len(source):
+        char = source[i]
+        if char in '"\'`':
+            j = i + 1
+            while j < len(source) and source[j] != char:
+                j += 2 if source[j] == '\\' else 1
+            token = source[i:j + 1]
+            i = j + 1
+        elif source.startswith('//', i):
+            end = source.find('\n', i)
+            i = len(source) if end == -1 else end
+            pending_space = True
+            continue
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            i = len(source) if end == -1 else end + 2
+            pending_space = True
+            continue
+        elif char.isspace():
+            pending_space = True
+            i += 1
+            continue
+        else:
+            token = char
+            i += 1
+        if pending_space and out:
+            previous = out[-1][-1]
+            # `a b` keeps its space, and so do `a - -b` / `a + +b`
+            if (_word(previous) and _word(token[0])) or (previous in '+-' and token[0] == previous):
+                out.append(' ')
+        pending_space = False
+        out.append(token)
+    return ''.join(out)
+
+
+# ============================================================================
+# Validation
+# ============================================================================
+
+def issue(issues, level, registry, key, message):
+    issues.append({'level': level, 'registry': registry, 'key': key, 'message': message})
+
+
+def keyword_sets(keywords):
+    """expectedKeywords/wrongKeywords → {condition: [keywords]} ('*' for plain lists)."""
+    if isinstance(keywords, list):
+        return {'*': keywords}
+    return keywords or {}
+
+
+def validate_detectors(data, issues):
+    for key, detector in data['detectors'].items():
+        if detector['source'] is None:
+            issue(issues, 'error', 'ERROR_DETECTORS', key, 'not a function')
+            continue
+        for pair, result in zip(SAMPLE_OPERANDS, detector['results']):
+            if isinstance(result, dict):
+                reason = f"throws {result['throws']!r}" if 'throws' in result else f"returns {result['returned']}"
+                issue(issues, 'error', 'ERROR_DETECTORS', key, f'{reason} for {pair}')
+            elif any(isinstance(value, str) for value in result):
+                issue(issues, 'error', 'ERROR_DETECTORS', key, f'returns non-numbers for {pair}')
+
+    mapped = set()
+    for problem_type, operators in data['by_operation'].items():
+        for operator, key in operators.items():
+            if key not in data['detectors']:
+                issue(issues, 'error', 'SUBJECT_CONFIG', problem_type,
+                      f'errorDetector maps {operator!r} to missing detector {key!r}')
+            mapped.add(key)
+    for key in data['detectors']:
+        if key not in mapped:
+            issue(issues, 'warning', 'ERROR_DETECTORS', key, 'no operation maps to this detector (unreachable)')
+
+
+def validate_patterns(patterns, issues):
+    earlier_phrases = []   # (phrase, group) in validator order
+    for group, config in patterns.items():
+        for index, pattern in enumerate(config.get('patterns', [])):
+            key = f'{group}[{index}]'
+            questions = [q.lower() for q in pattern.get('questionPatterns') or []]
+            expected = keyword_sets(pattern.get('expectedKeywords'))
+            wrong = keyword_sets(pattern.get('wrongKeywords'))
+
+            if not questions:
+                issue(issues, 'error', 'SEMANTIC_PATTERNS', key, 'no questionPatterns (never triggers)')
+            if not any(expected.values()):
+                issue(issues, 'error', 'SEMANTIC_PATTERNS', key, 'no expectedKeywords')
+
+            for label, sets in (('expectedKeywords', expected), ('wrongKeywords', wrong)):
+                for condition, keywords in sets.items():
+                    lowered = [k.lower() for k in keywords]
+                    duplicates = sorted({k for k in lowered if lowered.count(k) > 1})
+                    if duplicates:
+                        issue(issues, 'warning', 'SEMANTIC_PATTERNS', key,
+                              f'duplicate {label}[{condition!r}]: {", ".join(duplicates)}')
+
+            for condition, keywords in expected.items():
+                conflicts = sorted({k.lower() for k in keywords} & {k.lower() for k in wrong.get(condition, [])})
+                if conflicts:
+                    issue(issues, 'error', 'SEMANTIC_PATTERNS', key,
+                          f'expected and wrong for {condition!r}: {", ".join(conflicts)}')
+
+            # The validator judges the first triggered group only: a question
+            # containing an earlier group's phrase never reaches this one
+            shadowed = {}
+            for question in questions:
+                owner = next((g for phrase, g in earlier_phrases if g != group and phrase in question), None)
+                if owner:
+                    shadowed[question] = owner
+            for question, owner in shadowed.items():
+                issue(issues, 'warning', 'SEMANTIC_PATTERNS', key, f'question {question!r} is caught by {owner} first')
+            if questions and len(shadowed) == len(questions):
+                issue(issues, 'warning', 'SEMANTIC_PATTERNS', key, 'unreachable: every question phrase is caught earlier')
+
+            earlier_phrases.extend((question, group) for question in questions)
+
+
+# ============================================================================
+# Compilation
+# ============================================================================
+
+def js_object(entries):
+    return '{' + ','.join(f'{json.dumps(key)}:{value}' for key, value in entries) + '}'
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def compile_registries():
+    """Load, validate and compile. Returns {declarations, issues, hash, source_bytes}."""
+    data = run_node(LOAD_SCRIPT, {'samples': SAMPLE_OPERANDS, 'operators': OPERATORS})
+    issues = []
+    validate_detectors(data, issues)
+    validate_patterns(data['semantic_patterns'], issues)
+
+    minified = {key: minify_js(d['source']) for key, d in data['detectors'].items() if d['source']}
+    checked = run_node(MINIFIED_CHECK_SCRIPT, {'sources': minified, 'samples': SAMPLE_OPERANDS})
+    for key, results in checked.items():
+        if results != data['detectors'][key]['results']:
+            issue(issues, 'error', 'ERROR_DETECTORS', key, 'minified detector behaves differently from the source')
+
+    declarations = {
+        'ERROR_DETECTORS': f'const ERROR_DETECTORS={js_object(minified.items())};',
+        'ERROR_DETECTOR_BY_OPERATION': 'const ERROR_DETECTOR_BY_OPERATION='
+                                       f"{json.dumps(data['by_operation'], separators=(',', ':'))};",
+        'SEMANTIC_PATTERNS': 'const SEMANTIC_PATTERNS='
+                             f"{json.dumps(data['semantic_patterns'], separators=(',', ':'), ensure_ascii=False)};",
+    }
+    with open(REGISTRY_FILE, 'r') as f:
+        source_bytes = len(f.read().encode('utf-8'))
+    return {
+        'declarations': declarations,
+        'issues': issues,
+        'hash': content_hash('\n'.join(declarations.values())),
+        'source_bytes': source_bytes,
+    }
+
+
+def registry_block(compiled, names):
+    """Declarations for one node, headed by their content hash."""
+    body = '\n'.join(compiled['declarations'][name] for name in names)
+    return f'// {"+".join(names)} sha256:{content_hash(body)} - from config_registries.js, do not edit\n{body}'
+
+
+def render_module(compiled):
+    names = list(compiled['declarations'])
+    return ('// Generated from config_registries.js by build_registries.py - do not edit by hand\n'
+            f'// sha256:{compiled["hash"]}\n'
+            + '\n'.join(compiled['declarations'].values())
+            + f"\n\nif (typeof module !== 'undefined' && module.exports) {{\n"
+              f"  module.exports = {{ {', '.join(names)} }};\n}}\n")
+
+
+def render_report(compiled):
+    declarations = compiled['declarations']
+    return {
+        'hash': compiled['hash'],
+        'source_bytes': compiled['source_bytes'],
+        'compiled_bytes': sum(len(d.encode('utf-8')) for d in declarations.values()),
+        'declarations': {name: len(d.encode('utf-8')) for name, d in declarations.items()},
+        'errors': [i for i in compiled['issues'] if i['level'] == 'error'],
+        'warnings': [i for i in compiled['issues'] if i['level'] == 'warning'],
+    }
+
+
+# ============================================================================
+# Embedding
+# ============================================================================
+
+VERIFIER_NAMES = ['ERROR_DETECTORS', 'ERROR_DETECTOR_BY_OPERATION']
+EMBEDDED_DETECTORS_START = '  // Embedded configuration\n  const ERROR_DETECTORS = {'
+
+OLD_OPERATION_MAP = """    const operationMap = {
+      '+': 'math_arithmetic_addition',
+      '-': 'math_arithmetic_subtraction',
+      '*': 'math_arithmetic_multiplication',
+      '/': 'math_arithmetic_division'
+    };
+
+    const detectorKey = operationMap[operation];"""
+# Earlier builds looked the type up exactly: math_arithmetic_subtraction found no map
+EXACT_OPERATION_MAP = """    // Detector for this operator (SUBJECT_CONFIG evaluated by build_registries.py)
+    const detectorKey = (ERROR_DETECTOR_BY_OPERATION[input.current_problem.type || 'math_arithmetic'] || {})[operation];"""
+NEW_OPERATION_MAP = """    // Detector for this operator (SUBJECT_CONFIG evaluated by build_registries.py);
+    // a subtype (math_arithmetic_subtraction) uses the longest configured prefix
+    let problemType = input.current_problem.type || 'math_arithmetic';
+    while (!ERROR_DETECTOR_BY_OPERATION[problemType] && problemType.includes('_')) {
+      problemType = problemType.slice(0, problemType.lastIndexOf('_'));
+    }
+    const detectorKey = (ERROR_DETECTOR_BY_OPERATION[problemType] || {})[operation];"""
+
+# (text, correct_answer, type, student value, expected category) - not in exemplars/questions.json,
+# so the per-problem table does not answer first
+VERIFIER_CASES = [
+    ('What is 10 - 15?', '-5', 'math_arithmetic_subtraction', 25, 'wrong_operation'),
+    ('What is 7 * 3?', '21', 'math_arithmetic_multiplication', 10, 'wrong_operation'),
+    ('What is 12 / 4?', '3', 'math_arithmetic_division', 48, 'wrong_operation'),
+    ('What is -6 + 9?', '3', 'math_arithmetic_addition', 15, 'wrong_operation'),
+    ('What is 10 - 15?', '-5', None, 25, 'wrong_operation'),
+    ('What is 10 - 15?', '-5', 'math_arithmetic', 25, 'wrong_operation'),
+    ('What is 7 * 3?', '21', 'math_arithmetic_multiplication', 4, 'stuck'),
+    ('What is 7 * 3?', '21', 'geometry_area', 10, 'stuck'),
+]
+
+VERIFIER_CHECK_SCRIPT = r"""
+const { code, cases } = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const AsyncFunction = Object.getPrototypeOf(async function () {}).constructor;
+const node = new AsyncFunction('$input', code);
+(async () => {
+  const results = [];
+  for (const [text, correct_answer, type, numeric_value] of cases) {
+    const current_problem = type ? { text, correct_answer, type } : { text, correct_answer };
+    const item = { message_type: 'answer_attempt', numeric_value, current_problem };
+    const output = await node({ first: () => ({ json: item }) });
+    results.push(output.json.category);
+  }
+  process.stdout.write(JSON.stringify(results));
+})();
+"""
+
+
+def embed(workflow, compiled):
+    """Embed the verifier's block. Returns False when the same hash is already there."""
+    node = find_node(workflow, VERIFIER_NODE)
+    code = node['parameters']['jsCode']
+    block = registry_block(compiled, VERIFIER_NAMES)
+    if EXACT_OPERATION_MAP in code:
+        code = code.replace(EXACT_OPERATION_MAP, NEW_OPERATION_MAP, 1)
+    elif block.split('\n', 1)[0] in code:
+        return False
+
+    # One-time: the hand-copied registry is replaced by the compiled block
+    start = code.find(EMBEDDED_DETECTORS_START)
+    if start != -1:
+        stop = code.find(VALIDATORS_MARKER, start)
+        if stop == -1:
+            raise ValueError('Run build_problem_validators.py first')
+        code = code[:start] + code[stop:]
+    if OLD_OPERATION_MAP in code:
+        code = code.replace(OLD_OPERATION_MAP, NEW_OPERATION_MAP, 1)
+    elif 'ERROR_DETECTOR_BY_OPERATION[' not in code:
+        raise ValueError(f'Operator map not found in {VERIFIER_NODE}')
+
+    node['parameters']['jsCode'] = replace_marked_block(code, BLOCK_MARKER, block, anchor=VALIDATORS_MARKER)
+    return True
+
+
+def registry_declarations(names):
+    """Compiled declarations for builders that generate node code. Raises on validation errors."""
+    compiled = compile_registries()
+    errors = [i for i in compiled['issues'] if i['level'] == 'error']
+    if errors:
+        raise ValueError(f"config_registries.js does not validate: {errors[0]['key']}: {errors[0]['message']}")
+    return registry_block(compiled, names)
+
+
+def print_report(report):
+    print(f"Registries: {report['source_bytes'] / 1024:.1f} KB source → "
+          f"{report['compiled_bytes'] / 1024:.1f} KB compiled (sha256:{report['hash']})")
+    for name, size in report['declarations'].items():
+        print(f"  {name:<28} {size:>6} bytes")
+    for level, entries in (('✗', report['errors']), ('!', report['warnings'])):
+        for entry in entries:
+            print(f"  {level} {entry['registry']} {entry['key']}: {entry['message']}")
+    print(f"  {len(report['errors'])} errors, {len(report['warnings'])} warnings")
+
+
+def check_verifier(workflow):
+    """Run VERIFIER_CASES through the verifier node. Returns True when all categories match."""
+    code = find_node(workflow, VERIFIER_NODE)['parameters']['jsCode']
+    categories = run_node(VERIFIER_CHECK_SCRIPT, {'code': code, 'cases': VERIFIER_CASES})
+    wrong = [(case, got) for case, got in zip(VERIFIER_CASES, categories) if got != case[4]]
+    for (text, _, problem_type, value, expected), got in wrong:
+        print(f"  ✗ {text} ({problem_type or 'no type'}) → {value}: {got}, expected {expected}")
+    if wrong:
+        print(f"✗ {VERIFIER_NODE}: {len(wrong)}/{len(VERIFIER_CASES)} cases wrong")
+    else:
+        print(f"✓ {VERIFIER_NODE}: {len(VERIFIER_CASES)} typed/untyped cases categorized as expected")
+    return not wrong
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--check', action='store_true', help='validate only, write nothing')
+    args = parser.parse_args()
+
+    compiled = compile_registries()
+    errors = [i for i in compiled['issues'] if i['level'] == 'error']
+
+    if args.check or errors:
+        print_report(render_report(compiled))
+        if errors:
+            print("✗ Registries do not validate - nothing written")
+            return 1
+        return 0 if check_verifier(load_workflow()) else 1
+
+    workflow = load_workflow()
+    embedded = embed(workflow, compiled)
+    report = render_report(compiled)
+    print_report(report)
+
+    os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
+    with open(OUTPUT_FILE, 'w') as f:
+        f.write(render_module(compiled))
+    with open(REPORT_FILE, 'w') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+    print(f"✓ Wrote {OUTPUT_FILE} and {REPORT_FILE}")
+
+    if embedded:
+        save_workflow(workflow)
+        print(f"✓ Embedded into {VERIFIER_NODE}")
+    else:
+        print(f"  {VERIFIER_NODE} already has this registry (hash unchanged)")
+    return 0 if check_verifier(workflow) else 1
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Publish registry versions to Redis; preloaded workers pick them up per turn.
+
+PROBLEM:
+A new misconception detector or semantic pattern meant editing
+config_registries.js, rerunning the build scripts and re-importing the
+workflow - the registries, and the tables compiled from them (problem
+validators, semantic matcher, typo dictionary), only existed as blocks
+embedded in node code.
+
+SOLUTION:
+A registry document holds those compiled blocks, versioned by content:
+
+    tutor_registries:<version>   {"version", "blocks": {marker: js}, "nodes": {node: code hash}}
+    tutor_registries:current     "<version>"
+
+In the preloaded deployment copy (optimize_workflow.py --preload) the
+version comes with the session fetch: the saved session keeps the version
+it last read and when (`registry_version`, `registry_checked_at`). The n8n
+Redis node has no MGET, so `current` is read by a second GET only when that
+check is due - a new session, or one checked more than REGISTRY_RECHECK_MS
+ago - not on every turn:
+
+    Redis: Get Session1 → Registry Check Due1 ─(due)→ Redis: Get Registry Version1 ─┐
+                                              └──────────────────────────────────────┴→ Load Session1
+      → Registries Cached1 ─(this worker has not compiled it)→ Redis: Get Registries1 ─┐
+                          └───────────────────────────────────────────────────────────┴→ Content Feature Extractor
+
+Load Session1 picks the version - `registry_version` in the request body
+pins one, otherwise the pointer just read, otherwise the session's - and
+the document is only fetched when the worker's tutor-runtime has not
+compiled that version yet. A new `current` reaches new sessions at once and
+running ones within REGISTRY_RECHECK_MS. Nodes then get
+their tables from require('tutor-runtime').unit(node, hash, version, document),
+which rebuilds each unit once per version and keeps the last few in memory.
+No pointer in Redis means the tables built into the module.
+
+A document pins the node code it was compiled for (hash of the non-registry
+blocks): publishing tables that need new node code fails instead of
+mixing versions. That needs a redeploy, as before.
+
+    # after editing config_registries.js and running its build scripts:
+    python3 build_registry_store.py                           # write generated/registry-document.json
+    python3 build_registry_store.py --redis-url redis://...   # ... and publish it (pip install redis)
+    python3 build_registry_store.py --redis-url redis://... --activate <version>   # roll back
+"""
+
+import argparse
+import copy
+import json
+import os
+import uuid
+
+from build_runtime_module import MODULE_DIR, MODULE_NAME, REGISTRY_MARKERS, content_hash, node_units
+from workflow_utils import find_node, load_workflow, run_node
+
+KEY_PREFIX = 'tutor_registries:'
+CURRENT_KEY = KEY_PREFIX + 'current'
+DOCUMENT_FILE = 'generated/registry-document.json'
+
+SESSION_NODE = 'Redis: Get Session1'
+LOAD_NODE = 'Load Session1'
+EXTRACTOR_NODE = 'Content Feature Extractor'
+DUE_NODE = 'Registry Check Due1'
+VERSION_NODE = 'Redis: Get Registry Version1'
+CACHED_NODE = 'Registries Cached1'
+FETCH_NODE = 'Redis: Get Registries1'
+
+# How long a session trusts the version it last read before reading current again
+REGISTRY_RECHECK_MS = 60000
+
+# Added to build_field_projection.NODE_CONTRACTS for the preloaded copy
+REGISTRY_STORE_CONTRACTS = {
+    'Load Session1': {
+        'reads': {
+            'Normalize input1': ['session_id', 'student_id', 'message', 'current_problem', '_original_payload'],
+            'Redis: Get Session1': ['value', 'propertyName'],
+            VERSION_NODE: ['registry_version'],
+        },
+        'passes': ['Normalize input1'],
+    },
+    DUE_NODE: {'reads': {'$input': ['value', 'propertyName'], 'Normalize input1': ['_original_payload']},
+               'passes': ['$input']},
+    VERSION_NODE: {'reads': {}, 'passes': ['$input']},
+    CACHED_NODE: {'reads': {'$input': ['registries']}, 'passes': ['$input']},
+    FETCH_NODE: {'reads': {'$input': ['registries']}, 'passes': ['$input']},
+}
+
+LOAD_ANCHOR = """// Add start time for latency tracking
+"""
+LOAD_SELECTION = """// Registry store (build_registry_store.py): pinned by the request, else current when
+// Registry Check Due1 read it (saved with the session), else the session's version;
+// fetched only when this worker has not compiled that version yet
+if ($('Redis: Get Registry Version1').isExecuted) {
+  session.registry_version = $('Redis: Get Registry Version1').first().json.registry_version || null;
+  session.registry_checked_at = Date.now();
+}
+const registryVersion = (normalizedInput._original_payload || {}).registry_version
+  || session.registry_version || null;
+const registries = {
+  version: registryVersion,
+  fetch: registryVersion && !require('tutor-runtime').hasRegistries(registryVersion)
+    ? `tutor_registries:${registryVersion}` : null
+};
+
+"""
+LOAD_RETURN_OLD = """    _session_rejected: sessionRejected,
+"""
+LOAD_RETURN_NEW = """    _session_rejected: sessionRejected,
+    registries: registries,
+"""
+
+UNIT_LOADER = "require('tutor-runtime').unit({name}, '{hash}');"
+REGISTRY_LOADER = """// Registry store (build_registry_store.py): tables of the version Load Session1 selected
+const __registries = $('Load Session1').first().json.registries;
+const __registryDocument = $('Redis: Get Registries1').isExecuted
+  ? $('Redis: Get Registries1').first().json.registry_document : null;
+"""
+REGISTRY_UNIT = ("require('tutor-runtime').unit({name}, '{hash}', "
+                 "__registries.version, __registryDocument);")
+
+DUE_RULE = {
+    "conditions": {
+        "options": {"caseSensitive": True, "leftValue": "", "typeValidation": "strict", "version": 1},
+        "conditions": [{
+            # Regex on the raw session JSON: Load Session1 parses it right after
+            "leftValue": """={{ (() => {
+  if (($('Normalize input1').first().json._original_payload || {}).registry_version) return '';
+  const checked = /"registry_checked_at":(\\d+)/.exec(String($json.value || $json.propertyName || ''));
+  return checked && Date.now() - Number(checked[1]) < __RECHECK_MS__ ? '' : 'due';
+})() }}""".replace('__RECHECK_MS__', str(REGISTRY_RECHECK_MS)),
+            "rightValue": "",
+            "operator": {"type": "string", "operation": "notEmpty", "singleValue": True},
+            "id": "9b1d7e52-6c0a-4f3e-8d21-5a7c2e4b9f03"
+        }],
+        "combinator": "and"
+    },
+    "renameOutput": True,
+    "outputKey": "due"
+}
+
+CACHED_RULE = {
+    "conditions": {
+        "options": {"caseSensitive": True, "leftValue": "", "typeValidation": "strict", "version": 1},
+        "conditions": [{
+            "leftValue": "={{ $json.registries.fetch }}",
+            "rightValue": "",
+            "operator": {"type": "string", "operation": "notEmpty", "singleValue": True},
+            "id": "4f0f3c43-3a55-4d8e-9a4f-1f7f6c1d2b10"
+        }],
+        "combinator": "and"
+    },
+    "renameOutput": True,
+    "outputKey": "fetch"
+}
+
+CHECK_SCRIPT = r"""
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const runtime = require(input.path);
+const text = JSON.stringify(input.document);
+const exported = {};
+for (const [name, entry] of Object.entries(runtime.UNITS)) {
+  try {
+    exported[name] = Object.keys(runtime.unit(name, entry.hash, input.document.version, text));
+  } catch (error) {
+    exported[name] = { error: error.message };
+  }
+}
+process.stdout.write(JSON.stringify(exported));
+"""
+
+
+# ============================================================================
+# Registry documents
+# ============================================================================
+
+def registry_document(workflow):
+    """Versioned document of the registry blocks embedded in the workflow."""
+    blocks, nodes = {}, {}
+    for name, unit in node_units(workflow).items():
+        registry_blocks = [(marker, body) for marker, body in unit['blocks'] if marker in REGISTRY_MARKERS]
+        if not registry_blocks:
+            continue
+        for marker, body in registry_blocks:
+            if blocks.setdefault(marker, body) != body:
+                raise ValueError(f'{marker} differs between nodes - rerun its build script')
+        nodes[name] = unit['code_hash']
+    version = content_hash(json.dumps([blocks, nodes], sort_keys=True))
+    return {'version': version, 'blocks': blocks, 'nodes': nodes}
+
+
+def check_document(document):
+    """Compile the document with the built module: every unit must export its declarations."""
+    path = os.path.abspath(os.path.join(MODULE_DIR, 'index.js'))
+    if not os.path.exists(path):
+        raise ValueError(f'{path} not found - run python3 optimize_workflow.py --preload first')
+    exported = run_node(CHECK_SCRIPT, {'path': path, 'document': document})
+    errors = {}
+    for name, names in exported.items():
+        if isinstance(names, dict):
+            errors[name] = names['error']
+        elif name in document['nodes'] and len(names) == 0:
+            errors[name] = 'unit exports nothing'
+    return errors
+
+
+def publish(document, redis_url, activate=None):
+    try:
+        import redis
+    except ImportError:
+        raise SystemExit('✗ --redis-url needs the redis package: pip install redis')
+    client = redis.Redis.from_url(redis_url)
+    if activate:
+        if not client.exists(KEY_PREFIX + activate):
+            raise SystemExit(f'✗ {KEY_PREFIX}{activate} is not published')
+        client.set(CURRENT_KEY, activate)
+        return activate
+    # Document first: a worker that sees the new pointer must find it
+    client.set(KEY_PREFIX + document['version'], json.dumps(document, separators=(',', ':')))
+    client.set(CURRENT_KEY, document['version'])
+    return document['version']
+
+
+# ============================================================================
+# Wiring (preloaded deployment copy)
+# ============================================================================
+
+def patch_once(code, old, new, done_marker, name):
+    if done_marker in code:
+        return code
+    if old not in code:
+        raise ValueError(f'Expected code not found in {name}: {old.strip()[:60]!r}')
+    return code.replace(old, new, 1)
+
+
+def node_id(name):
+    # Stable across builds: the generated copy only changes when its content does
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f'tutor-workflow/{name}'))
+
+
+def redis_get(template, name, key, property_name, position, notes):
+    return {
+        "parameters": {"operation": "get", "propertyName": property_name, "key": key, "options": {}},
+        "id": node_id(name),
+        "name": name,
+        "type": "n8n-nodes-base.redis",
+        "typeVersion": template['typeVersion'],
+        "position": position,
+        "credentials": copy.deepcopy(template.get('credentials', {})),
+        "notes": notes
+    }
+
+
+def connect(workflow, source, targets):
+    workflow['connections'][source] = {
+        "main": [[{"node": target, "type": "main", "index": 0}] for target in targets]
+    }
+
+
+def wire_registry_store(workflow, units):
+    """Add the version check and document fetch; nodes load the selected version. Edits in place."""
+    session = find_node(workflow, SESSION_NODE)
+    load = find_node(workflow, LOAD_NODE)
+    x, y = session['position']
+    workflow['nodes'].append({
+        "parameters": {"rules": {"values": [copy.deepcopy(DUE_RULE)]}, "options": {"fallbackOutput": "extra"}},
+        "id": node_id(DUE_NODE),
+        "name": DUE_NODE,
+        "type": "n8n-nodes-base.switch",
+        "typeVersion": 3,
+        "position": [x + 100, y + 200],
+        "notes": f"Read the registry pointer only for new sessions or every {REGISTRY_RECHECK_MS // 1000} s"
+    })
+    workflow['nodes'].append(redis_get(
+        session, VERSION_NODE, f"={CURRENT_KEY}", 'registry_version', [x + 200, y + 400],
+        'Current registry version (build_registry_store.py) - when Registry Check Due1 says so'))
+    workflow['nodes'].append({
+        "parameters": {"rules": {"values": [copy.deepcopy(CACHED_RULE)]}, "options": {"fallbackOutput": "extra"}},
+        "id": node_id(CACHED_NODE),
+        "name": CACHED_NODE,
+        "type": "n8n-nodes-base.switch",
+        "typeVersion": 3,
+        "position": [load['position'][0] + 100, load['position'][1] + 200],
+        "notes": "Fetch the registry document only when this worker has not compiled the version"
+    })
+    workflow['nodes'].append(redis_get(
+        session, FETCH_NODE, '={{ $json.registries.fetch }}', 'registry_document',
+        [load['position'][0] + 200, load['position'][1] + 400], 'Registry document (build_registry_store.py)'))
+    connect(workflow, SESSION_NODE, [DUE_NODE])
+    connect(workflow, DUE_NODE, [VERSION_NODE, LOAD_NODE])
+    connect(workflow, VERSION_NODE, [LOAD_NODE])
+    connect(workflow, LOAD_NODE, [CACHED_NODE])
+    connect(workflow, CACHED_NODE, [FETCH_NODE, EXTRACTOR_NODE])
+    connect(workflow, FETCH_NODE, [EXTRACTOR_NODE])
+
+    code = load['parameters']['jsCode']
+    code = patch_once(code, LOAD_ANCHOR, LOAD_SELECTION + LOAD_ANCHOR, 'const registryVersion =', LOAD_NODE)
+    load['parameters']['jsCode'] = patch_once(code, LOAD_RETURN_OLD, LOAD_RETURN_NEW,
+                                              'registries: registries,', LOAD_NODE)
+
+    rewired = []
+    for name, unit in units.items():
+        if not any(marker in REGISTRY_MARKERS for marker, _ in unit['blocks']):
+            continue
+        node = find_node(workflow, name)
+        loader = UNIT_LOADER.format(name=json.dumps(name), hash=unit['hash'])
+        code = node['parameters']['jsCode']
+        if loader not in code:
+            raise ValueError(f'{name}: {MODULE_NAME} loader not found - hoist_blocks() first')
+        node['parameters']['jsCode'] = REGISTRY_LOADER + code.replace(
+            loader, REGISTRY_UNIT.format(name=json.dumps(name), hash=unit['hash']), 1)
+        rewired.append(name)
+    return rewired
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--redis-url', help='publish to this Redis (redis://[:password@]host:port/db)')
+    parser.add_argument('--activate', metavar='VERSION', help='point current at a published version')
+    args = parser.parse_args()
+
+    if args.activate:
+        if not args.redis_url:
+            parser.error('--activate needs --redis-url')
+        print(f"✓ {CURRENT_KEY} → {publish(None, args.redis_url, args.activate)}")
+        return 0
+
+    document = registry_document(load_workflow())
+    size = len(json.dumps(document, separators=(',', ':')).encode('utf-8'))
+    print(f"Registry version {document['version']} ({size / 1024:.1f} KB)")
+    for marker in document['blocks']:
+        print(f"  {marker}")
+    for name, code_hash in document['nodes'].items():
+        print(f"  for {name} (code {code_hash})")
+
+    errors = check_document(document)
+    if errors:
+        for name, error in errors.items():
+            print(f"✗ {name}: {error}")
+        return 1
+    print(f"✓ Compiles with {MODULE_DIR}/ for {len(document['nodes'])} nodes")
+
+    with open(DOCUMENT_FILE, 'w') as f:
+        json.dump(document, f, indent=2)
+        f.write('\n')
+    print(f"✓ Wrote {DOCUMENT_FILE}")
+
+    if args.redis_url:
+        print(f"✓ Published {KEY_PREFIX}{publish(document, args.redis_url)} and {CURRENT_KEY}")
+    else:
+        print(f"  Not published (--redis-url). With redis-cli:\n"
+              f"    redis-cli -x SET {KEY_PREFIX}{document['version']} < {DOCUMENT_FILE}\n"
+              f"    redis-cli SET {CURRENT_KEY} {document['version']}")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Answer the webhook with an explicit response contract instead of `{{ $json }}`.
+
+PROBLEM:
+"Webhook Response1" responded with `{{ $json }}` - the item Redis: Save
+Session1 passes through: `output`, `_session_id` and `_session_for_redis`,
+i.e. the full session with up to 15 turns of transcript. Every turn sent
+the client ~3 KB it never reads and exposed session internals. The Webhook
+node also puts the POST body under `body`, which Normalize input1 did not
+look in, so webhook callers fell through to the "unknown source" defaults.
+
+SOLUTION:
+functions/response_contract.js, embedded where the data is:
+  - Normalize input1: reads the webhook body, records response options
+    (body.include_timing)
+  - Update Session & Format Response1: bumps session.version and builds
+    `response_body` = {response, metadata: {category, attempt_count,
+    session_version, latency_ms?}}
+  - Webhook Response1: responds with `{{ $json.response_body }}`
+
+No compression: bodies are ~200 bytes. Earlier builds added an Encode
+Response1 Code node that gzipped bodies of 1 KB or more - none ever were,
+yet every turn paid for the binary encoding; this script removes it.
+"""
+
+from workflow_utils import (find_node, load_function_source, load_workflow,
+                            replace_marked_block, save_workflow)
+
+CONTRACT_FILE = 'functions/response_contract.js'
+# Each node embeds only the part of the contract it calls
+CONTRACT_EXPORTS = {
+    'Normalize input1': ['responseOptions'],
+    'Update Session & Format Response1': ['buildResponseBody'],
+}
+BLOCK_MARKER = 'RESPONSE_CONTRACT (functions/response_contract.js)'
+NORMALIZE_NODE = 'Normalize input1'
+UPDATE_NODE = 'Update Session & Format Response1'
+SAVE_NODE = 'Redis: Save Session1'
+# Removed: gzip encoding node of earlier builds
+ENCODE_NODE = 'Encode Response1'
+RESPOND_NODE = 'Webhook Response1'
+
+NORMALIZE_ANCHOR = '  // Detect source type'
+UPDATE_ANCHOR = '  const responseData = $input.first().json;'
+
+OLD_INPUT = """  const inputData = $input.item.json;
+"""
+NEW_INPUT = """  // Webhook Trigger puts the POST body under `body` (headers/params/query alongside)
+  const triggerData = $input.item.json;
+  const inputData = triggerData.body && triggerData.headers ? triggerData.body : triggerData;
+"""
+
+OLD_NORMALIZE_RETURN = """  return {
+    json: normalizedData
+  };"""
+NEW_NORMALIZE_RETURN = """  // What the client asked the response to include (timing)
+  normalizedData.response_options = responseOptions(inputData);
+
+  return {
+    json: normalizedData
+  };"""
+
+OLD_VERSION = """  session.stats.total_turns++;
+"""
+NEW_VERSION = """  session.stats.total_turns++;
+  // Bumped on every save - clients can tell a stale session from the response
+  session.version = (session.version || 0) + 1;
+"""
+
+OLD_UPDATE_RETURN = """      _session_for_redis: session
+    }"""
+NEW_UPDATE_RETURN = """      _session_for_redis: session,
+      // Webhook response contract - the only part of the turn the client gets
+      response_body: buildResponseBody(response, category, session,
+        contextData.response_options, contextData._start_time),
+      response_options: contextData.response_options
+    }"""
+
+# Gzip-era lines of earlier builds → current ones
+GZIP_ERA_LINES = [
+    ("  const requestHeaders = triggerData.headers || {};\n", ""),
+    ("responseOptions(inputData, requestHeaders)", "responseOptions(inputData)"),
+    ("// What the client asked the response to include (timing, gzip)",
+     "// What the client asked the response to include (timing)"),
+]
+
+RESPOND_PARAMETERS = {
+    "respondWith": "json",
+    "responseBody": "={{ $json.response_body }}",
+    "options": {}
+}
+
+
+def patch_once(code, old, new, done_marker, name):
+    if done_marker in code:
+        return code
+    if old not in code:
+        raise ValueError(f'Expected code not found in {name}: {old.strip()[:60]!r}')
+    return code.replace(old, new, 1)
+
+
+def patch_normalize(workflow):
+    node = find_node(workflow, NORMALIZE_NODE)
+    code = node['parameters']['jsCode']
+    for old, new in GZIP_ERA_LINES:
+        code = code.replace(old, new)
+    code = patch_once(code, OLD_INPUT, NEW_INPUT, 'const triggerData = $input.item.json;', NORMALIZE_NODE)
+    code = patch_once(code, OLD_NORMALIZE_RETURN, NEW_NORMALIZE_RETURN,
+                      '// What the client asked the response to include', NORMALIZE_NODE)
+    contract_js = load_function_source(CONTRACT_FILE, CONTRACT_EXPORTS[NORMALIZE_NODE])
+    node['parameters']['jsCode'] = replace_marked_block(code, BLOCK_MARKER, contract_js, anchor=NORMALIZE_ANCHOR)
+
+
+def patch_update_session(workflow):
+    node = find_node(workflow, UPDATE_NODE)
+    code = node['parameters']['jsCode']
+    code = patch_once(code, OLD_VERSION, NEW_VERSION, 'session.version = (session.version || 0) + 1;', UPDATE_NODE)
+    code = patch_once(code, OLD_UPDATE_RETURN, NEW_UPDATE_RETURN, '// Webhook response contract', UPDATE_NODE)
+    contract_js = load_function_source(CONTRACT_FILE, CONTRACT_EXPORTS[UPDATE_NODE])
+    node['parameters']['jsCode'] = replace_marked_block(code, BLOCK_MARKER, contract_js, anchor=UPDATE_ANCHOR)
+
+
+def remove_encode_node(workflow):
+    """One-time: drop Encode Response1, Redis: Save Session1 feeds Webhook Response1 again."""
+    node = find_node(workflow, ENCODE_NODE)
+    if not node:
+        return False
+    workflow['nodes'].remove(node)
+    workflow['connections'].pop(ENCODE_NODE, None)
+    workflow['connections'][SAVE_NODE] = {"main": [[{"node": RESPOND_NODE, "type": "main", "index": 0}]]}
+    return True
+
+
+def patch_respond(workflow):
+    node = find_node(workflow, RESPOND_NODE)
+    node['parameters'] = RESPOND_PARAMETERS
+    node['notes'] = 'Returns: {response: string, metadata: {category, attempt_count, session_version, latency_ms?}}'
+
+
+def main():
+    workflow = load_workflow()
+    patch_normalize(workflow)
+    print(f"✓ {NORMALIZE_NODE} reads the webhook body and records response options")
+
+    patch_update_session(workflow)
+    print(f"✓ {UPDATE_NODE} builds response_body and bumps session.version")
+
+    if remove_encode_node(workflow):
+        print(f"✓ Removed {ENCODE_NODE}: {SAVE_NODE} feeds {RESPOND_NODE}")
+
+    patch_respond(workflow)
+    print(f"✓ {RESPOND_NODE} sends the contract body as JSON")
+
+    save_workflow(workflow)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
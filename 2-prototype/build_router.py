@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Compile the routing decision table into a single Content-Based Router node.
+
+PROBLEM:
+Routing took two hops per turn. Merge waited for Load Session1 and the
+Content Feature Extractor, the Content-Based Router code node sniffed the
+merged items by shape and computed `_route` with nested if/else, and the
+Route by Content Type switch (complete_workflow_build.py) dispatched on it
+with four hand-built rules. Nobody could say which combinations of state
+and message type went where without reading the code.
+
+SOLUTION:
+Routing is the declarative ROUTING_TABLE below:
+
+    (teach-back active, scaffolding active, message_type, proximity) → route
+
+It is compiled here into a lookup over every feasible combination and
+embedded as the output expression of a Switch node (expression mode) - one
+node that decides and dispatches. Merge, the code router and Route by
+Content Type are removed:
+  - Load Session1 runs the answer-phrase analyzer and exposes `answer_phrase`
+  - Parse Features, one Code node after the feature extractor, parses the
+    model's JSON (a reply that is not JSON becomes message_type "other" and
+    goes to Classify Stuck) and joins the session side back in by node
+    reference ($('Load Session1')) - the item the code router used to emit
+  - the switch and the four validators read that item; state flags come
+    from its `tutor_state` (build_state_machine.py)
+
+    python3 build_router.py          # compile and embed
+    python3 build_router.py --check  # exhaustiveness report + run the
+                                     # compiled expression on every key
+"""
+
+import argparse
+import itertools
+import json
+import uuid
+
+from workflow_utils import (find_node, load_function_source, load_workflow,
+                            replace_marked_block, run_node, save_workflow)
+
+ANALYZER_FILE = 'functions/answer_phrase_analyzer.js'
+ANALYZER_EXPORTS = ['analyzeAnswerPhrases']
+ANALYZER_MARKER = 'ANSWER_PHRASE_ANALYZER (functions/answer_phrase_analyzer.js)'
+# Per-validator join blocks of earlier builds, replaced by JOIN_NODE
+JOIN_MARKER = 'ROUTED_INPUT (generated by build_router.py)'
+JOIN_NODE = 'Parse Features'
+EXTRACTOR_NODE = 'Content Feature Extractor'
+ROUTER_NODE = 'Content-Based Router'
+LEGACY_NODES = ['Merge', 'Route by Content Type']
+
+# Answer-phrase analyzer results below this confidence leave the LLM's numeric_value alone
+ANSWER_PHRASE_MIN_CONFIDENCE = 0.7
+
+# Output order of the router (and of the old Route by Content Type switch)
+ROUTES = ['verify_numeric', 'validate_conceptual', 'classify_stuck', 'teach_back_validator']
+ROUTE_TARGETS = {
+    'verify_numeric': 'Enhanced Numeric Verifier',
+    'validate_conceptual': 'Semantic Validator',
+    'classify_stuck': 'Classify Stuck',
+    'teach_back_validator': 'Teach-back validator',
+}
+
+MESSAGE_TYPES = ['answer_attempt', 'conceptual_response', 'question', 'help_request', 'off_topic', 'other']
+
+# How an answer attempt's number relates to the problem:
+#   process    - the analyzer is confident it is a process number ("5 steps")
+#   main       - the main answer (value key in the step's expected set as "main")
+#   expected   - an expected sub-answer of the current scaffolding step
+#   unexpected - the step has an expected set and the number is not in it
+#   near / far - no expected set recorded (uncatalogued problem, old session):
+#                within max(|answer| * 0.5, 1) of the main answer, or not
+#   none       - not an answer attempt
+PROXIMITY = ['process', 'main', 'expected', 'unexpected', 'near', 'far', 'none']
+
+# Proximities that need a recorded expected set (only exists while scaffolding)
+STEP_PROXIMITY = ['main', 'expected', 'unexpected']
+
+ANY = '*'
+
+# (teach_back, scaffolding, message_type, proximity, route) - first match wins
+ROUTING_TABLE = [
+    (True, ANY, 'help_request', ANY, 'classify_stuck'),
+    (True, ANY, ANY, ANY, 'teach_back_validator'),
+    (False, True, 'answer_attempt', 'process', 'validate_conceptual'),
+    (False, True, 'answer_attempt', 'main', 'verify_numeric'),
+    (False, True, 'answer_attempt', 'expected', 'validate_conceptual'),
+    (False, True, 'answer_attempt', 'unexpected', 'validate_conceptual'),
+    (False, True, 'answer_attempt', 'near', 'verify_numeric'),
+    (False, True, 'answer_attempt', 'far', 'validate_conceptual'),
+    (False, False, 'answer_attempt', ANY, 'verify_numeric'),
+    (False, ANY, 'conceptual_response', ANY, 'validate_conceptual'),
+    (False, ANY, ANY, ANY, 'classify_stuck'),
+]
+
+
+def feasible_keys():
+    """Every (teach_back, scaffolding, message_type, proximity) the router can see."""
+    for teach_back, scaffolding, message_type, proximity in itertools.product(
+            [False, True], [False, True], MESSAGE_TYPES, PROXIMITY):
+        # Only answer attempts have a proximity
+        if (message_type == 'answer_attempt') == (proximity == 'none'):
+            continue
+        if proximity in STEP_PROXIMITY and not scaffolding:
+            continue
+        yield teach_back, scaffolding, message_type, proximity
+
+
+def matches(row, key):
+    return all(want == ANY or want == have for want, have in zip(row[:4], key))
+
+
+def key_string(key):
+    teach_back, scaffolding, message_type, proximity = key
+    return f"{int(teach_back)}{int(scaffolding)}|{message_type}|{proximity}"
+
+
+def compile_table():
+    """Returns ({key string: output index}, report)."""
+    lookup = {}
+    uncovered = []
+    row_hits = [0] * len(ROUTING_TABLE)
+    for key in feasible_keys():
+        for i, row in enumerate(ROUTING_TABLE):
+            if matches(row, key):
+                lookup[key_string(key)] = ROUTES.index(row[4])
+                row_hits[i] += 1
+                break
+        else:
+            uncovered.append(key_string(key))
+
+    report = {
+        'keys': len(lookup) + len(uncovered),
+        'uncovered': uncovered,
+        'dead_rows': [i for i, hits in enumerate(row_hits) if hits == 0],
+        'row_hits': row_hits,
+    }
+    return lookup, report
+
+
+ROUTER_EXPRESSION = """={{ (() => {
+  const ROUTES = __LOOKUP__;
+  const TYPES = __TYPES__;
+  const phrase = $json.answer_phrase || {};
+  const confident = phrase.value !== null && phrase.value !== undefined && phrase.confidence >= __MIN_CONFIDENCE__;
+  const type = TYPES.includes($json.message_type) ? $json.message_type : 'other';
+  const teachBack = $json.tutor_state.teach_back ? 1 : 0;
+  const scaffolding = $json.tutor_state.scaffolding ? 1 : 0;
+  const expected = scaffolding ? $json.scaffolding_expected_answers : null;
+  let proximity = 'none';
+  if (type === 'answer_attempt') {
+    // Parse Features already replaced numeric_value with a confident analyzer value
+    const value = $json.numeric_value;
+    const rounded = Math.round(value * 1000) / 1000;
+    const role = expected ? expected[String(rounded === 0 ? 0 : rounded)] : null;
+    const correct = parseFloat(String($json.current_problem.correct_answer).replace(/[^0-9.\\-]/g, ''));
+    proximity = confident && phrase.role === 'process' ? 'process'
+      : expected ? (role === 'main' ? 'main' : role ? 'expected' : 'unexpected')
+      : Math.abs(value - correct) < Math.max(Math.abs(correct * 0.5), 1) ? 'near' : 'far';
+  }
+  return ROUTES[teachBack + '' + scaffolding + '|' + type + '|' + proximity];
+})() }}"""
+
+
+def router_expression(lookup):
+    return (ROUTER_EXPRESSION
+            .replace('__LOOKUP__', json.dumps(lookup, separators=(',', ':')))
+            .replace('__TYPES__', json.dumps(MESSAGE_TYPES[:-1]))
+            .replace('__MIN_CONFIDENCE__', str(ANSWER_PHRASE_MIN_CONFIDENCE)))
+
+
+JOIN_CODE = """// Parse Features (build_router.py) - the feature extractor's reply joined with
+// the session side, once, for Content-Based Router and the four validators
+const loaded = $('Load Session1').first().json;
+
+// The model can answer in prose or truncated JSON: route as "other" (Classify Stuck)
+let features = null;
+try {
+  features = JSON.parse($input.first().json.message.content);
+} catch (error) {
+  features = null;
+}
+if (!features || typeof features !== 'object' || Array.isArray(features)) {
+  features = { message_type: 'other', numeric_value: null, keywords: null, confidence: 0 };
+}
+
+const phrase = loaded.answer_phrase || { value: null, confidence: 0, role: 'neutral' };
+if (features.message_type === 'answer_attempt' && phrase.value !== null &&
+    phrase.confidence >= __MIN_CONFIDENCE__) {
+  features.numeric_value = phrase.value;
+}
+
+// Semantic Validator matches patterns against the tutor's last question
+const problem = (loaded.session && loaded.session.current_problem) || {};
+const lastQuestion = (problem.scaffolding && problem.scaffolding.last_question) || '';
+const expectedAnswers = (problem.scaffolding && problem.scaffolding.expected_answers) || null;
+
+return [{
+  json: {
+    ...loaded,
+    ...features,
+    scaffolding_last_question: lastQuestion,
+    scaffolding_expected_answers: expectedAnswers
+  }
+}];"""
+
+
+def join_code():
+    return JOIN_CODE.replace('__MIN_CONFIDENCE__', str(ANSWER_PHRASE_MIN_CONFIDENCE))
+
+
+INPUT_LINE = '  const input = $input.first().json;'
+JOINED_INPUT_PREFIX = "  const input = joinRoutedInput($('Load Session1').first().json, $input.first().json, "
+
+
+LOAD_SESSION_RETURN_OLD = """// Add start time for latency tracking"""
+LOAD_SESSION_RETURN_NEW = """// Local answer-phrase analysis - the router and validators use it when confident
+const answerPhrase = analyzeAnswerPhrases(normalizedInput.message);
+
+// Add start time for latency tracking"""
+
+LOAD_SESSION_FIELDS_OLD = """    current_problem: currentProblem
+  }
+};"""
+LOAD_SESSION_FIELDS_NEW = """    current_problem: currentProblem,
+    answer_phrase: {
+      value: answerPhrase.value,
+      confidence: answerPhrase.confidence,
+      role: answerPhrase.role
+    }
+  }
+};"""
+
+
+def patch_load_session(workflow):
+    node = find_node(workflow, 'Load Session1')
+    code = node['parameters']['jsCode']
+    code = replace_marked_block(code, ANALYZER_MARKER, load_function_source(ANALYZER_FILE, ANALYZER_EXPORTS))
+    if 'const answerPhrase = analyzeAnswerPhrases(normalizedInput.message);' not in code:
+        for old, new in [(LOAD_SESSION_RETURN_OLD, LOAD_SESSION_RETURN_NEW),
+                         (LOAD_SESSION_FIELDS_OLD, LOAD_SESSION_FIELDS_NEW)]:
+            if old not in code:
+                raise ValueError(f'Expected code not found in Load Session1: {old[:40]!r}')
+            code = code.replace(old, new, 1)
+    node['parameters']['jsCode'] = code
+
+
+def patch_validators(workflow):
+    """One-time: drop the per-validator joins of earlier builds - the item arrives joined."""
+    begin, end = f'// BEGIN {JOIN_MARKER}', f'// END {JOIN_MARKER}'
+    for name in ROUTE_TARGETS.values():
+        node = find_node(workflow, name)
+        code = node['parameters']['jsCode']
+        start = code.find(begin)
+        if start != -1:
+            stop = code.find(end, start) + len(end)
+            code = code[:start] + code[stop:].lstrip('\n')
+        line = code.find(JOINED_INPUT_PREFIX)
+        if line != -1:
+            code = code[:line] + INPUT_LINE + code[code.find('\n', line):]
+        if INPUT_LINE not in code:
+            raise ValueError(f'Input line not found in {name}')
+        node['parameters']['jsCode'] = code
+
+
+def add_join_node(workflow):
+    """Parse Features between the feature extractor and the router. Returns True when added."""
+    node = find_node(workflow, JOIN_NODE)
+    if node:
+        node['parameters']['jsCode'] = join_code()
+        return False
+
+    extractor = find_node(workflow, EXTRACTOR_NODE)
+    router = find_node(workflow, ROUTER_NODE)
+    workflow['nodes'].append({
+        "parameters": {"jsCode": join_code()},
+        "id": str(uuid.uuid4()),
+        "name": JOIN_NODE,
+        "type": "n8n-nodes-base.code",
+        "typeVersion": 2,
+        "position": [extractor['position'][0], router['position'][1] - 176],
+        "notes": "Guarded parse of the extractor's JSON, joined with Load Session1 (build_router.py)"
+    })
+    connections = workflow['connections']
+    connections[EXTRACTOR_NODE] = {"main": [[{"node": JOIN_NODE, "type": "main", "index": 0}]]}
+    connections[JOIN_NODE] = {"main": [[{"node": ROUTER_NODE, "type": "main", "index": 0}]]}
+    return True
+
+
+def replace_router(workflow, lookup):
+    """Swap Merge + code router + Route by Content Type for one Switch node."""
+    router = find_node(workflow, ROUTER_NODE)
+    connections = workflow['connections']
+
+    if router['type'] != 'n8n-nodes-base.switch':
+        dispatch = connections['Route by Content Type']['main']
+        position = router['position']
+        workflow['nodes'] = [n for n in workflow['nodes']
+                             if n['name'] not in LEGACY_NODES + [ROUTER_NODE]]
+        for name in LEGACY_NODES + [ROUTER_NODE]:
+            connections.pop(name, None)
+
+        router = {
+            "parameters": {},
+            "id": str(uuid.uuid4()),
+            "name": ROUTER_NODE,
+            "type": "n8n-nodes-base.switch",
+            "typeVersion": 3,
+            "position": position,
+            "notes": "Compiled decision table (build_router.py): decides and dispatches in one hop"
+        }
+        workflow['nodes'].append(router)
+        connections[ROUTER_NODE] = {"main": dispatch}
+        load_outputs = connections['Load Session1']['main'][0]
+        connections['Load Session1']['main'][0] = [c for c in load_outputs if c['node'] != 'Merge']
+
+    router['parameters'] = {
+        "mode": "expression",
+        "numberOutputs": len(ROUTES),
+        "output": router_expression(lookup),
+    }
+
+
+CHECK_SCRIPT = r"""
+const cases = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const body = cases.expression.replace(/^=\{\{/, '').replace(/\}\}$/, '');
+const evaluate = new Function('$json', 'return ' + body + ';');
+const join = new Function('$', '$input', cases.join);
+const routeOf = (loaded, content) => {
+  const $ = () => ({ first: () => ({ json: loaded }) });
+  const $input = { first: () => ({ json: { message: { content } } }) };
+  return evaluate(join($, $input)[0].json);
+};
+const results = {};
+for (const c of cases.keys) {
+  const [state, type, proximity] = c.split('|');
+  const correct = 2;
+  const phrase = proximity === 'process' ? { value: 5, confidence: 0.9, role: 'process' }
+    : { value: null, confidence: 0, role: 'neutral' };
+  const stepSet = ['main', 'expected', 'unexpected'].includes(proximity);
+  const loaded = {
+    current_problem: { correct_answer: String(correct) },
+    tutor_state: { teach_back: state[0] === '1', scaffolding: state[1] === '1' },
+    session: { current_problem: {
+      scaffolding: { expected_answers: stepSet ? { '2': 'main', '-3': 'start' } : null }
+    } },
+    answer_phrase: phrase
+  };
+  const values = { main: correct, expected: -3, unexpected: correct + 0.5, near: correct, far: correct + 100 };
+  const features = {
+    message_type: type === 'other' ? 'something_new' : type,
+    numeric_value: proximity in values ? values[proximity] : null
+  };
+  results[c] = routeOf(loaded, JSON.stringify(features));
+}
+// Replies that are not a JSON object: Classify Stuck, or Teach-back validator during teach-back
+const unparsed = {};
+for (const content of ['Sure! The student answered 2.', '{"message_type": "answer_attempt", "numeric', '[]', 'null']) {
+  for (const teachBack of [false, true]) {
+    const loaded = { current_problem: { correct_answer: '2' }, tutor_state: { teach_back: teachBack, scaffolding: false },
+      session: { current_problem: { scaffolding: {} } }, answer_phrase: null };
+    unparsed[`${teachBack ? 1 : 0}|${content}`] = routeOf(loaded, content);
+  }
+}
+process.stdout.write(JSON.stringify({ results, unparsed }));
+"""
+
+
+def check(lookup, report):
+    print(f"Routing table: {len(ROUTING_TABLE)} rows, {report['keys']} feasible keys")
+    for i, row in enumerate(ROUTING_TABLE):
+        conditions = ', '.join(str(c) for c in row[:4])
+        print(f"  row {i}: ({conditions}) → {row[4]:<22} {report['row_hits'][i]} keys")
+
+    ok = True
+    if report['uncovered']:
+        ok = False
+        print(f"✗ Uncovered keys: {report['uncovered']}")
+    if report['dead_rows']:
+        ok = False
+        print(f"✗ Rows shadowed by earlier rows: {report['dead_rows']}")
+
+    output = run_node(CHECK_SCRIPT, {'expression': router_expression(lookup), 'join': join_code(),
+                                     'keys': sorted(lookup)})
+    results = output['results']
+    wrong = {key: value for key, value in results.items() if value != lookup[key]}
+    if wrong:
+        ok = False
+        print(f"✗ Compiled expression disagrees with the table on {len(wrong)} keys: {sorted(wrong)[:5]}")
+    else:
+        print(f"✓ Compiled expression matches the table on all {len(results)} keys")
+
+    fallback = {'0': lookup['00|other|none'], '1': lookup['10|other|none']}
+    wrong = [key for key, route in output['unparsed'].items() if route != fallback[key[0]]]
+    if wrong:
+        ok = False
+        print(f"✗ Replies that are not JSON misrouted: {wrong}")
+    else:
+        print(f"✓ {len(output['unparsed'])} replies that are not JSON route as message_type \"other\" "
+              f"({ROUTES[fallback['0']]}, {ROUTES[fallback['1']]} during teach-back)")
+
+    if ok:
+        print("✓ Table is exhaustive with no dead rows")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--check', action='store_true', help='verify the table, do not touch the workflow')
+    args = parser.parse_args()
+
+    lookup, report = compile_table()
+    if args.check:
+        return 0 if check(lookup, report) else 1
+    if report['uncovered'] or report['dead_rows']:
+        print("✗ Routing table is not exhaustive - run with --check")
+        return 1
+
+    workflow = load_workflow()
+    patch_load_session(workflow)
+    patch_validators(workflow)
+    replace_router(workflow, lookup)
+    add_join_node(workflow)
+    save_workflow(workflow)
+    print(f"✓ {ROUTER_NODE} compiled from {len(ROUTING_TABLE)} rows ({len(lookup)} keys)")
+    print(f"✓ Removed {', '.join(LEGACY_NODES)}; {JOIN_NODE} joins Load Session1 once for the router and validators")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Package the Code nodes' embedded blocks as a module each n8n worker loads once.
+
+PROBLEM:
+Every build script embeds its tables and helpers into node code between
+`// BEGIN <marker>` / `// END <marker>`: the compiled registries, the
+per-problem table, the semantic matcher automaton, the typo dictionary, the
+teach-back rubric. Semantic Validator is ~35 KB of code, ~31 KB of it such
+blocks. n8n compiles and runs the whole jsCode on every execution, so every
+turn re-parses the blocks and re-allocates their objects, closures and
+keyword arrays.
+
+SOLUTION:
+Collect each Code node's blocks into one unit of generated/tutor-runtime/
+(a plain CommonJS package, no dependencies). All units are built when the
+module is first required - once per worker, Node's require cache keeps
+them. The deployment copy drops the node's blocks and starts the node with
+
+    const { lookupProblemValidator, ... } = require('tutor-runtime').unit('Semantic Validator', '<hash>');
+
+Units keep each node's own scope (blocks may call each other, e.g.
+sub_answers.js uses problemValueKey()), and the hash makes a worker with a
+stale module fail loudly instead of running old tables.
+
+Registry blocks (REGISTRY_MARKERS) can also come from a version published
+to Redis: unit() then rebuilds the unit with that version's blocks, once
+per version per worker (build_registry_store.py).
+
+Blocks are library code: they must not mutate their own tables per turn -
+the objects are now shared between executions (benchmarks/bench_preload.js
+checks this).
+
+Worker setup (self-hosted n8n only - n8n Cloud cannot load modules), see
+docs/DEPLOYMENT.md:
+    NODE_PATH=<dir containing tutor-runtime/>
+    NODE_FUNCTION_ALLOW_EXTERNAL=tutor-runtime
+
+    python3 optimize_workflow.py --preload   # writes the module and generated/workflow-preloaded.json
+"""
+
+import hashlib
+import json
+import os
+import re
+
+from workflow_utils import run_node
+
+MODULE_NAME = 'tutor-runtime'
+MODULE_DIR = 'generated/tutor-runtime'
+CODE_TYPE = 'n8n-nodes-base.code'
+
+BLOCK = re.compile(r'// BEGIN ([^\n]+)\n(.*?)\n// END \1', re.S)
+# Top-level declarations: block code is written at column 0
+DECLARATION = re.compile(r'^(?:async\s+)?(?:const|let|var|function\*?|class)\s+([A-Za-z_$][\w$]*)', re.M)
+
+MODULE_TEMPLATE = """// Generated by build_runtime_module.py from {source} - do not edit by hand
+// Per-node units of the blocks build scripts embed into Code nodes.
+// Built once, when a worker first requires the module.
+
+const UNITS = {{
+{units}
+}};
+
+const LOADED = {{}};
+for (const [name, entry] of Object.entries(UNITS)) {{
+  LOADED[name] = entry.load();
+}}
+
+// Registry store (build_registry_store.py): units rebuilt with the registry
+// blocks of a published version, compiled once per version per worker
+const REGISTRY_MARKERS = {registry_markers};
+const REGISTRY_CACHE_SIZE = 4;
+const REGISTRY_CACHE = new Map();
+
+function hasRegistries(version) {{
+  return REGISTRY_CACHE.has(version);
+}}
+
+function registryEntry(version, documentText) {{
+  let entry = REGISTRY_CACHE.get(version);
+  if (entry) {{
+    // Most recently used last
+    REGISTRY_CACHE.delete(version);
+  }} else {{
+    if (!documentText) {{
+      throw new Error(`Registry version "${{version}}" is not published (tutor_registries:${{version}})`);
+    }}
+    const document = JSON.parse(documentText);
+    if (document.version !== version) {{
+      throw new Error(`tutor_registries:${{version}} holds version "${{document.version}}"`);
+    }}
+    entry = {{ document, units: {{}} }};
+  }}
+  REGISTRY_CACHE.set(version, entry);
+  if (REGISTRY_CACHE.size > REGISTRY_CACHE_SIZE) {{
+    REGISTRY_CACHE.delete(REGISTRY_CACHE.keys().next().value);
+  }}
+  return entry;
+}}
+
+function compileUnit(name, document) {{
+  const entry = UNITS[name];
+  if (!(name in document.nodes)) {{
+    return LOADED[name];
+  }}
+  if (document.nodes[name] !== entry.code_hash) {{
+    throw new Error(`Registry version "${{document.version}}" was published for other code of "${{name}}" - ` +
+      'redeploy the workflow and module, or publish again');
+  }}
+  const body = entry.blocks.map(([marker, source]) => `// ${{marker}}\\n${{source === null ? document.blocks[marker] : source}}`);
+  return new Function(`${{body.join('\\n')}}\\nreturn {{ ${{entry.names.join(', ')}} }};`)();
+}}
+
+/**
+ * Exports of a node's blocks
+ *
+ * @param {{string}} name - Code node name
+ * @param {{string}} hash - Unit hash the node was built against
+ * @param {{string|null}} version - Registry version (null: tables built into the module)
+ * @param {{string|null}} documentText - Registry document from Redis, when this worker has not compiled `version`
+ */
+function unit(name, hash, version, documentText) {{
+  const entry = UNITS[name];
+  if (!entry || entry.hash !== hash) {{
+    throw new Error(`{module} is out of date for "${{name}}" - rebuild it (optimize_workflow.py --preload) ` +
+      'and reinstall it on every worker');
+  }}
+  if (!version) {{
+    return LOADED[name];
+  }}
+  const cached = registryEntry(version, documentText);
+  if (!cached.units[name]) {{
+    cached.units[name] = compileUnit(name, cached.document);
+  }}
+  return cached.units[name];
+}}
+
+module.exports = {{ unit, hasRegistries, UNITS, REGISTRY_MARKERS, REGISTRY_CACHE }};
+"""
+
+UNIT_TEMPLATE = """  {name}: {{
+    hash: {hash},
+    code_hash: {code_hash},
+    names: {names_json},
+    blocks: {blocks},
+    load: () => {{
+{body}
+      return {{ {names} }};
+    }}
+  }}"""
+
+# Blocks compiled from config_registries.js (and the question catalog): a
+# registry document from Redis replaces them, the other blocks are node code
+REGISTRY_MARKERS = [
+    'REGISTRIES (generated by build_registries.py)',
+    'PROBLEM_VALIDATORS (generated by build_problem_validators.py)',
+    'SEMANTIC_MATCHER (generated by build_semantic_matcher.py)',
+    'TYPO_DICTIONARY (generated by build_typo_dictionary.py)',
+]
+
+PACKAGE = {
+    'name': MODULE_NAME,
+    'version': '1.0.0',
+    'description': 'Tables and helpers of the tutor workflow Code nodes, preloaded once per n8n worker',
+    'main': 'index.js',
+    'private': True,
+}
+
+CHECK_SCRIPT = r"""
+const runtime = require(JSON.parse(require('fs').readFileSync(0, 'utf8')).path);
+process.stdout.write(JSON.stringify(Object.fromEntries(
+  Object.entries(runtime.UNITS).map(([name, entry]) => [name, Object.keys(runtime.unit(name, entry.hash))]))));
+"""
+
+
+def node_units(workflow):
+    """{node name: {'blocks': [(marker, body)], 'names': [...], 'hash': ...}} for Code nodes with blocks."""
+    units = {}
+    for node in workflow['nodes']:
+        if node['type'] != CODE_TYPE:
+            continue
+        blocks = [(m.group(1), m.group(2)) for m in BLOCK.finditer(node['parameters']['jsCode'])]
+        if not blocks:
+            continue
+        names = []
+        for _, body in blocks:
+            for name in DECLARATION.findall(body):
+                if name not in names:
+                    names.append(name)
+        joined = '\n'.join(f'// {marker}\n{body}' for marker, body in blocks)
+        code = '\n'.join(f'// {marker}\n{body}' for marker, body in blocks if marker not in REGISTRY_MARKERS)
+        units[node['name']] = {
+            'blocks': blocks,
+            'names': names,
+            'hash': content_hash(joined),
+            # Pins a registry document to the node code it was published for
+            'code_hash': content_hash(code),
+            'body': joined,
+        }
+    return units
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def indent(text, prefix):
+    return '\n'.join(prefix + line if line else line for line in text.split('\n'))
+
+
+def render_module(units, source):
+    rendered = ',\n'.join(
+        UNIT_TEMPLATE.format(
+            name=json.dumps(name), hash=json.dumps(unit['hash']), code_hash=json.dumps(unit['code_hash']),
+            names_json=json.dumps(unit['names']), body=indent(unit['body'], '      '), names=', '.join(unit['names']),
+            # Node code sources, for rebuilding the unit with another registry version
+            blocks=json.dumps([[marker, None if marker in REGISTRY_MARKERS else body]
+                               for marker, body in unit['blocks']]) if has_registry_blocks(unit) else '[]')
+        for name, unit in units.items())
+    return MODULE_TEMPLATE.format(source=source, units=rendered, module=MODULE_NAME,
+                                  registry_markers=json.dumps(REGISTRY_MARKERS))
+
+
+def has_registry_blocks(unit):
+    return any(marker in REGISTRY_MARKERS for marker, _ in unit['blocks'])
+
+
+def write_module(workflow, source='workflow-production-ready.json'):
+    """Write generated/tutor-runtime/ and check every unit loads. Returns the units."""
+    units = node_units(workflow)
+    os.makedirs(MODULE_DIR, exist_ok=True)
+    with open(os.path.join(MODULE_DIR, 'index.js'), 'w') as f:
+        f.write(render_module(units, source))
+    with open(os.path.join(MODULE_DIR, 'package.json'), 'w') as f:
+        json.dump(PACKAGE, f, indent=2)
+        f.write('\n')
+
+    exported = run_node(CHECK_SCRIPT, {'path': os.path.abspath(os.path.join(MODULE_DIR, 'index.js'))})
+    for name, unit in units.items():
+        if exported.get(name) != unit['names']:
+            raise ValueError(f'{MODULE_NAME} unit "{name}" does not load its declarations')
+    return units
+
+
+def hoist_blocks(workflow, units):
+    """Replace each node's blocks with one require() of its unit. Edits in place."""
+    for node in workflow['nodes']:
+        unit = units.get(node['name'])
+        if not unit:
+            continue
+        code = node['parameters']['jsCode']
+        loader = (f"// Preloaded per worker (build_runtime_module.py): {', '.join(m for m, _ in unit['blocks'])}\n"
+                  f"const {{ {', '.join(unit['names'])} }} = "
+                  f"require('{MODULE_NAME}').unit({json.dumps(node['name'])}, '{unit['hash']}');")
+        # At the top: block functions may be called before the block (function hoisting)
+        node['parameters']['jsCode'] = loader + '\n\n' + BLOCK.sub('', code)
+    return {name: {'blocks': [m for m, _ in unit['blocks']], 'bytes': len(unit['body'].encode('utf-8'))}
+            for name, unit in units.items()}
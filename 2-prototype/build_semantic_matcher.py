@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Compile SEMANTIC_PATTERNS into the Semantic Validator's matcher tables.
+
+PROBLEM: Semantic Validator carried its own copy of SEMANTIC_PATTERNS and, on
+every turn, looped over every group, every questionPattern and every keyword
+with String.includes. The cost grows with the registry, the embedded copy
+drifts from config_registries.js, and the keywords were judged without
+context, so "not left" counted as "left".
+
+SOLUTION: Compile the registry once, here, into one phrase list over all
+question phrases and keywords plus a trigger index (question phrase →
+pattern groups) - see functions/semantic_matcher.js. The validator then
+scans the tutor question once to find the triggered groups and the student
+message once to find keyword hits (with negation scope), and only evaluates
+the groups that were triggered.
+
+The scan is one indexOf per phrase until the registry reaches
+AUTOMATON_MIN_PHRASES; from there an Aho–Corasick automaton is compiled in
+(benchmarks/bench_semantic_matcher.js measures the crossover). Today's
+registry is well below it.
+
+Run after changing SEMANTIC_PATTERNS in config_registries.js.
+"""
+
+import argparse
+import json
+
+from workflow_utils import (
+    find_node, load_function_source, load_workflow, replace_marked_block,
+    run_node, save_workflow,
+)
+
+MATCHER_SOURCE = 'functions/semantic_matcher.js'
+# Runtime half of the module; compileSemanticPatterns() runs here, at build time
+MATCHER_EXPORTS = ['scanPhrases', 'markNegation', 'triggeredGroups', 'selectGenericSets', 'judgeKeywords']
+BLOCK_MARKER = 'SEMANTIC_MATCHER (generated by build_semantic_matcher.py)'
+VALIDATORS_MARKER = '// BEGIN PROBLEM_VALIDATORS'
+
+COMPILE_SCRIPT = """
+const { SEMANTIC_PATTERNS } = require('./config_registries.js');
+const { compileSemanticPatterns } = require('./functions/semantic_matcher.js');
+process.stdout.write(JSON.stringify(compileSemanticPatterns(SEMANTIC_PATTERNS)));
+"""
+
+EMBEDDED_PATTERNS_START = '  // Embedded configuration\n  const SEMANTIC_PATTERNS = {'
+
+PATTERN_LOOP_START = '  // PATTERN-BASED VALIDATION\n  patternLoop:'
+PATTERN_LOOP_END = '  // MAIN-ANSWER PHRASE'
+
+PATTERN_MATCH_NEW = """  // PATTERN-BASED VALIDATION (compiled: only groups the question triggers)
+  const messageHits = markNegation(studentMessage, scanPhrases(SEMANTIC_MATCHER, studentMessage));
+  for (const group of triggeredGroups(SEMANTIC_MATCHER, scaffoldingQuestion)) {
+    const problemSets = problemSpec && problemSpec.keyword_sets[group.type];
+    const sets = problemSets && !(problemSets.unless_question || []).some(w => scaffoldingQuestion.includes(w))
+      ? problemSets
+      : selectGenericSets(group, problemText, scaffoldingQuestion);
+
+    if (!sets || sets.expected.length === 0) continue;
+
+    const verdict = judgeKeywords(messageHits, sets, keywords);
+    if (verdict === 'correct') {
+      isCorrect = true;
+      reasoning = 'Student correctly identified concept';
+    } else if (verdict === 'wrong') {
+      isCorrect = false;
+      reasoning = 'Student gave incorrect answer';
+    } else {
+      needsLLMValidation = true;
+    }
+    break;
+  }
+
+"""
+
+
+def compile_matcher():
+    """Compile the registry through Node (the registry is CommonJS)."""
+    return run_node(COMPILE_SCRIPT)
+
+
+def matcher_block(matcher):
+    runtime = load_function_source(MATCHER_SOURCE, MATCHER_EXPORTS)
+    return (
+        f"const SEMANTIC_MATCHER = {json.dumps(matcher, separators=(',', ':'), ensure_ascii=False)};\n\n"
+        f"{runtime}"
+    )
+
+
+def embed(workflow, matcher):
+    node = find_node(workflow, 'Semantic Validator')
+    if not node:
+        raise ValueError('Semantic Validator not found')
+
+    code = node['parameters']['jsCode']
+
+    # One-time: the embedded registry copy is replaced by the compiled block
+    start = code.find(EMBEDDED_PATTERNS_START)
+    if start != -1:
+        stop = code.find(VALIDATORS_MARKER, start)
+        if stop == -1:
+            raise ValueError('Run build_problem_validators.py first')
+        code = code[:start] + code[stop:]
+
+    code = replace_marked_block(code, BLOCK_MARKER, matcher_block(matcher), anchor=VALIDATORS_MARKER)
+
+    # One-time: nested pattern loop → triggered groups
+    start = code.find(PATTERN_LOOP_START)
+    if start != -1:
+        stop = code.find(PATTERN_LOOP_END, start)
+        if stop == -1:
+            raise ValueError('Pattern loop end not found')
+        code = code[:start] + PATTERN_MATCH_NEW + code[stop:]
+    elif 'triggeredGroups(SEMANTIC_MATCHER' not in code:
+        raise ValueError('Pattern loop not found in Semantic Validator')
+
+    node['parameters']['jsCode'] = code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--no-embed', action='store_true', help='only print the table sizes')
+    args = parser.parse_args()
+
+    print("Compiling SEMANTIC_PATTERNS...")
+    matcher = compile_matcher()
+    question_phrases = len(matcher['triggers'])
+    print(f"  Groups:           {len(matcher['groups'])}")
+    print(f"  Phrases:          {len(matcher['phrases'])} ({question_phrases} question triggers)")
+    if 'goto' in matcher:
+        print(f"  Scan:             automaton, {len(matcher['goto'])} states")
+    else:
+        print("  Scan:             indexOf per phrase (below AUTOMATON_MIN_PHRASES)")
+    print(f"  Table size:       {len(json.dumps(matcher, separators=(',', ':'))) / 1024:.1f} KB")
+
+    if args.no_embed:
+        return 0
+
+    workflow = load_workflow()
+    embed(workflow, matcher)
+    save_workflow(workflow)
+    print("✓ Embedded compiled matcher into Semantic Validator")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Compile the tutoring state machine and embed it in the session nodes.
+
+PROBLEM:
+The tutoring state was spread over two flag objects
+(scaffolding.active/depth, teach_back.active/awaiting_explanation):
+  - Update Session & Format Response1 moved between states with two
+    if-chains that re-read the flags from Build Response Context1
+  - Load Session1 patched missing objects on every load and force-reset
+    teach-back on the first turn to survive corrupt Redis data
+  - the router derived its own view of the flags
+Flag combinations that mean nothing (teach-back and scaffolding both
+active) were repaired per request instead of being impossible, and a
+correct answer during teach-back counted the problem as solved twice.
+
+SOLUTION:
+An explicit state machine (functions/tutor_state.js):
+
+    idle ("I") → scaffolding(depth) ("S1".."S99") → teach_back ("T") → solved ("D")
+
+stored as one code in session.current_problem.state. TRANSITIONS below is
+compiled into a lookup keyed by "<state>|<category>"; categories without an
+entry keep the state. Every node goes through the same evaluator:
+  - Load Session1 rejects illegal sessions (→ new session) and exposes
+    `tutor_state` once per turn
+  - the router and Build Response Context1 read `tutor_state`
+  - Update Session applies one transition (applyTutorTransition)
+
+The state machine itself is the embedded TUTOR_STATE block, refreshed on
+every run. The node code around it (session loading, the scaffolding update)
+is rewritten only once, so what later scripts add there - the question-loop
+fields of build_question_loop.py - survives a re-run.
+
+    python3 build_state_machine.py          # compile and embed
+    python3 build_state_machine.py --check  # table report + evaluator run
+
+Run after add_expected_sub_answers.py and before build_question_loop.py.
+"""
+
+import argparse
+import json
+
+from workflow_utils import (find_node, load_function_source, load_workflow,
+                            replace_marked_block, run_node, save_workflow)
+
+STATE_FILE = 'functions/tutor_state.js'
+# Used by Load Session1 and Update Session & Format Response1 (one block for both)
+STATE_EXPORTS = ['parseTutorState', 'describeTutorState', 'applyTutorTransition', 'initialProblemState',
+                 'legacyTutorStateCode', 'tutorSessionError']
+BLOCK_MARKER = 'TUTOR_STATE (generated by build_state_machine.py)'
+
+STATES = ['idle', 'scaffolding', 'teach_back', 'solved']
+
+# Outputs of Route by Category1 (the categories validators can emit)
+CATEGORIES = ['correct', 'close', 'wrong_operation', 'conceptual_question', 'stuck',
+              'off_topic', 'scaffold_progress', 'teach_back_explanation']
+
+# depth: 'one' - start at 1, 'inc' - one deeper, 'same' - keep (scaffolding targets only)
+# ask:   the tutor's response is the new scaffolding question
+# solve: count the problem as solved
+TRANSITIONS = [
+    # (from, category, to, depth, ask, solve)
+    ('idle', 'stuck', 'scaffolding', 'one', True, False),
+    ('idle', 'correct', 'teach_back', None, False, True),
+    ('scaffolding', 'stuck', 'scaffolding', 'same', True, False),
+    ('scaffolding', 'scaffold_progress', 'scaffolding', 'inc', True, False),
+    ('scaffolding', 'correct', 'teach_back', None, False, True),
+    ('teach_back', 'teach_back_explanation', 'solved', None, False, False),
+]
+
+
+def compile_fsm():
+    """Returns (TUTOR_FSM, errors)."""
+    errors = []
+    transitions = {}
+    for source, category, target, depth, ask, solve in TRANSITIONS:
+        key = f'{source}|{category}'
+        if source not in STATES or target not in STATES:
+            errors.append(f'{key}: unknown state')
+        if category not in CATEGORIES:
+            errors.append(f'{key}: unknown category {category!r}')
+        if (target == 'scaffolding') != (depth is not None):
+            errors.append(f'{key}: depth rule only applies to scaffolding targets')
+        if ask and target != 'scaffolding':
+            errors.append(f'{key}: only scaffolding states ask a question')
+        if key in transitions:
+            errors.append(f'{key}: duplicate transition')
+        transitions[key] = {'to': target, 'depth': depth, 'ask': ask, 'solve': solve}
+
+    reachable = {'idle'}
+    frontier = ['idle']
+    while frontier:
+        state = frontier.pop()
+        for key, transition in transitions.items():
+            if key.startswith(state + '|') and transition['to'] not in reachable:
+                reachable.add(transition['to'])
+                frontier.append(transition['to'])
+    for state in STATES:
+        if state not in reachable:
+            errors.append(f'{state}: unreachable from idle')
+
+    return {'transitions': transitions}, errors
+
+
+def state_block(fsm):
+    data = json.dumps(fsm, separators=(',', ':'))
+    return f'const TUTOR_FSM = {data};\n\n{load_function_source(STATE_FILE, STATE_EXPORTS)}'
+
+
+# ============================================================================
+# Load Session1
+# ============================================================================
+
+LOAD_START = '// Get session from Redis Get node'
+LOAD_END = '// Local answer-phrase analysis'
+LOAD_BODY = """// Get session from Redis Get node
+let session = null;
+let sessionFound = false;
+
+try {
+  const redisData = $('Redis: Get Session1').first().json;
+  // Redis returns {key: '...', value: '...'} or {key: '...', propertyName: '...'}
+  if (redisData && (redisData.value || redisData.propertyName)) {
+    try {
+      session = JSON.parse(redisData.value || redisData.propertyName);
+      sessionFound = true;
+    } catch (error) {
+      session = null;
+    }
+  }
+} catch (error) {
+  // Redis node failed, will create new session
+}
+
+// Tutor state (build_state_machine.py): sessions saved before the state
+// machine carry flag objects - converted once, the code is saved back
+if (session && session.current_problem && session.current_problem.state === undefined) {
+  const legacyScaffolding = session.current_problem.scaffolding || {};
+  session.current_problem.state = legacyTutorStateCode(session.current_problem);
+  session.current_problem.scaffolding = {
+    last_question: legacyScaffolding.last_question || null,
+    expected_answers: legacyScaffolding.expected_answers || null
+  };
+  delete session.current_problem.teach_back;
+}
+
+// Illegal state: reject the stored session instead of patching fields
+const sessionRejected = session ? tutorSessionError(session) : null;
+if (sessionRejected) {
+  session = null;
+}
+
+if (!session) {
+  // Create new session
+  session = {
+    session_id: sessionId,
+    student_id: studentId,
+    created_at: new Date().toISOString(),
+    last_active: new Date().toISOString(),
+    current_problem: initialProblemState(currentProblem),
+    recent_turns: [],
+    stats: {
+      total_turns: 0,
+      problems_attempted: 1,
+      problems_solved: 0
+    }
+  };
+}
+
+// Check if problem changed (Hybrid Memory: keep only last 3 turns for continuity)
+if (session.current_problem.id !== currentProblem.id) {
+  // Keep last 3 turns from previous problem for continuity
+  session.recent_turns = session.recent_turns.slice(-3);
+  session.recent_turns.forEach(turn => {
+    turn.is_previous_problem = true;
+  });
+
+  // Reset problem data
+  session.current_problem = initialProblemState(currentProblem);
+  session.stats.problems_attempted++;
+}
+
+const tutorState = describeTutorState(parseTutorState(session.current_problem.state));
+
+"""
+
+LOAD_FIELDS_OLD = """    current_problem: currentProblem,
+"""
+LOAD_FIELDS_NEW = """    current_problem: currentProblem,
+    tutor_state: tutorState,
+    _session_rejected: sessionRejected,
+"""
+
+
+def replace_region(code, start, end, body, done_marker, name):
+    """Rewrite the flag-object code once; later runs only refresh the block."""
+    if done_marker in code:
+        return code
+    begin = code.find(start)
+    stop = code.find(end, begin)
+    if begin == -1 or stop == -1:
+        raise ValueError(f'Region {start!r} .. {end!r} not found in {name}')
+    return code[:begin] + body + code[stop:]
+
+
+def patch_load_session(workflow, block):
+    node = find_node(workflow, 'Load Session1')
+    code = replace_marked_block(node['parameters']['jsCode'], BLOCK_MARKER, block)
+    code = replace_region(code, LOAD_START, LOAD_END, LOAD_BODY, 'const sessionRejected = ', 'Load Session1')
+    if 'tutor_state: tutorState,' not in code:
+        if LOAD_FIELDS_OLD not in code:
+            raise ValueError('Output fields not found in Load Session1')
+        code = code.replace(LOAD_FIELDS_OLD, LOAD_FIELDS_NEW, 1)
+    node['parameters']['jsCode'] = code
+
+
+# ============================================================================
+# Update Session & Format Response1
+# ============================================================================
+
+UPDATE_NODE = 'Update Session & Format Response1'
+UPDATE_ANCHOR = '  const responseData = $input.first().json;'
+UPDATE_START = '  // STATE TRANSITION'
+UPDATE_END = '  // Track conversation in recent_turns'
+UPDATE_BODY = """  // STATE TRANSITION - one lookup in the compiled table (build_state_machine.py)
+  const problem = session.current_problem;
+  const transition = applyTutorTransition(session, category, TUTOR_FSM);
+
+  if (transition.ask) {
+    // Expected sub-answers for the step just asked - the router tests membership next turn
+    problem.scaffolding = {
+      last_question: response,
+      expected_answers: expectedSubAnswers(lookupProblemValidator(problem), problem, response)
+    };
+  } else if (transition.state.kind !== 'scaffolding') {
+    problem.scaffolding = { last_question: null, expected_answers: null };
+  }
+
+"""
+
+UPDATE_TURNS_GUARD = """  if (!session.recent_turns) {
+    session.recent_turns = [];
+  }
+
+"""
+
+
+def patch_update_session(workflow, block):
+    node = find_node(workflow, UPDATE_NODE)
+    code = replace_marked_block(node['parameters']['jsCode'], BLOCK_MARKER, block, anchor=UPDATE_ANCHOR)
+    code = replace_region(code, UPDATE_START, UPDATE_END, UPDATE_BODY, '  const transition = applyTutorTransition(', UPDATE_NODE)
+    # Load Session1 only passes legal sessions, which always have recent_turns
+    code = code.replace(UPDATE_TURNS_GUARD, '', 1)
+    node['parameters']['jsCode'] = code
+
+
+# ============================================================================
+# Build Response Context1
+# ============================================================================
+
+CONTEXT_OLD = """  const scaffoldingActive = session.current_problem?.scaffolding?.active || false;
+  const scaffoldingLastQuestion = session.current_problem?.scaffolding?.last_question || '';
+  const teachBackActive = session.current_problem?.teach_back?.active || false;"""
+CONTEXT_NEW = """  // Tutor state flags evaluated once by Load Session1 (functions/tutor_state.js)
+  const scaffoldingActive = input.tutor_state.scaffolding;
+  const scaffoldingLastQuestion = scaffoldingActive ? (session.current_problem.scaffolding.last_question || '') : '';
+  const teachBackActive = input.tutor_state.teach_back;"""
+
+
+def patch_response_context(workflow):
+    node = find_node(workflow, 'Build Response Context1')
+    code = node['parameters']['jsCode']
+    if CONTEXT_NEW not in code:
+        if CONTEXT_OLD not in code:
+            raise ValueError('State flags not found in Build Response Context1')
+        code = code.replace(CONTEXT_OLD, CONTEXT_NEW, 1)
+    node['parameters']['jsCode'] = code
+
+
+# ============================================================================
+# Check
+# ============================================================================
+
+CHECK_SCRIPT = r"""
+const fsm = require('./functions/tutor_state.js');
+const { TUTOR_FSM, conversation, codes } = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+let state = fsm.parseTutorState('I');
+const path = [state.code];
+let solved = 0;
+for (const category of conversation) {
+  const transition = fsm.nextTutorState(state, category, TUTOR_FSM);
+  state = transition.state;
+  solved += transition.solve ? 1 : 0;
+  path.push(state.code);
+}
+const parsed = {};
+for (const code of codes) parsed[JSON.stringify(code)] = fsm.parseTutorState(code) !== null;
+process.stdout.write(JSON.stringify({ path, solved, parsed }));
+"""
+
+CHECK_CONVERSATION = ['close', 'stuck', 'scaffold_progress', 'stuck', 'scaffold_progress',
+                      'correct', 'correct', 'teach_back_explanation', 'correct']
+CHECK_PATH = ['I', 'I', 'S1', 'S2', 'S2', 'S3', 'T', 'T', 'D', 'D']
+CHECK_CODES = {'I': True, 'S1': True, 'S99': True, 'T': True, 'D': True,
+               'S0': False, 'S100': False, 'X': False, 'TS': False, '': False, None: False}
+
+
+def check(fsm, errors):
+    print(f"Tutor state machine: {len(STATES)} states, {len(TRANSITIONS)} transitions, "
+          f"{len(STATES) * len(CATEGORIES) - len(TRANSITIONS)} (state, category) pairs keep the state")
+    for source, category, target, depth, ask, solve in TRANSITIONS:
+        effects = ', '.join(e for e, on in [('ask', ask), ('solve', solve)] if on)
+        print(f"  {source:<12} --{category}--> {target}{f'({depth})' if depth else ''}"
+              f"{f'  [{effects}]' if effects else ''}")
+
+    ok = not errors
+    for error in errors:
+        print(f"✗ {error}")
+
+    result = run_node(CHECK_SCRIPT, {'TUTOR_FSM': fsm, 'conversation': CHECK_CONVERSATION,
+                                     'codes': list(CHECK_CODES)})
+    if result['path'] != CHECK_PATH or result['solved'] != 1:
+        ok = False
+        print(f"✗ Sample conversation went {' → '.join(result['path'])} (solved {result['solved']}x)")
+    else:
+        print(f"✓ Sample conversation: {' → '.join(result['path'])}, solved once")
+
+    wrong = [code for code, legal in CHECK_CODES.items() if result['parsed'][json.dumps(code)] != legal]
+    if wrong:
+        ok = False
+        print(f"✗ State codes parsed wrongly: {wrong}")
+    else:
+        print(f"✓ {len(CHECK_CODES)} state codes accepted/rejected as expected")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--check', action='store_true', help='verify the table, do not touch the workflow')
+    args = parser.parse_args()
+
+    fsm, errors = compile_fsm()
+    if args.check:
+        return 0 if check(fsm, errors) else 1
+    if errors:
+        print("✗ State machine is inconsistent - run with --check")
+        return 1
+
+    block = state_block(fsm)
+    workflow = load_workflow()
+    patch_load_session(workflow, block)
+    patch_update_session(workflow, block)
+    patch_response_context(workflow)
+    save_workflow(workflow)
+    print(f"✓ Embedded tutor state machine ({len(TRANSITIONS)} transitions) into Load Session1 and {UPDATE_NODE}")
+    print("✓ Build Response Context1 reads tutor_state")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Instrument a workflow export with per-node timing checkpoints.
+
+PROBLEM:
+`include_timing` returns one number, latency_ms from Load Session1 to
+Update Session & Format Response1. Where a slow turn spent its time - the
+extractor, Redis, a validator, the response LLM, n8n's own hops - is not
+recorded anywhere, the session stats keep no timings, and the README's
+"Expected Latency" table is an estimate nobody can reproduce.
+
+SOLUTION:
+A build pass that writes an instrumented copy (generated/workflow-timed.json
+by default; --input takes the optimized or preloaded copy as well). Every
+Code node's own code runs unchanged inside a checkpoint wrapper that:
+
+  - picks up the turn's timing vector from its input item, or - after an
+    LLM node, which replaces the item - from whichever upstream Code node
+    ran last ($('Node').isExecuted)
+  - charges the time since the previous checkpoint to the LLM / Redis
+    node(s) in between (known at build time), or to "n8n" when only
+    Switches or nothing lie in between
+  - adds its own time and passes the vector on as `_timing`
+
+So the LLM and Redis nodes are timed by the checkpoints around them; the
+vector is compact: {start, last, at, ms: {node: ms}} in execution order.
+Date.now() resolution - Code nodes under 1 ms show 0.
+
+  - The Code node feeding the webhook response (directly or through the
+    Redis save) adds metadata.timing = {total_ms, nodes: {node: ms}} to the
+    response body it returns when the request sets "include_timing": true
+    (same flag as latency_ms).
+  - The Code node whose output a Redis SET saves (_session_for_redis) folds
+    the vector into session.metrics: {turn, nodes: {node: [count, mean_ms,
+    max_ms]}}, mean an exponential moving average (METRICS_ALPHA). The
+    Redis save comes after it and is in neither.
+
+Timing runs are for measuring, not serving: the wrapper adds about 1 KB to
+each Code node. The README table comes from real turns with
+load_test.py --timing against the instrumented copy, then:
+
+    python3 build_timing.py                      # generated/workflow-timed.json
+    python3 build_timing.py --input generated/workflow-optimized.json \\
+        --output generated/workflow-optimized-timed.json
+    python3 build_timing.py --table load-report.json   # README latency table
+"""
+
+import argparse
+import json
+import re
+
+from optimize_workflow import CHECK_SCRIPT, CODE_TYPE, SWITCH_TYPE, node_map, predecessors, successors
+from workflow_utils import WORKFLOW_FILE, load_workflow, run_node, save_workflow
+
+OUTPUT_FILE = 'generated/workflow-timed.json'
+
+REDIS_TYPE = 'n8n-nodes-base.redis'
+LLM_TYPE = '@n8n/n8n-nodes-langchain.openAi'
+RESPOND_TYPE = 'n8n-nodes-base.respondToWebhook'
+
+# Time between two checkpoints with no LLM or Redis node in between
+HOP_LABEL = 'n8n'
+
+# Weight of the newest turn in session.metrics means
+METRICS_ALPHA = 0.2
+
+WRAPPED_MARKER = '// Timing checkpoints (build_timing.py)'
+
+# README "Expected Latency" rows → nodes whose time they add up
+# (Full turn: the whole vector)
+LATENCY_STAGES = {
+    'Full turn': None,
+    'Stage 1 triage': ['Content Feature Extractor'],
+    'Verification': ['Enhanced Numeric Verifier', 'Semantic Validator', 'Classify Stuck',
+                     'Teach-back validator'],
+    'Response gen': ['Synthesis LLM1', 'Response: Unified1'],
+}
+
+# Redis SET value "={{ JSON.stringify($json.field) }}" → field
+SAVED_FIELD = re.compile(r'\$json\.(\w+)')
+
+CHECKPOINT_START = """{marker} - node code below runs unchanged
+const __t0 = Date.now();
+const __prev = [($input.first() && $input.first().json || {{}})._timing]
+  .concat({candidates}.filter(name => $(name).isExecuted).map(name => ($(name).first().json || {{}})._timing))
+  .filter(Boolean).sort((a, b) => b.last - a.last)[0];
+const __timing = __prev
+  ? {{ start: __prev.start, last: __prev.last, at: __prev.at, ms: {{ ...__prev.ms }} }}
+  : {{ start: __t0, ms: {{}} }};
+if (__prev) {{
+  const __gap = ({gaps})[__prev.at] || {hop};
+  __timing.ms[__gap] = (__timing.ms[__gap] || 0) + (__t0 - __prev.last);
+}}"""
+
+CHECKPOINT_CALL = """const __out = await (async function ($input, $json) {{
+{code}
+}})($input, $json);
+const __t1 = Date.now();
+__timing.ms[{name}] = __t1 - __t0;
+__timing.last = __t1;
+__timing.at = {name};"""
+
+CHECKPOINT_METRICS = """// Rolling per-node aggregates in the saved session: [count, mean_ms, max_ms]
+const __fold = (entry, ms) => (entry
+  ? [entry[0] + 1, Math.round((entry[1] + {alpha} * (ms - entry[1])) * 10) / 10, Math.max(entry[2], ms)]
+  : [1, ms, ms]);
+const __metrics = session => {{
+  const metrics = session.metrics || {{ turn: null, nodes: {{}} }};
+  metrics.turn = __fold(metrics.turn, __t1 - __timing.start);
+  for (const [node, ms] of Object.entries(__timing.ms)) metrics.nodes[node] = __fold(metrics.nodes[node], ms);
+  session.metrics = metrics;
+}};"""
+
+CHECKPOINT_END = """for (const entry of Array.isArray(__out) ? __out : [__out]) {{
+  const json = entry && entry.json !== undefined ? entry.json : entry;
+  if (json && typeof json === 'object') {{
+    json._timing = __timing;{fold}
+  }}
+}}
+return __out;"""
+
+FOLD_LINE = """
+    if (json.{field} && typeof json.{field} === 'object') __metrics(json.{field});"""
+
+# Response metadata.timing, when the request asked for timing
+RESPONSE_LINE = """
+    if (json.response_body && json.response_body.metadata && (json.response_options || {}).timing) {
+      json.response_body.metadata.timing = { total_ms: __t1 - __timing.start, nodes: __timing.ms };
+    }"""
+
+
+# ============================================================================
+# Graph
+# ============================================================================
+
+def upstream_checkpoints(workflow, name):
+    """Nearest upstream Code nodes → the LLM / Redis nodes between them and `name`."""
+    nodes = node_map(workflow)
+    found = {}
+
+    def walk(current, between):
+        for source in predecessors(workflow, current):
+            node = nodes[source]
+            if node['type'] == CODE_TYPE:
+                labels = found.setdefault(source, [])
+                for label in between:
+                    if label not in labels:
+                        labels.append(label)
+                if not between and HOP_LABEL not in labels:
+                    labels.append(HOP_LABEL)
+            elif node['type'] in (REDIS_TYPE, LLM_TYPE):
+                walk(source, [source] + between)
+            elif node['type'] == SWITCH_TYPE:
+                walk(source, between)
+
+    walk(name, [])
+    # A measured node on one path and a plain hop on another: the measured node wins
+    return {source: ' + '.join(label for label in labels if label != HOP_LABEL or len(labels) == 1)
+            for source, labels in found.items()}
+
+
+def saved_fields(workflow, name):
+    """Fields of this node's output that a following Redis SET stores."""
+    nodes = node_map(workflow)
+    fields = []
+    for target in successors(workflow, name):
+        node = nodes[target]
+        if node['type'] == REDIS_TYPE and node['parameters'].get('operation') == 'set':
+            fields += SAVED_FIELD.findall(node['parameters'].get('value', ''))
+    return fields
+
+
+def feeds_response(workflow, name):
+    """The webhook response follows this node, directly or after Redis nodes."""
+    nodes = node_map(workflow)
+    for target in successors(workflow, name):
+        if nodes[target]['type'] == RESPOND_TYPE:
+            return True
+        if nodes[target]['type'] == REDIS_TYPE and feeds_response(workflow, target):
+            return True
+    return False
+
+
+# ============================================================================
+# Instrumentation
+# ============================================================================
+
+def checkpoint_code(name, code, gaps, response=False, fields=()):
+    parts = [CHECKPOINT_START.format(marker=WRAPPED_MARKER, candidates=json.dumps(sorted(gaps)),
+                                     gaps=json.dumps(gaps, sort_keys=True), hop=json.dumps(HOP_LABEL))]
+    parts.append(CHECKPOINT_CALL.format(code=code, name=json.dumps(name)))
+    if fields:
+        parts.append(CHECKPOINT_METRICS.format(alpha=METRICS_ALPHA))
+    fold = ''.join(FOLD_LINE.format(field=field) for field in fields)
+    if response:
+        fold += RESPONSE_LINE
+    parts.append(CHECKPOINT_END.format(fold=fold))
+    return '\n'.join(parts)
+
+
+def instrument(workflow):
+    """Wrap every Code node in place; returns {name: {gaps, response, metrics}} (skipped nodes omitted)."""
+    report = {}
+    for node in workflow['nodes']:
+        if node['type'] != CODE_TYPE:
+            continue
+        code = node['parameters'].get('jsCode', '')
+        if WRAPPED_MARKER in code:
+            raise ValueError(f"{node['name']} is already instrumented - build from an uninstrumented export")
+        if node['parameters'].get('mode', 'runOnceForAllItems') != 'runOnceForAllItems':
+            continue
+        gaps = upstream_checkpoints(workflow, node['name'])
+        response = feeds_response(workflow, node['name'])
+        fields = saved_fields(workflow, node['name'])
+        node['parameters']['jsCode'] = checkpoint_code(node['name'], code, gaps, response, fields)
+        report[node['name']] = {'gaps': gaps, 'response': response, 'metrics': fields}
+    workflow['name'] = f"{workflow.get('name', 'workflow')} (timed)"
+    return report
+
+
+# ============================================================================
+# README table
+# ============================================================================
+
+def print_table(path):
+    """The README "Expected Latency" table from a load_test.py --timing report."""
+    with open(path) as f:
+        report = json.load(f)
+    stages = (report.get('timing') or {}).get('stages')
+    if not stages:
+        print(f"✗ {path} has no timing - run load_test.py --timing against an instrumented workflow")
+        return 1
+    turns = report['timing']['turns']
+    print(f"Measured: {turns} turns, {report['config']['url']}\n")
+    print('| Operation | p50 | p95 |')
+    print('|-----------|-----|-----|')
+    for label in LATENCY_STAGES:
+        stage = stages.get(label)
+        if stage and stage['p50_ms'] is not None:
+            print(f"| {label} | {stage['p50_ms']:.0f}ms | {stage['p95_ms']:.0f}ms |")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--input', default=WORKFLOW_FILE)
+    parser.add_argument('--output', default=OUTPUT_FILE)
+    parser.add_argument('--table', metavar='REPORT', help='print the README latency table from a load_test.py report')
+    args = parser.parse_args()
+    if args.table:
+        return print_table(args.table)
+
+    workflow = load_workflow(args.input)
+    report = instrument(workflow)
+    width = max(len(name) for name in report)
+    for name, entry in report.items():
+        extras = (['response metadata.timing'] if entry['response'] else []) + \
+                 [f'{field}.metrics' for field in entry['metrics']]
+        before = ', '.join(f'{source} ({label})' for source, label in sorted(entry['gaps'].items())) or 'turn start'
+        print(f"  {name:<{width}}  after {before}{'   + ' + ', '.join(extras) if extras else ''}")
+
+    code = {node['name']: node['parameters']['jsCode'] for node in workflow['nodes']
+            if node['type'] == CODE_TYPE and node['name'] in report}
+    errors = run_node(CHECK_SCRIPT, code)
+    if errors:
+        for name, error in errors.items():
+            print(f"✗ {name}: instrumented code does not compile: {error}")
+        return 1
+    print(f"\n✓ {len(report)} Code nodes instrumented")
+
+    save_workflow(workflow, args.output)
+    print(f"✓ Wrote {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
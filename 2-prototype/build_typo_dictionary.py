@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Generate the typo dictionary used by Semantic Validator and Teach-back validator.
+
+PROBLEM: The validators match keywords exactly. Eight-year-olds write
+"subtrakt", "negitive", "ading" and "rite", so a correct answer falls through
+to `stuck` and costs an extra scaffolding LLM turn.
+
+SOLUTION: Precompute a SymSpell-style symmetric-delete dictionary from the
+registry keywords (SEMANTIC_PATTERNS) plus the teach-back vocabulary:
+every keyword is indexed under all strings reachable by deleting up to
+MAX_EDIT characters. At runtime a token's own delete variants are looked up
+in that index (functions/typo_normalizer.js) - a bounded number of hash
+lookups, independent of the vocabulary size.
+
+Ordinary words are the risky part ("let" is one edit from "left", "that"
+from "than", "native" two from "negative"), so:
+  - keywords and tokens shorter than MIN_CORRECTION_LENGTH letters are
+    exact-only (aliases still apply)
+  - the allowed distance grows with word length (see max_distance)
+  - no word in english_words.txt is rewritten into a different keyword: the
+    ones the normalizer would otherwise correct are stored as `protected`.
+    Inflections of the keyword itself (backwards, negatives, imagine) are
+    still corrected - they mean the same thing
+
+Output: generated/typo_dictionary.js (embedded into both validators)
+
+    python3 build_typo_dictionary.py          # generate and embed
+    python3 build_typo_dictionary.py --check  # typo and false-positive corpus
+"""
+
+import argparse
+import json
+
+from workflow_utils import (
+    find_node, load_function_source, load_workflow, replace_marked_block,
+    run_node, save_workflow,
+)
+
+OUTPUT_FILE = 'generated/typo_dictionary.js'
+NORMALIZER_SOURCE = 'functions/typo_normalizer.js'
+NORMALIZER_EXPORTS = ['normalizeTypos']
+BLOCK_MARKER = 'TYPO_DICTIONARY (generated by build_typo_dictionary.py)'
+INPUT_ANCHOR = '  const input = $input.first().json;'
+TARGET_NODES = ['Semantic Validator', 'Teach-back validator']
+
+MAX_EDIT = 2
+# Shorter tokens and keywords are only matched exactly
+MIN_CORRECTION_LENGTH = 5
+ENGLISH_WORDS_FILE = 'english_words.txt'
+
+# Words the Teach-back validator looks for that are not in SEMANTIC_PATTERNS
+TEACH_BACK_VOCABULARY = [
+    'followed', 'counted', 'started', 'imagined', 'pictured', 'visualized',
+    'because', 'first', 'then', 'number', 'line', 'steps', 'easy',
+]
+
+# Homophones and kid spellings that edit distance alone would not reach
+ALIASES = {
+    'rite': 'right',
+    'wright': 'right',
+    'rigt': 'right',
+    'lef': 'left',
+    'ad': 'add',
+    'subtrac': 'subtract',
+    'minis': 'minus',
+}
+
+# (message, expected normalized text): misspelled keywords are corrected,
+# ordinary words next to a keyword are left alone
+CHECK_CORPUS = [
+    ('i subtrakt', 'i subtract'),
+    ('its negitive', 'its negative'),
+    ('ading 5', 'adding 5'),
+    ('move to the rite', 'move to the right'),
+    ('i moved rihgt', 'i moved right'),
+    ('we go backwrd', 'we go backward'),
+    ('it is posative', 'it is positive'),
+    ('i imagend a line', 'i imagined a line'),
+    ('let me think... right', 'let me think... right'),
+    ("lets see, that's less", "lets see, that's less"),
+    ('they said then', 'they said then'),
+    ('i live on a number line', 'i live on a number line'),
+    ('thank you, it is less than zero', 'thank you, it is less than zero'),
+    ('my legs are tired', 'my legs are tired'),
+    ('a native plant', 'a native plant'),
+    ('the counter said 2', 'the counter said 2'),
+    ('padding', 'padding'),
+    ('i went backwards', 'i went backward'),
+    ('i used my fist', 'i used my fist'),
+    ('the light is on', 'the light is on'),
+    ('in that position', 'in that position'),
+]
+
+REWRITTEN_SCRIPT = """
+const { normalizeTypos } = require('./functions/typo_normalizer.js');
+const { dictionary, words } = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+process.stdout.write(JSON.stringify(words
+  .map(word => [word, normalizeTypos(word, dictionary).text])
+  .filter(([word, corrected]) => corrected !== word)));
+"""
+
+CHECK_SCRIPT = """
+const { normalizeTypos } = require('./functions/typo_normalizer.js');
+const { dictionary, messages } = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+process.stdout.write(JSON.stringify(messages.map(message => normalizeTypos(message, dictionary).text)));
+"""
+
+REGISTRY_SCRIPT = """
+const { SEMANTIC_PATTERNS } = require('./config_registries.js');
+process.stdout.write(JSON.stringify(SEMANTIC_PATTERNS));
+"""
+
+
+def max_distance(word):
+    """Edits allowed for a keyword: none for short words, two for long ones."""
+    if len(word) < MIN_CORRECTION_LENGTH:
+        return 0
+    if len(word) <= 7:
+        return 1
+    return 2
+
+
+def delete_variants(word, distance):
+    variants = {word}
+    frontier = [word]
+    for _ in range(distance):
+        following = []
+        for current in frontier:
+            for i in range(len(current)):
+                variant = current[:i] + current[i + 1:]
+                if variant not in variants:
+                    variants.add(variant)
+                    following.append(variant)
+        frontier = following
+    return variants
+
+
+def registry_words(semantic_patterns):
+    """Single words from every keyword list, in registry order."""
+    words = []
+    for config in semantic_patterns.values():
+        for pattern in config['patterns']:
+            for field in ('expectedKeywords', 'wrongKeywords'):
+                sets = pattern.get(field) or []
+                lists = sets.values() if isinstance(sets, dict) else [sets]
+                for keywords in lists:
+                    for phrase in keywords:
+                        words.extend(phrase.lower().split())
+    return words
+
+
+def english_words():
+    with open(ENGLISH_WORDS_FILE) as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+
+def build_dictionary(semantic_patterns):
+    vocabulary = []
+    for word in registry_words(semantic_patterns) + TEACH_BACK_VOCABULARY:
+        if word.isalpha() and word not in vocabulary:
+            vocabulary.append(word)
+
+    deletes = {}
+    distances = []
+    for word_id, word in enumerate(vocabulary):
+        distances.append(max_distance(word))
+        for variant in sorted(delete_variants(word, distances[-1])):
+            deletes.setdefault(variant, []).append(word_id)
+
+    for alias, target in ALIASES.items():
+        if target not in vocabulary:
+            raise ValueError(f'Alias {alias!r} points to unknown keyword {target!r}')
+
+    dictionary = {
+        'max_edit': MAX_EDIT,
+        'min_length': MIN_CORRECTION_LENGTH,
+        'words': vocabulary,
+        'max_distance': distances,
+        'deletes': deletes,
+        'aliases': ALIASES,
+        'protected': {},
+    }
+    # Only the English words the normalizer would rewrite need to be stored
+    candidates = [word for word in english_words() if word not in vocabulary and word not in ALIASES]
+    for word, keyword in run_node(REWRITTEN_SCRIPT, {'dictionary': dictionary, 'words': candidates}):
+        if not (word.startswith(keyword) or keyword.startswith(word)):
+            dictionary['protected'][word] = 1
+    return dictionary
+
+
+def render_module(dictionary):
+    data = json.dumps(dictionary, separators=(',', ':'), sort_keys=False)
+    return (
+        '// Generated from config_registries.js by build_typo_dictionary.py - do not edit by hand\n'
+        f'const TYPO_DICTIONARY = {data};\n\n'
+        "if (typeof module !== 'undefined' && module.exports) {\n"
+        '  module.exports = { TYPO_DICTIONARY };\n'
+        '}\n'
+    )
+
+
+def embedded_block(dictionary):
+    data = json.dumps(dictionary, separators=(',', ':'))
+    return f'const TYPO_DICTIONARY = {data};\n\n{load_function_source(NORMALIZER_SOURCE, NORMALIZER_EXPORTS)}'
+
+
+MESSAGE_OLD = "  const studentMessage = (input.student_message || input.message || '').toLowerCase();"
+MESSAGE_NEW = ("  const studentMessage = normalizeTypos(\n"
+               "    (input.student_message || input.message || '').toLowerCase(), TYPO_DICTIONARY\n"
+               "  ).text;")
+
+
+def embed(workflow, dictionary):
+    block = embedded_block(dictionary)
+    for name in TARGET_NODES:
+        node = find_node(workflow, name)
+        if not node:
+            raise ValueError(f'{name} not found')
+        code = node['parameters']['jsCode']
+        code = replace_marked_block(code, BLOCK_MARKER, block, anchor=INPUT_ANCHOR)
+        if MESSAGE_NEW not in code:
+            if MESSAGE_OLD not in code:
+                raise ValueError(f'studentMessage line not found in {name}')
+            code = code.replace(MESSAGE_OLD, MESSAGE_NEW, 1)
+        node['parameters']['jsCode'] = code
+
+
+def check(dictionary):
+    messages = [message for message, _ in CHECK_CORPUS]
+    normalized = run_node(CHECK_SCRIPT, {'dictionary': dictionary, 'messages': messages})
+    wrong = [(message, expected, got) for (message, expected), got in zip(CHECK_CORPUS, normalized) if got != expected]
+    for message, expected, got in wrong:
+        print(f"✗ {message!r} → {got!r} (expected {expected!r})")
+    if not wrong:
+        print(f"✓ {len(CHECK_CORPUS)} corpus messages normalized as expected")
+    return not wrong
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--no-embed', action='store_true', help='do not touch the workflow')
+    parser.add_argument('--check', action='store_true', help='run the corpus, do not write anything')
+    args = parser.parse_args()
+
+    dictionary = build_dictionary(run_node(REGISTRY_SCRIPT))
+    if args.check:
+        return 0 if check(dictionary) else 1
+    with open(OUTPUT_FILE, 'w') as f:
+        f.write(render_module(dictionary))
+
+    print(f"  Keywords:        {len(dictionary['words'])}")
+    print(f"  Delete variants: {len(dictionary['deletes'])}")
+    print(f"  Protected words: {len(dictionary['protected'])}")
+    print(f"  Wrote {OUTPUT_FILE} ({len(render_module(dictionary)) / 1024:.1f} KB)")
+
+    if args.no_embed:
+        return 0
+
+    workflow = load_workflow()
+    embed(workflow, dictionary)
+    save_workflow(workflow)
+    print(f"✓ Embedded typo dictionary into {', '.join(TARGET_NODES)}")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
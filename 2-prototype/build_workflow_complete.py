@@ -7,6 +7,8 @@ Builds the entire new workflow JSON with all nodes and connections
 import json
 import uuid
 
+from build_registries import registry_declarations
+
 def main():
     print("=" * 70)
     print("BUILDING COMPLETE OPTION A WORKFLOW")
@@ -40,21 +42,11 @@ def main():
     base_x, base_y = load_session['position']
     print(f"Base position from Load Session: [{base_x}, {base_y}]")
 
-    # Read config file
-    with open('config_registries.js', 'r') as f:
-        config_content = f.read()
-
-    # Extract ERROR_DETECTORS (for Enhanced Numeric Verifier)
-    start_idx = config_content.find('const ERROR_DETECTORS = {')
-    end_idx = config_content.find('\n// ============================================================================\n// SEMANTIC PATTERN REGISTRY')
-    error_detectors_code = config_content[start_idx:end_idx].strip()
-
-    # Extract SEMANTIC_PATTERNS (for Semantic Validator)
-    start_idx = config_content.find('const SEMANTIC_PATTERNS = {')
-    end_idx = config_content.find('\n  // FUTURE: Add patterns for other subjects\n  // \'history_time_period\'')
-    semantic_patterns_code = config_content[start_idx:end_idx].strip()
+    # Compiled and validated registries (build_registries.py)
+    error_detectors_code = registry_declarations(['ERROR_DETECTORS', 'ERROR_DETECTOR_BY_OPERATION'])
+    semantic_patterns_code = registry_declarations(['SEMANTIC_PATTERNS'])
 
-    print(f"\nExtracted config:")
+    print(f"\nCompiled config:")
     print(f"  ERROR_DETECTORS: {len(error_detectors_code)} chars")
     print(f"  SEMANTIC_PATTERNS: {len(semantic_patterns_code)} chars")
 
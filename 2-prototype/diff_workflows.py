@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Diff two workflow exports by what they cost per turn.
+
+PROBLEM:
+workflow-production-ready.json and its backup sit side by side, and the
+fix_*.py scripts rewrite prompts and Code nodes in place. `git diff` on the
+export shows a wall of escaped JSON; what a change does at runtime - one
+more LLM call on a route, 400 more prompt tokens for every stuck turn, a
+higher maxTokens, a Code node twice the size - is not visible until the
+OpenAI bill or the latency numbers move.
+
+SOLUTION:
+Compare two exports (files, or git revisions as REV:./path) and report:
+
+  - nodes and edges added / removed; a node whose name only gained or lost
+    n8n's copy suffix ("Load Session" → "Load Session1") with the same type
+    counts as renamed, and its edges as unchanged
+  - per LLM node: prompt tokens of the template as stored (every branch of
+    its expressions) and rendered (mean per call over the golden
+    conversations of exemplars/questions.json, run through
+    benchmarks/workflow_walk.js), model, maxTokens, temperature
+  - per route - the output of the last Switch before the response, i.e. the
+    category: LLM calls and prompt tokens per turn on its costliest path.
+    Rendered, each LLM call of the golden turns is rendered again with
+    `category` set to the route, so "Response: Unified1" costs what it
+    costs for a stuck turn even when no golden turn ends up stuck
+  - Code node sizes
+
+An AI Agent counts as one LLM call with its system message, text and tool
+descriptions as prompt and the settings of its chat model; memory and tool
+round trips come on top. Tokens are estimated at CHARS_PER_TOKEN, as in
+benchmarks/cassette.js. Rendering needs a workflow the walker can run
+(Webhook trigger, the node types of the current export); otherwise that
+side shows "-" and route deltas are template deltas. An LLM node no golden
+turn reaches (Synthesis LLM1 with the local stand-ins) counts with its
+template.
+
+    python3 diff_workflows.py                                # backup → current
+    cp workflow-production-ready.json /tmp/before.json && python3 fix_something.py
+    python3 diff_workflows.py /tmp/before.json workflow-production-ready.json
+    python3 diff_workflows.py HEAD:./workflow-production-ready.json workflow-production-ready.json \\
+        --max-token-growth 200 --json diff.json              # exit 1: a route grew by more
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+
+from analyze_latency import LLM_TYPE, RESPOND_TYPE, SWITCH_TYPE, node_map, route_paths
+from optimize_workflow import CODE_TYPE
+from workflow_utils import WORKFLOW_FILE, load_workflow, run_node
+
+BACKUP_FILE = 'workflow-production-ready-backup.json'
+
+AGENT_TYPE = '@n8n/n8n-nodes-langchain.agent'
+TOOL_CODE_TYPE = '@n8n/n8n-nodes-langchain.toolCode'
+CODE_TYPES = {CODE_TYPE, TOOL_CODE_TYPE}
+
+# Rough token estimate for English prompts (benchmarks/cassette.js countTokens)
+CHARS_PER_TOKEN = 4
+
+COPY_SUFFIX = re.compile(r'\s*\d+$')
+
+# Golden conversations through the walker with the local LLM stand-in. Every
+# OpenAI node call is also re-rendered once per route key, with the call's
+# input item and `category` set to the key. Prints {turns, calls: {node:
+# [prompt_tokens]}, routes: {node: {key: [prompt_tokens]}}} or {error}
+RENDER_SCRIPT = r"""
+const fs = require('fs');
+const { walkTurn, evaluateParameter } = require('./benchmarks/workflow_walk.js');
+const { goldenScripts } = require('./benchmarks/bench_golden.js');
+const { MemoryRedis, localLlm } = require('./benchmarks/stand_ins.js');
+const { workflow, keys } = JSON.parse(fs.readFileSync(0, 'utf8'));
+const tokens = text => Math.ceil(String(text).length / %d);
+const push = (entries, key, value) => (entries[key] || (entries[key] = [])).push(value);
+(async () => {
+  const trigger = workflow.nodes.find(node => node.type === 'n8n-nodes-base.webhook');
+  if (!trigger) return { error: 'no Webhook trigger' };
+  const llmNodes = new Map(workflow.nodes.filter(node => node.type === '%s').map(node => [node.name, node]));
+  const scripts = goldenScripts(JSON.parse(fs.readFileSync('exemplars/questions.json', 'utf8')).questions);
+  const redis = new MemoryRedis();
+  const local = localLlm();
+  const result = { turns: 0, calls: {}, routes: {} };
+  for (const script of scripts) {
+    for (const turn of script.turns) {
+      const run = await walkTurn(workflow, {
+        trigger: trigger.name,
+        body: {
+          student_id: 'diff', session_id: `diff_${script.id}`, message: turn.message, current_problem: script.problem
+        },
+        headers: {},
+        redis,
+        capture: true,
+        llm: (node, prompt, item) => { push(result.calls, node, tokens(prompt)); return local(node, prompt, item); }
+      });
+      result.turns++;
+      const outputs = new Map(run.runs.map(step => [step.node, step.items]));
+      const $ = name => ({
+        isExecuted: outputs.has(name), first: () => outputs.get(name)[0], all: () => outputs.get(name)
+      });
+      for (const step of run.runs.filter(step => llmNodes.has(step.node))) {
+        const routes = result.routes[step.node] || (result.routes[step.node] = {});
+        for (const key of keys) {
+          const item = { json: { ...step.input[0].json, category: key } };
+          const $input = { first: () => item, last: () => item, all: () => [item], item };
+          const context = { $json: item.json, $input, $ };
+          try {
+            push(routes, key, tokens(llmNodes.get(step.node).parameters.messages.values
+              .map(message => evaluateParameter(message.content, context)).join('\\n')));
+          } catch (error) {
+            // An expression that needs data this category never has: no sample
+          }
+        }
+      }
+    }
+  }
+  return result;
+})().catch(error => ({ error: error.message })).then(result => process.stdout.write(JSON.stringify(result)));
+""" % (CHARS_PER_TOKEN, LLM_TYPE)
+
+
+def load_version(spec):
+    """A workflow file, or REV:path read with `git show` (path relative to the repo root, or ./path)."""
+    if os.path.exists(spec) or ':' not in spec:
+        return load_workflow(spec)
+    result = subprocess.run(['git', 'show', spec], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise FileNotFoundError(f'{spec}: {result.stderr.strip()}')
+    return json.loads(result.stdout)
+
+
+def count_tokens(text):
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def mean(values):
+    return round(sum(values) / len(values)) if values else None
+
+
+# ============================================================================
+# What each version contains
+# ============================================================================
+
+def sub_nodes(workflow, name, kind):
+    """Nodes attached to `name` through an ai_* connection (chat model, tools)."""
+    return [source for source, outputs in workflow['connections'].items()
+            for branch in outputs.get(kind) or [] for target in branch or [] if target['node'] == name]
+
+
+def llm_nodes(workflow):
+    """{name: {template_tokens, model, max_tokens, temperature}} of the nodes that call a model."""
+    nodes = node_map(workflow)
+    found = {}
+    for name, node in nodes.items():
+        parameters = node['parameters']
+        if node['type'] == LLM_TYPE:
+            prompt = [message.get('content', '') for message in parameters.get('messages', {}).get('values', [])]
+            settings = parameters
+        elif node['type'] == AGENT_TYPE:
+            prompt = [parameters.get('options', {}).get('systemMessage', ''), parameters.get('text', '')] + \
+                [nodes[tool]['parameters'].get('description', '') for tool in sub_nodes(workflow, name, 'ai_tool')]
+            models = sub_nodes(workflow, name, 'ai_languageModel')
+            settings = nodes[models[0]]['parameters'] if models else {}
+        else:
+            continue
+        model = settings.get('modelId', settings.get('model'))
+        options = settings.get('options', {})
+        found[name] = {
+            'template_tokens': count_tokens('\n'.join(prompt)),
+            'model': model.get('value') if isinstance(model, dict) else model,
+            'max_tokens': options.get('maxTokens'),
+            'temperature': options.get('temperature'),
+        }
+    return found
+
+
+def edges(workflow):
+    """{(source, connection type, output index, target)}"""
+    return {(source, kind, index, connection['node'])
+            for source, outputs in workflow['connections'].items()
+            for kind, branches in outputs.items()
+            for index, branch in enumerate(branches)
+            for connection in branch or []}
+
+
+def code_sizes(workflow):
+    return {node['name']: len(node['parameters'].get('jsCode', '').encode('utf-8'))
+            for node in workflow['nodes'] if node['type'] in CODE_TYPES}
+
+
+def routes(workflow, llm):
+    """{route: [[LLM node, ...] per distinct path]} - route: output of the last Switch before the response."""
+    nodes = node_map(workflow)
+    sinks = {name for name, node in nodes.items() if node['type'] == RESPOND_TYPE}
+    found = {}
+    for labels, path in route_paths(workflow, sinks):
+        switches = [name for name in path if nodes[name]['type'] == SWITCH_TYPE]
+        calls = [name for name in path if name in llm]
+        for key in labels[switches[-1]] if switches else [path[-1]]:
+            if calls not in found.setdefault(key, []):
+                found[key].append(calls)
+    return found
+
+
+def rendered(workflow, keys):
+    """Prompt tokens with sample data: {turns, nodes: {node: mean per call}, routes: {node: {route: mean}}}."""
+    result = run_node(RENDER_SCRIPT, {'workflow': workflow, 'keys': sorted(keys)})
+    if 'error' in result:
+        return result
+    return {
+        'turns': result['turns'],
+        'nodes': {node: mean(values) for node, values in result['calls'].items()},
+        'routes': {node: {key: mean(values) for key, values in per_key.items()}
+                   for node, per_key in result['routes'].items()},
+    }
+
+
+def summarize(workflow, render=True):
+    llm = llm_nodes(workflow)
+    paths = routes(workflow, llm)
+    return {
+        'types': {node['name']: node['type'] for node in workflow['nodes']},
+        'edges': edges(workflow),
+        'llm': llm,
+        'code': code_sizes(workflow),
+        'routes': paths,
+        'rendered': rendered(workflow, paths) if render else {'error': 'not rendered (--static)'},
+    }
+
+
+# ============================================================================
+# Diff
+# ============================================================================
+
+def pair_nodes(old_types, new_types):
+    """old name → new name: the same name, or the same type and name up to n8n's copy suffix."""
+    pairs = {name: name for name in old_types if new_types.get(name) == old_types[name]}
+    removed = [name for name in old_types if name not in pairs]
+    added = [name for name in new_types if name not in pairs.values()]
+    for name in removed:
+        matches = [other for other in added if new_types[other] == old_types[name]
+                   and COPY_SUFFIX.sub('', other) == COPY_SUFFIX.sub('', name)]
+        if len(matches) == 1:
+            pairs[name] = matches[0]
+            added.remove(matches[0])
+    return pairs
+
+
+def delta(before, after):
+    return None if before is None or after is None else after - before
+
+
+def route_cost(version, route, basis):
+    """{'calls': [min, max], 'tokens': prompt tokens per turn on the costliest path} or None."""
+    paths = version['routes'].get(route)
+    if not paths:
+        return None
+    samples = version['rendered']
+
+    def tokens(node):
+        if basis == 'rendered':
+            by_route = samples['routes'].get(node, {})
+            if by_route.get(route) is not None:
+                return by_route[route]
+            if samples['nodes'].get(node) is not None:
+                return samples['nodes'][node]
+        return version['llm'][node]['template_tokens']
+
+    return {'calls': [min(len(path) for path in paths), max(len(path) for path in paths)],
+            'tokens': max(sum(tokens(node) for node in path) for path in paths)}
+
+
+def diff(old, new):
+    pairs = pair_nodes(old['types'], new['types'])
+    renamed = {name: other for name, other in pairs.items() if name != other}
+    mapped = {(pairs.get(source, source), kind, index, pairs.get(target, target))
+              for source, kind, index, target in old['edges']}
+
+    def side_by_side(key):
+        """{name after (or before, if removed): (name before, name after)} over both versions."""
+        names = {pairs.get(name, name): (name, None) for name in old[key]}
+        for name in new[key]:
+            names[name] = (names.get(name, (None, None))[0], name)
+        return dict(sorted(names.items()))
+
+    llm = {}
+    for name, (before, after) in side_by_side('llm').items():
+        entry = {'before': before, 'after': after}
+        for key in ('template_tokens', 'model', 'max_tokens', 'temperature'):
+            entry[key] = [before and old['llm'][before][key], after and new['llm'][after][key]]
+        entry['rendered_tokens'] = [before and old['rendered'].get('nodes', {}).get(before),
+                                    after and new['rendered'].get('nodes', {}).get(after)]
+        llm[name] = entry
+
+    basis = 'template' if 'error' in old['rendered'] or 'error' in new['rendered'] else 'rendered'
+    route_diff = {}
+    for route in sorted(set(old['routes']) | set(new['routes'])):
+        costs = [route_cost(version, route, basis) for version in (old, new)]
+        templates = [route_cost(version, route, 'template') for version in (old, new)]
+        route_diff[route] = {
+            'llm_calls': [cost and cost['calls'] for cost in costs],
+            'template_tokens': [cost and cost['tokens'] for cost in templates],
+            'rendered_tokens': [None if 'error' in version['rendered']
+                                else (route_cost(version, route, 'rendered') or {}).get('tokens')
+                                for version in (old, new)],
+            'token_delta': delta(*[cost and cost['tokens'] for cost in costs]),
+        }
+
+    return {
+        'nodes': {
+            'added': sorted((name, new['types'][name]) for name in new['types'] if name not in pairs.values()),
+            'removed': sorted((name, old['types'][name]) for name in old['types'] if name not in pairs),
+            'renamed': renamed,
+        },
+        'edges': {'added': sorted(new['edges'] - mapped), 'removed': sorted(mapped - new['edges'])},
+        'llm': llm,
+        'basis': basis,
+        'routes': route_diff,
+        'code': {name: [before and old['code'][before], after and new['code'][after]]
+                 for name, (before, after) in side_by_side('code').items()},
+        'rendered': {side: version['rendered'].get('error') or f"{version['rendered']['turns']} golden turns"
+                     for side, version in (('before', old), ('after', new))},
+    }
+
+
+# ============================================================================
+# Report
+# ============================================================================
+
+def show(value, signed=False):
+    if value is None:
+        return '-'
+    if isinstance(value, list):
+        return str(value[0]) if value[0] == value[1] else f'{value[0]}-{value[1]}'
+    return f'{value:+}' if signed else str(value)
+
+
+def change(pair):
+    """"a → b (+d)" for numbers, "a → b" otherwise, "a" when unchanged."""
+    before, after = pair
+    if before == after:
+        return show(before)
+    step = delta(before, after) if all(isinstance(value, (int, float)) for value in pair) else None
+    return f"{show(before)} → {show(after)}" + (f" ({show(step, signed=True)})" if step else '')
+
+
+def edge_label(edge):
+    source, kind, index, target = edge
+    output = f'[{index}]' if index else ''
+    return f"{source}{output} → {target}" + ('' if kind == 'main' else f'  ({kind})')
+
+
+def print_report(result, old_name, new_name):
+    print(f"{old_name} → {new_name}")
+    print(f"Rendered with sample data: before {result['rendered']['before']}, after {result['rendered']['after']}")
+
+    nodes = result['nodes']
+    print(f"\nNodes: +{len(nodes['added'])} -{len(nodes['removed'])}, {len(nodes['renamed'])} renamed")
+    for name, kind in nodes['added']:
+        print(f"  + {name}  ({kind.split('.')[-1]})")
+    for name, kind in nodes['removed']:
+        print(f"  - {name}  ({kind.split('.')[-1]})")
+    for old, new in sorted(nodes['renamed'].items()):
+        print(f"  ~ {old} → {new}")
+
+    print(f"\nEdges: +{len(result['edges']['added'])} -{len(result['edges']['removed'])}")
+    for edge in result['edges']['added']:
+        print(f"  + {edge_label(edge)}")
+    for edge in result['edges']['removed']:
+        print(f"  - {edge_label(edge)}")
+
+    print("\nLLM nodes (prompt tokens: template, rendered mean per call)")
+    width = max([len(name) for name in result['llm']] + [4])
+    for name, entry in result['llm'].items():
+        state = '+' if entry['before'] is None else '-' if entry['after'] is None else ' '
+        settings = '   '.join(f"{label} {change(entry[key])}" for label, key in
+                               (('model', 'model'), ('maxTokens', 'max_tokens'), ('temperature', 'temperature'))
+                               if entry[key] != [None, None])
+        print(f"{state} {name:<{width}}  template {change(entry['template_tokens'])}   "
+              f"rendered {change(entry['rendered_tokens'])}")
+        if settings:
+            print(f"  {'':<{width}}  {settings}")
+
+    print("\nRoutes (per turn, costliest path: LLM calls, prompt tokens)")
+    width = max([len(name) for name in result['routes']] + [5])
+    for name, entry in result['routes'].items():
+        print(f"  {name:<{width}}  calls {change(entry['llm_calls'])}   template {change(entry['template_tokens'])}"
+              f"   rendered {change(entry['rendered_tokens'])}")
+
+    changed = {name: sizes for name, sizes in result['code'].items() if sizes[0] != sizes[1]}
+    totals = [sum(sizes[side] or 0 for sizes in result['code'].values()) for side in (0, 1)]
+    print(f"\nCode nodes: {change(totals)} bytes in total")
+    for name, sizes in changed.items():
+        print(f"  {name:<36} {change(sizes)}")
+
+    print(f"\nCost per turn ({result['basis']} prompts):")
+    moved = False
+    for name, entry in result['routes'].items():
+        calls = entry['llm_calls']
+        if None in calls:
+            moved = True
+            print(f"  {name}: route {'added' if calls[0] is None else 'removed'}")
+            continue
+        if entry['token_delta'] or calls[0] != calls[1]:
+            moved = True
+            tokens = f"{show(entry['token_delta'], signed=True)} prompt tokens" if entry['token_delta'] \
+                else 'prompt tokens unchanged'
+            print(f"  {name}: {tokens}" + (f", LLM calls {change(calls)}" if calls[0] != calls[1] else ''))
+    for name, entry in result['llm'].items():
+        if entry['before'] and entry['after'] and entry['max_tokens'][0] != entry['max_tokens'][1]:
+            moved = True
+            print(f"  {name}: maxTokens {change(entry['max_tokens'])} - worst-case completion time moves with it")
+    if not moved:
+        print("  unchanged")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('before', nargs='?', default=BACKUP_FILE, help='workflow file or REV:./path')
+    parser.add_argument('after', nargs='?', default=WORKFLOW_FILE, help='workflow file or REV:./path')
+    parser.add_argument('--static', action='store_true', help='skip rendering prompts with the golden conversations')
+    parser.add_argument('--json', metavar='FILE', help='write the diff as JSON')
+    parser.add_argument('--max-token-growth', type=int, metavar='TOKENS',
+                        help='exit 1 when a route\'s prompt tokens per turn grow by more')
+    args = parser.parse_args()
+
+    old = summarize(load_version(args.before), render=not args.static)
+    new = summarize(load_version(args.after), render=not args.static)
+    result = diff(old, new)
+    print_report(result, args.before, args.after)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"\n✓ Wrote {args.json}")
+
+    if args.max_token_growth is None:
+        return 0
+    grown = [name for name, entry in result['routes'].items()
+             if (entry['token_delta'] or 0) > args.max_token_growth]
+    if grown:
+        print(f"✗ Prompt tokens per turn grew by more than {args.max_token_growth} on: {', '.join(grown)}")
+        return 1
+    print(f"✓ No route grew by more than {args.max_token_growth} prompt tokens per turn")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Fix the errors lint_workflow.py reports on the shipped workflows.
+
+PROBLEM:
+docs/DEPLOYMENT.md gates an import on `python3 lint_workflow.py`, but it
+exited 1 on the production workflow:
+  - redis-set-no-ttl: Redis: Save Session(1) SETs tutor_session:<id> without
+    expiry, so every abandoned session stays in Redis (~3 KB each) instead
+    of the 30 minutes DEPLOYMENT.md promises
+  - unguarded-json-parse: Parse Synthesis Decision(1) parses the Synthesis
+    LLM reply outside try/catch; a reply in prose fails the whole turn after
+    the client already waited for two LLM calls
+
+SOLUTION:
+  - session SETs (key `tutor_session:...`) expire after SESSION_TTL_SECONDS,
+    refreshed on every saved turn
+  - the synthesis reply is parsed in try/catch; an unreadable reply means
+    action "continue" (keep scaffolding), what Response: Unified assumes
+    when synthesis_action is missing
+
+Both patches are idempotent and find nodes by type and key, so they also
+apply to an export re-saved from the n8n UI. The backup is left alone: it is
+the rollback artifact and stays byte-identical to what was last deployed
+(lint_workflow.py still reports its findings, without failing on them).
+
+    python3 fix_lint_errors.py                  # production workflow
+    python3 lint_workflow.py                    # exit 0
+"""
+
+import argparse
+
+from lint_workflow import CODE_TYPE, REDIS_TYPE, SESSION_TTL_SECONDS
+from workflow_utils import WORKFLOW_FILE, load_workflow, save_workflow
+
+SESSION_KEY_PREFIX = '=tutor_session:'
+SYNTHESIS_NODE_PREFIX = 'Parse Synthesis Decision'
+
+OLD_PARSE = """const parsed = JSON.parse(llmResponse);
+"""
+NEW_PARSE = """// A reply that is not JSON must not fail the turn: keep scaffolding
+let parsed;
+try {
+  parsed = JSON.parse(llmResponse);
+} catch (error) {
+  parsed = null;
+}
+if (!parsed || typeof parsed !== 'object') {
+  parsed = { action: 'continue', synthesis_hint: '' };
+}
+"""
+
+
+def add_session_ttl(workflow):
+    """Names of the session SET nodes that got an expiry."""
+    patched = []
+    for node in workflow['nodes']:
+        parameters = node['parameters']
+        if node['type'] != REDIS_TYPE or parameters.get('operation') != 'set':
+            continue
+        if not parameters.get('key', '').startswith(SESSION_KEY_PREFIX):
+            continue
+        if parameters.get('expire') and parameters.get('ttl') == SESSION_TTL_SECONDS:
+            continue
+        parameters['expire'] = True
+        parameters['ttl'] = SESSION_TTL_SECONDS
+        patched.append(node['name'])
+    return patched
+
+
+def guard_synthesis_parse(workflow):
+    """Names of the synthesis parse nodes that got the guard."""
+    patched = []
+    for node in workflow['nodes']:
+        if node['type'] != CODE_TYPE or not node['name'].startswith(SYNTHESIS_NODE_PREFIX):
+            continue
+        code = node['parameters']['jsCode']
+        if NEW_PARSE in code:
+            continue
+        if OLD_PARSE not in code:
+            raise ValueError(f"Expected code not found in {node['name']}: {OLD_PARSE.strip()!r}")
+        node['parameters']['jsCode'] = code.replace(OLD_PARSE, NEW_PARSE, 1)
+        patched.append(node['name'])
+    return patched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('files', nargs='*', default=[WORKFLOW_FILE],
+                        help='workflow JSON files (default: production)')
+    args = parser.parse_args()
+
+    for path in args.files:
+        workflow = load_workflow(path)
+        ttl = add_session_ttl(workflow)
+        guarded = guard_synthesis_parse(workflow)
+        if not ttl and not guarded:
+            print(f"  {path}: already fixed")
+            continue
+        save_workflow(workflow, path)
+        for name in ttl:
+            print(f"✓ {path}: {name} expires sessions after {SESSION_TTL_SECONDS} s")
+        for name in guarded:
+            print(f"✓ {path}: {name} parses the synthesis reply in try/catch")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,240 @@
+/**
+ * answer_phrase_analyzer.js
+ *
+ * Local answer extraction for messages that contain several numbers
+ * Handles: answer cues ("we get 2"), process cues ("5 steps"), written numbers
+ *
+ * PURPOSE: "that's 5 steps and we get 2" should resolve to 2 without asking
+ * an LLM. Every number in the message is scored by its context and the best
+ * answer candidate is returned with a confidence.
+ *
+ * OUTPUT:
+ *   {
+ *     value: 2,                 // answer candidate (null if no number)
+ *     confidence: 0.93,         // 0-1
+ *     role: "answer",           // answer | process | neutral
+ *     candidates: [{ value, score, role, text }]
+ *   }
+ *
+ * For use in n8n Code nodes or standalone Node.js
+ */
+
+const ANSWER_PHRASE_CONFIG = {
+  // Phrases right before a number that mark it as the answer
+  answerCues: [
+    'we get', 'i get', 'you get', 'get', 'got', 'land on', 'landed on', 'lands on',
+    'land at', 'end up at', 'end up on', 'ended up at', 'ended on', 'reach', 'reached',
+    'to reach', 'equals', 'equal', 'is equal to', '=', "it's", 'its', 'it is',
+    "that's", 'thats', 'is', 'answer is', 'the answer is', 'i think', 'think',
+    'maybe', 'so', 'makes', 'at'
+  ],
+  // Phrases right before a number that mark it as part of the process
+  processLeadCues: [
+    'move', 'moved', 'moving', 'go', 'went', 'count', 'counted', 'jump', 'jumped',
+    'from', 'start at', 'started at', 'start from', 'add', 'added', 'subtract',
+    'subtracted', 'take away', 'plus', 'minus', 'times', 'another', 'then'
+  ],
+  // Words right after a number that mark it as part of the process
+  processTailCues: [
+    'steps', 'step', 'spaces', 'space', 'jumps', 'jump', 'times', 'more', 'places',
+    'units', 'to the right', 'to the left', 'and'
+  ],
+  // Words right after a number that describe a position (an answer)
+  positionTailCues: ['past zero', 'after zero', 'right of zero', 'left of zero', 'below zero', 'above zero'],
+  numberWords: {
+    zero: 0, one: 1, two: 2, three: 3, four: 4, five: 5, six: 6, seven: 7,
+    eight: 8, nine: 9, ten: 10, eleven: 11, twelve: 12, thirteen: 13,
+    fourteen: 14, fifteen: 15, sixteen: 16, seventeen: 17, eighteen: 18,
+    nineteen: 19, twenty: 20
+  }
+};
+
+/**
+ * Find every number in a message (digits, fractions, written numbers)
+ *
+ * @param {string} message - Raw student message
+ * @returns {Array} [{value, start, end, text}]
+ */
+function findNumbers(message) {
+  const words = Object.keys(ANSWER_PHRASE_CONFIG.numberWords).join('|');
+  const pattern = new RegExp(
+    '(?:\\b(negative|minus)\\s+)?' +
+    '(?:(-|−)?(\\d+(?:\\.\\d+)?(?:\\/\\d+)?|\\.\\d+)|\\b(' + words + ')\\b)',
+    'gi'
+  );
+
+  const found = [];
+  let match;
+  while ((match = pattern.exec(message)) !== null) {
+    let value;
+    if (match[3] !== undefined) {
+      const [numerator, denominator] = match[3].split('/');
+      value = denominator ? parseFloat(numerator) / parseFloat(denominator) : parseFloat(numerator);
+    } else {
+      value = ANSWER_PHRASE_CONFIG.numberWords[match[4].toLowerCase()];
+    }
+
+    // "minus 5" after another number is an operation, not a sign
+    const signWord = match[1] ? match[1].toLowerCase() : null;
+    const before = message.slice(0, match.index).trim();
+    const signIsOperator = signWord === 'minus' && new RegExp('(\\d|\\b(' + words + '))$').test(before);
+    const dashIsOperator = match[2] && /[\d)]\s*$/.test(message.slice(0, match.index));
+    if ((signWord && !signIsOperator) || (match[2] && !dashIsOperator)) {
+      value = -value;
+    }
+
+    // "past zero", "left of zero": zero is a landmark, not a candidate
+    if (match[4] && match[4].toLowerCase() === 'zero' && /\b(past|after|of|below|above)\s*$/.test(before)) {
+      continue;
+    }
+
+    const start = signIsOperator ? match.index + match[0].indexOf(match[3] || match[4]) : match.index;
+    found.push({ value, start, end: match.index + match[0].length, text: message.slice(start, match.index + match[0].length) });
+  }
+  return found;
+}
+
+// Length of the longest cue `text` ends with (0 if none) - "start at" beats "at"
+function endingCueLength(text, cues) {
+  let longest = 0;
+  for (const cue of cues) {
+    if (text === cue || text.endsWith(' ' + cue) || (cue === '=' && text.endsWith('='))) {
+      longest = Math.max(longest, cue.length);
+    }
+  }
+  return longest;
+}
+
+function startsWithCue(text, cues) {
+  return cues.some(cue => text === cue || text.startsWith(cue + ' ') || text.startsWith(cue + ','));
+}
+
+/**
+ * Score each number in a message and pick the answer candidate
+ *
+ * @param {string} message - Raw student message
+ * @returns {object} {value, confidence, role, candidates}
+ */
+function analyzeAnswerPhrases(message) {
+  const text = String(message || '').toLowerCase().replace(/[’‘]/g, "'");
+  const numbers = findNumbers(text);
+
+  if (numbers.length === 0) {
+    return { value: null, confidence: 0, role: 'neutral', candidates: [] };
+  }
+
+  const stripped = text.replace(/[\s?!.,]+/g, ' ').trim();
+  const candidates = numbers.map((number, index) => {
+    const lead = text.slice(0, number.start).replace(/[^a-z0-9=' ]+/g, ' ').replace(/\s+/g, ' ').trim();
+    const tail = text.slice(number.end).replace(/[^a-z0-9' ]+/g, ' ').replace(/\s+/g, ' ').trim();
+
+    let score = 0;
+    let role = 'neutral';
+
+    const answerLead = endingCueLength(lead, ANSWER_PHRASE_CONFIG.answerCues);
+    const processLead = endingCueLength(lead, ANSWER_PHRASE_CONFIG.processLeadCues);
+    if (answerLead > processLead) {
+      score += 3;
+      role = 'answer';
+    } else if (processLead > 0) {
+      score -= 2;
+      role = 'process';
+    }
+
+    // "2 steps past zero" is a position, even though "steps" is a process word
+    const positionTail = tail.replace(/^(steps?|spaces?)\s+/, '');
+    if (startsWithCue(positionTail, ANSWER_PHRASE_CONFIG.positionTailCues)) {
+      score += 2;
+      role = 'answer';
+    } else if (startsWithCue(tail, ANSWER_PHRASE_CONFIG.processTailCues)) {
+      score -= 2;
+      if (role !== 'answer') role = 'process';
+    }
+
+    // The last number usually carries the conclusion ("... so 2")
+    if (index === numbers.length - 1) score += 0.5;
+
+    return { value: number.value, score, role, text: number.text.trim() };
+  });
+
+  // Bare number ("2", "2?", "-3") - unambiguous
+  if (numbers.length === 1 && stripped === numbers[0].text.replace(/[\s?!.,]+/g, ' ').trim()) {
+    return { value: numbers[0].value, confidence: 1.0, role: 'answer', candidates };
+  }
+
+  const ranked = [...candidates].sort((a, b) => b.score - a.score);
+  const best = ranked[0];
+
+  let confidence;
+  if (ranked.length === 1) {
+    confidence = best.role === 'answer' ? 0.95 : best.role === 'process' ? 0.8 : 0.85;
+  } else {
+    const margin = best.score - ranked[1].score;
+    confidence = Math.min(0.95, 0.5 + 0.15 * margin);
+    if (ranked.every(candidate => Math.abs(candidate.value - best.value) < 0.001)) {
+      confidence = 0.95;
+    }
+    // Several numbers and none is cued as the answer: leave it to the LLM
+    if (best.role !== 'answer') {
+      confidence = Math.min(confidence, 0.6);
+    }
+  }
+
+  return {
+    value: best.value,
+    confidence: Math.round(confidence * 100) / 100,
+    role: best.role,
+    candidates
+  };
+}
+
+/**
+ * n8n Code node usage (Content-Based Router):
+ *
+ * const analysis = analyzeAnswerPhrases(loadSessionData.message);
+ * if (analysis.value !== null && analysis.confidence >= 0.7) {
+ *   features.numeric_value = analysis.value;
+ *   // analysis.role === 'answer'  → main-problem attempt
+ *   // analysis.role === 'process' → scaffolding sub-answer
+ * }
+ */
+
+// For Node.js module export (not embedded into n8n nodes)
+
+/**
+ * Run the labeled corpus: node functions/answer_phrase_analyzer.js exemplars/answer_phrases.json
+ */
+function runCorpus(corpusPath) {
+  const corpus = JSON.parse(require('fs').readFileSync(corpusPath, 'utf8'));
+  let passed = 0;
+  const failures = [];
+
+  for (const sample of corpus.samples) {
+    const result = analyzeAnswerPhrases(sample.message);
+    const valueOk = sample.expected_value === null
+      ? result.value === null
+      : result.value !== null && Math.abs(result.value - sample.expected_value) < 0.001;
+    const roleOk = !sample.expected_role || result.role === sample.expected_role;
+    if (valueOk && roleOk) {
+      passed++;
+    } else {
+      failures.push({ sample, result: { value: result.value, role: result.role, confidence: result.confidence } });
+    }
+  }
+
+  console.log(`Answer-phrase corpus: ${passed}/${corpus.samples.length} passed`);
+  for (const failure of failures) {
+    console.log(`  ✗ "${failure.sample.message}" expected ${failure.sample.expected_value} ` +
+      `(${failure.sample.expected_role || 'any'}), got ${failure.result.value} (${failure.result.role})`);
+  }
+  return failures.length === 0;
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = { analyzeAnswerPhrases, findNumbers, runCorpus, ANSWER_PHRASE_CONFIG };
+
+  if (typeof require !== 'undefined' && require.main === module) {
+    const ok = runCorpus(process.argv[2] || `${__dirname}/../exemplars/answer_phrases.json`);
+    process.exit(ok ? 0 : 1);
+  }
+}
@@ -0,0 +1,147 @@
+/**
+ * question_loop.js
+ *
+ * Local near-duplicate check on the tutor's scaffolding questions
+ * Handles: "How many steps from -3 to 0?" then "Can you count the steps from -3 to 0?"
+ *
+ * PURPOSE: Scaffolding loops - the tutor re-asking a step the student already
+ * answered, in other words - were left to the Synthesis Detector LLM ("Tutor
+ * is repeating questions"), which only runs on scaffold_progress and often
+ * answers "continue". Each question is reduced to a signature (the content
+ * words of its last "?" sentence). When Update Session records a new
+ * scaffolding question it compares its signature with the ones asked
+ * earlier in the same scaffolding episode (token-set Jaccard) and flags a
+ * repeat in the session. The next turn decides deterministically:
+ *   - scaffold_progress → synthesize (Route by Category1 skips the
+ *                         Synthesis Detector LLM)
+ *   - stuck             → escalate (walk through the step, no new rephrasing)
+ *
+ * OUTPUT:
+ *   trackQuestionLoop(...) → {
+ *     question_signatures: ["-3 0 many step", "-3 0 count step"],
+ *     question_loop: { question: "Can you count the steps from -3 to 0?", repeats: 1,
+ *                      similarity: 0.6, synthesis_hint: "You found 3. Put it together - What is -3 + 5?" }
+ *   }                                                  // question_loop null without a repeat
+ *
+ * For use in n8n Code nodes or standalone Node.js
+ */
+
+const QUESTION_LOOP_CONFIG = {
+  // Jaccard similarity of two signatures that counts as the same question
+  threshold: 0.6,
+  // Shorter signatures ("Why?", "Ready?") are never compared
+  minTokens: 2,
+  // Earlier near-duplicates of the latest question before it is a loop
+  repeats: 1,
+  // Signatures kept per scaffolding episode
+  history: 8,
+  stopwords: new Set([
+    'a', 'an', 'and', 'are', 'at', 'be', 'can', 'could', 'did', 'do', 'does', 'for', 'from', 'go',
+    'how', 'i', 'if', 'in', 'is', 'it', 'let', "let's", 'lets', 'me', 'now', 'of', 'on', 'or',
+    'so', 'that', 'the', 'then', 'there', 'this', 'to', 'try', 'up', 'us', 'we', 'what', "what's",
+    'whats', 'when', 'where', 'which', 'will', 'with', 'would', 'you', 'your'
+  ]),
+  // Numbers (signed, decimal, fraction) or words
+  token: /-?\d+(?:\.\d+)?(?:\/\d+)?|[a-z]+(?:'[a-z]+)?/g
+};
+
+// Last sentence of a tutor message that ends with "?"
+function lastQuestion(tutorResponse) {
+  const sentences = String(tutorResponse || '').replace(/−/g, '-').split(/(?<=[.!?])\s+/);
+  const question = sentences.filter(sentence => sentence.trim().endsWith('?')).pop();
+  return question ? question.trim() : null;
+}
+
+/**
+ * Signature of the question a tutor response asks
+ *
+ * @param {string} tutorResponse - Tutor message
+ * @returns {string|null} Sorted content tokens of the last "?" sentence, space separated; null without a question
+ */
+function questionSignature(tutorResponse) {
+  const question = lastQuestion(tutorResponse);
+  if (!question) return null;
+  const tokens = new Set();
+  for (const token of question.toLowerCase().match(QUESTION_LOOP_CONFIG.token) || []) {
+    if (QUESTION_LOOP_CONFIG.stopwords.has(token)) continue;
+    // Plural and singular are the same question ("steps" / "step")
+    tokens.add(token.length > 3 && token.endsWith('s') && !token.endsWith('ss') ? token.slice(0, -1) : token);
+  }
+  return tokens.size >= QUESTION_LOOP_CONFIG.minTokens ? [...tokens].sort().join(' ') : null;
+}
+
+function signatureSimilarity(a, b) {
+  if (!a || !b) return 0;
+  const left = new Set(a.split(' '));
+  const right = b.split(' ');
+  const shared = right.filter(token => left.has(token)).length;
+  return shared / (left.size + right.length - shared);
+}
+
+/**
+ * Step answers of this problem, for a synthesis hint that needs no LLM
+ *
+ * @param {Array} recentTurns - session.recent_turns
+ * @param {string} message - Student message of the current turn
+ * @param {object} problem - session current_problem ({text})
+ * @returns {string}
+ */
+function loopSynthesisHint(recentTurns, message, problem) {
+  const answers = [];
+  const messages = (recentTurns || [])
+    .filter(turn => !turn.is_previous_problem && turn.category === 'scaffold_progress')
+    .map(turn => turn.student_message)
+    .concat([message]);
+  for (const text of messages) {
+    const match = String(text || '').replace(/−/g, '-').match(/-?\d+(?:\.\d+)?(?:\/\d+)?/);
+    if (match && !answers.includes(match[0])) answers.push(match[0]);
+  }
+  const found = answers.length > 0 ? `You found ${answers.join(' and ')}. ` : '';
+  return `${found}Put it together - ${problem.text}`;
+}
+
+/**
+ * Record a new scaffolding question and flag it when it repeats an earlier one
+ *
+ * @param {object|null} scaffolding - session current_problem.scaffolding before this question
+ * @param {string} response - Tutor message asking the new question
+ * @param {Array} recentTurns - session.recent_turns
+ * @param {string} message - Student message of the current turn
+ * @param {object} problem - session current_problem
+ * @returns {object} { question_signatures, question_loop } for the new scaffolding state
+ */
+function trackQuestionLoop(scaffolding, response, recentTurns, message, problem) {
+  const asked = (scaffolding && scaffolding.question_signatures) || [];
+  const signature = questionSignature(response);
+  const result = { question_signatures: asked, question_loop: null };
+  if (!signature) return result;
+
+  let repeats = 0;
+  let similarity = 0;
+  for (const earlier of asked) {
+    const score = signatureSimilarity(signature, earlier);
+    if (score >= QUESTION_LOOP_CONFIG.threshold) repeats++;
+    similarity = Math.max(similarity, score);
+  }
+  result.question_signatures = asked.concat([signature]).slice(-QUESTION_LOOP_CONFIG.history);
+  if (repeats >= QUESTION_LOOP_CONFIG.repeats) {
+    result.question_loop = {
+      question: lastQuestion(response),
+      repeats,
+      similarity: Math.round(similarity * 100) / 100,
+      synthesis_hint: loopSynthesisHint(recentTurns, message, problem)
+    };
+  }
+  return result;
+}
+
+// For Node.js module export
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = {
+    QUESTION_LOOP_CONFIG,
+    questionSignature,
+    signatureSimilarity,
+    loopSynthesisHint,
+    trackQuestionLoop
+  };
+}
@@ -0,0 +1,83 @@
+/**
+ * response_contract.js
+ *
+ * Webhook response contract: what the client gets back for a turn
+ * Handles: response body, optional timing
+ *
+ * PURPOSE: "Webhook Response1" used to answer with `{{ $json }}` - whatever
+ * Redis: Save Session1 passed through, `_session_for_redis` (the whole
+ * transcript) included. Clients only show the tutor text and a few
+ * counters, so the body is now built explicitly and session internals stay
+ * on the server.
+ *
+ * REQUEST OPTIONS:
+ *   body.include_timing: true      → metadata.latency_ms
+ *
+ * Bodies are ~200 bytes, so they go out as plain JSON: gzip would save a few
+ * dozen bytes for a binary re-encode and a Content-Encoding header per turn.
+ *
+ * OUTPUT:
+ *   {
+ *     "response": "When we see +, are we adding or subtracting?",
+ *     "metadata": {
+ *       "category": "wrong_operation",
+ *       "attempt_count": 1,
+ *       "session_version": 4,
+ *       "latency_ms": 1450            // only with include_timing
+ *     }
+ *   }
+ *
+ * For use in n8n Code nodes or standalone Node.js
+ */
+
+/**
+ * Response options requested by the client
+ *
+ * @param {object} payload - Request body (webhook) or chat input
+ * @returns {object} {timing}
+ */
+function responseOptions(payload) {
+  return {
+    timing: Boolean(payload && payload.include_timing)
+  };
+}
+
+/**
+ * Response body for a finished turn
+ *
+ * @param {string} response - Tutor text
+ * @param {string} category - Validator category
+ * @param {object} session - Session as saved (version already bumped)
+ * @param {object} options - Output of responseOptions
+ * @param {number} startTime - Date.now() when Load Session1 ran
+ * @returns {object} {response, metadata}
+ */
+function buildResponseBody(response, category, session, options, startTime) {
+  const metadata = {
+    category: category,
+    attempt_count: session.current_problem.attempt_count,
+    session_version: session.version
+  };
+  if (options && options.timing && typeof startTime === 'number') {
+    metadata.latency_ms = Date.now() - startTime;
+  }
+  return { response, metadata };
+}
+
+/**
+ * n8n Code node usage:
+ *
+ * // Normalize input1
+ * normalizedData.response_options = responseOptions(inputData);
+ *
+ * // Update Session & Format Response1
+ * response_body: buildResponseBody(response, category, session, options, contextData._start_time)
+ *
+ * // Webhook Response1 (Respond to Webhook, JSON)
+ * ={{ $json.response_body }}
+ */
+
+// For Node.js module export
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = { responseOptions, buildResponseBody };
+}
@@ -0,0 +1,321 @@
+/**
+ * semantic_matcher.js
+ *
+ * Compiled SEMANTIC_PATTERNS matcher for the Semantic Validator
+ * Handles: multi-pattern scan (Aho–Corasick for large registries), trigger
+ * index, negation scope
+ *
+ * PURPOSE: The validator used to loop over every pattern group, every
+ * questionPattern and every keyword with String.includes on every turn, and
+ * "not left" counted as "left". The registry is now compiled once (at build
+ * time, see build_semantic_matcher.py) into:
+ *   - one phrase list over all question phrases and keywords
+ *   - a trigger index: question phrase → pattern groups
+ *   - from AUTOMATON_MIN_PHRASES phrases on, an automaton over the list
+ * With the automaton a turn is two linear scans (tutor question + student
+ * message), whatever the size of the registry. Below that size one indexOf
+ * per phrase is faster (benchmarks/bench_semantic_matcher.js), so small
+ * registries are compiled without it.
+ *
+ * COMPILED FORMAT (plain JSON, safe to embed in a Code node):
+ *   {
+ *     phrases: ["adding or subtracting", "add", ...],
+ *     goto: [{ "a": 1, ... }, ...],      // automaton transitions per state (or absent)
+ *     fail: [0, 0, ...],                  // failure links (or absent)
+ *     out: [[], [3], ...],                // phrase ids ending at each state (or absent)
+ *     triggers: { "0": [0], ... },        // question phrase id → group ids
+ *     groups: [{ type, selector, expected, wrong }]
+ *   }
+ *
+ * For use in n8n Code nodes or standalone Node.js
+ */
+
+const SEMANTIC_MATCHER_CONFIG = {
+  negators: ['not', 'no', "don't", 'dont', "doesn't", 'doesnt', "isn't", 'isnt',
+    "aren't", 'arent', 'never', 'nope', "can't", 'cant', "wouldn't", 'instead'],
+  // Words that close a negation scope ("not left but right")
+  scopeBreakers: ['but', 'so', 'because', 'its', "it's", 'actually', 'and'],
+  // How many tokens after a negator are still negated ("don't think it's left")
+  negationWindow: 3
+};
+
+const NEGATORS = new Set(SEMANTIC_MATCHER_CONFIG.negators);
+const SCOPE_BREAKERS = new Set(SEMANTIC_MATCHER_CONFIG.scopeBreakers);
+const PUNCTUATION_TOKENS = new Set([',', '.', ';', '!', '?']);
+
+function isWordChar(ch) {
+  return ch !== undefined && /[a-z0-9]/.test(ch);
+}
+
+// Whole words only, but a phrase may end on punctuation ("what does -")
+function isWholeWord(text, phrase, start, end) {
+  return (!isWordChar(phrase[0]) || !isWordChar(text[start - 1])) &&
+    (!isWordChar(phrase[phrase.length - 1]) || !isWordChar(text[end]));
+}
+
+/**
+ * Find every registry phrase in `text` in a single pass
+ *
+ * @param {object} matcher - Compiled matcher
+ * @param {string} text - Lowercased text
+ * @returns {Array} [{id, phrase, start, end}]
+ */
+function scanPhrases(matcher, text) {
+  if (!matcher.goto) return scanPhrasesByIndex(matcher.phrases, text);
+
+  const hits = [];
+  let state = 0;
+
+  for (let i = 0; i < text.length; i++) {
+    const ch = text[i];
+    while (state !== 0 && matcher.goto[state][ch] === undefined) {
+      state = matcher.fail[state];
+    }
+    state = matcher.goto[state][ch] !== undefined ? matcher.goto[state][ch] : 0;
+
+    for (const id of matcher.out[state]) {
+      const phrase = matcher.phrases[id];
+      const start = i - phrase.length + 1;
+      if (isWholeWord(text, phrase, start, i + 1)) {
+        hits.push({ id, phrase, start, end: i + 1 });
+      }
+    }
+  }
+  return hits;
+}
+
+// Small registries: one indexOf per phrase, hits in the automaton's order
+function scanPhrasesByIndex(phrases, text) {
+  const hits = [];
+  phrases.forEach((phrase, id) => {
+    for (let start = text.indexOf(phrase); start !== -1; start = text.indexOf(phrase, start + 1)) {
+      if (isWholeWord(text, phrase, start, start + phrase.length)) {
+        hits.push({ id, phrase, start, end: start + phrase.length });
+      }
+    }
+  });
+  return hits.sort((a, b) => a.end - b.end || a.start - b.start);
+}
+
+/**
+ * Mark hits that fall inside a negation scope ("not left", "don't add")
+ *
+ * @param {string} text - Lowercased text
+ * @param {Array} hits - Output of scanPhrases
+ * @returns {Array} hits with a `negated` flag
+ */
+function markNegation(text, hits) {
+  if (hits.length === 0) return hits;
+
+  // Only the tokens before the last hit can negate anything
+  const lastStart = Math.max(...hits.map(hit => hit.start));
+  const tokens = [];
+  const tokenPattern = /[a-z0-9'’]+|[,.;!?]/g;
+  let match;
+  while ((match = tokenPattern.exec(text)) !== null && match.index < lastStart) {
+    tokens.push({ word: match[0].includes('’') ? match[0].replace(/’/g, "'") : match[0], start: match.index });
+  }
+
+  const { negationWindow } = SEMANTIC_MATCHER_CONFIG;
+
+  return hits.map(hit => {
+    let index = tokens.findIndex(token => token.start >= hit.start);
+    if (index === -1) index = tokens.length;
+
+    let negated = false;
+    for (let back = index - 1; back >= 0 && back >= index - negationWindow; back--) {
+      const word = tokens[back].word;
+      if (PUNCTUATION_TOKENS.has(word) || SCOPE_BREAKERS.has(word)) break;
+      if (NEGATORS.has(word)) {
+        negated = true;
+        break;
+      }
+    }
+    return { id: hit.id, phrase: hit.phrase, start: hit.start, end: hit.end, negated };
+  });
+}
+
+/**
+ * Pattern groups triggered by the tutor's last question, in registry order
+ *
+ * @param {object} matcher - Compiled matcher
+ * @param {string} question - Lowercased scaffolding question
+ * @returns {Array} group objects
+ */
+function triggeredGroups(matcher, question) {
+  const groupIds = new Set();
+  for (const hit of scanPhrases(matcher, question)) {
+    for (const groupId of matcher.triggers[hit.id] || []) {
+      groupIds.add(groupId);
+    }
+  }
+  return [...groupIds].sort((a, b) => a - b).map(id => matcher.groups[id]);
+}
+
+/**
+ * Pick the expected/wrong keyword sets of a group for a problem that is not
+ * in the per-problem table (same rules the validator always used)
+ */
+function selectGenericSets(group, problemText, question) {
+  let key = null;
+  if (group.selector === 'operation') {
+    if (problemText.includes('+') && !problemText.includes('+ -')) key = '+';
+    else if (problemText.includes('-') && !problemText.includes('+ -')) key = '-';
+  } else if (group.selector === 'direction') {
+    if (problemText.match(/\+\s*\d/) || question.includes('positive')) key = 'positive';
+    else if (problemText.match(/\-\s*\d/) || question.includes('negative')) key = 'negative';
+  }
+  // List-valued groups are indexed but, as before, not judged here
+  if (key === null || !group.expected[key]) return null;
+  return { expected: group.expected[key], wrong: group.wrong[key] || [] };
+}
+
+/**
+ * Judge the student's message against expected/wrong keyword sets
+ *
+ * @param {Array} messageHits - markNegation(scanPhrases(message))
+ * @param {object} sets - {expected: [...], wrong: [...]}
+ * @param {Array} fallbackKeywords - Keywords from the feature extractor,
+ *   used only when the message contains no registry phrase at all
+ * @returns {string} 'correct' | 'wrong' | 'ambiguous'
+ */
+function judgeKeywords(messageHits, sets, fallbackKeywords) {
+  const expected = new Set(sets.expected);
+  const wrong = new Set(sets.wrong);
+
+  let hasCorrect;
+  let hasWrong;
+  if (messageHits.length > 0) {
+    hasCorrect = messageHits.some(hit => !hit.negated && expected.has(hit.phrase));
+    // "not right" when right is expected is a wrong answer;
+    // "not left" alone is not a right answer - leave it to the LLM
+    hasWrong = messageHits.some(hit => (!hit.negated && wrong.has(hit.phrase)) ||
+      (hit.negated && expected.has(hit.phrase)));
+  } else {
+    hasCorrect = (fallbackKeywords || []).some(kw => expected.has(kw));
+    hasWrong = (fallbackKeywords || []).some(kw => wrong.has(kw));
+  }
+
+  if (hasCorrect && !hasWrong) return 'correct';
+  if (hasWrong) return 'wrong';
+  return 'ambiguous';
+}
+
+/**
+ * n8n Code node usage (Semantic Validator):
+ *
+ * const groups = triggeredGroups(SEMANTIC_MATCHER, scaffoldingQuestion);
+ * const messageHits = markNegation(studentMessage, scanPhrases(SEMANTIC_MATCHER, studentMessage));
+ * for (const group of groups) {
+ *   const sets = selectGenericSets(group, problemText, scaffoldingQuestion);
+ *   if (sets) { verdict = judgeKeywords(messageHits, sets, input.keywords); break; }
+ * }
+ */
+
+// For Node.js module export (not embedded into n8n nodes)
+
+// Phrase count from which the automaton beats one indexOf per phrase
+// (benchmarks/bench_semantic_matcher.js: crossover at ~75 phrases, 10 groups)
+const AUTOMATON_MIN_PHRASES = 100;
+
+/**
+ * Compile a SEMANTIC_PATTERNS registry into matcher tables
+ *
+ * @param {object} semanticPatterns - Registry from config_registries.js
+ * @param {number} minAutomatonPhrases - Build the automaton from this many phrases on
+ * @returns {object} Compiled matcher (plain JSON)
+ */
+function compileSemanticPatterns(semanticPatterns, minAutomatonPhrases = AUTOMATON_MIN_PHRASES) {
+  const phrases = [];
+  const phraseIds = new Map();
+  const phraseId = phrase => {
+    const key = String(phrase).toLowerCase();
+    if (!phraseIds.has(key)) {
+      phraseIds.set(key, phrases.length);
+      phrases.push(key);
+    }
+    return phraseIds.get(key);
+  };
+  const lower = list => (list || []).map(kw => String(kw).toLowerCase());
+  const lowerSets = sets => {
+    if (Array.isArray(sets)) return { '*': lower(sets) };
+    const result = {};
+    for (const [key, list] of Object.entries(sets || {})) result[key] = lower(list);
+    return result;
+  };
+
+  const groups = [];
+  const triggers = {};
+  for (const [type, config] of Object.entries(semanticPatterns)) {
+    for (const pattern of config.patterns) {
+      const expectedKeys = Array.isArray(pattern.expectedKeywords) ? ['*'] : Object.keys(pattern.expectedKeywords || {});
+      const selector = expectedKeys.includes('+') ? 'operation'
+        : expectedKeys.includes('positive') ? 'direction'
+          : 'list';
+      const groupId = groups.length;
+      groups.push({
+        type,
+        selector,
+        expected: lowerSets(pattern.expectedKeywords),
+        wrong: lowerSets(pattern.wrongKeywords)
+      });
+
+      for (const question of pattern.questionPatterns || []) {
+        const id = phraseId(question);
+        triggers[id] = triggers[id] || [];
+        if (!triggers[id].includes(groupId)) triggers[id].push(groupId);
+      }
+      for (const sets of [groups[groupId].expected, groups[groupId].wrong]) {
+        for (const list of Object.values(sets)) list.forEach(phraseId);
+      }
+    }
+  }
+
+  if (phrases.length < minAutomatonPhrases) {
+    return { phrases, triggers, groups };
+  }
+
+  // Aho–Corasick: trie, then failure links breadth-first
+  const goto = [{}];
+  const out = [[]];
+  phrases.forEach((phrase, id) => {
+    let state = 0;
+    for (const ch of phrase) {
+      if (goto[state][ch] === undefined) {
+        goto[state][ch] = goto.length;
+        goto.push({});
+        out.push([]);
+      }
+      state = goto[state][ch];
+    }
+    out[state].push(id);
+  });
+
+  const fail = new Array(goto.length).fill(0);
+  const queue = Object.values(goto[0]);
+  while (queue.length > 0) {
+    const state = queue.shift();
+    for (const [ch, next] of Object.entries(goto[state])) {
+      let link = fail[state];
+      while (link !== 0 && goto[link][ch] === undefined) link = fail[link];
+      fail[next] = goto[link][ch] !== undefined && goto[link][ch] !== next ? goto[link][ch] : 0;
+      out[next] = out[next].concat(out[fail[next]]);
+      queue.push(next);
+    }
+  }
+
+  return { phrases, goto, fail, out, triggers, groups };
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = {
+    compileSemanticPatterns,
+    AUTOMATON_MIN_PHRASES,
+    scanPhrases,
+    markNegation,
+    triggeredGroups,
+    selectGenericSets,
+    judgeKeywords,
+    SEMANTIC_MATCHER_CONFIG
+  };
+}
@@ -0,0 +1,115 @@
+/**
+ * sub_answers.js
+ *
+ * Expected sub-answers for the current scaffolding step
+ * Handles: "Where do we start?" → -3, "How many steps?" → 5, "What is 3 × 4?" → 12
+ *
+ * PURPOSE: During scaffolding the router used to guess whether a number was a
+ * main-answer attempt or a step answer from its distance to the main answer
+ * (within 50% → Enhanced Numeric Verifier, else Semantic Validator). A step
+ * answer that happens to be close to the answer ("3" for -3 + 5) went to the
+ * verifier and was graded against the main problem. Instead, Update Session
+ * records the set of values the step expects when it asks the question, and
+ * the router and Semantic Validator test membership by value key.
+ *
+ * Sources, narrowed by cues in the tutor's question:
+ *   - sub_answers roles from the PROBLEM_VALIDATORS entry (problem model)
+ *   - any "a op b" the tutor's question asks about
+ *
+ * Requires problemValueKey() from the PROBLEM_VALIDATORS block.
+ *
+ * OUTPUT:
+ *   { "2": "main", "5": "steps", "3": "steps" }   // value key → role, or null
+ *
+ * For use in n8n Code nodes or standalone Node.js
+ */
+
+const SUB_ANSWER_CONFIG = {
+  // Question cues that narrow the step to one role
+  cues: {
+    start: ['start', 'begin', 'where are we'],
+    steps: ['how many steps', 'how many spaces', 'how many jumps', 'how far', 'how many more', 'count'],
+    intermediate: ['first', 'multiply', 'times'],
+    denominator: ['denominator', 'same size', 'convert'],
+    givens: ['how many', 'how much']
+  },
+  // "3 × 4", "2 - 5", "5 - (-3)", "2/4 + 1/4"
+  questionExpression: /(-?\d+(?:\.\d+)?(?:\/\d+)?)\s+([+\-−×*÷])\s+\(?\s*(-?\d+(?:\.\d+)?(?:\/\d+)?)\s*\)?/g
+};
+
+function parseSubAnswerValue(text) {
+  const match = String(text === null || text === undefined ? '' : text).replace('−', '-')
+    .match(/-?\d+(?:\.\d+)?(?:\/\d+)?/);
+  if (!match) return NaN;
+  const [numerator, denominator] = match[0].split('/');
+  return denominator ? parseFloat(numerator) / parseFloat(denominator) : parseFloat(numerator);
+}
+
+// Values of the simple expressions the tutor's question asks about
+function questionValues(question) {
+  const values = [];
+  for (const match of question.matchAll(SUB_ANSWER_CONFIG.questionExpression)) {
+    const a = parseSubAnswerValue(match[1]);
+    const b = parseSubAnswerValue(match[3]);
+    const value = { '+': a + b, '-': a - b, '−': a - b, '×': a * b, '*': a * b, '÷': a / b }[match[2]];
+    if (Number.isFinite(value)) values.push(value);
+  }
+  return values;
+}
+
+/**
+ * Expected sub-answer set for the step the tutor just asked
+ *
+ * @param {object|null} spec - PROBLEM_VALIDATORS entry (null for uncatalogued problems)
+ * @param {object} problem - session current_problem ({correct_answer})
+ * @param {string} lastQuestion - Tutor's scaffolding question
+ * @returns {object|null} value key → role ("main" for the answer itself); null when nothing is known
+ */
+function expectedSubAnswers(spec, problem, lastQuestion) {
+  const question = String(lastQuestion || '').toLowerCase();
+  const correct = spec ? spec.correct_value : parseSubAnswerValue(problem && problem.correct_answer);
+  if (!Number.isFinite(correct)) return null;
+
+  const sets = (spec && spec.sub_answers) || {};
+  const cues = SUB_ANSWER_CONFIG.cues;
+  const cued = Object.keys(cues).filter(role =>
+    sets[role] && cues[role].some(cue => question.includes(cue)));
+  const asked = questionValues(question);
+  // No cue: any role, unless the question spells out what to compute
+  const roles = cued.length > 0 || asked.length > 0 ? cued : Object.keys(sets);
+
+  const expected = {};
+  for (const role of roles) {
+    for (const value of sets[role]) {
+      const key = problemValueKey(value);
+      if (!expected[key]) expected[key] = role;
+    }
+  }
+  for (const value of asked) {
+    const key = problemValueKey(value);
+    if (!expected[key]) expected[key] = 'question';
+  }
+  if (Object.keys(expected).length === 0) return null;
+
+  expected[problemValueKey(correct)] = 'main';
+  return expected;
+}
+
+/**
+ * n8n Code node usage (Update Session & Format Response1):
+ *
+ * const scaffolding = session.current_problem.scaffolding;
+ * scaffolding.expected_answers = expectedSubAnswers(
+ *   lookupProblemValidator(session.current_problem), session.current_problem, scaffolding.last_question);
+ *
+ * Router / Semantic Validator: scaffolding.expected_answers[problemValueKey(value)]
+ */
+
+// For Node.js module export
+if (typeof module !== 'undefined' && module.exports) {
+  // Standalone Node.js: n8n embeds the table block alongside this file instead
+  if (typeof problemValueKey === 'undefined') {
+    global.problemValueKey = require('../generated/problem_validators.js').problemValueKey;
+  }
+  module.exports = { expectedSubAnswers, questionValues, parseSubAnswerValue, SUB_ANSWER_CONFIG };
+}
@@ -0,0 +1,196 @@
+/**
+ * teach_back_rubric.js
+ *
+ * Deterministic rubric for teach-back explanations
+ * Handles: operands, operation, direction, start/end point
+ *
+ * PURPOSE: Teach-back validator used to accept any message containing "it was"
+ * or "steps" (or any number) as an explanation and left the quality call to
+ * the response LLM. The rubric checks the explanation against the cached
+ * problem model (PROBLEM_VALIDATORS entry) instead:
+ *   - strong  → short closure template, no LLM call
+ *   - partial → response LLM, told what is missing or wrong
+ *   - none    → old pattern check decides
+ * A wrong keyword ("moved left" for -3 + 5) is never strong, whatever the
+ * score: the explanation contradicts the problem and the LLM has to address it.
+ *
+ * Requires findNumbers() from answer_phrase_analyzer.js.
+ *
+ * OUTPUT:
+ *   {
+ *     score: 0.75,                       // met / applicable criteria
+ *     level: "strong",                   // strong | partial | none
+ *     criteria: { operands: true, operation: true, direction: null, start_end: false },
+ *     missing: ["start_end"],            // null criteria do not apply to this problem
+ *     contradicted: []                   // criteria the student got wrong (wrong keywords)
+ *   }
+ *
+ * For use in n8n Code nodes or standalone Node.js
+ */
+
+const TEACH_BACK_RUBRIC_CONFIG = {
+  // Generic operation vocabulary, used when the problem has no keyword sets
+  operationWords: {
+    '+': ['add', 'adding', 'added', 'plus', 'sum', 'addition', 'together', 'more'],
+    '-': ['subtract', 'subtracting', 'subtracted', 'minus', 'take away', 'took away', 'subtraction', 'less', 'fewer'],
+    '*': ['times', 'multiply', 'multiplied', 'multiplying', 'groups of', 'lots of'],
+    '/': ['divide', 'divided', 'dividing', 'split', 'share', 'shared']
+  },
+  // Strong explanations need at least this share of the applicable criteria
+  strongScore: 0.75,
+  closures: [
+    'Great explaining! {summary} You really understand this one!',
+    'Perfect! {summary} That is exactly how to solve it.',
+    'Wonderful explanation! {summary} You nailed it!'
+  ]
+};
+
+function mentionsWord(text, word) {
+  return new RegExp('(?:^|[^a-z])' + word.replace(/[.*+?^${}()|[\]\\]/g, '\\$&') + '(?![a-z])').test(text);
+}
+
+function mentionsValue(numbers, value) {
+  return numbers.some(number => Math.abs(number.value - value) < 0.001);
+}
+
+/**
+ * Score a teach-back explanation against the problem model
+ *
+ * @param {string} message - Lowercased student message
+ * @param {object} spec - PROBLEM_VALIDATORS entry (operands, operation, correct_value, keyword_sets)
+ * @returns {object} {score, level, criteria, missing, contradicted}
+ */
+function scoreTeachBack(message, spec) {
+  const text = String(message || '').toLowerCase();
+  const numbers = findNumbers(text);
+  const operands = spec.operands || [];
+  const criteria = {};
+
+  criteria.operands = operands.length > 0
+    ? operands.every(operand => mentionsValue(numbers, operand))
+    : null;
+
+  // Problem keyword sets plus the generic past-tense forms ("added", "took away")
+  const operationSets = spec.keyword_sets && spec.keyword_sets.math_operation_identification;
+  const operationWords = (operationSets ? operationSets.expected : [])
+    .concat(TEACH_BACK_RUBRIC_CONFIG.operationWords[spec.operation] || []);
+  const contradicted = [];
+  if (operationSets && operationSets.wrong.some(word => mentionsWord(text, word))) {
+    contradicted.push('operation');
+  }
+  criteria.operation = operationWords.length > 0
+    ? operationWords.some(word => mentionsWord(text, word)) && !contradicted.includes('operation')
+    : null;
+
+  const directionSets = spec.keyword_sets && spec.keyword_sets.math_direction_identification;
+  if (directionSets && directionSets.wrong.some(word => mentionsWord(text, word))) {
+    contradicted.push('direction');
+  }
+  criteria.direction = directionSets
+    ? directionSets.expected.some(word => mentionsWord(text, word)) && !contradicted.includes('direction')
+    : null;
+
+  // Start point is the first operand, end point is the answer
+  criteria.start_end = operands.length > 0
+    ? mentionsValue(numbers, operands[0]) && mentionsValue(numbers, spec.correct_value)
+    : mentionsValue(numbers, spec.correct_value);
+
+  const applicable = Object.keys(criteria).filter(name => criteria[name] !== null);
+  const met = applicable.filter(name => criteria[name]);
+  const score = applicable.length > 0 ? Math.round((met.length / applicable.length) * 100) / 100 : 0;
+
+  const statesAnswer = mentionsValue(numbers, spec.correct_value);
+  let level = 'none';
+  if (score >= TEACH_BACK_RUBRIC_CONFIG.strongScore && statesAnswer && contradicted.length === 0) {
+    level = 'strong';
+  } else if (met.length > 0 || statesAnswer || contradicted.length > 0) {
+    level = 'partial';
+  }
+
+  return {
+    score,
+    level,
+    criteria,
+    missing: applicable.filter(name => !criteria[name]),
+    contradicted
+  };
+}
+
+/**
+ * Closure message for a strong explanation (no LLM call)
+ *
+ * @param {object} rubric - Output of scoreTeachBack
+ * @param {object} spec - PROBLEM_VALIDATORS entry
+ * @param {object} problem - session current_problem ({text, correct_answer})
+ * @returns {string}
+ */
+function teachBackClosure(rubric, spec, problem) {
+  const answer = problem.correct_answer;
+  let summary = `You got ${answer}.`;
+  if (rubric.criteria.direction && spec.operands.length > 0) {
+    const direction = spec.keyword_sets.math_direction_identification.expected[0];
+    summary = `You started at ${spec.operands[0]}, moved ${direction}, and landed on ${answer}.`;
+  } else if (rubric.criteria.start_end && spec.operands.length > 0) {
+    summary = `You started at ${spec.operands[0]} and ended up at ${answer}.`;
+  }
+
+  const closures = TEACH_BACK_RUBRIC_CONFIG.closures;
+  const template = closures[String(problem.text || '').length % closures.length];
+  return template.replace('{summary}', summary);
+}
+
+/**
+ * n8n Code node usage (Teach-back validator):
+ *
+ * const problemSpec = lookupProblemValidator(input.current_problem);
+ * if (problemSpec) {
+ *   const rubric = scoreTeachBack(studentMessage, problemSpec);
+ *   if (rubric.level === 'strong') {
+ *     const closure = teachBackClosure(rubric, problemSpec, input.current_problem);
+ *     // → category teach_back_explanation + teach_back_closure (skips the LLM)
+ *   }
+ * }
+ */
+
+// For Node.js module export
+
+/**
+ * Run the labeled explanations: node functions/teach_back_rubric.js exemplars/teach_back_explanations.json
+ */
+function runCorpus(corpusPath) {
+  const corpus = JSON.parse(require('fs').readFileSync(corpusPath, 'utf8'));
+  const { PROBLEM_VALIDATORS } = require('../generated/problem_validators.js');
+  let passed = 0;
+  const failures = [];
+
+  for (const sample of corpus.samples) {
+    const result = scoreTeachBack(sample.message, PROBLEM_VALIDATORS[sample.problem_id]);
+    const contradictedOk = !sample.expected_contradicted ||
+      JSON.stringify(result.contradicted) === JSON.stringify(sample.expected_contradicted);
+    if (result.level === sample.expected_level && contradictedOk) {
+      passed++;
+    } else {
+      failures.push({ sample, result });
+    }
+  }
+
+  console.log(`Teach-back rubric corpus: ${passed}/${corpus.samples.length} passed`);
+  for (const failure of failures) {
+    console.log(`  ✗ ${failure.sample.problem_id} "${failure.sample.message}" expected ${failure.sample.expected_level}, ` +
+      `got ${failure.result.level} (score ${failure.result.score}, contradicted: ${failure.result.contradicted.join(', ') || '-'})`);
+  }
+  return failures.length === 0;
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+  // Standalone Node.js: n8n embeds the analyzer alongside this file instead
+  if (typeof findNumbers === 'undefined') {
+    global.findNumbers = require('./answer_phrase_analyzer.js').findNumbers;
+  }
+  module.exports = { scoreTeachBack, teachBackClosure, runCorpus, TEACH_BACK_RUBRIC_CONFIG };
+
+  if (typeof require !== 'undefined' && require.main === module) {
+    const ok = runCorpus(process.argv[2] || `${__dirname}/../exemplars/teach_back_explanations.json`);
+    process.exit(ok ? 0 : 1);
+  }
+}
@@ -0,0 +1,182 @@
+/**
+ * tutor_state.js
+ *
+ * Tutoring state machine: idle → scaffolding(depth) → teach_back → solved
+ * Handles: state codes, transitions by category, session validation
+ *
+ * PURPOSE: The tutoring state used to live in two flag objects
+ * (scaffolding.active/depth, teach_back.active/awaiting_explanation) that
+ * every node re-derived on its own: if-chains in Update Session, defensive
+ * resets in Load Session1, flag checks in the router. The state is now one
+ * compact code in session.current_problem.state and every node goes through
+ * these functions. Transitions come from TUTOR_FSM, compiled by
+ * build_state_machine.py into a lookup keyed by "<state>|<category>".
+ *
+ * STATE CODES:
+ *   "I"   idle
+ *   "S2"  scaffolding, depth 2 (1-99)
+ *   "T"   teach-back (answer correct, waiting for the explanation)
+ *   "D"   solved
+ *
+ * TUTOR_FSM FORMAT (generated):
+ *   {
+ *     transitions: {
+ *       "idle|stuck": { to: "scaffolding", depth: "one", ask: true, solve: false },
+ *       ...
+ *     }
+ *   }
+ *   Categories without an entry keep the current state.
+ *
+ * For use in n8n Code nodes or standalone Node.js
+ */
+
+const TUTOR_STATE_KINDS = { I: 'idle', S: 'scaffolding', T: 'teach_back', D: 'solved' };
+const TUTOR_STATE_CODE = /^(?:[ITD]|S[1-9]\d?)$/;
+
+/**
+ * Parse a state code
+ *
+ * @param {string} code - "I", "S2", "T", "D"
+ * @returns {object|null} {code, kind, depth} or null for an illegal code
+ */
+function parseTutorState(code) {
+  if (typeof code !== 'string' || !TUTOR_STATE_CODE.test(code)) return null;
+  return {
+    code,
+    kind: TUTOR_STATE_KINDS[code[0]],
+    depth: code[0] === 'S' ? parseInt(code.slice(1), 10) : 0
+  };
+}
+
+function tutorStateCode(kind, depth) {
+  return kind === 'scaffolding' ? 'S' + depth : kind === 'idle' ? 'I' : kind === 'teach_back' ? 'T' : 'D';
+}
+
+/**
+ * Flags the router, prompts and Update Session read
+ *
+ * @param {object} state - Output of parseTutorState
+ * @returns {object} {code, kind, depth, scaffolding, teach_back, solved}
+ */
+function describeTutorState(state) {
+  return {
+    code: state.code,
+    kind: state.kind,
+    depth: state.depth,
+    scaffolding: state.kind === 'scaffolding',
+    teach_back: state.kind === 'teach_back',
+    solved: state.kind === 'solved'
+  };
+}
+
+/**
+ * Apply a turn's category (one table lookup)
+ *
+ * @param {object} state - Output of parseTutorState
+ * @param {string} category - Validator category for this turn
+ * @param {object} fsm - TUTOR_FSM
+ * @returns {object} {state, ask, solve} - ask: the response is the new scaffolding question
+ */
+function nextTutorState(state, category, fsm) {
+  const transition = fsm.transitions[state.kind + '|' + category];
+  if (!transition) return { state, ask: false, solve: false };
+
+  const depth = transition.to !== 'scaffolding' ? 0
+    : transition.depth === 'one' ? 1
+    : transition.depth === 'inc' ? Math.min(state.depth + 1, 99)
+    : state.depth;
+  return {
+    state: parseTutorState(tutorStateCode(transition.to, depth)),
+    ask: transition.ask,
+    solve: transition.solve
+  };
+}
+
+/**
+ * Move session.current_problem to the next state and count a solve
+ *
+ * @param {object} session - Session passed by Load Session1 (always legal)
+ * @param {string} category - Validator category for this turn
+ * @param {object} fsm - TUTOR_FSM
+ * @returns {object} Output of nextTutorState
+ */
+function applyTutorTransition(session, category, fsm) {
+  const problem = session.current_problem;
+  const state = parseTutorState(problem.state);
+  if (!state) {
+    throw new Error(`Illegal tutor state ${JSON.stringify(problem.state)} in session ${session.session_id}`);
+  }
+  const transition = nextTutorState(state, category, fsm);
+  problem.state = transition.state.code;
+  // Solved on the turn the answer first becomes correct
+  if (transition.solve) {
+    session.stats.problems_solved++;
+  }
+  return transition;
+}
+
+/**
+ * Problem record for a problem the student has not worked on yet
+ */
+function initialProblemState(problem) {
+  return {
+    id: problem.id,
+    text: problem.text,
+    correct_answer: problem.correct_answer,
+    attempt_count: 0,
+    state: 'I',
+    // Current scaffolding question - only meaningful in a scaffolding state
+    scaffolding: { last_question: null, expected_answers: null }
+  };
+}
+
+/**
+ * State code for a session saved before the state machine (flag objects)
+ */
+function legacyTutorStateCode(problem) {
+  if (problem.teach_back && problem.teach_back.active) return 'T';
+  if (problem.scaffolding && problem.scaffolding.active) {
+    return 'S' + Math.min(Math.max(parseInt(problem.scaffolding.depth, 10) || 1, 1), 99);
+  }
+  return 'I';
+}
+
+/**
+ * Why a stored session is not a legal state, or null when it is
+ *
+ * @param {object} session - Parsed session from Redis
+ * @returns {string|null}
+ */
+function tutorSessionError(session) {
+  const problem = session && session.current_problem;
+  if (!problem || typeof problem !== 'object') return 'missing current_problem';
+  if (!problem.id || !problem.text || problem.correct_answer === undefined || problem.correct_answer === null) {
+    return 'incomplete current_problem';
+  }
+  const state = parseTutorState(problem.state);
+  if (!state) return `illegal state code ${JSON.stringify(problem.state)}`;
+  if (!Array.isArray(session.recent_turns)) return 'missing recent_turns';
+  if (state.kind !== 'idle' && session.recent_turns.length === 0) return `state ${state.code} without any turns`;
+  if (!session.stats || typeof session.stats.total_turns !== 'number') return 'missing stats';
+  return null;
+}
+
+/**
+ * n8n Code node usage:
+ *
+ * // Load Session1 - reject illegal sessions, expose the flags once per turn
+ * if (tutorSessionError(session)) session = null;   // → new session
+ * const tutorState = describeTutorState(parseTutorState(session.current_problem.state));
+ *
+ * // Update Session & Format Response1
+ * const transition = applyTutorTransition(session, category, TUTOR_FSM);
+ * if (transition.ask) problem.scaffolding = { last_question: response, ... };
+ */
+
+// For Node.js module export
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = {
+    parseTutorState, describeTutorState, nextTutorState, applyTutorTransition, tutorStateCode,
+    initialProblemState, legacyTutorStateCode, tutorSessionError
+  };
+}
@@ -0,0 +1,130 @@
+/**
+ * typo_normalizer.js
+ *
+ * Typo-tolerant keyword normalization (SymSpell-style symmetric delete)
+ * Handles: "subtrakt" → subtract, "negitive" → negative, "ading" → adding, "rite" → right
+ *
+ * PURPOSE: Students misspell the very keywords the validators look for, and an
+ * exact match miss turns a correct answer into `stuck` plus an extra LLM
+ * scaffolding turn. The dictionary (generated/typo_dictionary.js, built by
+ * build_typo_dictionary.py from the registry keywords) maps every delete
+ * variant of every keyword back to the keyword, so a token is corrected with
+ * a handful of hash lookups whatever the size of the vocabulary.
+ *
+ * DICTIONARY FORMAT:
+ *   {
+ *     max_edit: 2,
+ *     min_length: 5,                    // shorter tokens are never corrected
+ *     words: ["adding", "add", ...],
+ *     max_distance: [1, 0, ...],        // per word; short words are exact-only
+ *     deletes: { "ading": [0], ... },   // delete variant → word ids
+ *     aliases: { "rite": "right" },     // homophones edit distance can't reach
+ *     protected: { "padding": 1, ... }  // English words never "corrected"
+ *   }
+ *
+ * For use in n8n Code nodes or standalone Node.js
+ */
+
+/**
+ * Optimal string alignment distance (Damerau-Levenshtein with adjacent
+ * transpositions), giving up as soon as it exceeds `limit`
+ */
+function editDistance(a, b, limit) {
+  if (Math.abs(a.length - b.length) > limit) return limit + 1;
+
+  let previous2 = null;
+  let previous = Array.from({ length: b.length + 1 }, (_, j) => j);
+  for (let i = 1; i <= a.length; i++) {
+    const current = [i];
+    let rowMin = i;
+    for (let j = 1; j <= b.length; j++) {
+      const cost = a[i - 1] === b[j - 1] ? 0 : 1;
+      let value = Math.min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost);
+      if (previous2 && i > 1 && j > 1 && a[i - 1] === b[j - 2] && a[i - 2] === b[j - 1]) {
+        value = Math.min(value, previous2[j - 2] + 1);
+      }
+      current.push(value);
+      rowMin = Math.min(rowMin, value);
+    }
+    if (rowMin > limit) return limit + 1;
+    previous2 = previous;
+    previous = current;
+  }
+  return previous[b.length];
+}
+
+// Every string reachable from `word` by deleting up to `distance` characters
+function deleteVariants(word, distance) {
+  const variants = new Set([word]);
+  let frontier = [word];
+  for (let d = 0; d < distance; d++) {
+    const next = [];
+    for (const current of frontier) {
+      for (let i = 0; i < current.length; i++) {
+        const variant = current.slice(0, i) + current.slice(i + 1);
+        if (!variants.has(variant)) {
+          variants.add(variant);
+          next.push(variant);
+        }
+      }
+    }
+    frontier = next;
+  }
+  return variants;
+}
+
+/**
+ * Correct a single lowercase token
+ *
+ * @returns {object|null} {word, distance} or null when no keyword is close enough
+ */
+function correctToken(token, dictionary) {
+  if (dictionary.aliases[token]) return { word: dictionary.aliases[token], distance: 0 };
+  if (dictionary.protected[token] || token.length < dictionary.min_length) return null;
+
+  let best = null;
+  for (const variant of deleteVariants(token, dictionary.max_edit)) {
+    for (const id of dictionary.deletes[variant] || []) {
+      const word = dictionary.words[id];
+      const limit = dictionary.max_distance[id];
+      const distance = word === token ? 0 : editDistance(token, word, limit);
+      if (distance > limit) continue;
+      // Ties go to the earliest registry keyword
+      if (!best || distance < best.distance || (distance === best.distance && id < best.id)) {
+        best = { word, distance, id };
+      }
+    }
+  }
+  return best && { word: best.word, distance: best.distance };
+}
+
+/**
+ * Replace misspelled keywords in a message
+ *
+ * @param {string} text - Lowercased message
+ * @param {object} dictionary - TYPO_DICTIONARY
+ * @returns {object} {text, corrections: [{from, to, distance}]}
+ */
+function normalizeTypos(text, dictionary) {
+  const corrections = [];
+  const normalized = String(text || '').replace(/[a-z']+/g, token => {
+    const correction = correctToken(token, dictionary);
+    if (!correction || correction.word === token) return token;
+    corrections.push({ from: token, to: correction.word, distance: correction.distance });
+    return correction.word;
+  });
+  return { text: normalized, corrections };
+}
+
+/**
+ * n8n Code node usage (Semantic Validator, Teach-back validator):
+ *
+ * const studentMessage = normalizeTypos(
+ *   (input.student_message || input.message || '').toLowerCase(), TYPO_DICTIONARY
+ * ).text;
+ */
+
+// For Node.js module export
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = { normalizeTypos, correctToken, editDistance, deleteVariants };
+}
@@ -0,0 +1,52 @@
+// Generated from exemplars/questions.json - do not edit by hand
+const PROBLEM_VALIDATORS = {
+  "frac_add_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 0\\.75|\\+0\\.75|0\\.75|3\\/4|\\.75)(?![\\d./])", "close_threshold": 0.3, "correct_value": 0.75, "id": "frac_add_1", "keyword_sets": {"math_direction_identification": {"expected": ["right", "to the right", "rightward", "forward"], "unless_question": ["positive", "negative"], "wrong": ["left", "to the left", "leftward"]}, "math_operation_identification": {"expected": ["adding", "add", "plus", "addition", "sum"], "wrong": ["subtracting", "subtract", "minus", "subtraction"]}}, "operands": [0.5, 0.25], "operation": "+", "sub_answers": {"denominator": [4], "operands": [0.5, 0.25], "start": [0.5], "steps": [0.25]}, "surface_verdicts": {}, "text_key": "what is 1/2 + 1/4?", "verdicts": {"-0.75": "wrong_operation", "0.25": "wrong_operation", "0.333": "wrong_operation", "0.5": "close", "0.75": "correct"}},
+  "frac_sub_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 0\\.5|\\+0\\.5|0\\.5|1\\/2|\\.5)(?![\\d./])", "close_threshold": 0.3, "correct_value": 0.5, "id": "frac_sub_1", "keyword_sets": {"math_direction_identification": {"expected": ["left", "to the left", "leftward", "backward"], "unless_question": ["positive", "negative"], "wrong": ["right", "to the right", "rightward"]}, "math_operation_identification": {"expected": ["subtracting", "subtract", "minus", "subtraction", "difference"], "wrong": ["adding", "add", "plus", "addition"]}}, "operands": [0.666667, 0.166667], "operation": "-", "sub_answers": {"denominator": [6], "operands": [0.666667, 0.166667], "start": [0.666667], "steps": [0.166667]}, "surface_verdicts": {"3/6": "close"}, "text_key": "what is 2/3 - 1/6?", "verdicts": {"-0.5": "wrong_operation", "0.333": "wrong_operation", "0.5": "correct", "0.833": "wrong_operation"}},
+  "neg_add_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 2|two|\\+2|2)(?![\\d./])", "close_threshold": 0.4, "correct_value": 2, "id": "neg_add_1", "keyword_sets": {"math_direction_identification": {"expected": ["right", "to the right", "rightward", "forward"], "unless_question": ["positive", "negative"], "wrong": ["left", "to the left", "leftward"]}, "math_operation_identification": {"expected": ["adding", "add", "plus", "addition", "sum"], "wrong": ["subtracting", "subtract", "minus", "subtraction"]}}, "operands": [-3, 5], "operation": "+", "sub_answers": {"operands": [-3, 5], "start": [-3], "steps": [5, 3]}, "surface_verdicts": {}, "text_key": "what is -3 + 5?", "verdicts": {"-2": "wrong_operation", "-8": "wrong_operation", "1": "close", "2": "correct", "3": "close", "8": "wrong_operation"}},
+  "neg_mult_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:negative six|negative 6|minus six|minus 6|\\-6)(?![\\d./])", "close_threshold": 1.2, "correct_value": -6, "id": "neg_mult_1", "keyword_sets": {}, "operands": [-2, 3], "operation": "*", "sub_answers": {"operands": [-2, 3], "start": [-2]}, "surface_verdicts": {}, "text_key": "what is -2 \u00d7 3?", "verdicts": {"-5": "wrong_operation", "-6": "correct", "1": "wrong_operation", "6": "wrong_operation"}},
+  "neg_sub_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 8|eight|\\+8|8)(?![\\d./])", "close_threshold": 1.6, "correct_value": 8, "id": "neg_sub_1", "keyword_sets": {"math_direction_identification": {"expected": ["right", "to the right", "rightward", "forward"], "unless_question": ["positive", "negative"], "wrong": ["left", "to the left", "leftward"]}}, "operands": [5, -3], "operation": "-", "sub_answers": {"operands": [5, -3], "start": [5], "steps": [3]}, "surface_verdicts": {}, "text_key": "what is 5 - (-3)?", "verdicts": {"-8": "wrong_operation", "2": "wrong_operation", "8": "correct"}},
+  "neg_sub_2": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:negative eight|minus eight|negative 8|minus 8|\\-8)(?![\\d./])", "close_threshold": 1.6, "correct_value": -8, "id": "neg_sub_2", "keyword_sets": {"math_direction_identification": {"expected": ["left", "to the left", "leftward", "backward"], "unless_question": ["positive", "negative"], "wrong": ["right", "to the right", "rightward"]}, "math_operation_identification": {"expected": ["subtracting", "subtract", "minus", "subtraction", "difference"], "wrong": ["adding", "add", "plus", "addition"]}}, "operands": [-3, 5], "operation": "-", "sub_answers": {"operands": [-3, 5], "start": [-3], "steps": [5]}, "surface_verdicts": {}, "text_key": "what is -3 - 5?", "verdicts": {"-8": "correct", "2": "wrong_operation", "8": "wrong_operation"}},
+  "order_ops_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 14|fourteen|\\+14|14)(?![\\d./])", "close_threshold": 2.8, "correct_value": 14, "id": "order_ops_1", "keyword_sets": {}, "operands": [2, 3, 4], "operation": "+", "sub_answers": {"intermediate": [12], "operands": [2, 3, 4], "start": [2]}, "surface_verdicts": {}, "text_key": "what is 2 + 3 \u00d7 4?", "verdicts": {"14": "correct", "20": "wrong_operation"}},
+  "word_debt_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:negative two|negative 2|minus two|minus 2|\\-2)(?![\\d./])", "close_threshold": 0.4, "correct_value": -2, "id": "word_debt_1", "keyword_sets": {}, "operands": [], "operation": null, "sub_answers": {"givens": [3, 5], "start": [3]}, "surface_verdicts": {}, "text_key": "sarah had 3 apples. she gave away 5 apples. how many apples does she have now?", "verdicts": {"-2": "correct", "0": "wrong_operation", "2": "wrong_operation"}},
+  "word_neg_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:negative three|minus three|negative 3|minus 3|\\-3)(?![\\d./])", "close_threshold": 0.6, "correct_value": -3, "id": "word_neg_1", "keyword_sets": {}, "operands": [], "operation": null, "sub_answers": {"givens": [2, 5], "start": [2]}, "surface_verdicts": {}, "text_key": "the temperature was 2\u00b0c. it dropped 5 degrees. what is the new temperature?", "verdicts": {"-3": "correct", "3": "wrong_operation", "7": "wrong_operation"}}
+};
+const PROBLEM_TEXT_INDEX = {
+  "what is 1/2 + 1/4?": "frac_add_1",
+  "what is 2/3 - 1/6?": "frac_sub_1",
+  "what is -3 + 5?": "neg_add_1",
+  "what is -2 \u00d7 3?": "neg_mult_1",
+  "what is 5 - (-3)?": "neg_sub_1",
+  "what is -3 - 5?": "neg_sub_2",
+  "what is 2 + 3 \u00d7 4?": "order_ops_1",
+  "sarah had 3 apples. she gave away 5 apples. how many apples does she have now?": "word_debt_1",
+  "the temperature was 2\u00b0c. it dropped 5 degrees. what is the new temperature?": "word_neg_1"
+};
+
+function problemValueKey(value) {
+  const rounded = Math.round(value * 1000) / 1000;
+  return String(rounded === 0 ? 0 : rounded);
+}
+
+function problemSurfaceKey(text) {
+  const fractions = String(text || '').match(/-?\d+\s*\/\s*\d+/g);
+  return fractions ? fractions[fractions.length - 1].replace(/\s+/g, '') : null;
+}
+
+// Written form first ("3/6" unsimplified), then the value
+function problemVerdict(spec, value, text) {
+  const surface = problemSurfaceKey(text);
+  return (surface && spec.surface_verdicts[surface]) || spec.verdicts[problemValueKey(value)];
+}
+
+function lookupProblemValidator(problem) {
+  if (!problem) return null;
+  const textKey = String(problem.text || '').trim().toLowerCase();
+  const byId = PROBLEM_VALIDATORS[problem.id];
+  if (byId && (!textKey || byId.text_key === textKey)) return byId;
+  const byText = PROBLEM_TEXT_INDEX[textKey];
+  return byText ? PROBLEM_VALIDATORS[byText] : null;
+}
+
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = { PROBLEM_VALIDATORS, PROBLEM_TEXT_INDEX, problemValueKey, problemSurfaceKey, problemVerdict, lookupProblemValidator };
+}
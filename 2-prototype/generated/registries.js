@@ -0,0 +1,9 @@
+// Generated from config_registries.js by build_registries.py - do not edit by hand
+// sha256:7e9c01f268159f96
+const ERROR_DETECTORS={"math_arithmetic_addition":(num1,num2,operation)=>{return[Math.abs(num1)+Math.abs(num2),num1-num2,Math.abs(num1-num2),-(num1+num2)];},"math_arithmetic_subtraction":(num1,num2,operation)=>{return[num1+num2,Math.abs(num1)+Math.abs(num2),num2-num1,Math.abs(num1-num2)];},"math_arithmetic_multiplication":(num1,num2,operation)=>{return[num1+num2,Math.abs(num1*num2),-(num1*num2)];},"math_arithmetic_division":(num1,num2,operation)=>{if(num2===0)return[];return[num1*num2,num2/num1,Math.abs(num1/num2),-(num1/num2)];}};
+const ERROR_DETECTOR_BY_OPERATION={"math_arithmetic":{"+":"math_arithmetic_addition","-":"math_arithmetic_subtraction","*":"math_arithmetic_multiplication","/":"math_arithmetic_division"}};
+const SEMANTIC_PATTERNS={"math_operation_identification":{"patterns":[{"questionPatterns":["adding or subtracting","add or subtract"],"expectedKeywords":{"+":["adding","add","plus","addition","sum"],"-":["subtracting","subtract","minus","subtraction","difference"]},"wrongKeywords":{"+":["subtracting","subtract","minus","subtraction"],"-":["adding","add","plus","addition"]}}]},"math_direction_identification":{"patterns":[{"questionPatterns":["direction","which way","right or left"],"expectedKeywords":{"positive":["right","to the right","rightward","forward"],"negative":["left","to the left","leftward","backward"]},"wrongKeywords":{"positive":["left","to the left","leftward"],"negative":["right","to the right","rightward"]}}]},"math_negative_number_concept":{"patterns":[{"questionPatterns":["what does -","what is -","negative number"],"expectedKeywords":["negative","less than zero","below zero","left of zero"],"wrongKeywords":["positive","greater than zero","above zero"]}]}};
+
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = { ERROR_DETECTORS, ERROR_DETECTOR_BY_OPERATION, SEMANTIC_PATTERNS };
+}
@@ -0,0 +1,1213 @@
+// Generated by build_runtime_module.py from workflow-production-ready.json - do not edit by hand
+// Per-node units of the blocks build scripts embed into Code nodes.
+// Built once, when a worker first requires the module.
+
+const UNITS = {
+  "Enhanced Numeric Verifier": {
+    hash: "8d4ab9f87d803ad3",
+    code_hash: "e3b0c44298fc1c14",
+    names: ["ERROR_DETECTORS", "ERROR_DETECTOR_BY_OPERATION", "PROBLEM_VALIDATORS", "PROBLEM_TEXT_INDEX", "problemValueKey", "problemSurfaceKey", "problemVerdict", "lookupProblemValidator"],
+    blocks: [["REGISTRIES (generated by build_registries.py)", null], ["PROBLEM_VALIDATORS (generated by build_problem_validators.py)", null]],
+    load: () => {
+      // REGISTRIES (generated by build_registries.py)
+      // ERROR_DETECTORS+ERROR_DETECTOR_BY_OPERATION sha256:216d365bd6bfef25 - from config_registries.js, do not edit
+      const ERROR_DETECTORS={"math_arithmetic_addition":(num1,num2,operation)=>{return[Math.abs(num1)+Math.abs(num2),num1-num2,Math.abs(num1-num2),-(num1+num2)];},"math_arithmetic_subtraction":(num1,num2,operation)=>{return[num1+num2,Math.abs(num1)+Math.abs(num2),num2-num1,Math.abs(num1-num2)];},"math_arithmetic_multiplication":(num1,num2,operation)=>{return[num1+num2,Math.abs(num1*num2),-(num1*num2)];},"math_arithmetic_division":(num1,num2,operation)=>{if(num2===0)return[];return[num1*num2,num2/num1,Math.abs(num1/num2),-(num1/num2)];}};
+      const ERROR_DETECTOR_BY_OPERATION={"math_arithmetic":{"+":"math_arithmetic_addition","-":"math_arithmetic_subtraction","*":"math_arithmetic_multiplication","/":"math_arithmetic_division"}};
+      // PROBLEM_VALIDATORS (generated by build_problem_validators.py)
+      // Generated from exemplars/questions.json - do not edit by hand
+      const PROBLEM_VALIDATORS = {
+        "frac_add_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 0\\.75|\\+0\\.75|0\\.75|3\\/4|\\.75)(?![\\d./])", "close_threshold": 0.3, "correct_value": 0.75, "id": "frac_add_1", "keyword_sets": {"math_direction_identification": {"expected": ["right", "to the right", "rightward", "forward"], "unless_question": ["positive", "negative"], "wrong": ["left", "to the left", "leftward"]}, "math_operation_identification": {"expected": ["adding", "add", "plus", "addition", "sum"], "wrong": ["subtracting", "subtract", "minus", "subtraction"]}}, "operands": [0.5, 0.25], "operation": "+", "sub_answers": {"denominator": [4], "operands": [0.5, 0.25], "start": [0.5], "steps": [0.25]}, "surface_verdicts": {}, "text_key": "what is 1/2 + 1/4?", "verdicts": {"-0.75": "wrong_operation", "0.25": "wrong_operation", "0.333": "wrong_operation", "0.5": "close", "0.75": "correct"}},
+        "frac_sub_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 0\\.5|\\+0\\.5|0\\.5|1\\/2|\\.5)(?![\\d./])", "close_threshold": 0.3, "correct_value": 0.5, "id": "frac_sub_1", "keyword_sets": {"math_direction_identification": {"expected": ["left", "to the left", "leftward", "backward"], "unless_question": ["positive", "negative"], "wrong": ["right", "to the right", "rightward"]}, "math_operation_identification": {"expected": ["subtracting", "subtract", "minus", "subtraction", "difference"], "wrong": ["adding", "add", "plus", "addition"]}}, "operands": [0.666667, 0.166667], "operation": "-", "sub_answers": {"denominator": [6], "operands": [0.666667, 0.166667], "start": [0.666667], "steps": [0.166667]}, "surface_verdicts": {"3/6": "close"}, "text_key": "what is 2/3 - 1/6?", "verdicts": {"-0.5": "wrong_operation", "0.333": "wrong_operation", "0.5": "correct", "0.833": "wrong_operation"}},
+        "neg_add_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 2|two|\\+2|2)(?![\\d./])", "close_threshold": 0.4, "correct_value": 2, "id": "neg_add_1", "keyword_sets": {"math_direction_identification": {"expected": ["right", "to the right", "rightward", "forward"], "unless_question": ["positive", "negative"], "wrong": ["left", "to the left", "leftward"]}, "math_operation_identification": {"expected": ["adding", "add", "plus", "addition", "sum"], "wrong": ["subtracting", "subtract", "minus", "subtraction"]}}, "operands": [-3, 5], "operation": "+", "sub_answers": {"operands": [-3, 5], "start": [-3], "steps": [5, 3]}, "surface_verdicts": {}, "text_key": "what is -3 + 5?", "verdicts": {"-2": "wrong_operation", "-8": "wrong_operation", "1": "close", "2": "correct", "3": "close", "8": "wrong_operation"}},
+        "neg_mult_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:negative six|negative 6|minus six|minus 6|\\-6)(?![\\d./])", "close_threshold": 1.2, "correct_value": -6, "id": "neg_mult_1", "keyword_sets": {}, "operands": [-2, 3], "operation": "*", "sub_answers": {"operands": [-2, 3], "start": [-2]}, "surface_verdicts": {}, "text_key": "what is -2 \u00d7 3?", "verdicts": {"-5": "wrong_operation", "-6": "correct", "1": "wrong_operation", "6": "wrong_operation"}},
+        "neg_sub_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 8|eight|\\+8|8)(?![\\d./])", "close_threshold": 1.6, "correct_value": 8, "id": "neg_sub_1", "keyword_sets": {"math_direction_identification": {"expected": ["right", "to the right", "rightward", "forward"], "unless_question": ["positive", "negative"], "wrong": ["left", "to the left", "leftward"]}}, "operands": [5, -3], "operation": "-", "sub_answers": {"operands": [5, -3], "start": [5], "steps": [3]}, "surface_verdicts": {}, "text_key": "what is 5 - (-3)?", "verdicts": {"-8": "wrong_operation", "2": "wrong_operation", "8": "correct"}},
+        "neg_sub_2": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:negative eight|minus eight|negative 8|minus 8|\\-8)(?![\\d./])", "close_threshold": 1.6, "correct_value": -8, "id": "neg_sub_2", "keyword_sets": {"math_direction_identification": {"expected": ["left", "to the left", "leftward", "backward"], "unless_question": ["positive", "negative"], "wrong": ["right", "to the right", "rightward"]}, "math_operation_identification": {"expected": ["subtracting", "subtract", "minus", "subtraction", "difference"], "wrong": ["adding", "add", "plus", "addition"]}}, "operands": [-3, 5], "operation": "-", "sub_answers": {"operands": [-3, 5], "start": [-3], "steps": [5]}, "surface_verdicts": {}, "text_key": "what is -3 - 5?", "verdicts": {"-8": "correct", "2": "wrong_operation", "8": "wrong_operation"}},
+        "order_ops_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 14|fourteen|\\+14|14)(?![\\d./])", "close_threshold": 2.8, "correct_value": 14, "id": "order_ops_1", "keyword_sets": {}, "operands": [2, 3, 4], "operation": "+", "sub_answers": {"intermediate": [12], "operands": [2, 3, 4], "start": [2]}, "surface_verdicts": {}, "text_key": "what is 2 + 3 \u00d7 4?", "verdicts": {"14": "correct", "20": "wrong_operation"}},
+        "word_debt_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:negative two|negative 2|minus two|minus 2|\\-2)(?![\\d./])", "close_threshold": 0.4, "correct_value": -2, "id": "word_debt_1", "keyword_sets": {}, "operands": [], "operation": null, "sub_answers": {"givens": [3, 5], "start": [3]}, "surface_verdicts": {}, "text_key": "sarah had 3 apples. she gave away 5 apples. how many apples does she have now?", "verdicts": {"-2": "correct", "0": "wrong_operation", "2": "wrong_operation"}},
+        "word_neg_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:negative three|minus three|negative 3|minus 3|\\-3)(?![\\d./])", "close_threshold": 0.6, "correct_value": -3, "id": "word_neg_1", "keyword_sets": {}, "operands": [], "operation": null, "sub_answers": {"givens": [2, 5], "start": [2]}, "surface_verdicts": {}, "text_key": "the temperature was 2\u00b0c. it dropped 5 degrees. what is the new temperature?", "verdicts": {"-3": "correct", "3": "wrong_operation", "7": "wrong_operation"}}
+      };
+      const PROBLEM_TEXT_INDEX = {
+        "what is 1/2 + 1/4?": "frac_add_1",
+        "what is 2/3 - 1/6?": "frac_sub_1",
+        "what is -3 + 5?": "neg_add_1",
+        "what is -2 \u00d7 3?": "neg_mult_1",
+        "what is 5 - (-3)?": "neg_sub_1",
+        "what is -3 - 5?": "neg_sub_2",
+        "what is 2 + 3 \u00d7 4?": "order_ops_1",
+        "sarah had 3 apples. she gave away 5 apples. how many apples does she have now?": "word_debt_1",
+        "the temperature was 2\u00b0c. it dropped 5 degrees. what is the new temperature?": "word_neg_1"
+      };
+
+      function problemValueKey(value) {
+        const rounded = Math.round(value * 1000) / 1000;
+        return String(rounded === 0 ? 0 : rounded);
+      }
+
+      function problemSurfaceKey(text) {
+        const fractions = String(text || '').match(/-?\d+\s*\/\s*\d+/g);
+        return fractions ? fractions[fractions.length - 1].replace(/\s+/g, '') : null;
+      }
+
+      // Written form first ("3/6" unsimplified), then the value
+      function problemVerdict(spec, value, text) {
+        const surface = problemSurfaceKey(text);
+        return (surface && spec.surface_verdicts[surface]) || spec.verdicts[problemValueKey(value)];
+      }
+
+      function lookupProblemValidator(problem) {
+        if (!problem) return null;
+        const textKey = String(problem.text || '').trim().toLowerCase();
+        const byId = PROBLEM_VALIDATORS[problem.id];
+        if (byId && (!textKey || byId.text_key === textKey)) return byId;
+        const byText = PROBLEM_TEXT_INDEX[textKey];
+        return byText ? PROBLEM_VALIDATORS[byText] : null;
+      }
+      return { ERROR_DETECTORS, ERROR_DETECTOR_BY_OPERATION, PROBLEM_VALIDATORS, PROBLEM_TEXT_INDEX, problemValueKey, problemSurfaceKey, problemVerdict, lookupProblemValidator };
+    }
+  },
+  "Semantic Validator": {
+    hash: "a4cfc4a83311cb5d",
+    code_hash: "e3b0c44298fc1c14",
+    names: ["SEMANTIC_MATCHER", "SEMANTIC_MATCHER_CONFIG", "NEGATORS", "SCOPE_BREAKERS", "PUNCTUATION_TOKENS", "isWordChar", "isWholeWord", "scanPhrases", "scanPhrasesByIndex", "markNegation", "triggeredGroups", "selectGenericSets", "judgeKeywords", "PROBLEM_VALIDATORS", "PROBLEM_TEXT_INDEX", "problemValueKey", "problemSurfaceKey", "problemVerdict", "lookupProblemValidator", "TYPO_DICTIONARY", "editDistance", "deleteVariants", "correctToken", "normalizeTypos"],
+    blocks: [["SEMANTIC_MATCHER (generated by build_semantic_matcher.py)", null], ["PROBLEM_VALIDATORS (generated by build_problem_validators.py)", null], ["TYPO_DICTIONARY (generated by build_typo_dictionary.py)", null]],
+    load: () => {
+      // SEMANTIC_MATCHER (generated by build_semantic_matcher.py)
+      const SEMANTIC_MATCHER = {"phrases":["adding or subtracting","add or subtract","adding","add","plus","addition","sum","subtracting","subtract","minus","subtraction","difference","direction","which way","right or left","right","to the right","rightward","forward","left","to the left","leftward","backward","what does -","what is -","negative number","negative","less than zero","below zero","left of zero","positive","greater than zero","above zero"],"triggers":{"0":[0],"1":[0],"12":[1],"13":[1],"14":[1],"23":[2],"24":[2],"25":[2]},"groups":[{"type":"math_operation_identification","selector":"operation","expected":{"+":["adding","add","plus","addition","sum"],"-":["subtracting","subtract","minus","subtraction","difference"]},"wrong":{"+":["subtracting","subtract","minus","subtraction"],"-":["adding","add","plus","addition"]}},{"type":"math_direction_identification","selector":"direction","expected":{"positive":["right","to the right","rightward","forward"],"negative":["left","to the left","leftward","backward"]},"wrong":{"positive":["left","to the left","leftward"],"negative":["right","to the right","rightward"]}},{"type":"math_negative_number_concept","selector":"list","expected":{"*":["negative","less than zero","below zero","left of zero"]},"wrong":{"*":["positive","greater than zero","above zero"]}}]};
+
+      const SEMANTIC_MATCHER_CONFIG = {
+        negators: ['not', 'no', "don't", 'dont', "doesn't", 'doesnt', "isn't", 'isnt',
+          "aren't", 'arent', 'never', 'nope', "can't", 'cant', "wouldn't", 'instead'],
+        scopeBreakers: ['but', 'so', 'because', 'its', "it's", 'actually', 'and'],
+        negationWindow: 3
+      };
+
+      const NEGATORS = new Set(SEMANTIC_MATCHER_CONFIG.negators);
+
+      const SCOPE_BREAKERS = new Set(SEMANTIC_MATCHER_CONFIG.scopeBreakers);
+
+      const PUNCTUATION_TOKENS = new Set([',', '.', ';', '!', '?']);
+
+      function isWordChar(ch) {
+        return ch !== undefined && /[a-z0-9]/.test(ch);
+      }
+
+      function isWholeWord(text, phrase, start, end) {
+        return (!isWordChar(phrase[0]) || !isWordChar(text[start - 1])) &&
+          (!isWordChar(phrase[phrase.length - 1]) || !isWordChar(text[end]));
+      }
+
+      function scanPhrases(matcher, text) {
+        if (!matcher.goto) return scanPhrasesByIndex(matcher.phrases, text);
+        const hits = [];
+        let state = 0;
+        for (let i = 0; i < text.length; i++) {
+          const ch = text[i];
+          while (state !== 0 && matcher.goto[state][ch] === undefined) {
+            state = matcher.fail[state];
+          }
+          state = matcher.goto[state][ch] !== undefined ? matcher.goto[state][ch] : 0;
+          for (const id of matcher.out[state]) {
+            const phrase = matcher.phrases[id];
+            const start = i - phrase.length + 1;
+            if (isWholeWord(text, phrase, start, i + 1)) {
+              hits.push({ id, phrase, start, end: i + 1 });
+            }
+          }
+        }
+        return hits;
+      }
+
+      function scanPhrasesByIndex(phrases, text) {
+        const hits = [];
+        phrases.forEach((phrase, id) => {
+          for (let start = text.indexOf(phrase); start !== -1; start = text.indexOf(phrase, start + 1)) {
+            if (isWholeWord(text, phrase, start, start + phrase.length)) {
+              hits.push({ id, phrase, start, end: start + phrase.length });
+            }
+          }
+        });
+        return hits.sort((a, b) => a.end - b.end || a.start - b.start);
+      }
+
+      function markNegation(text, hits) {
+        if (hits.length === 0) return hits;
+        const lastStart = Math.max(...hits.map(hit => hit.start));
+        const tokens = [];
+        const tokenPattern = /[a-z0-9'’]+|[,.;!?]/g;
+        let match;
+        while ((match = tokenPattern.exec(text)) !== null && match.index < lastStart) {
+          tokens.push({ word: match[0].includes('’') ? match[0].replace(/’/g, "'") : match[0], start: match.index });
+        }
+        const { negationWindow } = SEMANTIC_MATCHER_CONFIG;
+        return hits.map(hit => {
+          let index = tokens.findIndex(token => token.start >= hit.start);
+          if (index === -1) index = tokens.length;
+          let negated = false;
+          for (let back = index - 1; back >= 0 && back >= index - negationWindow; back--) {
+            const word = tokens[back].word;
+            if (PUNCTUATION_TOKENS.has(word) || SCOPE_BREAKERS.has(word)) break;
+            if (NEGATORS.has(word)) {
+              negated = true;
+              break;
+            }
+          }
+          return { id: hit.id, phrase: hit.phrase, start: hit.start, end: hit.end, negated };
+        });
+      }
+
+      function triggeredGroups(matcher, question) {
+        const groupIds = new Set();
+        for (const hit of scanPhrases(matcher, question)) {
+          for (const groupId of matcher.triggers[hit.id] || []) {
+            groupIds.add(groupId);
+          }
+        }
+        return [...groupIds].sort((a, b) => a - b).map(id => matcher.groups[id]);
+      }
+
+      function selectGenericSets(group, problemText, question) {
+        let key = null;
+        if (group.selector === 'operation') {
+          if (problemText.includes('+') && !problemText.includes('+ -')) key = '+';
+          else if (problemText.includes('-') && !problemText.includes('+ -')) key = '-';
+        } else if (group.selector === 'direction') {
+          if (problemText.match(/\+\s*\d/) || question.includes('positive')) key = 'positive';
+          else if (problemText.match(/\-\s*\d/) || question.includes('negative')) key = 'negative';
+        }
+        if (key === null || !group.expected[key]) return null;
+        return { expected: group.expected[key], wrong: group.wrong[key] || [] };
+      }
+
+      function judgeKeywords(messageHits, sets, fallbackKeywords) {
+        const expected = new Set(sets.expected);
+        const wrong = new Set(sets.wrong);
+        let hasCorrect;
+        let hasWrong;
+        if (messageHits.length > 0) {
+          hasCorrect = messageHits.some(hit => !hit.negated && expected.has(hit.phrase));
+          hasWrong = messageHits.some(hit => (!hit.negated && wrong.has(hit.phrase)) ||
+            (hit.negated && expected.has(hit.phrase)));
+        } else {
+          hasCorrect = (fallbackKeywords || []).some(kw => expected.has(kw));
+          hasWrong = (fallbackKeywords || []).some(kw => wrong.has(kw));
+        }
+        if (hasCorrect && !hasWrong) return 'correct';
+        if (hasWrong) return 'wrong';
+        return 'ambiguous';
+      }
+      // PROBLEM_VALIDATORS (generated by build_problem_validators.py)
+      // Generated from exemplars/questions.json - do not edit by hand
+      const PROBLEM_VALIDATORS = {
+        "frac_add_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 0\\.75|\\+0\\.75|0\\.75|3\\/4|\\.75)(?![\\d./])", "close_threshold": 0.3, "correct_value": 0.75, "id": "frac_add_1", "keyword_sets": {"math_direction_identification": {"expected": ["right", "to the right", "rightward", "forward"], "unless_question": ["positive", "negative"], "wrong": ["left", "to the left", "leftward"]}, "math_operation_identification": {"expected": ["adding", "add", "plus", "addition", "sum"], "wrong": ["subtracting", "subtract", "minus", "subtraction"]}}, "operands": [0.5, 0.25], "operation": "+", "sub_answers": {"denominator": [4], "operands": [0.5, 0.25], "start": [0.5], "steps": [0.25]}, "surface_verdicts": {}, "text_key": "what is 1/2 + 1/4?", "verdicts": {"-0.75": "wrong_operation", "0.25": "wrong_operation", "0.333": "wrong_operation", "0.5": "close", "0.75": "correct"}},
+        "frac_sub_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 0\\.5|\\+0\\.5|0\\.5|1\\/2|\\.5)(?![\\d./])", "close_threshold": 0.3, "correct_value": 0.5, "id": "frac_sub_1", "keyword_sets": {"math_direction_identification": {"expected": ["left", "to the left", "leftward", "backward"], "unless_question": ["positive", "negative"], "wrong": ["right", "to the right", "rightward"]}, "math_operation_identification": {"expected": ["subtracting", "subtract", "minus", "subtraction", "difference"], "wrong": ["adding", "add", "plus", "addition"]}}, "operands": [0.666667, 0.166667], "operation": "-", "sub_answers": {"denominator": [6], "operands": [0.666667, 0.166667], "start": [0.666667], "steps": [0.166667]}, "surface_verdicts": {"3/6": "close"}, "text_key": "what is 2/3 - 1/6?", "verdicts": {"-0.5": "wrong_operation", "0.333": "wrong_operation", "0.5": "correct", "0.833": "wrong_operation"}},
+        "neg_add_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 2|two|\\+2|2)(?![\\d./])", "close_threshold": 0.4, "correct_value": 2, "id": "neg_add_1", "keyword_sets": {"math_direction_identification": {"expected": ["right", "to the right", "rightward", "forward"], "unless_question": ["positive", "negative"], "wrong": ["left", "to the left", "leftward"]}, "math_operation_identification": {"expected": ["adding", "add", "plus", "addition", "sum"], "wrong": ["subtracting", "subtract", "minus", "subtraction"]}}, "operands": [-3, 5], "operation": "+", "sub_answers": {"operands": [-3, 5], "start": [-3], "steps": [5, 3]}, "surface_verdicts": {}, "text_key": "what is -3 + 5?", "verdicts": {"-2": "wrong_operation", "-8": "wrong_operation", "1": "close", "2": "correct", "3": "close", "8": "wrong_operation"}},
+        "neg_mult_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:negative six|negative 6|minus six|minus 6|\\-6)(?![\\d./])", "close_threshold": 1.2, "correct_value": -6, "id": "neg_mult_1", "keyword_sets": {}, "operands": [-2, 3], "operation": "*", "sub_answers": {"operands": [-2, 3], "start": [-2]}, "surface_verdicts": {}, "text_key": "what is -2 \u00d7 3?", "verdicts": {"-5": "wrong_operation", "-6": "correct", "1": "wrong_operation", "6": "wrong_operation"}},
+        "neg_sub_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 8|eight|\\+8|8)(?![\\d./])", "close_threshold": 1.6, "correct_value": 8, "id": "neg_sub_1", "keyword_sets": {"math_direction_identification": {"expected": ["right", "to the right", "rightward", "forward"], "unless_question": ["positive", "negative"], "wrong": ["left", "to the left", "leftward"]}}, "operands": [5, -3], "operation": "-", "sub_answers": {"operands": [5, -3], "start": [5], "steps": [3]}, "surface_verdicts": {}, "text_key": "what is 5 - (-3)?", "verdicts": {"-8": "wrong_operation", "2": "wrong_operation", "8": "correct"}},
+        "neg_sub_2": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:negative eight|minus eight|negative 8|minus 8|\\-8)(?![\\d./])", "close_threshold": 1.6, "correct_value": -8, "id": "neg_sub_2", "keyword_sets": {"math_direction_identification": {"expected": ["left", "to the left", "leftward", "backward"], "unless_question": ["positive", "negative"], "wrong": ["right", "to the right", "rightward"]}, "math_operation_identification": {"expected": ["subtracting", "subtract", "minus", "subtraction", "difference"], "wrong": ["adding", "add", "plus", "addition"]}}, "operands": [-3, 5], "operation": "-", "sub_answers": {"operands": [-3, 5], "start": [-3], "steps": [5]}, "surface_verdicts": {}, "text_key": "what is -3 - 5?", "verdicts": {"-8": "correct", "2": "wrong_operation", "8": "wrong_operation"}},
+        "order_ops_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 14|fourteen|\\+14|14)(?![\\d./])", "close_threshold": 2.8, "correct_value": 14, "id": "order_ops_1", "keyword_sets": {}, "operands": [2, 3, 4], "operation": "+", "sub_answers": {"intermediate": [12], "operands": [2, 3, 4], "start": [2]}, "surface_verdicts": {}, "text_key": "what is 2 + 3 \u00d7 4?", "verdicts": {"14": "correct", "20": "wrong_operation"}},
+        "word_debt_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:negative two|negative 2|minus two|minus 2|\\-2)(?![\\d./])", "close_threshold": 0.4, "correct_value": -2, "id": "word_debt_1", "keyword_sets": {}, "operands": [], "operation": null, "sub_answers": {"givens": [3, 5], "start": [3]}, "surface_verdicts": {}, "text_key": "sarah had 3 apples. she gave away 5 apples. how many apples does she have now?", "verdicts": {"-2": "correct", "0": "wrong_operation", "2": "wrong_operation"}},
+        "word_neg_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:negative three|minus three|negative 3|minus 3|\\-3)(?![\\d./])", "close_threshold": 0.6, "correct_value": -3, "id": "word_neg_1", "keyword_sets": {}, "operands": [], "operation": null, "sub_answers": {"givens": [2, 5], "start": [2]}, "surface_verdicts": {}, "text_key": "the temperature was 2\u00b0c. it dropped 5 degrees. what is the new temperature?", "verdicts": {"-3": "correct", "3": "wrong_operation", "7": "wrong_operation"}}
+      };
+      const PROBLEM_TEXT_INDEX = {
+        "what is 1/2 + 1/4?": "frac_add_1",
+        "what is 2/3 - 1/6?": "frac_sub_1",
+        "what is -3 + 5?": "neg_add_1",
+        "what is -2 \u00d7 3?": "neg_mult_1",
+        "what is 5 - (-3)?": "neg_sub_1",
+        "what is -3 - 5?": "neg_sub_2",
+        "what is 2 + 3 \u00d7 4?": "order_ops_1",
+        "sarah had 3 apples. she gave away 5 apples. how many apples does she have now?": "word_debt_1",
+        "the temperature was 2\u00b0c. it dropped 5 degrees. what is the new temperature?": "word_neg_1"
+      };
+
+      function problemValueKey(value) {
+        const rounded = Math.round(value * 1000) / 1000;
+        return String(rounded === 0 ? 0 : rounded);
+      }
+
+      function problemSurfaceKey(text) {
+        const fractions = String(text || '').match(/-?\d+\s*\/\s*\d+/g);
+        return fractions ? fractions[fractions.length - 1].replace(/\s+/g, '') : null;
+      }
+
+      // Written form first ("3/6" unsimplified), then the value
+      function problemVerdict(spec, value, text) {
+        const surface = problemSurfaceKey(text);
+        return (surface && spec.surface_verdicts[surface]) || spec.verdicts[problemValueKey(value)];
+      }
+
+      function lookupProblemValidator(problem) {
+        if (!problem) return null;
+        const textKey = String(problem.text || '').trim().toLowerCase();
+        const byId = PROBLEM_VALIDATORS[problem.id];
+        if (byId && (!textKey || byId.text_key === textKey)) return byId;
+        const byText = PROBLEM_TEXT_INDEX[textKey];
+        return byText ? PROBLEM_VALIDATORS[byText] : null;
+      }
+      // TYPO_DICTIONARY (generated by build_typo_dictionary.py)
+      const TYPO_DICTIONARY = {"max_edit":2,"min_length":5,"words":["adding","add","plus","addition","sum","subtracting","subtract","minus","subtraction","difference","right","to","the","rightward","forward","left","leftward","backward","negative","less","than","zero","below","of","positive","greater","above","followed","counted","started","imagined","pictured","visualized","because","first","then","number","line","steps","easy"],"max_distance":[1,0,0,2,0,2,2,1,2,2,1,0,0,2,1,0,2,2,2,0,0,0,1,0,2,1,1,2,1,1,2,2,2,1,1,0,1,0,1,0],"deletes":{"addig":[0],"addin":[0],"adding":[0],"addng":[0],"ading":[0],"dding":[0],"add":[1],"plus":[2],"addiin":[3],"addiio":[3],"addiion":[3],"addion":[3],"additi":[3],"additin":[3],"additio":[3],"addition":[3],"additn":[3],"addito":[3],"additon":[3],"addtin":[3],"addtio":[3],"addtion":[3],"addton":[3],"adiion":[3],"aditin":[3],"aditio":[3],"adition":[3],"aditon":[3],"adtion":[3],"aition":[3],"ddiion":[3],"dditin":[3],"dditio":[3],"ddition":[3],"dditon":[3],"ddtion":[3],"dition":[3],"sum":[4],"btracting":[5],"sbracting":[5],"sbtacting":[5],"sbtracing":[5],"sbtractig":[5],"sbtractin":[5,8],"sbtracting":[5],"sbtractng":[5],"sbtrating":[5],"sbtrcting":[5],"stracting":[5],"subacting":[5],"subracing":[5],"subractig":[5],"subractin":[5,8],"subracting":[5],"subractng":[5],"subrating":[5],"subrcting":[5],"subtacing":[5],"subtactig":[5],"subtactin":[5,8],"subtacting":[5],"subtactng":[5],"subtating":[5],"subtcting":[5],"subtracig":[5],"subtracin":[5,8],"subtracing":[5],"subtracng":[5],"subtractg":[5],"subtracti":[5,8],"subtractig":[5],"subtractin":[5,8],"subtracting":[5],"subtractn":[5,8],"subtractng":[5],"subtraing":[5],"subtratig":[5],"subtratin":[5,8],"subtrating":[5],"subtratng":[5],"subtrcing":[5],"subtrctig":[5],"subtrctin":[5,8],"subtrcting":[5],"subtrctng":[5],"subtrting":[5],"suracting":[5],"sutacting":[5],"sutracing":[5],"sutractig":[5],"sutractin":[5,8],"sutracting":[5],"sutractng":[5],"sutrating":[5],"sutrcting":[5],"ubracting":[5],"ubtacting":[5],"ubtracing":[5],"ubtractig":[5],"ubtractin":[5,8],"ubtracting":[5],"ubtractng":[5],"ubtrating":[5],"ubtrcting":[5],"utracting":[5],"btract":[6],"sbract":[6],"sbtact":[6],"sbtrac":[6],"sbtract":[6],"sbtrat":[6],"sbtrct":[6],"stract":[6],"subact":[6],"subrac":[6],"subract":[6],"subrat":[6],"subrct":[6],"subtac":[6],"subtact":[6],"subtat":[6],"subtct":[6],"subtra":[6],"subtrac":[6],"subtract":[6],"subtrat":[6],"subtrc":[6],"subtrct":[6],"subtrt":[6],"suract":[6],"sutact":[6],"sutrac":[6],"sutract":[6],"sutrat":[6],"sutrct":[6],"ubract":[6],"ubtact":[6],"ubtrac":[6],"ubtract":[6],"ubtrat":[6],"ubtrct":[6],"utract":[6],"inus":[7],"mins":[7],"minu":[7],"minus":[7],"mius":[7],"mnus":[7],"btraction":[8],"sbraction":[8],"sbtaction":[8],"sbtracion":[8],"sbtractio":[8],"sbtraction":[8],"sbtracton":[8],"sbtration":[8],"sbtrction":[8],"straction":[8],"subaction":[8],"subracion":[8],"subractio":[8],"subraction":[8],"subracton":[8],"subration":[8],"subrction":[8],"subtacion":[8],"subtactio":[8],"subtaction":[8],"subtacton":[8],"subtation":[8],"subtction":[8],"subtracio":[8],"subtracion":[8],"subtracon":[8],"subtractio":[8],"subtraction":[8],"subtracto":[8],"subtracton":[8],"subtraion":[8],"subtratio":[8],"subtration":[8],"subtraton":[8],"subtrcion":[8],"subtrctio":[8],"subtrction":[8],"subtrcton":[8],"subtrtion":[8],"suraction":[8],"sutaction":[8],"sutracion":[8],"sutractio":[8],"sutraction":[8],"sutracton":[8],"sutration":[8],"sutrction":[8],"ubraction":[8],"ubtaction":[8],"ubtracion":[8],"ubtractio":[8],"ubtraction":[8],"ubtracton":[8],"ubtration":[8],"ubtrction":[8],"utraction":[8],"dference":[9],"dffeence":[9],"dfferece":[9],"dfferenc":[9],"dfference":[9],"dfferene":[9],"dffernce":[9],"dffrence":[9],"dierence":[9],"difeence":[9],"diferece":[9],"diferenc":[9],"diference":[9],"diferene":[9],"difernce":[9],"diffeece":[9],"diffeenc":[9],"diffeence":[9],"diffeene":[9],"diffence":[9],"differce":[9],"differec":[9],"differece":[9],"differee":[9],"differen":[9],"differenc":[9],"difference":[9],"differene":[9],"differnc":[9],"differnce":[9],"differne":[9],"diffrece":[9],"diffrenc":[9],"diffrence":[9],"diffrene":[9],"diffrnce":[9],"difrence":[9],"fference":[9],"iference":[9],"iffeence":[9],"ifferece":[9],"ifferenc":[9],"ifference":[9],"ifferene":[9],"iffernce":[9],"iffrence":[9],"ight":[10],"rght":[10],"righ":[10],"right":[10],"rigt":[10],"riht":[10],"to":[11],"the":[12],"ghtward":[13],"ightard":[13],"ightwad":[13],"ightwar":[13],"ightward":[13],"ightwrd":[13],"ighward":[13],"igtward":[13],"ihtward":[13],"rghtard":[13],"rghtwad":[13],"rghtwar":[13],"rghtward":[13],"rghtwrd":[13],"rghward":[13],"rgtward":[13],"rhtward":[13],"righard":[13],"rightad":[13],"rightar":[13],"rightard":[13],"rightrd":[13],"rightwa":[13],"rightwad":[13],"rightwar":[13],"rightward":[13],"rightwd":[13],"rightwr":[13],"rightwrd":[13],"righwad":[13],"righwar":[13],"righward":[13],"righwrd":[13],"rigtard":[13],"rigtwad":[13],"rigtwar":[13],"rigtward":[13],"rigtwrd":[13],"rigward":[13],"rihtard":[13],"rihtwad":[13],"rihtwar":[13],"rihtward":[13],"rihtwrd":[13],"rihward":[13],"ritward":[13],"forard":[14],"forwad":[14],"forwar":[14],"forward":[14],"forwrd":[14],"foward":[14],"frward":[14],"orward":[14],"left":[15],"eftard":[16],"eftwad":[16],"eftwar":[16],"eftward":[16],"eftwrd":[16],"efward":[16],"etward":[16],"ftward":[16],"lefard":[16],"leftad":[16],"leftar":[16],"leftard":[16],"leftrd":[16],"leftwa":[16],"leftwad":[16],"leftwar":[16],"leftward":[16],"leftwd":[16],"leftwr":[16],"leftwrd":[16],"lefwad":[16],"lefwar":[16],"lefward":[16],"lefwrd":[16],"letard":[16],"letwad":[16],"letwar":[16],"letward":[16],"letwrd":[16],"leward":[16],"lftard":[16],"lftwad":[16],"lftwar":[16],"lftward":[16],"lftwrd":[16],"lfward":[16],"ltward":[16],"ackard":[17],"ackwad":[17],"ackwar":[17],"ackward":[17],"ackwrd":[17],"acward":[17],"akward":[17],"bacard":[17],"backad":[17],"backar":[17],"backard":[17],"backrd":[17],"backwa":[17],"backwad":[17],"backwar":[17],"backward":[17],"backwd":[17],"backwr":[17],"backwrd":[17],"bacwad":[17],"bacwar":[17],"bacward":[17],"bacwrd":[17],"bakard":[17],"bakwad":[17],"bakwar":[17],"bakward":[17],"bakwrd":[17],"baward":[17],"bckard":[17],"bckwad":[17],"bckwar":[17],"bckward":[17],"bckwrd":[17],"bcward":[17],"bkward":[17],"ckward":[17],"eative":[18],"egaive":[18],"egatie":[18],"egativ":[18],"egative":[18],"egatve":[18],"egtive":[18],"gative":[18],"native":[18],"neaive":[18],"neatie":[18],"neativ":[18],"neative":[18],"neatve":[18],"negaie":[18],"negaiv":[18],"negaive":[18],"negate":[18],"negati":[18],"negatie":[18],"negativ":[18],"negative":[18],"negatv":[18],"negatve":[18],"negave":[18],"negive":[18],"negtie":[18],"negtiv":[18],"negtive":[18],"negtve":[18],"netive":[18],"ngaive":[18],"ngatie":[18],"ngativ":[18],"ngative":[18],"ngatve":[18],"ngtive":[18],"less":[19],"than":[20],"zero":[21],"belo":[22],"below":[22],"belw":[22],"beow":[22],"blow":[22],"elow":[22],"of":[23],"oitive":[24],"osiive":[24],"ositie":[24],"ositiv":[24],"ositive":[24],"ositve":[24],"ostive":[24],"pitive":[24],"poiive":[24],"poitie":[24],"poitiv":[24],"poitive":[24],"poitve":[24],"posiie":[24],"posiiv":[24],"posiive":[24],"posite":[24],"positi":[24],"positie":[24],"positiv":[24],"positive":[24],"positv":[24],"positve":[24],"posive":[24],"postie":[24],"postiv":[24],"postive":[24],"postve":[24],"potive":[24],"psiive":[24],"psitie":[24],"psitiv":[24],"psitive":[24],"psitve":[24],"pstive":[24],"sitive":[24],"geater":[25],"grater":[25],"greaer":[25],"greate":[25],"greater":[25],"greatr":[25],"greter":[25],"reater":[25],"aboe":[26],"abov":[26],"above":[26],"abve":[26],"aove":[26],"bove":[26],"flloed":[27],"fllowd":[27],"fllowe":[27],"fllowed":[27],"fllwed":[27],"flowed":[27],"folled":[27],"follod":[27],"folloe":[27],"folloed":[27],"follow":[27],"followd":[27],"followe":[27],"followed":[27],"follwd":[27],"follwe":[27],"follwed":[27],"foloed":[27],"folowd":[27],"folowe":[27],"folowed":[27],"folwed":[27],"foowed":[27],"llowed":[27],"olloed":[27],"ollowd":[27],"ollowe":[27],"ollowed":[27],"ollwed":[27],"olowed":[27],"conted":[28],"couned":[28],"countd":[28],"counte":[28],"counted":[28],"couted":[28],"cunted":[28],"ounted":[28],"sarted":[29],"stared":[29],"startd":[29],"starte":[29],"started":[29],"stated":[29],"strted":[29],"tarted":[29],"agined":[30],"iagied":[30],"iagind":[30],"iagine":[30],"iagined":[30],"iagned":[30],"iained":[30],"igined":[30],"imaged":[30],"imagid":[30],"imagie":[30],"imagied":[30],"imagin":[30],"imagind":[30],"imagine":[30],"imagined":[30],"imagnd":[30],"imagne":[30],"imagned":[30],"imaied":[30],"imaind":[30],"imaine":[30],"imained":[30],"imaned":[30],"imgied":[30],"imgind":[30],"imgine":[30],"imgined":[30],"imgned":[30],"imined":[30],"magied":[30],"magind":[30],"magine":[30],"magined":[30],"magned":[30],"mained":[30],"mgined":[30],"ctured":[31],"ictred":[31],"ictued":[31],"icturd":[31],"icture":[31],"ictured":[31],"icured":[31],"itured":[31],"pctred":[31],"pctued":[31],"pcturd":[31],"pcture":[31],"pctured":[31],"pcured":[31],"picred":[31],"picted":[31],"pictrd":[31],"pictre":[31],"pictred":[31],"pictud":[31],"pictue":[31],"pictued":[31],"pictur":[31],"picturd":[31],"picture":[31],"pictured":[31],"picued":[31],"picurd":[31],"picure":[31],"picured":[31],"pitred":[31],"pitued":[31],"piturd":[31],"piture":[31],"pitured":[31],"piured":[31],"ptured":[31],"isalized":[32],"isuaized":[32],"isualied":[32],"isualizd":[32],"isualize":[32],"isualized":[32],"isualzed":[32],"isulized":[32],"iualized":[32],"sualized":[32],"vialized":[32],"visaized":[32],"visalied":[32],"visalizd":[32],"visalize":[32],"visalized":[32],"visalzed":[32],"vislized":[32],"visuaied":[32],"visuaizd":[32],"visuaize":[32],"visuaized":[32],"visualed":[32],"visualid":[32],"visualie":[32],"visualied":[32],"visualiz":[32],"visualizd":[32],"visualize":[32],"visualized":[32],"visualzd":[32],"visualze":[32],"visualzed":[32],"visuazed":[32],"visuized":[32],"visulied":[32],"visulizd":[32],"visulize":[32],"visulized":[32],"visulzed":[32],"viuaized":[32],"viualied":[32],"viualizd":[32],"viualize":[32],"viualized":[32],"viualzed":[32],"viulized":[32],"vsalized":[32],"vsuaized":[32],"vsualied":[32],"vsualizd":[32],"vsualize":[32],"vsualized":[32],"vsualzed":[32],"vsulized":[32],"vualized":[32],"bcause":[33],"beause":[33],"becase":[33],"becaue":[33],"becaus":[33],"because":[33],"becuse":[33],"ecause":[33],"firs":[34],"first":[34],"firt":[34],"fist":[34],"frst":[34],"irst":[34],"then":[35],"nmber":[36],"nuber":[36],"numbe":[36],"number":[36],"numbr":[36],"numer":[36],"umber":[36],"line":[37],"seps":[38],"step":[38],"steps":[38],"stes":[38],"stps":[38],"teps":[38],"easy":[39]},"aliases":{"rite":"right","wright":"right","rigt":"right","lef":"left","ad":"add","subtrac":"subtract","minis":"minus"},"protected":{"abode":1,"addiction":1,"addling":1,"aiding":1,"allowed":1,"audition":1,"backboard":1,"backyard":1,"bellow":1,"bellowed":1,"bright":1,"counter":1,"courted":1,"different":1,"edition":1,"eight":1,"fight":1,"fright":1,"gadding":1,"grater":1,"greaten":1,"greeter":1,"hallowed":1,"hollowed":1,"imagines":1,"imaging":1,"light":1,"lumber":1,"mellowed":1,"menus":1,"might":1,"minds":1,"mines":1,"minks":1,"mints":1,"mounted":1,"native":1,"negation":1,"night":1,"numbed":1,"padding":1,"pictures":1,"position":1,"punctured":1,"relative":1,"sedative":1,"sedition":1,"sight":1,"sinus":1,"smarted":1,"starred":1,"starter":1,"startled":1,"starved":1,"stated":1,"steeps":1,"stems":1,"stews":1,"stops":1,"tight":1,"umber":1,"wadding":1,"wallowed":1,"wight":1,"yellowed":1}};
+
+      function editDistance(a, b, limit) {
+        if (Math.abs(a.length - b.length) > limit) return limit + 1;
+        let previous2 = null;
+        let previous = Array.from({ length: b.length + 1 }, (_, j) => j);
+        for (let i = 1; i <= a.length; i++) {
+          const current = [i];
+          let rowMin = i;
+          for (let j = 1; j <= b.length; j++) {
+            const cost = a[i - 1] === b[j - 1] ? 0 : 1;
+            let value = Math.min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost);
+            if (previous2 && i > 1 && j > 1 && a[i - 1] === b[j - 2] && a[i - 2] === b[j - 1]) {
+              value = Math.min(value, previous2[j - 2] + 1);
+            }
+            current.push(value);
+            rowMin = Math.min(rowMin, value);
+          }
+          if (rowMin > limit) return limit + 1;
+          previous2 = previous;
+          previous = current;
+        }
+        return previous[b.length];
+      }
+
+      function deleteVariants(word, distance) {
+        const variants = new Set([word]);
+        let frontier = [word];
+        for (let d = 0; d < distance; d++) {
+          const next = [];
+          for (const current of frontier) {
+            for (let i = 0; i < current.length; i++) {
+              const variant = current.slice(0, i) + current.slice(i + 1);
+              if (!variants.has(variant)) {
+                variants.add(variant);
+                next.push(variant);
+              }
+            }
+          }
+          frontier = next;
+        }
+        return variants;
+      }
+
+      function correctToken(token, dictionary) {
+        if (dictionary.aliases[token]) return { word: dictionary.aliases[token], distance: 0 };
+        if (dictionary.protected[token] || token.length < dictionary.min_length) return null;
+        let best = null;
+        for (const variant of deleteVariants(token, dictionary.max_edit)) {
+          for (const id of dictionary.deletes[variant] || []) {
+            const word = dictionary.words[id];
+            const limit = dictionary.max_distance[id];
+            const distance = word === token ? 0 : editDistance(token, word, limit);
+            if (distance > limit) continue;
+            if (!best || distance < best.distance || (distance === best.distance && id < best.id)) {
+              best = { word, distance, id };
+            }
+          }
+        }
+        return best && { word: best.word, distance: best.distance };
+      }
+
+      function normalizeTypos(text, dictionary) {
+        const corrections = [];
+        const normalized = String(text || '').replace(/[a-z']+/g, token => {
+          const correction = correctToken(token, dictionary);
+          if (!correction || correction.word === token) return token;
+          corrections.push({ from: token, to: correction.word, distance: correction.distance });
+          return correction.word;
+        });
+        return { text: normalized, corrections };
+      }
+      return { SEMANTIC_MATCHER, SEMANTIC_MATCHER_CONFIG, NEGATORS, SCOPE_BREAKERS, PUNCTUATION_TOKENS, isWordChar, isWholeWord, scanPhrases, scanPhrasesByIndex, markNegation, triggeredGroups, selectGenericSets, judgeKeywords, PROBLEM_VALIDATORS, PROBLEM_TEXT_INDEX, problemValueKey, problemSurfaceKey, problemVerdict, lookupProblemValidator, TYPO_DICTIONARY, editDistance, deleteVariants, correctToken, normalizeTypos };
+    }
+  },
+  "Normalize input1": {
+    hash: "051864d9d9782cbe",
+    code_hash: "051864d9d9782cbe",
+    names: ["responseOptions"],
+    blocks: [],
+    load: () => {
+      // RESPONSE_CONTRACT (functions/response_contract.js)
+      function responseOptions(payload) {
+        return {
+          timing: Boolean(payload && payload.include_timing)
+        };
+      }
+      return { responseOptions };
+    }
+  },
+  "Load Session1": {
+    hash: "0b4e76b989da385b",
+    code_hash: "0b4e76b989da385b",
+    names: ["TUTOR_FSM", "TUTOR_STATE_KINDS", "TUTOR_STATE_CODE", "parseTutorState", "tutorStateCode", "describeTutorState", "nextTutorState", "applyTutorTransition", "initialProblemState", "legacyTutorStateCode", "tutorSessionError", "ANSWER_PHRASE_CONFIG", "findNumbers", "endingCueLength", "startsWithCue", "analyzeAnswerPhrases"],
+    blocks: [],
+    load: () => {
+      // TUTOR_STATE (generated by build_state_machine.py)
+      const TUTOR_FSM = {"transitions":{"idle|stuck":{"to":"scaffolding","depth":"one","ask":true,"solve":false},"idle|correct":{"to":"teach_back","depth":null,"ask":false,"solve":true},"scaffolding|stuck":{"to":"scaffolding","depth":"same","ask":true,"solve":false},"scaffolding|scaffold_progress":{"to":"scaffolding","depth":"inc","ask":true,"solve":false},"scaffolding|correct":{"to":"teach_back","depth":null,"ask":false,"solve":true},"teach_back|teach_back_explanation":{"to":"solved","depth":null,"ask":false,"solve":false}}};
+
+      const TUTOR_STATE_KINDS = { I: 'idle', S: 'scaffolding', T: 'teach_back', D: 'solved' };
+
+      const TUTOR_STATE_CODE = /^(?:[ITD]|S[1-9]\d?)$/;
+
+      function parseTutorState(code) {
+        if (typeof code !== 'string' || !TUTOR_STATE_CODE.test(code)) return null;
+        return {
+          code,
+          kind: TUTOR_STATE_KINDS[code[0]],
+          depth: code[0] === 'S' ? parseInt(code.slice(1), 10) : 0
+        };
+      }
+
+      function tutorStateCode(kind, depth) {
+        return kind === 'scaffolding' ? 'S' + depth : kind === 'idle' ? 'I' : kind === 'teach_back' ? 'T' : 'D';
+      }
+
+      function describeTutorState(state) {
+        return {
+          code: state.code,
+          kind: state.kind,
+          depth: state.depth,
+          scaffolding: state.kind === 'scaffolding',
+          teach_back: state.kind === 'teach_back',
+          solved: state.kind === 'solved'
+        };
+      }
+
+      function nextTutorState(state, category, fsm) {
+        const transition = fsm.transitions[state.kind + '|' + category];
+        if (!transition) return { state, ask: false, solve: false };
+        const depth = transition.to !== 'scaffolding' ? 0
+          : transition.depth === 'one' ? 1
+          : transition.depth === 'inc' ? Math.min(state.depth + 1, 99)
+          : state.depth;
+        return {
+          state: parseTutorState(tutorStateCode(transition.to, depth)),
+          ask: transition.ask,
+          solve: transition.solve
+        };
+      }
+
+      function applyTutorTransition(session, category, fsm) {
+        const problem = session.current_problem;
+        const state = parseTutorState(problem.state);
+        if (!state) {
+          throw new Error(`Illegal tutor state ${JSON.stringify(problem.state)} in session ${session.session_id}`);
+        }
+        const transition = nextTutorState(state, category, fsm);
+        problem.state = transition.state.code;
+        if (transition.solve) {
+          session.stats.problems_solved++;
+        }
+        return transition;
+      }
+
+      function initialProblemState(problem) {
+        return {
+          id: problem.id,
+          text: problem.text,
+          correct_answer: problem.correct_answer,
+          attempt_count: 0,
+          state: 'I',
+          scaffolding: { last_question: null, expected_answers: null }
+        };
+      }
+
+      function legacyTutorStateCode(problem) {
+        if (problem.teach_back && problem.teach_back.active) return 'T';
+        if (problem.scaffolding && problem.scaffolding.active) {
+          return 'S' + Math.min(Math.max(parseInt(problem.scaffolding.depth, 10) || 1, 1), 99);
+        }
+        return 'I';
+      }
+
+      function tutorSessionError(session) {
+        const problem = session && session.current_problem;
+        if (!problem || typeof problem !== 'object') return 'missing current_problem';
+        if (!problem.id || !problem.text || problem.correct_answer === undefined || problem.correct_answer === null) {
+          return 'incomplete current_problem';
+        }
+        const state = parseTutorState(problem.state);
+        if (!state) return `illegal state code ${JSON.stringify(problem.state)}`;
+        if (!Array.isArray(session.recent_turns)) return 'missing recent_turns';
+        if (state.kind !== 'idle' && session.recent_turns.length === 0) return `state ${state.code} without any turns`;
+        if (!session.stats || typeof session.stats.total_turns !== 'number') return 'missing stats';
+        return null;
+      }
+      // ANSWER_PHRASE_ANALYZER (functions/answer_phrase_analyzer.js)
+      const ANSWER_PHRASE_CONFIG = {
+        answerCues: [
+          'we get', 'i get', 'you get', 'get', 'got', 'land on', 'landed on', 'lands on',
+          'land at', 'end up at', 'end up on', 'ended up at', 'ended on', 'reach', 'reached',
+          'to reach', 'equals', 'equal', 'is equal to', '=', "it's", 'its', 'it is',
+          "that's", 'thats', 'is', 'answer is', 'the answer is', 'i think', 'think',
+          'maybe', 'so', 'makes', 'at'
+        ],
+        processLeadCues: [
+          'move', 'moved', 'moving', 'go', 'went', 'count', 'counted', 'jump', 'jumped',
+          'from', 'start at', 'started at', 'start from', 'add', 'added', 'subtract',
+          'subtracted', 'take away', 'plus', 'minus', 'times', 'another', 'then'
+        ],
+        processTailCues: [
+          'steps', 'step', 'spaces', 'space', 'jumps', 'jump', 'times', 'more', 'places',
+          'units', 'to the right', 'to the left', 'and'
+        ],
+        positionTailCues: ['past zero', 'after zero', 'right of zero', 'left of zero', 'below zero', 'above zero'],
+        numberWords: {
+          zero: 0, one: 1, two: 2, three: 3, four: 4, five: 5, six: 6, seven: 7,
+          eight: 8, nine: 9, ten: 10, eleven: 11, twelve: 12, thirteen: 13,
+          fourteen: 14, fifteen: 15, sixteen: 16, seventeen: 17, eighteen: 18,
+          nineteen: 19, twenty: 20
+        }
+      };
+
+      function findNumbers(message) {
+        const words = Object.keys(ANSWER_PHRASE_CONFIG.numberWords).join('|');
+        const pattern = new RegExp(
+          '(?:\\b(negative|minus)\\s+)?' +
+          '(?:(-|−)?(\\d+(?:\\.\\d+)?(?:\\/\\d+)?|\\.\\d+)|\\b(' + words + ')\\b)',
+          'gi'
+        );
+        const found = [];
+        let match;
+        while ((match = pattern.exec(message)) !== null) {
+          let value;
+          if (match[3] !== undefined) {
+            const [numerator, denominator] = match[3].split('/');
+            value = denominator ? parseFloat(numerator) / parseFloat(denominator) : parseFloat(numerator);
+          } else {
+            value = ANSWER_PHRASE_CONFIG.numberWords[match[4].toLowerCase()];
+          }
+          const signWord = match[1] ? match[1].toLowerCase() : null;
+          const before = message.slice(0, match.index).trim();
+          const signIsOperator = signWord === 'minus' && new RegExp('(\\d|\\b(' + words + '))$').test(before);
+          const dashIsOperator = match[2] && /[\d)]\s*$/.test(message.slice(0, match.index));
+          if ((signWord && !signIsOperator) || (match[2] && !dashIsOperator)) {
+            value = -value;
+          }
+          if (match[4] && match[4].toLowerCase() === 'zero' && /\b(past|after|of|below|above)\s*$/.test(before)) {
+            continue;
+          }
+          const start = signIsOperator ? match.index + match[0].indexOf(match[3] || match[4]) : match.index;
+          found.push({ value, start, end: match.index + match[0].length, text: message.slice(start, match.index + match[0].length) });
+        }
+        return found;
+      }
+
+      function endingCueLength(text, cues) {
+        let longest = 0;
+        for (const cue of cues) {
+          if (text === cue || text.endsWith(' ' + cue) || (cue === '=' && text.endsWith('='))) {
+            longest = Math.max(longest, cue.length);
+          }
+        }
+        return longest;
+      }
+
+      function startsWithCue(text, cues) {
+        return cues.some(cue => text === cue || text.startsWith(cue + ' ') || text.startsWith(cue + ','));
+      }
+
+      function analyzeAnswerPhrases(message) {
+        const text = String(message || '').toLowerCase().replace(/[’‘]/g, "'");
+        const numbers = findNumbers(text);
+        if (numbers.length === 0) {
+          return { value: null, confidence: 0, role: 'neutral', candidates: [] };
+        }
+        const stripped = text.replace(/[\s?!.,]+/g, ' ').trim();
+        const candidates = numbers.map((number, index) => {
+          const lead = text.slice(0, number.start).replace(/[^a-z0-9=' ]+/g, ' ').replace(/\s+/g, ' ').trim();
+          const tail = text.slice(number.end).replace(/[^a-z0-9' ]+/g, ' ').replace(/\s+/g, ' ').trim();
+          let score = 0;
+          let role = 'neutral';
+          const answerLead = endingCueLength(lead, ANSWER_PHRASE_CONFIG.answerCues);
+          const processLead = endingCueLength(lead, ANSWER_PHRASE_CONFIG.processLeadCues);
+          if (answerLead > processLead) {
+            score += 3;
+            role = 'answer';
+          } else if (processLead > 0) {
+            score -= 2;
+            role = 'process';
+          }
+          const positionTail = tail.replace(/^(steps?|spaces?)\s+/, '');
+          if (startsWithCue(positionTail, ANSWER_PHRASE_CONFIG.positionTailCues)) {
+            score += 2;
+            role = 'answer';
+          } else if (startsWithCue(tail, ANSWER_PHRASE_CONFIG.processTailCues)) {
+            score -= 2;
+            if (role !== 'answer') role = 'process';
+          }
+          if (index === numbers.length - 1) score += 0.5;
+          return { value: number.value, score, role, text: number.text.trim() };
+        });
+        if (numbers.length === 1 && stripped === numbers[0].text.replace(/[\s?!.,]+/g, ' ').trim()) {
+          return { value: numbers[0].value, confidence: 1.0, role: 'answer', candidates };
+        }
+        const ranked = [...candidates].sort((a, b) => b.score - a.score);
+        const best = ranked[0];
+        let confidence;
+        if (ranked.length === 1) {
+          confidence = best.role === 'answer' ? 0.95 : best.role === 'process' ? 0.8 : 0.85;
+        } else {
+          const margin = best.score - ranked[1].score;
+          confidence = Math.min(0.95, 0.5 + 0.15 * margin);
+          if (ranked.every(candidate => Math.abs(candidate.value - best.value) < 0.001)) {
+            confidence = 0.95;
+          }
+          if (best.role !== 'answer') {
+            confidence = Math.min(confidence, 0.6);
+          }
+        }
+        return {
+          value: best.value,
+          confidence: Math.round(confidence * 100) / 100,
+          role: best.role,
+          candidates
+        };
+      }
+      return { TUTOR_FSM, TUTOR_STATE_KINDS, TUTOR_STATE_CODE, parseTutorState, tutorStateCode, describeTutorState, nextTutorState, applyTutorTransition, initialProblemState, legacyTutorStateCode, tutorSessionError, ANSWER_PHRASE_CONFIG, findNumbers, endingCueLength, startsWithCue, analyzeAnswerPhrases };
+    }
+  },
+  "Update Session & Format Response1": {
+    hash: "7711063d5272d471",
+    code_hash: "b9b15112b27cc0ab",
+    names: ["PROBLEM_VALIDATORS", "PROBLEM_TEXT_INDEX", "problemValueKey", "problemSurfaceKey", "problemVerdict", "lookupProblemValidator", "SUB_ANSWER_CONFIG", "parseSubAnswerValue", "questionValues", "expectedSubAnswers", "TUTOR_FSM", "TUTOR_STATE_KINDS", "TUTOR_STATE_CODE", "parseTutorState", "tutorStateCode", "describeTutorState", "nextTutorState", "applyTutorTransition", "initialProblemState", "legacyTutorStateCode", "tutorSessionError", "buildResponseBody", "QUESTION_LOOP_CONFIG", "lastQuestion", "questionSignature", "signatureSimilarity", "loopSynthesisHint", "trackQuestionLoop"],
+    blocks: [["PROBLEM_VALIDATORS (generated by build_problem_validators.py)", null], ["SUB_ANSWERS (functions/sub_answers.js)", "const SUB_ANSWER_CONFIG = {\n  cues: {\n    start: ['start', 'begin', 'where are we'],\n    steps: ['how many steps', 'how many spaces', 'how many jumps', 'how far', 'how many more', 'count'],\n    intermediate: ['first', 'multiply', 'times'],\n    denominator: ['denominator', 'same size', 'convert'],\n    givens: ['how many', 'how much']\n  },\n  questionExpression: /(-?\\d+(?:\\.\\d+)?(?:\\/\\d+)?)\\s+([+\\-\u2212\u00d7*\u00f7])\\s+\\(?\\s*(-?\\d+(?:\\.\\d+)?(?:\\/\\d+)?)\\s*\\)?/g\n};\n\nfunction parseSubAnswerValue(text) {\n  const match = String(text === null || text === undefined ? '' : text).replace('\u2212', '-')\n    .match(/-?\\d+(?:\\.\\d+)?(?:\\/\\d+)?/);\n  if (!match) return NaN;\n  const [numerator, denominator] = match[0].split('/');\n  return denominator ? parseFloat(numerator) / parseFloat(denominator) : parseFloat(numerator);\n}\n\nfunction questionValues(question) {\n  const values = [];\n  for (const match of question.matchAll(SUB_ANSWER_CONFIG.questionExpression)) {\n    const a = parseSubAnswerValue(match[1]);\n    const b = parseSubAnswerValue(match[3]);\n    const value = { '+': a + b, '-': a - b, '\u2212': a - b, '\u00d7': a * b, '*': a * b, '\u00f7': a / b }[match[2]];\n    if (Number.isFinite(value)) values.push(value);\n  }\n  return values;\n}\n\nfunction expectedSubAnswers(spec, problem, lastQuestion) {\n  const question = String(lastQuestion || '').toLowerCase();\n  const correct = spec ? spec.correct_value : parseSubAnswerValue(problem && problem.correct_answer);\n  if (!Number.isFinite(correct)) return null;\n  const sets = (spec && spec.sub_answers) || {};\n  const cues = SUB_ANSWER_CONFIG.cues;\n  const cued = Object.keys(cues).filter(role =>\n    sets[role] && cues[role].some(cue => question.includes(cue)));\n  const asked = questionValues(question);\n  const roles = cued.length > 0 || asked.length > 0 ? cued : Object.keys(sets);\n  const expected = {};\n  for (const role of roles) {\n    for (const value of sets[role]) {\n      const key = problemValueKey(value);\n      if (!expected[key]) expected[key] = role;\n    }\n  }\n  for (const value of asked) {\n    const key = problemValueKey(value);\n    if (!expected[key]) expected[key] = 'question';\n  }\n  if (Object.keys(expected).length === 0) return null;\n  expected[problemValueKey(correct)] = 'main';\n  return expected;\n}"], ["TUTOR_STATE (generated by build_state_machine.py)", "const TUTOR_FSM = {\"transitions\":{\"idle|stuck\":{\"to\":\"scaffolding\",\"depth\":\"one\",\"ask\":true,\"solve\":false},\"idle|correct\":{\"to\":\"teach_back\",\"depth\":null,\"ask\":false,\"solve\":true},\"scaffolding|stuck\":{\"to\":\"scaffolding\",\"depth\":\"same\",\"ask\":true,\"solve\":false},\"scaffolding|scaffold_progress\":{\"to\":\"scaffolding\",\"depth\":\"inc\",\"ask\":true,\"solve\":false},\"scaffolding|correct\":{\"to\":\"teach_back\",\"depth\":null,\"ask\":false,\"solve\":true},\"teach_back|teach_back_explanation\":{\"to\":\"solved\",\"depth\":null,\"ask\":false,\"solve\":false}}};\n\nconst TUTOR_STATE_KINDS = { I: 'idle', S: 'scaffolding', T: 'teach_back', D: 'solved' };\n\nconst TUTOR_STATE_CODE = /^(?:[ITD]|S[1-9]\\d?)$/;\n\nfunction parseTutorState(code) {\n  if (typeof code !== 'string' || !TUTOR_STATE_CODE.test(code)) return null;\n  return {\n    code,\n    kind: TUTOR_STATE_KINDS[code[0]],\n    depth: code[0] === 'S' ? parseInt(code.slice(1), 10) : 0\n  };\n}\n\nfunction tutorStateCode(kind, depth) {\n  return kind === 'scaffolding' ? 'S' + depth : kind === 'idle' ? 'I' : kind === 'teach_back' ? 'T' : 'D';\n}\n\nfunction describeTutorState(state) {\n  return {\n    code: state.code,\n    kind: state.kind,\n    depth: state.depth,\n    scaffolding: state.kind === 'scaffolding',\n    teach_back: state.kind === 'teach_back',\n    solved: state.kind === 'solved'\n  };\n}\n\nfunction nextTutorState(state, category, fsm) {\n  const transition = fsm.transitions[state.kind + '|' + category];\n  if (!transition) return { state, ask: false, solve: false };\n  const depth = transition.to !== 'scaffolding' ? 0\n    : transition.depth === 'one' ? 1\n    : transition.depth === 'inc' ? Math.min(state.depth + 1, 99)\n    : state.depth;\n  return {\n    state: parseTutorState(tutorStateCode(transition.to, depth)),\n    ask: transition.ask,\n    solve: transition.solve\n  };\n}\n\nfunction applyTutorTransition(session, category, fsm) {\n  const problem = session.current_problem;\n  const state = parseTutorState(problem.state);\n  if (!state) {\n    throw new Error(`Illegal tutor state ${JSON.stringify(problem.state)} in session ${session.session_id}`);\n  }\n  const transition = nextTutorState(state, category, fsm);\n  problem.state = transition.state.code;\n  if (transition.solve) {\n    session.stats.problems_solved++;\n  }\n  return transition;\n}\n\nfunction initialProblemState(problem) {\n  return {\n    id: problem.id,\n    text: problem.text,\n    correct_answer: problem.correct_answer,\n    attempt_count: 0,\n    state: 'I',\n    scaffolding: { last_question: null, expected_answers: null }\n  };\n}\n\nfunction legacyTutorStateCode(problem) {\n  if (problem.teach_back && problem.teach_back.active) return 'T';\n  if (problem.scaffolding && problem.scaffolding.active) {\n    return 'S' + Math.min(Math.max(parseInt(problem.scaffolding.depth, 10) || 1, 1), 99);\n  }\n  return 'I';\n}\n\nfunction tutorSessionError(session) {\n  const problem = session && session.current_problem;\n  if (!problem || typeof problem !== 'object') return 'missing current_problem';\n  if (!problem.id || !problem.text || problem.correct_answer === undefined || problem.correct_answer === null) {\n    return 'incomplete current_problem';\n  }\n  const state = parseTutorState(problem.state);\n  if (!state) return `illegal state code ${JSON.stringify(problem.state)}`;\n  if (!Array.isArray(session.recent_turns)) return 'missing recent_turns';\n  if (state.kind !== 'idle' && session.recent_turns.length === 0) return `state ${state.code} without any turns`;\n  if (!session.stats || typeof session.stats.total_turns !== 'number') return 'missing stats';\n  return null;\n}"], ["RESPONSE_CONTRACT (functions/response_contract.js)", "function buildResponseBody(response, category, session, options, startTime) {\n  const metadata = {\n    category: category,\n    attempt_count: session.current_problem.attempt_count,\n    session_version: session.version\n  };\n  if (options && options.timing && typeof startTime === 'number') {\n    metadata.latency_ms = Date.now() - startTime;\n  }\n  return { response, metadata };\n}"], ["QUESTION_LOOP (functions/question_loop.js)", "const QUESTION_LOOP_CONFIG = {\n  threshold: 0.6,\n  minTokens: 2,\n  repeats: 1,\n  history: 8,\n  stopwords: new Set([\n    'a', 'an', 'and', 'are', 'at', 'be', 'can', 'could', 'did', 'do', 'does', 'for', 'from', 'go',\n    'how', 'i', 'if', 'in', 'is', 'it', 'let', \"let's\", 'lets', 'me', 'now', 'of', 'on', 'or',\n    'so', 'that', 'the', 'then', 'there', 'this', 'to', 'try', 'up', 'us', 'we', 'what', \"what's\",\n    'whats', 'when', 'where', 'which', 'will', 'with', 'would', 'you', 'your'\n  ]),\n  token: /-?\\d+(?:\\.\\d+)?(?:\\/\\d+)?|[a-z]+(?:'[a-z]+)?/g\n};\n\nfunction lastQuestion(tutorResponse) {\n  const sentences = String(tutorResponse || '').replace(/\u2212/g, '-').split(/(?<=[.!?])\\s+/);\n  const question = sentences.filter(sentence => sentence.trim().endsWith('?')).pop();\n  return question ? question.trim() : null;\n}\n\nfunction questionSignature(tutorResponse) {\n  const question = lastQuestion(tutorResponse);\n  if (!question) return null;\n  const tokens = new Set();\n  for (const token of question.toLowerCase().match(QUESTION_LOOP_CONFIG.token) || []) {\n    if (QUESTION_LOOP_CONFIG.stopwords.has(token)) continue;\n    tokens.add(token.length > 3 && token.endsWith('s') && !token.endsWith('ss') ? token.slice(0, -1) : token);\n  }\n  return tokens.size >= QUESTION_LOOP_CONFIG.minTokens ? [...tokens].sort().join(' ') : null;\n}\n\nfunction signatureSimilarity(a, b) {\n  if (!a || !b) return 0;\n  const left = new Set(a.split(' '));\n  const right = b.split(' ');\n  const shared = right.filter(token => left.has(token)).length;\n  return shared / (left.size + right.length - shared);\n}\n\nfunction loopSynthesisHint(recentTurns, message, problem) {\n  const answers = [];\n  const messages = (recentTurns || [])\n    .filter(turn => !turn.is_previous_problem && turn.category === 'scaffold_progress')\n    .map(turn => turn.student_message)\n    .concat([message]);\n  for (const text of messages) {\n    const match = String(text || '').replace(/\u2212/g, '-').match(/-?\\d+(?:\\.\\d+)?(?:\\/\\d+)?/);\n    if (match && !answers.includes(match[0])) answers.push(match[0]);\n  }\n  const found = answers.length > 0 ? `You found ${answers.join(' and ')}. ` : '';\n  return `${found}Put it together - ${problem.text}`;\n}\n\nfunction trackQuestionLoop(scaffolding, response, recentTurns, message, problem) {\n  const asked = (scaffolding && scaffolding.question_signatures) || [];\n  const signature = questionSignature(response);\n  const result = { question_signatures: asked, question_loop: null };\n  if (!signature) return result;\n  let repeats = 0;\n  let similarity = 0;\n  for (const earlier of asked) {\n    const score = signatureSimilarity(signature, earlier);\n    if (score >= QUESTION_LOOP_CONFIG.threshold) repeats++;\n    similarity = Math.max(similarity, score);\n  }\n  result.question_signatures = asked.concat([signature]).slice(-QUESTION_LOOP_CONFIG.history);\n  if (repeats >= QUESTION_LOOP_CONFIG.repeats) {\n    result.question_loop = {\n      question: lastQuestion(response),\n      repeats,\n      similarity: Math.round(similarity * 100) / 100,\n      synthesis_hint: loopSynthesisHint(recentTurns, message, problem)\n    };\n  }\n  return result;\n}"]],
+    load: () => {
+      // PROBLEM_VALIDATORS (generated by build_problem_validators.py)
+      // Generated from exemplars/questions.json - do not edit by hand
+      const PROBLEM_VALIDATORS = {
+        "frac_add_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 0\\.75|\\+0\\.75|0\\.75|3\\/4|\\.75)(?![\\d./])", "close_threshold": 0.3, "correct_value": 0.75, "id": "frac_add_1", "keyword_sets": {"math_direction_identification": {"expected": ["right", "to the right", "rightward", "forward"], "unless_question": ["positive", "negative"], "wrong": ["left", "to the left", "leftward"]}, "math_operation_identification": {"expected": ["adding", "add", "plus", "addition", "sum"], "wrong": ["subtracting", "subtract", "minus", "subtraction"]}}, "operands": [0.5, 0.25], "operation": "+", "sub_answers": {"denominator": [4], "operands": [0.5, 0.25], "start": [0.5], "steps": [0.25]}, "surface_verdicts": {}, "text_key": "what is 1/2 + 1/4?", "verdicts": {"-0.75": "wrong_operation", "0.25": "wrong_operation", "0.333": "wrong_operation", "0.5": "close", "0.75": "correct"}},
+        "frac_sub_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 0\\.5|\\+0\\.5|0\\.5|1\\/2|\\.5)(?![\\d./])", "close_threshold": 0.3, "correct_value": 0.5, "id": "frac_sub_1", "keyword_sets": {"math_direction_identification": {"expected": ["left", "to the left", "leftward", "backward"], "unless_question": ["positive", "negative"], "wrong": ["right", "to the right", "rightward"]}, "math_operation_identification": {"expected": ["subtracting", "subtract", "minus", "subtraction", "difference"], "wrong": ["adding", "add", "plus", "addition"]}}, "operands": [0.666667, 0.166667], "operation": "-", "sub_answers": {"denominator": [6], "operands": [0.666667, 0.166667], "start": [0.666667], "steps": [0.166667]}, "surface_verdicts": {"3/6": "close"}, "text_key": "what is 2/3 - 1/6?", "verdicts": {"-0.5": "wrong_operation", "0.333": "wrong_operation", "0.5": "correct", "0.833": "wrong_operation"}},
+        "neg_add_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 2|two|\\+2|2)(?![\\d./])", "close_threshold": 0.4, "correct_value": 2, "id": "neg_add_1", "keyword_sets": {"math_direction_identification": {"expected": ["right", "to the right", "rightward", "forward"], "unless_question": ["positive", "negative"], "wrong": ["left", "to the left", "leftward"]}, "math_operation_identification": {"expected": ["adding", "add", "plus", "addition", "sum"], "wrong": ["subtracting", "subtract", "minus", "subtraction"]}}, "operands": [-3, 5], "operation": "+", "sub_answers": {"operands": [-3, 5], "start": [-3], "steps": [5, 3]}, "surface_verdicts": {}, "text_key": "what is -3 + 5?", "verdicts": {"-2": "wrong_operation", "-8": "wrong_operation", "1": "close", "2": "correct", "3": "close", "8": "wrong_operation"}},
+        "neg_mult_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:negative six|negative 6|minus six|minus 6|\\-6)(?![\\d./])", "close_threshold": 1.2, "correct_value": -6, "id": "neg_mult_1", "keyword_sets": {}, "operands": [-2, 3], "operation": "*", "sub_answers": {"operands": [-2, 3], "start": [-2]}, "surface_verdicts": {}, "text_key": "what is -2 \u00d7 3?", "verdicts": {"-5": "wrong_operation", "-6": "correct", "1": "wrong_operation", "6": "wrong_operation"}},
+        "neg_sub_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 8|eight|\\+8|8)(?![\\d./])", "close_threshold": 1.6, "correct_value": 8, "id": "neg_sub_1", "keyword_sets": {"math_direction_identification": {"expected": ["right", "to the right", "rightward", "forward"], "unless_question": ["positive", "negative"], "wrong": ["left", "to the left", "leftward"]}}, "operands": [5, -3], "operation": "-", "sub_answers": {"operands": [5, -3], "start": [5], "steps": [3]}, "surface_verdicts": {}, "text_key": "what is 5 - (-3)?", "verdicts": {"-8": "wrong_operation", "2": "wrong_operation", "8": "correct"}},
+        "neg_sub_2": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:negative eight|minus eight|negative 8|minus 8|\\-8)(?![\\d./])", "close_threshold": 1.6, "correct_value": -8, "id": "neg_sub_2", "keyword_sets": {"math_direction_identification": {"expected": ["left", "to the left", "leftward", "backward"], "unless_question": ["positive", "negative"], "wrong": ["right", "to the right", "rightward"]}, "math_operation_identification": {"expected": ["subtracting", "subtract", "minus", "subtraction", "difference"], "wrong": ["adding", "add", "plus", "addition"]}}, "operands": [-3, 5], "operation": "-", "sub_answers": {"operands": [-3, 5], "start": [-3], "steps": [5]}, "surface_verdicts": {}, "text_key": "what is -3 - 5?", "verdicts": {"-8": "correct", "2": "wrong_operation", "8": "wrong_operation"}},
+        "order_ops_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 14|fourteen|\\+14|14)(?![\\d./])", "close_threshold": 2.8, "correct_value": 14, "id": "order_ops_1", "keyword_sets": {}, "operands": [2, 3, 4], "operation": "+", "sub_answers": {"intermediate": [12], "operands": [2, 3, 4], "start": [2]}, "surface_verdicts": {}, "text_key": "what is 2 + 3 \u00d7 4?", "verdicts": {"14": "correct", "20": "wrong_operation"}},
+        "word_debt_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:negative two|negative 2|minus two|minus 2|\\-2)(?![\\d./])", "close_threshold": 0.4, "correct_value": -2, "id": "word_debt_1", "keyword_sets": {}, "operands": [], "operation": null, "sub_answers": {"givens": [3, 5], "start": [3]}, "surface_verdicts": {}, "text_key": "sarah had 3 apples. she gave away 5 apples. how many apples does she have now?", "verdicts": {"-2": "correct", "0": "wrong_operation", "2": "wrong_operation"}},
+        "word_neg_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:negative three|minus three|negative 3|minus 3|\\-3)(?![\\d./])", "close_threshold": 0.6, "correct_value": -3, "id": "word_neg_1", "keyword_sets": {}, "operands": [], "operation": null, "sub_answers": {"givens": [2, 5], "start": [2]}, "surface_verdicts": {}, "text_key": "the temperature was 2\u00b0c. it dropped 5 degrees. what is the new temperature?", "verdicts": {"-3": "correct", "3": "wrong_operation", "7": "wrong_operation"}}
+      };
+      const PROBLEM_TEXT_INDEX = {
+        "what is 1/2 + 1/4?": "frac_add_1",
+        "what is 2/3 - 1/6?": "frac_sub_1",
+        "what is -3 + 5?": "neg_add_1",
+        "what is -2 \u00d7 3?": "neg_mult_1",
+        "what is 5 - (-3)?": "neg_sub_1",
+        "what is -3 - 5?": "neg_sub_2",
+        "what is 2 + 3 \u00d7 4?": "order_ops_1",
+        "sarah had 3 apples. she gave away 5 apples. how many apples does she have now?": "word_debt_1",
+        "the temperature was 2\u00b0c. it dropped 5 degrees. what is the new temperature?": "word_neg_1"
+      };
+
+      function problemValueKey(value) {
+        const rounded = Math.round(value * 1000) / 1000;
+        return String(rounded === 0 ? 0 : rounded);
+      }
+
+      function problemSurfaceKey(text) {
+        const fractions = String(text || '').match(/-?\d+\s*\/\s*\d+/g);
+        return fractions ? fractions[fractions.length - 1].replace(/\s+/g, '') : null;
+      }
+
+      // Written form first ("3/6" unsimplified), then the value
+      function problemVerdict(spec, value, text) {
+        const surface = problemSurfaceKey(text);
+        return (surface && spec.surface_verdicts[surface]) || spec.verdicts[problemValueKey(value)];
+      }
+
+      function lookupProblemValidator(problem) {
+        if (!problem) return null;
+        const textKey = String(problem.text || '').trim().toLowerCase();
+        const byId = PROBLEM_VALIDATORS[problem.id];
+        if (byId && (!textKey || byId.text_key === textKey)) return byId;
+        const byText = PROBLEM_TEXT_INDEX[textKey];
+        return byText ? PROBLEM_VALIDATORS[byText] : null;
+      }
+      // SUB_ANSWERS (functions/sub_answers.js)
+      const SUB_ANSWER_CONFIG = {
+        cues: {
+          start: ['start', 'begin', 'where are we'],
+          steps: ['how many steps', 'how many spaces', 'how many jumps', 'how far', 'how many more', 'count'],
+          intermediate: ['first', 'multiply', 'times'],
+          denominator: ['denominator', 'same size', 'convert'],
+          givens: ['how many', 'how much']
+        },
+        questionExpression: /(-?\d+(?:\.\d+)?(?:\/\d+)?)\s+([+\-−×*÷])\s+\(?\s*(-?\d+(?:\.\d+)?(?:\/\d+)?)\s*\)?/g
+      };
+
+      function parseSubAnswerValue(text) {
+        const match = String(text === null || text === undefined ? '' : text).replace('−', '-')
+          .match(/-?\d+(?:\.\d+)?(?:\/\d+)?/);
+        if (!match) return NaN;
+        const [numerator, denominator] = match[0].split('/');
+        return denominator ? parseFloat(numerator) / parseFloat(denominator) : parseFloat(numerator);
+      }
+
+      function questionValues(question) {
+        const values = [];
+        for (const match of question.matchAll(SUB_ANSWER_CONFIG.questionExpression)) {
+          const a = parseSubAnswerValue(match[1]);
+          const b = parseSubAnswerValue(match[3]);
+          const value = { '+': a + b, '-': a - b, '−': a - b, '×': a * b, '*': a * b, '÷': a / b }[match[2]];
+          if (Number.isFinite(value)) values.push(value);
+        }
+        return values;
+      }
+
+      function expectedSubAnswers(spec, problem, lastQuestion) {
+        const question = String(lastQuestion || '').toLowerCase();
+        const correct = spec ? spec.correct_value : parseSubAnswerValue(problem && problem.correct_answer);
+        if (!Number.isFinite(correct)) return null;
+        const sets = (spec && spec.sub_answers) || {};
+        const cues = SUB_ANSWER_CONFIG.cues;
+        const cued = Object.keys(cues).filter(role =>
+          sets[role] && cues[role].some(cue => question.includes(cue)));
+        const asked = questionValues(question);
+        const roles = cued.length > 0 || asked.length > 0 ? cued : Object.keys(sets);
+        const expected = {};
+        for (const role of roles) {
+          for (const value of sets[role]) {
+            const key = problemValueKey(value);
+            if (!expected[key]) expected[key] = role;
+          }
+        }
+        for (const value of asked) {
+          const key = problemValueKey(value);
+          if (!expected[key]) expected[key] = 'question';
+        }
+        if (Object.keys(expected).length === 0) return null;
+        expected[problemValueKey(correct)] = 'main';
+        return expected;
+      }
+      // TUTOR_STATE (generated by build_state_machine.py)
+      const TUTOR_FSM = {"transitions":{"idle|stuck":{"to":"scaffolding","depth":"one","ask":true,"solve":false},"idle|correct":{"to":"teach_back","depth":null,"ask":false,"solve":true},"scaffolding|stuck":{"to":"scaffolding","depth":"same","ask":true,"solve":false},"scaffolding|scaffold_progress":{"to":"scaffolding","depth":"inc","ask":true,"solve":false},"scaffolding|correct":{"to":"teach_back","depth":null,"ask":false,"solve":true},"teach_back|teach_back_explanation":{"to":"solved","depth":null,"ask":false,"solve":false}}};
+
+      const TUTOR_STATE_KINDS = { I: 'idle', S: 'scaffolding', T: 'teach_back', D: 'solved' };
+
+      const TUTOR_STATE_CODE = /^(?:[ITD]|S[1-9]\d?)$/;
+
+      function parseTutorState(code) {
+        if (typeof code !== 'string' || !TUTOR_STATE_CODE.test(code)) return null;
+        return {
+          code,
+          kind: TUTOR_STATE_KINDS[code[0]],
+          depth: code[0] === 'S' ? parseInt(code.slice(1), 10) : 0
+        };
+      }
+
+      function tutorStateCode(kind, depth) {
+        return kind === 'scaffolding' ? 'S' + depth : kind === 'idle' ? 'I' : kind === 'teach_back' ? 'T' : 'D';
+      }
+
+      function describeTutorState(state) {
+        return {
+          code: state.code,
+          kind: state.kind,
+          depth: state.depth,
+          scaffolding: state.kind === 'scaffolding',
+          teach_back: state.kind === 'teach_back',
+          solved: state.kind === 'solved'
+        };
+      }
+
+      function nextTutorState(state, category, fsm) {
+        const transition = fsm.transitions[state.kind + '|' + category];
+        if (!transition) return { state, ask: false, solve: false };
+        const depth = transition.to !== 'scaffolding' ? 0
+          : transition.depth === 'one' ? 1
+          : transition.depth === 'inc' ? Math.min(state.depth + 1, 99)
+          : state.depth;
+        return {
+          state: parseTutorState(tutorStateCode(transition.to, depth)),
+          ask: transition.ask,
+          solve: transition.solve
+        };
+      }
+
+      function applyTutorTransition(session, category, fsm) {
+        const problem = session.current_problem;
+        const state = parseTutorState(problem.state);
+        if (!state) {
+          throw new Error(`Illegal tutor state ${JSON.stringify(problem.state)} in session ${session.session_id}`);
+        }
+        const transition = nextTutorState(state, category, fsm);
+        problem.state = transition.state.code;
+        if (transition.solve) {
+          session.stats.problems_solved++;
+        }
+        return transition;
+      }
+
+      function initialProblemState(problem) {
+        return {
+          id: problem.id,
+          text: problem.text,
+          correct_answer: problem.correct_answer,
+          attempt_count: 0,
+          state: 'I',
+          scaffolding: { last_question: null, expected_answers: null }
+        };
+      }
+
+      function legacyTutorStateCode(problem) {
+        if (problem.teach_back && problem.teach_back.active) return 'T';
+        if (problem.scaffolding && problem.scaffolding.active) {
+          return 'S' + Math.min(Math.max(parseInt(problem.scaffolding.depth, 10) || 1, 1), 99);
+        }
+        return 'I';
+      }
+
+      function tutorSessionError(session) {
+        const problem = session && session.current_problem;
+        if (!problem || typeof problem !== 'object') return 'missing current_problem';
+        if (!problem.id || !problem.text || problem.correct_answer === undefined || problem.correct_answer === null) {
+          return 'incomplete current_problem';
+        }
+        const state = parseTutorState(problem.state);
+        if (!state) return `illegal state code ${JSON.stringify(problem.state)}`;
+        if (!Array.isArray(session.recent_turns)) return 'missing recent_turns';
+        if (state.kind !== 'idle' && session.recent_turns.length === 0) return `state ${state.code} without any turns`;
+        if (!session.stats || typeof session.stats.total_turns !== 'number') return 'missing stats';
+        return null;
+      }
+      // RESPONSE_CONTRACT (functions/response_contract.js)
+      function buildResponseBody(response, category, session, options, startTime) {
+        const metadata = {
+          category: category,
+          attempt_count: session.current_problem.attempt_count,
+          session_version: session.version
+        };
+        if (options && options.timing && typeof startTime === 'number') {
+          metadata.latency_ms = Date.now() - startTime;
+        }
+        return { response, metadata };
+      }
+      // QUESTION_LOOP (functions/question_loop.js)
+      const QUESTION_LOOP_CONFIG = {
+        threshold: 0.6,
+        minTokens: 2,
+        repeats: 1,
+        history: 8,
+        stopwords: new Set([
+          'a', 'an', 'and', 'are', 'at', 'be', 'can', 'could', 'did', 'do', 'does', 'for', 'from', 'go',
+          'how', 'i', 'if', 'in', 'is', 'it', 'let', "let's", 'lets', 'me', 'now', 'of', 'on', 'or',
+          'so', 'that', 'the', 'then', 'there', 'this', 'to', 'try', 'up', 'us', 'we', 'what', "what's",
+          'whats', 'when', 'where', 'which', 'will', 'with', 'would', 'you', 'your'
+        ]),
+        token: /-?\d+(?:\.\d+)?(?:\/\d+)?|[a-z]+(?:'[a-z]+)?/g
+      };
+
+      function lastQuestion(tutorResponse) {
+        const sentences = String(tutorResponse || '').replace(/−/g, '-').split(/(?<=[.!?])\s+/);
+        const question = sentences.filter(sentence => sentence.trim().endsWith('?')).pop();
+        return question ? question.trim() : null;
+      }
+
+      function questionSignature(tutorResponse) {
+        const question = lastQuestion(tutorResponse);
+        if (!question) return null;
+        const tokens = new Set();
+        for (const token of question.toLowerCase().match(QUESTION_LOOP_CONFIG.token) || []) {
+          if (QUESTION_LOOP_CONFIG.stopwords.has(token)) continue;
+          tokens.add(token.length > 3 && token.endsWith('s') && !token.endsWith('ss') ? token.slice(0, -1) : token);
+        }
+        return tokens.size >= QUESTION_LOOP_CONFIG.minTokens ? [...tokens].sort().join(' ') : null;
+      }
+
+      function signatureSimilarity(a, b) {
+        if (!a || !b) return 0;
+        const left = new Set(a.split(' '));
+        const right = b.split(' ');
+        const shared = right.filter(token => left.has(token)).length;
+        return shared / (left.size + right.length - shared);
+      }
+
+      function loopSynthesisHint(recentTurns, message, problem) {
+        const answers = [];
+        const messages = (recentTurns || [])
+          .filter(turn => !turn.is_previous_problem && turn.category === 'scaffold_progress')
+          .map(turn => turn.student_message)
+          .concat([message]);
+        for (const text of messages) {
+          const match = String(text || '').replace(/−/g, '-').match(/-?\d+(?:\.\d+)?(?:\/\d+)?/);
+          if (match && !answers.includes(match[0])) answers.push(match[0]);
+        }
+        const found = answers.length > 0 ? `You found ${answers.join(' and ')}. ` : '';
+        return `${found}Put it together - ${problem.text}`;
+      }
+
+      function trackQuestionLoop(scaffolding, response, recentTurns, message, problem) {
+        const asked = (scaffolding && scaffolding.question_signatures) || [];
+        const signature = questionSignature(response);
+        const result = { question_signatures: asked, question_loop: null };
+        if (!signature) return result;
+        let repeats = 0;
+        let similarity = 0;
+        for (const earlier of asked) {
+          const score = signatureSimilarity(signature, earlier);
+          if (score >= QUESTION_LOOP_CONFIG.threshold) repeats++;
+          similarity = Math.max(similarity, score);
+        }
+        result.question_signatures = asked.concat([signature]).slice(-QUESTION_LOOP_CONFIG.history);
+        if (repeats >= QUESTION_LOOP_CONFIG.repeats) {
+          result.question_loop = {
+            question: lastQuestion(response),
+            repeats,
+            similarity: Math.round(similarity * 100) / 100,
+            synthesis_hint: loopSynthesisHint(recentTurns, message, problem)
+          };
+        }
+        return result;
+      }
+      return { PROBLEM_VALIDATORS, PROBLEM_TEXT_INDEX, problemValueKey, problemSurfaceKey, problemVerdict, lookupProblemValidator, SUB_ANSWER_CONFIG, parseSubAnswerValue, questionValues, expectedSubAnswers, TUTOR_FSM, TUTOR_STATE_KINDS, TUTOR_STATE_CODE, parseTutorState, tutorStateCode, describeTutorState, nextTutorState, applyTutorTransition, initialProblemState, legacyTutorStateCode, tutorSessionError, buildResponseBody, QUESTION_LOOP_CONFIG, lastQuestion, questionSignature, signatureSimilarity, loopSynthesisHint, trackQuestionLoop };
+    }
+  },
+  "Teach-back validator": {
+    hash: "64feea32a17f72c1",
+    code_hash: "62cd2c22b426f878",
+    names: ["TYPO_DICTIONARY", "editDistance", "deleteVariants", "correctToken", "normalizeTypos", "PROBLEM_VALIDATORS", "PROBLEM_TEXT_INDEX", "problemValueKey", "problemSurfaceKey", "problemVerdict", "lookupProblemValidator", "ANSWER_PHRASE_CONFIG", "findNumbers", "TEACH_BACK_RUBRIC_CONFIG", "mentionsWord", "mentionsValue", "scoreTeachBack", "teachBackClosure"],
+    blocks: [["TYPO_DICTIONARY (generated by build_typo_dictionary.py)", null], ["PROBLEM_VALIDATORS (generated by build_problem_validators.py)", null], ["TEACH_BACK_RUBRIC (functions/teach_back_rubric.js)", "const ANSWER_PHRASE_CONFIG = {\n  answerCues: [\n    'we get', 'i get', 'you get', 'get', 'got', 'land on', 'landed on', 'lands on',\n    'land at', 'end up at', 'end up on', 'ended up at', 'ended on', 'reach', 'reached',\n    'to reach', 'equals', 'equal', 'is equal to', '=', \"it's\", 'its', 'it is',\n    \"that's\", 'thats', 'is', 'answer is', 'the answer is', 'i think', 'think',\n    'maybe', 'so', 'makes', 'at'\n  ],\n  processLeadCues: [\n    'move', 'moved', 'moving', 'go', 'went', 'count', 'counted', 'jump', 'jumped',\n    'from', 'start at', 'started at', 'start from', 'add', 'added', 'subtract',\n    'subtracted', 'take away', 'plus', 'minus', 'times', 'another', 'then'\n  ],\n  processTailCues: [\n    'steps', 'step', 'spaces', 'space', 'jumps', 'jump', 'times', 'more', 'places',\n    'units', 'to the right', 'to the left', 'and'\n  ],\n  positionTailCues: ['past zero', 'after zero', 'right of zero', 'left of zero', 'below zero', 'above zero'],\n  numberWords: {\n    zero: 0, one: 1, two: 2, three: 3, four: 4, five: 5, six: 6, seven: 7,\n    eight: 8, nine: 9, ten: 10, eleven: 11, twelve: 12, thirteen: 13,\n    fourteen: 14, fifteen: 15, sixteen: 16, seventeen: 17, eighteen: 18,\n    nineteen: 19, twenty: 20\n  }\n};\n\nfunction findNumbers(message) {\n  const words = Object.keys(ANSWER_PHRASE_CONFIG.numberWords).join('|');\n  const pattern = new RegExp(\n    '(?:\\\\b(negative|minus)\\\\s+)?' +\n    '(?:(-|\u2212)?(\\\\d+(?:\\\\.\\\\d+)?(?:\\\\/\\\\d+)?|\\\\.\\\\d+)|\\\\b(' + words + ')\\\\b)',\n    'gi'\n  );\n  const found = [];\n  let match;\n  while ((match = pattern.exec(message)) !== null) {\n    let value;\n    if (match[3] !== undefined) {\n      const [numerator, denominator] = match[3].split('/');\n      value = denominator ? parseFloat(numerator) / parseFloat(denominator) : parseFloat(numerator);\n    } else {\n      value = ANSWER_PHRASE_CONFIG.numberWords[match[4].toLowerCase()];\n    }\n    const signWord = match[1] ? match[1].toLowerCase() : null;\n    const before = message.slice(0, match.index).trim();\n    const signIsOperator = signWord === 'minus' && new RegExp('(\\\\d|\\\\b(' + words + '))$').test(before);\n    const dashIsOperator = match[2] && /[\\d)]\\s*$/.test(message.slice(0, match.index));\n    if ((signWord && !signIsOperator) || (match[2] && !dashIsOperator)) {\n      value = -value;\n    }\n    if (match[4] && match[4].toLowerCase() === 'zero' && /\\b(past|after|of|below|above)\\s*$/.test(before)) {\n      continue;\n    }\n    const start = signIsOperator ? match.index + match[0].indexOf(match[3] || match[4]) : match.index;\n    found.push({ value, start, end: match.index + match[0].length, text: message.slice(start, match.index + match[0].length) });\n  }\n  return found;\n}\n\nconst TEACH_BACK_RUBRIC_CONFIG = {\n  operationWords: {\n    '+': ['add', 'adding', 'added', 'plus', 'sum', 'addition', 'together', 'more'],\n    '-': ['subtract', 'subtracting', 'subtracted', 'minus', 'take away', 'took away', 'subtraction', 'less', 'fewer'],\n    '*': ['times', 'multiply', 'multiplied', 'multiplying', 'groups of', 'lots of'],\n    '/': ['divide', 'divided', 'dividing', 'split', 'share', 'shared']\n  },\n  strongScore: 0.75,\n  closures: [\n    'Great explaining! {summary} You really understand this one!',\n    'Perfect! {summary} That is exactly how to solve it.',\n    'Wonderful explanation! {summary} You nailed it!'\n  ]\n};\n\nfunction mentionsWord(text, word) {\n  return new RegExp('(?:^|[^a-z])' + word.replace(/[.*+?^${}()|[\\]\\\\]/g, '\\\\$&') + '(?![a-z])').test(text);\n}\n\nfunction mentionsValue(numbers, value) {\n  return numbers.some(number => Math.abs(number.value - value) < 0.001);\n}\n\nfunction scoreTeachBack(message, spec) {\n  const text = String(message || '').toLowerCase();\n  const numbers = findNumbers(text);\n  const operands = spec.operands || [];\n  const criteria = {};\n  criteria.operands = operands.length > 0\n    ? operands.every(operand => mentionsValue(numbers, operand))\n    : null;\n  const operationSets = spec.keyword_sets && spec.keyword_sets.math_operation_identification;\n  const operationWords = (operationSets ? operationSets.expected : [])\n    .concat(TEACH_BACK_RUBRIC_CONFIG.operationWords[spec.operation] || []);\n  const contradicted = [];\n  if (operationSets && operationSets.wrong.some(word => mentionsWord(text, word))) {\n    contradicted.push('operation');\n  }\n  criteria.operation = operationWords.length > 0\n    ? operationWords.some(word => mentionsWord(text, word)) && !contradicted.includes('operation')\n    : null;\n  const directionSets = spec.keyword_sets && spec.keyword_sets.math_direction_identification;\n  if (directionSets && directionSets.wrong.some(word => mentionsWord(text, word))) {\n    contradicted.push('direction');\n  }\n  criteria.direction = directionSets\n    ? directionSets.expected.some(word => mentionsWord(text, word)) && !contradicted.includes('direction')\n    : null;\n  criteria.start_end = operands.length > 0\n    ? mentionsValue(numbers, operands[0]) && mentionsValue(numbers, spec.correct_value)\n    : mentionsValue(numbers, spec.correct_value);\n  const applicable = Object.keys(criteria).filter(name => criteria[name] !== null);\n  const met = applicable.filter(name => criteria[name]);\n  const score = applicable.length > 0 ? Math.round((met.length / applicable.length) * 100) / 100 : 0;\n  const statesAnswer = mentionsValue(numbers, spec.correct_value);\n  let level = 'none';\n  if (score >= TEACH_BACK_RUBRIC_CONFIG.strongScore && statesAnswer && contradicted.length === 0) {\n    level = 'strong';\n  } else if (met.length > 0 || statesAnswer || contradicted.length > 0) {\n    level = 'partial';\n  }\n  return {\n    score,\n    level,\n    criteria,\n    missing: applicable.filter(name => !criteria[name]),\n    contradicted\n  };\n}\n\nfunction teachBackClosure(rubric, spec, problem) {\n  const answer = problem.correct_answer;\n  let summary = `You got ${answer}.`;\n  if (rubric.criteria.direction && spec.operands.length > 0) {\n    const direction = spec.keyword_sets.math_direction_identification.expected[0];\n    summary = `You started at ${spec.operands[0]}, moved ${direction}, and landed on ${answer}.`;\n  } else if (rubric.criteria.start_end && spec.operands.length > 0) {\n    summary = `You started at ${spec.operands[0]} and ended up at ${answer}.`;\n  }\n  const closures = TEACH_BACK_RUBRIC_CONFIG.closures;\n  const template = closures[String(problem.text || '').length % closures.length];\n  return template.replace('{summary}', summary);\n}"]],
+    load: () => {
+      // TYPO_DICTIONARY (generated by build_typo_dictionary.py)
+      const TYPO_DICTIONARY = {"max_edit":2,"min_length":5,"words":["adding","add","plus","addition","sum","subtracting","subtract","minus","subtraction","difference","right","to","the","rightward","forward","left","leftward","backward","negative","less","than","zero","below","of","positive","greater","above","followed","counted","started","imagined","pictured","visualized","because","first","then","number","line","steps","easy"],"max_distance":[1,0,0,2,0,2,2,1,2,2,1,0,0,2,1,0,2,2,2,0,0,0,1,0,2,1,1,2,1,1,2,2,2,1,1,0,1,0,1,0],"deletes":{"addig":[0],"addin":[0],"adding":[0],"addng":[0],"ading":[0],"dding":[0],"add":[1],"plus":[2],"addiin":[3],"addiio":[3],"addiion":[3],"addion":[3],"additi":[3],"additin":[3],"additio":[3],"addition":[3],"additn":[3],"addito":[3],"additon":[3],"addtin":[3],"addtio":[3],"addtion":[3],"addton":[3],"adiion":[3],"aditin":[3],"aditio":[3],"adition":[3],"aditon":[3],"adtion":[3],"aition":[3],"ddiion":[3],"dditin":[3],"dditio":[3],"ddition":[3],"dditon":[3],"ddtion":[3],"dition":[3],"sum":[4],"btracting":[5],"sbracting":[5],"sbtacting":[5],"sbtracing":[5],"sbtractig":[5],"sbtractin":[5,8],"sbtracting":[5],"sbtractng":[5],"sbtrating":[5],"sbtrcting":[5],"stracting":[5],"subacting":[5],"subracing":[5],"subractig":[5],"subractin":[5,8],"subracting":[5],"subractng":[5],"subrating":[5],"subrcting":[5],"subtacing":[5],"subtactig":[5],"subtactin":[5,8],"subtacting":[5],"subtactng":[5],"subtating":[5],"subtcting":[5],"subtracig":[5],"subtracin":[5,8],"subtracing":[5],"subtracng":[5],"subtractg":[5],"subtracti":[5,8],"subtractig":[5],"subtractin":[5,8],"subtracting":[5],"subtractn":[5,8],"subtractng":[5],"subtraing":[5],"subtratig":[5],"subtratin":[5,8],"subtrating":[5],"subtratng":[5],"subtrcing":[5],"subtrctig":[5],"subtrctin":[5,8],"subtrcting":[5],"subtrctng":[5],"subtrting":[5],"suracting":[5],"sutacting":[5],"sutracing":[5],"sutractig":[5],"sutractin":[5,8],"sutracting":[5],"sutractng":[5],"sutrating":[5],"sutrcting":[5],"ubracting":[5],"ubtacting":[5],"ubtracing":[5],"ubtractig":[5],"ubtractin":[5,8],"ubtracting":[5],"ubtractng":[5],"ubtrating":[5],"ubtrcting":[5],"utracting":[5],"btract":[6],"sbract":[6],"sbtact":[6],"sbtrac":[6],"sbtract":[6],"sbtrat":[6],"sbtrct":[6],"stract":[6],"subact":[6],"subrac":[6],"subract":[6],"subrat":[6],"subrct":[6],"subtac":[6],"subtact":[6],"subtat":[6],"subtct":[6],"subtra":[6],"subtrac":[6],"subtract":[6],"subtrat":[6],"subtrc":[6],"subtrct":[6],"subtrt":[6],"suract":[6],"sutact":[6],"sutrac":[6],"sutract":[6],"sutrat":[6],"sutrct":[6],"ubract":[6],"ubtact":[6],"ubtrac":[6],"ubtract":[6],"ubtrat":[6],"ubtrct":[6],"utract":[6],"inus":[7],"mins":[7],"minu":[7],"minus":[7],"mius":[7],"mnus":[7],"btraction":[8],"sbraction":[8],"sbtaction":[8],"sbtracion":[8],"sbtractio":[8],"sbtraction":[8],"sbtracton":[8],"sbtration":[8],"sbtrction":[8],"straction":[8],"subaction":[8],"subracion":[8],"subractio":[8],"subraction":[8],"subracton":[8],"subration":[8],"subrction":[8],"subtacion":[8],"subtactio":[8],"subtaction":[8],"subtacton":[8],"subtation":[8],"subtction":[8],"subtracio":[8],"subtracion":[8],"subtracon":[8],"subtractio":[8],"subtraction":[8],"subtracto":[8],"subtracton":[8],"subtraion":[8],"subtratio":[8],"subtration":[8],"subtraton":[8],"subtrcion":[8],"subtrctio":[8],"subtrction":[8],"subtrcton":[8],"subtrtion":[8],"suraction":[8],"sutaction":[8],"sutracion":[8],"sutractio":[8],"sutraction":[8],"sutracton":[8],"sutration":[8],"sutrction":[8],"ubraction":[8],"ubtaction":[8],"ubtracion":[8],"ubtractio":[8],"ubtraction":[8],"ubtracton":[8],"ubtration":[8],"ubtrction":[8],"utraction":[8],"dference":[9],"dffeence":[9],"dfferece":[9],"dfferenc":[9],"dfference":[9],"dfferene":[9],"dffernce":[9],"dffrence":[9],"dierence":[9],"difeence":[9],"diferece":[9],"diferenc":[9],"diference":[9],"diferene":[9],"difernce":[9],"diffeece":[9],"diffeenc":[9],"diffeence":[9],"diffeene":[9],"diffence":[9],"differce":[9],"differec":[9],"differece":[9],"differee":[9],"differen":[9],"differenc":[9],"difference":[9],"differene":[9],"differnc":[9],"differnce":[9],"differne":[9],"diffrece":[9],"diffrenc":[9],"diffrence":[9],"diffrene":[9],"diffrnce":[9],"difrence":[9],"fference":[9],"iference":[9],"iffeence":[9],"ifferece":[9],"ifferenc":[9],"ifference":[9],"ifferene":[9],"iffernce":[9],"iffrence":[9],"ight":[10],"rght":[10],"righ":[10],"right":[10],"rigt":[10],"riht":[10],"to":[11],"the":[12],"ghtward":[13],"ightard":[13],"ightwad":[13],"ightwar":[13],"ightward":[13],"ightwrd":[13],"ighward":[13],"igtward":[13],"ihtward":[13],"rghtard":[13],"rghtwad":[13],"rghtwar":[13],"rghtward":[13],"rghtwrd":[13],"rghward":[13],"rgtward":[13],"rhtward":[13],"righard":[13],"rightad":[13],"rightar":[13],"rightard":[13],"rightrd":[13],"rightwa":[13],"rightwad":[13],"rightwar":[13],"rightward":[13],"rightwd":[13],"rightwr":[13],"rightwrd":[13],"righwad":[13],"righwar":[13],"righward":[13],"righwrd":[13],"rigtard":[13],"rigtwad":[13],"rigtwar":[13],"rigtward":[13],"rigtwrd":[13],"rigward":[13],"rihtard":[13],"rihtwad":[13],"rihtwar":[13],"rihtward":[13],"rihtwrd":[13],"rihward":[13],"ritward":[13],"forard":[14],"forwad":[14],"forwar":[14],"forward":[14],"forwrd":[14],"foward":[14],"frward":[14],"orward":[14],"left":[15],"eftard":[16],"eftwad":[16],"eftwar":[16],"eftward":[16],"eftwrd":[16],"efward":[16],"etward":[16],"ftward":[16],"lefard":[16],"leftad":[16],"leftar":[16],"leftard":[16],"leftrd":[16],"leftwa":[16],"leftwad":[16],"leftwar":[16],"leftward":[16],"leftwd":[16],"leftwr":[16],"leftwrd":[16],"lefwad":[16],"lefwar":[16],"lefward":[16],"lefwrd":[16],"letard":[16],"letwad":[16],"letwar":[16],"letward":[16],"letwrd":[16],"leward":[16],"lftard":[16],"lftwad":[16],"lftwar":[16],"lftward":[16],"lftwrd":[16],"lfward":[16],"ltward":[16],"ackard":[17],"ackwad":[17],"ackwar":[17],"ackward":[17],"ackwrd":[17],"acward":[17],"akward":[17],"bacard":[17],"backad":[17],"backar":[17],"backard":[17],"backrd":[17],"backwa":[17],"backwad":[17],"backwar":[17],"backward":[17],"backwd":[17],"backwr":[17],"backwrd":[17],"bacwad":[17],"bacwar":[17],"bacward":[17],"bacwrd":[17],"bakard":[17],"bakwad":[17],"bakwar":[17],"bakward":[17],"bakwrd":[17],"baward":[17],"bckard":[17],"bckwad":[17],"bckwar":[17],"bckward":[17],"bckwrd":[17],"bcward":[17],"bkward":[17],"ckward":[17],"eative":[18],"egaive":[18],"egatie":[18],"egativ":[18],"egative":[18],"egatve":[18],"egtive":[18],"gative":[18],"native":[18],"neaive":[18],"neatie":[18],"neativ":[18],"neative":[18],"neatve":[18],"negaie":[18],"negaiv":[18],"negaive":[18],"negate":[18],"negati":[18],"negatie":[18],"negativ":[18],"negative":[18],"negatv":[18],"negatve":[18],"negave":[18],"negive":[18],"negtie":[18],"negtiv":[18],"negtive":[18],"negtve":[18],"netive":[18],"ngaive":[18],"ngatie":[18],"ngativ":[18],"ngative":[18],"ngatve":[18],"ngtive":[18],"less":[19],"than":[20],"zero":[21],"belo":[22],"below":[22],"belw":[22],"beow":[22],"blow":[22],"elow":[22],"of":[23],"oitive":[24],"osiive":[24],"ositie":[24],"ositiv":[24],"ositive":[24],"ositve":[24],"ostive":[24],"pitive":[24],"poiive":[24],"poitie":[24],"poitiv":[24],"poitive":[24],"poitve":[24],"posiie":[24],"posiiv":[24],"posiive":[24],"posite":[24],"positi":[24],"positie":[24],"positiv":[24],"positive":[24],"positv":[24],"positve":[24],"posive":[24],"postie":[24],"postiv":[24],"postive":[24],"postve":[24],"potive":[24],"psiive":[24],"psitie":[24],"psitiv":[24],"psitive":[24],"psitve":[24],"pstive":[24],"sitive":[24],"geater":[25],"grater":[25],"greaer":[25],"greate":[25],"greater":[25],"greatr":[25],"greter":[25],"reater":[25],"aboe":[26],"abov":[26],"above":[26],"abve":[26],"aove":[26],"bove":[26],"flloed":[27],"fllowd":[27],"fllowe":[27],"fllowed":[27],"fllwed":[27],"flowed":[27],"folled":[27],"follod":[27],"folloe":[27],"folloed":[27],"follow":[27],"followd":[27],"followe":[27],"followed":[27],"follwd":[27],"follwe":[27],"follwed":[27],"foloed":[27],"folowd":[27],"folowe":[27],"folowed":[27],"folwed":[27],"foowed":[27],"llowed":[27],"olloed":[27],"ollowd":[27],"ollowe":[27],"ollowed":[27],"ollwed":[27],"olowed":[27],"conted":[28],"couned":[28],"countd":[28],"counte":[28],"counted":[28],"couted":[28],"cunted":[28],"ounted":[28],"sarted":[29],"stared":[29],"startd":[29],"starte":[29],"started":[29],"stated":[29],"strted":[29],"tarted":[29],"agined":[30],"iagied":[30],"iagind":[30],"iagine":[30],"iagined":[30],"iagned":[30],"iained":[30],"igined":[30],"imaged":[30],"imagid":[30],"imagie":[30],"imagied":[30],"imagin":[30],"imagind":[30],"imagine":[30],"imagined":[30],"imagnd":[30],"imagne":[30],"imagned":[30],"imaied":[30],"imaind":[30],"imaine":[30],"imained":[30],"imaned":[30],"imgied":[30],"imgind":[30],"imgine":[30],"imgined":[30],"imgned":[30],"imined":[30],"magied":[30],"magind":[30],"magine":[30],"magined":[30],"magned":[30],"mained":[30],"mgined":[30],"ctured":[31],"ictred":[31],"ictued":[31],"icturd":[31],"icture":[31],"ictured":[31],"icured":[31],"itured":[31],"pctred":[31],"pctued":[31],"pcturd":[31],"pcture":[31],"pctured":[31],"pcured":[31],"picred":[31],"picted":[31],"pictrd":[31],"pictre":[31],"pictred":[31],"pictud":[31],"pictue":[31],"pictued":[31],"pictur":[31],"picturd":[31],"picture":[31],"pictured":[31],"picued":[31],"picurd":[31],"picure":[31],"picured":[31],"pitred":[31],"pitued":[31],"piturd":[31],"piture":[31],"pitured":[31],"piured":[31],"ptured":[31],"isalized":[32],"isuaized":[32],"isualied":[32],"isualizd":[32],"isualize":[32],"isualized":[32],"isualzed":[32],"isulized":[32],"iualized":[32],"sualized":[32],"vialized":[32],"visaized":[32],"visalied":[32],"visalizd":[32],"visalize":[32],"visalized":[32],"visalzed":[32],"vislized":[32],"visuaied":[32],"visuaizd":[32],"visuaize":[32],"visuaized":[32],"visualed":[32],"visualid":[32],"visualie":[32],"visualied":[32],"visualiz":[32],"visualizd":[32],"visualize":[32],"visualized":[32],"visualzd":[32],"visualze":[32],"visualzed":[32],"visuazed":[32],"visuized":[32],"visulied":[32],"visulizd":[32],"visulize":[32],"visulized":[32],"visulzed":[32],"viuaized":[32],"viualied":[32],"viualizd":[32],"viualize":[32],"viualized":[32],"viualzed":[32],"viulized":[32],"vsalized":[32],"vsuaized":[32],"vsualied":[32],"vsualizd":[32],"vsualize":[32],"vsualized":[32],"vsualzed":[32],"vsulized":[32],"vualized":[32],"bcause":[33],"beause":[33],"becase":[33],"becaue":[33],"becaus":[33],"because":[33],"becuse":[33],"ecause":[33],"firs":[34],"first":[34],"firt":[34],"fist":[34],"frst":[34],"irst":[34],"then":[35],"nmber":[36],"nuber":[36],"numbe":[36],"number":[36],"numbr":[36],"numer":[36],"umber":[36],"line":[37],"seps":[38],"step":[38],"steps":[38],"stes":[38],"stps":[38],"teps":[38],"easy":[39]},"aliases":{"rite":"right","wright":"right","rigt":"right","lef":"left","ad":"add","subtrac":"subtract","minis":"minus"},"protected":{"abode":1,"addiction":1,"addling":1,"aiding":1,"allowed":1,"audition":1,"backboard":1,"backyard":1,"bellow":1,"bellowed":1,"bright":1,"counter":1,"courted":1,"different":1,"edition":1,"eight":1,"fight":1,"fright":1,"gadding":1,"grater":1,"greaten":1,"greeter":1,"hallowed":1,"hollowed":1,"imagines":1,"imaging":1,"light":1,"lumber":1,"mellowed":1,"menus":1,"might":1,"minds":1,"mines":1,"minks":1,"mints":1,"mounted":1,"native":1,"negation":1,"night":1,"numbed":1,"padding":1,"pictures":1,"position":1,"punctured":1,"relative":1,"sedative":1,"sedition":1,"sight":1,"sinus":1,"smarted":1,"starred":1,"starter":1,"startled":1,"starved":1,"stated":1,"steeps":1,"stems":1,"stews":1,"stops":1,"tight":1,"umber":1,"wadding":1,"wallowed":1,"wight":1,"yellowed":1}};
+
+      function editDistance(a, b, limit) {
+        if (Math.abs(a.length - b.length) > limit) return limit + 1;
+        let previous2 = null;
+        let previous = Array.from({ length: b.length + 1 }, (_, j) => j);
+        for (let i = 1; i <= a.length; i++) {
+          const current = [i];
+          let rowMin = i;
+          for (let j = 1; j <= b.length; j++) {
+            const cost = a[i - 1] === b[j - 1] ? 0 : 1;
+            let value = Math.min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost);
+            if (previous2 && i > 1 && j > 1 && a[i - 1] === b[j - 2] && a[i - 2] === b[j - 1]) {
+              value = Math.min(value, previous2[j - 2] + 1);
+            }
+            current.push(value);
+            rowMin = Math.min(rowMin, value);
+          }
+          if (rowMin > limit) return limit + 1;
+          previous2 = previous;
+          previous = current;
+        }
+        return previous[b.length];
+      }
+
+      function deleteVariants(word, distance) {
+        const variants = new Set([word]);
+        let frontier = [word];
+        for (let d = 0; d < distance; d++) {
+          const next = [];
+          for (const current of frontier) {
+            for (let i = 0; i < current.length; i++) {
+              const variant = current.slice(0, i) + current.slice(i + 1);
+              if (!variants.has(variant)) {
+                variants.add(variant);
+                next.push(variant);
+              }
+            }
+          }
+          frontier = next;
+        }
+        return variants;
+      }
+
+      function correctToken(token, dictionary) {
+        if (dictionary.aliases[token]) return { word: dictionary.aliases[token], distance: 0 };
+        if (dictionary.protected[token] || token.length < dictionary.min_length) return null;
+        let best = null;
+        for (const variant of deleteVariants(token, dictionary.max_edit)) {
+          for (const id of dictionary.deletes[variant] || []) {
+            const word = dictionary.words[id];
+            const limit = dictionary.max_distance[id];
+            const distance = word === token ? 0 : editDistance(token, word, limit);
+            if (distance > limit) continue;
+            if (!best || distance < best.distance || (distance === best.distance && id < best.id)) {
+              best = { word, distance, id };
+            }
+          }
+        }
+        return best && { word: best.word, distance: best.distance };
+      }
+
+      function normalizeTypos(text, dictionary) {
+        const corrections = [];
+        const normalized = String(text || '').replace(/[a-z']+/g, token => {
+          const correction = correctToken(token, dictionary);
+          if (!correction || correction.word === token) return token;
+          corrections.push({ from: token, to: correction.word, distance: correction.distance });
+          return correction.word;
+        });
+        return { text: normalized, corrections };
+      }
+      // PROBLEM_VALIDATORS (generated by build_problem_validators.py)
+      // Generated from exemplars/questions.json - do not edit by hand
+      const PROBLEM_VALIDATORS = {
+        "frac_add_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 0\\.75|\\+0\\.75|0\\.75|3\\/4|\\.75)(?![\\d./])", "close_threshold": 0.3, "correct_value": 0.75, "id": "frac_add_1", "keyword_sets": {"math_direction_identification": {"expected": ["right", "to the right", "rightward", "forward"], "unless_question": ["positive", "negative"], "wrong": ["left", "to the left", "leftward"]}, "math_operation_identification": {"expected": ["adding", "add", "plus", "addition", "sum"], "wrong": ["subtracting", "subtract", "minus", "subtraction"]}}, "operands": [0.5, 0.25], "operation": "+", "sub_answers": {"denominator": [4], "operands": [0.5, 0.25], "start": [0.5], "steps": [0.25]}, "surface_verdicts": {}, "text_key": "what is 1/2 + 1/4?", "verdicts": {"-0.75": "wrong_operation", "0.25": "wrong_operation", "0.333": "wrong_operation", "0.5": "close", "0.75": "correct"}},
+        "frac_sub_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 0\\.5|\\+0\\.5|0\\.5|1\\/2|\\.5)(?![\\d./])", "close_threshold": 0.3, "correct_value": 0.5, "id": "frac_sub_1", "keyword_sets": {"math_direction_identification": {"expected": ["left", "to the left", "leftward", "backward"], "unless_question": ["positive", "negative"], "wrong": ["right", "to the right", "rightward"]}, "math_operation_identification": {"expected": ["subtracting", "subtract", "minus", "subtraction", "difference"], "wrong": ["adding", "add", "plus", "addition"]}}, "operands": [0.666667, 0.166667], "operation": "-", "sub_answers": {"denominator": [6], "operands": [0.666667, 0.166667], "start": [0.666667], "steps": [0.166667]}, "surface_verdicts": {"3/6": "close"}, "text_key": "what is 2/3 - 1/6?", "verdicts": {"-0.5": "wrong_operation", "0.333": "wrong_operation", "0.5": "correct", "0.833": "wrong_operation"}},
+        "neg_add_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 2|two|\\+2|2)(?![\\d./])", "close_threshold": 0.4, "correct_value": 2, "id": "neg_add_1", "keyword_sets": {"math_direction_identification": {"expected": ["right", "to the right", "rightward", "forward"], "unless_question": ["positive", "negative"], "wrong": ["left", "to the left", "leftward"]}, "math_operation_identification": {"expected": ["adding", "add", "plus", "addition", "sum"], "wrong": ["subtracting", "subtract", "minus", "subtraction"]}}, "operands": [-3, 5], "operation": "+", "sub_answers": {"operands": [-3, 5], "start": [-3], "steps": [5, 3]}, "surface_verdicts": {}, "text_key": "what is -3 + 5?", "verdicts": {"-2": "wrong_operation", "-8": "wrong_operation", "1": "close", "2": "correct", "3": "close", "8": "wrong_operation"}},
+        "neg_mult_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:negative six|negative 6|minus six|minus 6|\\-6)(?![\\d./])", "close_threshold": 1.2, "correct_value": -6, "id": "neg_mult_1", "keyword_sets": {}, "operands": [-2, 3], "operation": "*", "sub_answers": {"operands": [-2, 3], "start": [-2]}, "surface_verdicts": {}, "text_key": "what is -2 \u00d7 3?", "verdicts": {"-5": "wrong_operation", "-6": "correct", "1": "wrong_operation", "6": "wrong_operation"}},
+        "neg_sub_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 8|eight|\\+8|8)(?![\\d./])", "close_threshold": 1.6, "correct_value": 8, "id": "neg_sub_1", "keyword_sets": {"math_direction_identification": {"expected": ["right", "to the right", "rightward", "forward"], "unless_question": ["positive", "negative"], "wrong": ["left", "to the left", "leftward"]}}, "operands": [5, -3], "operation": "-", "sub_answers": {"operands": [5, -3], "start": [5], "steps": [3]}, "surface_verdicts": {}, "text_key": "what is 5 - (-3)?", "verdicts": {"-8": "wrong_operation", "2": "wrong_operation", "8": "correct"}},
+        "neg_sub_2": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:negative eight|minus eight|negative 8|minus 8|\\-8)(?![\\d./])", "close_threshold": 1.6, "correct_value": -8, "id": "neg_sub_2", "keyword_sets": {"math_direction_identification": {"expected": ["left", "to the left", "leftward", "backward"], "unless_question": ["positive", "negative"], "wrong": ["right", "to the right", "rightward"]}, "math_operation_identification": {"expected": ["subtracting", "subtract", "minus", "subtraction", "difference"], "wrong": ["adding", "add", "plus", "addition"]}}, "operands": [-3, 5], "operation": "-", "sub_answers": {"operands": [-3, 5], "start": [-3], "steps": [5]}, "surface_verdicts": {}, "text_key": "what is -3 - 5?", "verdicts": {"-8": "correct", "2": "wrong_operation", "8": "wrong_operation"}},
+        "order_ops_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:positive 14|fourteen|\\+14|14)(?![\\d./])", "close_threshold": 2.8, "correct_value": 14, "id": "order_ops_1", "keyword_sets": {}, "operands": [2, 3, 4], "operation": "+", "sub_answers": {"intermediate": [12], "operands": [2, 3, 4], "start": [2]}, "surface_verdicts": {}, "text_key": "what is 2 + 3 \u00d7 4?", "verdicts": {"14": "correct", "20": "wrong_operation"}},
+        "word_debt_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:negative two|negative 2|minus two|minus 2|\\-2)(?![\\d./])", "close_threshold": 0.4, "correct_value": -2, "id": "word_debt_1", "keyword_sets": {}, "operands": [], "operation": null, "sub_answers": {"givens": [3, 5], "start": [3]}, "surface_verdicts": {}, "text_key": "sarah had 3 apples. she gave away 5 apples. how many apples does she have now?", "verdicts": {"-2": "correct", "0": "wrong_operation", "2": "wrong_operation"}},
+        "word_neg_1": {"answer_phrase": "(?:^|\\b)(?:landed on|answer is|end up at|end up on|lands on|land on|reached|we get|that's|equals|it is|thats|equal|think|reach|it's|get|got|its|is)\\s+(?:negative three|minus three|negative 3|minus 3|\\-3)(?![\\d./])", "close_threshold": 0.6, "correct_value": -3, "id": "word_neg_1", "keyword_sets": {}, "operands": [], "operation": null, "sub_answers": {"givens": [2, 5], "start": [2]}, "surface_verdicts": {}, "text_key": "the temperature was 2\u00b0c. it dropped 5 degrees. what is the new temperature?", "verdicts": {"-3": "correct", "3": "wrong_operation", "7": "wrong_operation"}}
+      };
+      const PROBLEM_TEXT_INDEX = {
+        "what is 1/2 + 1/4?": "frac_add_1",
+        "what is 2/3 - 1/6?": "frac_sub_1",
+        "what is -3 + 5?": "neg_add_1",
+        "what is -2 \u00d7 3?": "neg_mult_1",
+        "what is 5 - (-3)?": "neg_sub_1",
+        "what is -3 - 5?": "neg_sub_2",
+        "what is 2 + 3 \u00d7 4?": "order_ops_1",
+        "sarah had 3 apples. she gave away 5 apples. how many apples does she have now?": "word_debt_1",
+        "the temperature was 2\u00b0c. it dropped 5 degrees. what is the new temperature?": "word_neg_1"
+      };
+
+      function problemValueKey(value) {
+        const rounded = Math.round(value * 1000) / 1000;
+        return String(rounded === 0 ? 0 : rounded);
+      }
+
+      function problemSurfaceKey(text) {
+        const fractions = String(text || '').match(/-?\d+\s*\/\s*\d+/g);
+        return fractions ? fractions[fractions.length - 1].replace(/\s+/g, '') : null;
+      }
+
+      // Written form first ("3/6" unsimplified), then the value
+      function problemVerdict(spec, value, text) {
+        const surface = problemSurfaceKey(text);
+        return (surface && spec.surface_verdicts[surface]) || spec.verdicts[problemValueKey(value)];
+      }
+
+      function lookupProblemValidator(problem) {
+        if (!problem) return null;
+        const textKey = String(problem.text || '').trim().toLowerCase();
+        const byId = PROBLEM_VALIDATORS[problem.id];
+        if (byId && (!textKey || byId.text_key === textKey)) return byId;
+        const byText = PROBLEM_TEXT_INDEX[textKey];
+        return byText ? PROBLEM_VALIDATORS[byText] : null;
+      }
+      // TEACH_BACK_RUBRIC (functions/teach_back_rubric.js)
+      const ANSWER_PHRASE_CONFIG = {
+        answerCues: [
+          'we get', 'i get', 'you get', 'get', 'got', 'land on', 'landed on', 'lands on',
+          'land at', 'end up at', 'end up on', 'ended up at', 'ended on', 'reach', 'reached',
+          'to reach', 'equals', 'equal', 'is equal to', '=', "it's", 'its', 'it is',
+          "that's", 'thats', 'is', 'answer is', 'the answer is', 'i think', 'think',
+          'maybe', 'so', 'makes', 'at'
+        ],
+        processLeadCues: [
+          'move', 'moved', 'moving', 'go', 'went', 'count', 'counted', 'jump', 'jumped',
+          'from', 'start at', 'started at', 'start from', 'add', 'added', 'subtract',
+          'subtracted', 'take away', 'plus', 'minus', 'times', 'another', 'then'
+        ],
+        processTailCues: [
+          'steps', 'step', 'spaces', 'space', 'jumps', 'jump', 'times', 'more', 'places',
+          'units', 'to the right', 'to the left', 'and'
+        ],
+        positionTailCues: ['past zero', 'after zero', 'right of zero', 'left of zero', 'below zero', 'above zero'],
+        numberWords: {
+          zero: 0, one: 1, two: 2, three: 3, four: 4, five: 5, six: 6, seven: 7,
+          eight: 8, nine: 9, ten: 10, eleven: 11, twelve: 12, thirteen: 13,
+          fourteen: 14, fifteen: 15, sixteen: 16, seventeen: 17, eighteen: 18,
+          nineteen: 19, twenty: 20
+        }
+      };
+
+      function findNumbers(message) {
+        const words = Object.keys(ANSWER_PHRASE_CONFIG.numberWords).join('|');
+        const pattern = new RegExp(
+          '(?:\\b(negative|minus)\\s+)?' +
+          '(?:(-|−)?(\\d+(?:\\.\\d+)?(?:\\/\\d+)?|\\.\\d+)|\\b(' + words + ')\\b)',
+          'gi'
+        );
+        const found = [];
+        let match;
+        while ((match = pattern.exec(message)) !== null) {
+          let value;
+          if (match[3] !== undefined) {
+            const [numerator, denominator] = match[3].split('/');
+            value = denominator ? parseFloat(numerator) / parseFloat(denominator) : parseFloat(numerator);
+          } else {
+            value = ANSWER_PHRASE_CONFIG.numberWords[match[4].toLowerCase()];
+          }
+          const signWord = match[1] ? match[1].toLowerCase() : null;
+          const before = message.slice(0, match.index).trim();
+          const signIsOperator = signWord === 'minus' && new RegExp('(\\d|\\b(' + words + '))$').test(before);
+          const dashIsOperator = match[2] && /[\d)]\s*$/.test(message.slice(0, match.index));
+          if ((signWord && !signIsOperator) || (match[2] && !dashIsOperator)) {
+            value = -value;
+          }
+          if (match[4] && match[4].toLowerCase() === 'zero' && /\b(past|after|of|below|above)\s*$/.test(before)) {
+            continue;
+          }
+          const start = signIsOperator ? match.index + match[0].indexOf(match[3] || match[4]) : match.index;
+          found.push({ value, start, end: match.index + match[0].length, text: message.slice(start, match.index + match[0].length) });
+        }
+        return found;
+      }
+
+      const TEACH_BACK_RUBRIC_CONFIG = {
+        operationWords: {
+          '+': ['add', 'adding', 'added', 'plus', 'sum', 'addition', 'together', 'more'],
+          '-': ['subtract', 'subtracting', 'subtracted', 'minus', 'take away', 'took away', 'subtraction', 'less', 'fewer'],
+          '*': ['times', 'multiply', 'multiplied', 'multiplying', 'groups of', 'lots of'],
+          '/': ['divide', 'divided', 'dividing', 'split', 'share', 'shared']
+        },
+        strongScore: 0.75,
+        closures: [
+          'Great explaining! {summary} You really understand this one!',
+          'Perfect! {summary} That is exactly how to solve it.',
+          'Wonderful explanation! {summary} You nailed it!'
+        ]
+      };
+
+      function mentionsWord(text, word) {
+        return new RegExp('(?:^|[^a-z])' + word.replace(/[.*+?^${}()|[\]\\]/g, '\\$&') + '(?![a-z])').test(text);
+      }
+
+      function mentionsValue(numbers, value) {
+        return numbers.some(number => Math.abs(number.value - value) < 0.001);
+      }
+
+      function scoreTeachBack(message, spec) {
+        const text = String(message || '').toLowerCase();
+        const numbers = findNumbers(text);
+        const operands = spec.operands || [];
+        const criteria = {};
+        criteria.operands = operands.length > 0
+          ? operands.every(operand => mentionsValue(numbers, operand))
+          : null;
+        const operationSets = spec.keyword_sets && spec.keyword_sets.math_operation_identification;
+        const operationWords = (operationSets ? operationSets.expected : [])
+          .concat(TEACH_BACK_RUBRIC_CONFIG.operationWords[spec.operation] || []);
+        const contradicted = [];
+        if (operationSets && operationSets.wrong.some(word => mentionsWord(text, word))) {
+          contradicted.push('operation');
+        }
+        criteria.operation = operationWords.length > 0
+          ? operationWords.some(word => mentionsWord(text, word)) && !contradicted.includes('operation')
+          : null;
+        const directionSets = spec.keyword_sets && spec.keyword_sets.math_direction_identification;
+        if (directionSets && directionSets.wrong.some(word => mentionsWord(text, word))) {
+          contradicted.push('direction');
+        }
+        criteria.direction = directionSets
+          ? directionSets.expected.some(word => mentionsWord(text, word)) && !contradicted.includes('direction')
+          : null;
+        criteria.start_end = operands.length > 0
+          ? mentionsValue(numbers, operands[0]) && mentionsValue(numbers, spec.correct_value)
+          : mentionsValue(numbers, spec.correct_value);
+        const applicable = Object.keys(criteria).filter(name => criteria[name] !== null);
+        const met = applicable.filter(name => criteria[name]);
+        const score = applicable.length > 0 ? Math.round((met.length / applicable.length) * 100) / 100 : 0;
+        const statesAnswer = mentionsValue(numbers, spec.correct_value);
+        let level = 'none';
+        if (score >= TEACH_BACK_RUBRIC_CONFIG.strongScore && statesAnswer && contradicted.length === 0) {
+          level = 'strong';
+        } else if (met.length > 0 || statesAnswer || contradicted.length > 0) {
+          level = 'partial';
+        }
+        return {
+          score,
+          level,
+          criteria,
+          missing: applicable.filter(name => !criteria[name]),
+          contradicted
+        };
+      }
+
+      function teachBackClosure(rubric, spec, problem) {
+        const answer = problem.correct_answer;
+        let summary = `You got ${answer}.`;
+        if (rubric.criteria.direction && spec.operands.length > 0) {
+          const direction = spec.keyword_sets.math_direction_identification.expected[0];
+          summary = `You started at ${spec.operands[0]}, moved ${direction}, and landed on ${answer}.`;
+        } else if (rubric.criteria.start_end && spec.operands.length > 0) {
+          summary = `You started at ${spec.operands[0]} and ended up at ${answer}.`;
+        }
+        const closures = TEACH_BACK_RUBRIC_CONFIG.closures;
+        const template = closures[String(problem.text || '').length % closures.length];
+        return template.replace('{summary}', summary);
+      }
+      return { TYPO_DICTIONARY, editDistance, deleteVariants, correctToken, normalizeTypos, PROBLEM_VALIDATORS, PROBLEM_TEXT_INDEX, problemValueKey, problemSurfaceKey, problemVerdict, lookupProblemValidator, ANSWER_PHRASE_CONFIG, findNumbers, TEACH_BACK_RUBRIC_CONFIG, mentionsWord, mentionsValue, scoreTeachBack, teachBackClosure };
+    }
+  }
+};
+
+const LOADED = {};
+for (const [name, entry] of Object.entries(UNITS)) {
+  LOADED[name] = entry.load();
+}
+
+// Registry store (build_registry_store.py): units rebuilt with the registry
+// blocks of a published version, compiled once per version per worker
+const REGISTRY_MARKERS = ["REGISTRIES (generated by build_registries.py)", "PROBLEM_VALIDATORS (generated by build_problem_validators.py)", "SEMANTIC_MATCHER (generated by build_semantic_matcher.py)", "TYPO_DICTIONARY (generated by build_typo_dictionary.py)"];
+const REGISTRY_CACHE_SIZE = 4;
+const REGISTRY_CACHE = new Map();
+
+function hasRegistries(version) {
+  return REGISTRY_CACHE.has(version);
+}
+
+function registryEntry(version, documentText) {
+  let entry = REGISTRY_CACHE.get(version);
+  if (entry) {
+    // Most recently used last
+    REGISTRY_CACHE.delete(version);
+  } else {
+    if (!documentText) {
+      throw new Error(`Registry version "${version}" is not published (tutor_registries:${version})`);
+    }
+    const document = JSON.parse(documentText);
+    if (document.version !== version) {
+      throw new Error(`tutor_registries:${version} holds version "${document.version}"`);
+    }
+    entry = { document, units: {} };
+  }
+  REGISTRY_CACHE.set(version, entry);
+  if (REGISTRY_CACHE.size > REGISTRY_CACHE_SIZE) {
+    REGISTRY_CACHE.delete(REGISTRY_CACHE.keys().next().value);
+  }
+  return entry;
+}
+
+function compileUnit(name, document) {
+  const entry = UNITS[name];
+  if (!(name in document.nodes)) {
+    return LOADED[name];
+  }
+  if (document.nodes[name] !== entry.code_hash) {
+    throw new Error(`Registry version "${document.version}" was published for other code of "${name}" - ` +
+      'redeploy the workflow and module, or publish again');
+  }
+  const body = entry.blocks.map(([marker, source]) => `// ${marker}\n${source === null ? document.blocks[marker] : source}`);
+  return new Function(`${body.join('\n')}\nreturn { ${entry.names.join(', ')} };`)();
+}
+
+/**
+ * Exports of a node's blocks
+ *
+ * @param {string} name - Code node name
+ * @param {string} hash - Unit hash the node was built against
+ * @param {string|null} version - Registry version (null: tables built into the module)
+ * @param {string|null} documentText - Registry document from Redis, when this worker has not compiled `version`
+ */
+function unit(name, hash, version, documentText) {
+  const entry = UNITS[name];
+  if (!entry || entry.hash !== hash) {
+    throw new Error(`tutor-runtime is out of date for "${name}" - rebuild it (optimize_workflow.py --preload) ` +
+      'and reinstall it on every worker');
+  }
+  if (!version) {
+    return LOADED[name];
+  }
+  const cached = registryEntry(version, documentText);
+  if (!cached.units[name]) {
+    cached.units[name] = compileUnit(name, cached.document);
+  }
+  return cached.units[name];
+}
+
+module.exports = { unit, hasRegistries, UNITS, REGISTRY_MARKERS, REGISTRY_CACHE };
@@ -0,0 +1,6 @@
+// Generated from config_registries.js by build_typo_dictionary.py - do not edit by hand
+const TYPO_DICTIONARY = {"max_edit":2,"min_length":5,"words":["adding","add","plus","addition","sum","subtracting","subtract","minus","subtraction","difference","right","to","the","rightward","forward","left","leftward","backward","negative","less","than","zero","below","of","positive","greater","above","followed","counted","started","imagined","pictured","visualized","because","first","then","number","line","steps","easy"],"max_distance":[1,0,0,2,0,2,2,1,2,2,1,0,0,2,1,0,2,2,2,0,0,0,1,0,2,1,1,2,1,1,2,2,2,1,1,0,1,0,1,0],"deletes":{"addig":[0],"addin":[0],"adding":[0],"addng":[0],"ading":[0],"dding":[0],"add":[1],"plus":[2],"addiin":[3],"addiio":[3],"addiion":[3],"addion":[3],"additi":[3],"additin":[3],"additio":[3],"addition":[3],"additn":[3],"addito":[3],"additon":[3],"addtin":[3],"addtio":[3],"addtion":[3],"addton":[3],"adiion":[3],"aditin":[3],"aditio":[3],"adition":[3],"aditon":[3],"adtion":[3],"aition":[3],"ddiion":[3],"dditin":[3],"dditio":[3],"ddition":[3],"dditon":[3],"ddtion":[3],"dition":[3],"sum":[4],"btracting":[5],"sbracting":[5],"sbtacting":[5],"sbtracing":[5],"sbtractig":[5],"sbtractin":[5,8],"sbtracting":[5],"sbtractng":[5],"sbtrating":[5],"sbtrcting":[5],"stracting":[5],"subacting":[5],"subracing":[5],"subractig":[5],"subractin":[5,8],"subracting":[5],"subractng":[5],"subrating":[5],"subrcting":[5],"subtacing":[5],"subtactig":[5],"subtactin":[5,8],"subtacting":[5],"subtactng":[5],"subtating":[5],"subtcting":[5],"subtracig":[5],"subtracin":[5,8],"subtracing":[5],"subtracng":[5],"subtractg":[5],"subtracti":[5,8],"subtractig":[5],"subtractin":[5,8],"subtracting":[5],"subtractn":[5,8],"subtractng":[5],"subtraing":[5],"subtratig":[5],"subtratin":[5,8],"subtrating":[5],"subtratng":[5],"subtrcing":[5],"subtrctig":[5],"subtrctin":[5,8],"subtrcting":[5],"subtrctng":[5],"subtrting":[5],"suracting":[5],"sutacting":[5],"sutracing":[5],"sutractig":[5],"sutractin":[5,8],"sutracting":[5],"sutractng":[5],"sutrating":[5],"sutrcting":[5],"ubracting":[5],"ubtacting":[5],"ubtracing":[5],"ubtractig":[5],"ubtractin":[5,8],"ubtracting":[5],"ubtractng":[5],"ubtrating":[5],"ubtrcting":[5],"utracting":[5],"btract":[6],"sbract":[6],"sbtact":[6],"sbtrac":[6],"sbtract":[6],"sbtrat":[6],"sbtrct":[6],"stract":[6],"subact":[6],"subrac":[6],"subract":[6],"subrat":[6],"subrct":[6],"subtac":[6],"subtact":[6],"subtat":[6],"subtct":[6],"subtra":[6],"subtrac":[6],"subtract":[6],"subtrat":[6],"subtrc":[6],"subtrct":[6],"subtrt":[6],"suract":[6],"sutact":[6],"sutrac":[6],"sutract":[6],"sutrat":[6],"sutrct":[6],"ubract":[6],"ubtact":[6],"ubtrac":[6],"ubtract":[6],"ubtrat":[6],"ubtrct":[6],"utract":[6],"inus":[7],"mins":[7],"minu":[7],"minus":[7],"mius":[7],"mnus":[7],"btraction":[8],"sbraction":[8],"sbtaction":[8],"sbtracion":[8],"sbtractio":[8],"sbtraction":[8],"sbtracton":[8],"sbtration":[8],"sbtrction":[8],"straction":[8],"subaction":[8],"subracion":[8],"subractio":[8],"subraction":[8],"subracton":[8],"subration":[8],"subrction":[8],"subtacion":[8],"subtactio":[8],"subtaction":[8],"subtacton":[8],"subtation":[8],"subtction":[8],"subtracio":[8],"subtracion":[8],"subtracon":[8],"subtractio":[8],"subtraction":[8],"subtracto":[8],"subtracton":[8],"subtraion":[8],"subtratio":[8],"subtration":[8],"subtraton":[8],"subtrcion":[8],"subtrctio":[8],"subtrction":[8],"subtrcton":[8],"subtrtion":[8],"suraction":[8],"sutaction":[8],"sutracion":[8],"sutractio":[8],"sutraction":[8],"sutracton":[8],"sutration":[8],"sutrction":[8],"ubraction":[8],"ubtaction":[8],"ubtracion":[8],"ubtractio":[8],"ubtraction":[8],"ubtracton":[8],"ubtration":[8],"ubtrction":[8],"utraction":[8],"dference":[9],"dffeence":[9],"dfferece":[9],"dfferenc":[9],"dfference":[9],"dfferene":[9],"dffernce":[9],"dffrence":[9],"dierence":[9],"difeence":[9],"diferece":[9],"diferenc":[9],"diference":[9],"diferene":[9],"difernce":[9],"diffeece":[9],"diffeenc":[9],"diffeence":[9],"diffeene":[9],"diffence":[9],"differce":[9],"differec":[9],"differece":[9],"differee":[9],"differen":[9],"differenc":[9],"difference":[9],"differene":[9],"differnc":[9],"differnce":[9],"differne":[9],"diffrece":[9],"diffrenc":[9],"diffrence":[9],"diffrene":[9],"diffrnce":[9],"difrence":[9],"fference":[9],"iference":[9],"iffeence":[9],"ifferece":[9],"ifferenc":[9],"ifference":[9],"ifferene":[9],"iffernce":[9],"iffrence":[9],"ight":[10],"rght":[10],"righ":[10],"right":[10],"rigt":[10],"riht":[10],"to":[11],"the":[12],"ghtward":[13],"ightard":[13],"ightwad":[13],"ightwar":[13],"ightward":[13],"ightwrd":[13],"ighward":[13],"igtward":[13],"ihtward":[13],"rghtard":[13],"rghtwad":[13],"rghtwar":[13],"rghtward":[13],"rghtwrd":[13],"rghward":[13],"rgtward":[13],"rhtward":[13],"righard":[13],"rightad":[13],"rightar":[13],"rightard":[13],"rightrd":[13],"rightwa":[13],"rightwad":[13],"rightwar":[13],"rightward":[13],"rightwd":[13],"rightwr":[13],"rightwrd":[13],"righwad":[13],"righwar":[13],"righward":[13],"righwrd":[13],"rigtard":[13],"rigtwad":[13],"rigtwar":[13],"rigtward":[13],"rigtwrd":[13],"rigward":[13],"rihtard":[13],"rihtwad":[13],"rihtwar":[13],"rihtward":[13],"rihtwrd":[13],"rihward":[13],"ritward":[13],"forard":[14],"forwad":[14],"forwar":[14],"forward":[14],"forwrd":[14],"foward":[14],"frward":[14],"orward":[14],"left":[15],"eftard":[16],"eftwad":[16],"eftwar":[16],"eftward":[16],"eftwrd":[16],"efward":[16],"etward":[16],"ftward":[16],"lefard":[16],"leftad":[16],"leftar":[16],"leftard":[16],"leftrd":[16],"leftwa":[16],"leftwad":[16],"leftwar":[16],"leftward":[16],"leftwd":[16],"leftwr":[16],"leftwrd":[16],"lefwad":[16],"lefwar":[16],"lefward":[16],"lefwrd":[16],"letard":[16],"letwad":[16],"letwar":[16],"letward":[16],"letwrd":[16],"leward":[16],"lftard":[16],"lftwad":[16],"lftwar":[16],"lftward":[16],"lftwrd":[16],"lfward":[16],"ltward":[16],"ackard":[17],"ackwad":[17],"ackwar":[17],"ackward":[17],"ackwrd":[17],"acward":[17],"akward":[17],"bacard":[17],"backad":[17],"backar":[17],"backard":[17],"backrd":[17],"backwa":[17],"backwad":[17],"backwar":[17],"backward":[17],"backwd":[17],"backwr":[17],"backwrd":[17],"bacwad":[17],"bacwar":[17],"bacward":[17],"bacwrd":[17],"bakard":[17],"bakwad":[17],"bakwar":[17],"bakward":[17],"bakwrd":[17],"baward":[17],"bckard":[17],"bckwad":[17],"bckwar":[17],"bckward":[17],"bckwrd":[17],"bcward":[17],"bkward":[17],"ckward":[17],"eative":[18],"egaive":[18],"egatie":[18],"egativ":[18],"egative":[18],"egatve":[18],"egtive":[18],"gative":[18],"native":[18],"neaive":[18],"neatie":[18],"neativ":[18],"neative":[18],"neatve":[18],"negaie":[18],"negaiv":[18],"negaive":[18],"negate":[18],"negati":[18],"negatie":[18],"negativ":[18],"negative":[18],"negatv":[18],"negatve":[18],"negave":[18],"negive":[18],"negtie":[18],"negtiv":[18],"negtive":[18],"negtve":[18],"netive":[18],"ngaive":[18],"ngatie":[18],"ngativ":[18],"ngative":[18],"ngatve":[18],"ngtive":[18],"less":[19],"than":[20],"zero":[21],"belo":[22],"below":[22],"belw":[22],"beow":[22],"blow":[22],"elow":[22],"of":[23],"oitive":[24],"osiive":[24],"ositie":[24],"ositiv":[24],"ositive":[24],"ositve":[24],"ostive":[24],"pitive":[24],"poiive":[24],"poitie":[24],"poitiv":[24],"poitive":[24],"poitve":[24],"posiie":[24],"posiiv":[24],"posiive":[24],"posite":[24],"positi":[24],"positie":[24],"positiv":[24],"positive":[24],"positv":[24],"positve":[24],"posive":[24],"postie":[24],"postiv":[24],"postive":[24],"postve":[24],"potive":[24],"psiive":[24],"psitie":[24],"psitiv":[24],"psitive":[24],"psitve":[24],"pstive":[24],"sitive":[24],"geater":[25],"grater":[25],"greaer":[25],"greate":[25],"greater":[25],"greatr":[25],"greter":[25],"reater":[25],"aboe":[26],"abov":[26],"above":[26],"abve":[26],"aove":[26],"bove":[26],"flloed":[27],"fllowd":[27],"fllowe":[27],"fllowed":[27],"fllwed":[27],"flowed":[27],"folled":[27],"follod":[27],"folloe":[27],"folloed":[27],"follow":[27],"followd":[27],"followe":[27],"followed":[27],"follwd":[27],"follwe":[27],"follwed":[27],"foloed":[27],"folowd":[27],"folowe":[27],"folowed":[27],"folwed":[27],"foowed":[27],"llowed":[27],"olloed":[27],"ollowd":[27],"ollowe":[27],"ollowed":[27],"ollwed":[27],"olowed":[27],"conted":[28],"couned":[28],"countd":[28],"counte":[28],"counted":[28],"couted":[28],"cunted":[28],"ounted":[28],"sarted":[29],"stared":[29],"startd":[29],"starte":[29],"started":[29],"stated":[29],"strted":[29],"tarted":[29],"agined":[30],"iagied":[30],"iagind":[30],"iagine":[30],"iagined":[30],"iagned":[30],"iained":[30],"igined":[30],"imaged":[30],"imagid":[30],"imagie":[30],"imagied":[30],"imagin":[30],"imagind":[30],"imagine":[30],"imagined":[30],"imagnd":[30],"imagne":[30],"imagned":[30],"imaied":[30],"imaind":[30],"imaine":[30],"imained":[30],"imaned":[30],"imgied":[30],"imgind":[30],"imgine":[30],"imgined":[30],"imgned":[30],"imined":[30],"magied":[30],"magind":[30],"magine":[30],"magined":[30],"magned":[30],"mained":[30],"mgined":[30],"ctured":[31],"ictred":[31],"ictued":[31],"icturd":[31],"icture":[31],"ictured":[31],"icured":[31],"itured":[31],"pctred":[31],"pctued":[31],"pcturd":[31],"pcture":[31],"pctured":[31],"pcured":[31],"picred":[31],"picted":[31],"pictrd":[31],"pictre":[31],"pictred":[31],"pictud":[31],"pictue":[31],"pictued":[31],"pictur":[31],"picturd":[31],"picture":[31],"pictured":[31],"picued":[31],"picurd":[31],"picure":[31],"picured":[31],"pitred":[31],"pitued":[31],"piturd":[31],"piture":[31],"pitured":[31],"piured":[31],"ptured":[31],"isalized":[32],"isuaized":[32],"isualied":[32],"isualizd":[32],"isualize":[32],"isualized":[32],"isualzed":[32],"isulized":[32],"iualized":[32],"sualized":[32],"vialized":[32],"visaized":[32],"visalied":[32],"visalizd":[32],"visalize":[32],"visalized":[32],"visalzed":[32],"vislized":[32],"visuaied":[32],"visuaizd":[32],"visuaize":[32],"visuaized":[32],"visualed":[32],"visualid":[32],"visualie":[32],"visualied":[32],"visualiz":[32],"visualizd":[32],"visualize":[32],"visualized":[32],"visualzd":[32],"visualze":[32],"visualzed":[32],"visuazed":[32],"visuized":[32],"visulied":[32],"visulizd":[32],"visulize":[32],"visulized":[32],"visulzed":[32],"viuaized":[32],"viualied":[32],"viualizd":[32],"viualize":[32],"viualized":[32],"viualzed":[32],"viulized":[32],"vsalized":[32],"vsuaized":[32],"vsualied":[32],"vsualizd":[32],"vsualize":[32],"vsualized":[32],"vsualzed":[32],"vsulized":[32],"vualized":[32],"bcause":[33],"beause":[33],"becase":[33],"becaue":[33],"becaus":[33],"because":[33],"becuse":[33],"ecause":[33],"firs":[34],"first":[34],"firt":[34],"fist":[34],"frst":[34],"irst":[34],"then":[35],"nmber":[36],"nuber":[36],"numbe":[36],"number":[36],"numbr":[36],"numer":[36],"umber":[36],"line":[37],"seps":[38],"step":[38],"steps":[38],"stes":[38],"stps":[38],"teps":[38],"easy":[39]},"aliases":{"rite":"right","wright":"right","rigt":"right","lef":"left","ad":"add","subtrac":"subtract","minis":"minus"},"protected":{"abode":1,"addiction":1,"addling":1,"aiding":1,"allowed":1,"audition":1,"backboard":1,"backyard":1,"bellow":1,"bellowed":1,"bright":1,"counter":1,"courted":1,"different":1,"edition":1,"eight":1,"fight":1,"fright":1,"gadding":1,"grater":1,"greaten":1,"greeter":1,"hallowed":1,"hollowed":1,"imagines":1,"imaging":1,"light":1,"lumber":1,"mellowed":1,"menus":1,"might":1,"minds":1,"mines":1,"minks":1,"mints":1,"mounted":1,"native":1,"negation":1,"night":1,"numbed":1,"padding":1,"pictures":1,"position":1,"punctured":1,"relative":1,"sedative":1,"sedition":1,"sight":1,"sinus":1,"smarted":1,"starred":1,"starter":1,"startled":1,"starved":1,"stated":1,"steeps":1,"stems":1,"stews":1,"stops":1,"tight":1,"umber":1,"wadding":1,"wallowed":1,"wight":1,"yellowed":1}};
+
+if (typeof module !== 'undefined' && module.exports) {
+  module.exports = { TYPO_DICTIONARY };
+}
@@ -0,0 +1,563 @@
+#!/usr/bin/env python3
+"""
+Performance lint for n8n workflow exports.
+
+PROBLEM:
+The same performance mistakes keep coming back in review: a session SET
+that never expires, a JSON.parse of an LLM reply that takes the whole
+execution down when the model answers in prose, a 10 KB table rebuilt on
+every run, `...input` dragging `_original_payload` and the session through
+every node, LLM calls without maxTokens. Each was found by reading node
+code by hand, after the fact.
+
+SOLUTION:
+Check the workflow JSON for them. Every finding names the node and carries
+an estimated cost (milliseconds per turn, or bytes) so the list can be
+sorted by what it costs:
+
+  redis-set-no-ttl      Redis SET without expire/ttl: keys are never evicted
+  unguarded-json-parse  JSON.parse of an LLM (or agent) reply outside
+                        try/catch, in a node without an error output
+  large-constant        object/array/Set/Map literal over 1 KB in jsCode,
+                        compiled on every run (rebuilt per call inside a
+                        function); info only for embedded blocks, which
+                        optimize_workflow.py --preload moves to the worker
+  spread-large-field    `...x` of an item that carries a known-large field
+                        (_original_payload, session, _session_for_redis)
+  cross-lookup          $('Node').first()/.item/.all(): that node's output
+                        must be kept for the rest of the execution
+  llm-no-max-tokens     LLM node without options.maxTokens
+  fan-out-reconverge    a node whose branches all meet again at one node
+
+Errors fail the run (exit 1) unless --no-fail; warnings and info do not.
+Without arguments both the production workflow and its backup are linted,
+but only production errors fail: the backup is the rollback artifact, kept
+byte-identical to what was last deployed, so its findings are reported only.
+Costs use the profiles of analyze_latency.py.
+
+    python3 lint_workflow.py                     # production (gated) + backup (reported)
+    python3 lint_workflow.py generated/workflow-preloaded.json
+    python3 lint_workflow.py --min-severity warning --json lint.json
+"""
+
+import argparse
+import json
+import re
+from collections import deque
+
+from analyze_latency import LATENCY_BUDGET, LATENCY_PROFILES, node_latency, read_from_input
+from optimize_workflow import TAIL_DUPLICATION_MAX_BYTES
+from workflow_utils import WORKFLOW_FILE, load_workflow
+
+BACKUP_FILE = 'workflow-production-ready-backup.json'
+
+CODE_TYPE = 'n8n-nodes-base.code'
+SWITCH_TYPE = 'n8n-nodes-base.switch'
+REDIS_TYPE = 'n8n-nodes-base.redis'
+RESPOND_TYPE = 'n8n-nodes-base.respondToWebhook'
+# Nodes whose output is a model reply
+LLM_TYPES = {'@n8n/n8n-nodes-langchain.openAi', '@n8n/n8n-nodes-langchain.agent',
+             '@n8n/n8n-nodes-langchain.lmChatOpenAi'}
+# Nodes that call the model themselves and take options.maxTokens (an agent's
+# limit sits on its chat model sub-node)
+MAX_TOKENS_TYPES = {'@n8n/n8n-nodes-langchain.openAi', '@n8n/n8n-nodes-langchain.lmChatOpenAi'}
+
+SEVERITIES = ['info', 'warning', 'error']
+
+# Bytes a field adds to every item that carries it (ARCHITECTURE.md: ~3 KB
+# session pass-through; _original_payload is the request body copy)
+LARGE_FIELDS = {'_original_payload': 400, 'session': 3072, '_session_for_redis': 3072}
+# Session document kept per session_id when the SET never expires
+SESSION_BYTES = 3072
+SESSION_TTL_SECONDS = 1800
+LARGE_CONSTANT_BYTES = 1024
+# gpt-4o-mini output cap, what an LLM call without maxTokens may generate
+MODEL_MAX_OUTPUT_TOKENS = 16384
+
+SPREAD = re.compile(r'\.\.\.\s*(\$\(\s*[\'"][^\'"]+[\'"]\s*\)[\w$.()]*|[A-Za-z_$][\w$.]*)')
+CROSS_LOOKUP = re.compile(r'\$\(\s*[\'"]([^\'"]+)[\'"]\s*\)\s*\.\s*(first|last|all|item)\b')
+LITERAL_START = re.compile(r'^([ \t]*)(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*(?:new\s+(?:Set|Map)\(\s*)?([\[{])',
+                           re.MULTILINE)
+BLOCK = re.compile(r'// BEGIN (.+)\n[\s\S]*?// END \1')
+
+
+# ============================================================================
+# JavaScript scanning
+# ============================================================================
+
+def matching_brace(code, start):
+    """Index of the bracket closing code[start], skipping strings, comments and regex literals."""
+    pairs = {'{': '}', '[': ']', '(': ')'}
+    stack = []
+    index = start
+    previous = ''
+    while index < len(code):
+        char = code[index]
+        if char in '\'"`':
+            index += 1
+            while index < len(code) and code[index] != char:
+                index += 2 if code[index] == '\\' else 1
+        elif code.startswith('//', index):
+            index = code.find('\n', index)
+            if index < 0:
+                return -1
+            continue
+        elif code.startswith('/*', index):
+            index = code.find('*/', index) + 1
+        elif char == '/' and previous in '(,=:[!&|?{};+-*%<>~^' or (char == '/' and previous == ''):
+            index += 1
+            in_class = False
+            while index < len(code) and (code[index] != '/' or in_class):
+                if code[index] == '\\':
+                    index += 1
+                elif code[index] == '[':
+                    in_class = True
+                elif code[index] == ']':
+                    in_class = False
+                index += 1
+        elif char in pairs:
+            stack.append(pairs[char])
+        elif char in ')]}':
+            if not stack or stack.pop() != char:
+                return -1
+            if not stack:
+                return index
+        if not char.isspace():
+            previous = char
+        index += 1
+    return -1
+
+
+def block_spans(code, pattern):
+    """(start, end) of the `{...}` bodies that follow each match of pattern (ending in `{`)."""
+    spans = []
+    for match in re.finditer(pattern, code):
+        end = matching_brace(code, match.end() - 1)
+        if end > 0:
+            spans.append((match.start(), end))
+    return spans
+
+
+def within(position, spans):
+    return any(start <= position <= end for start, end in spans)
+
+
+def enclosing_function(code, position):
+    """(name, [parameters]) of the innermost `function name(...) {...}` around position, or None."""
+    best = None
+    for match in re.finditer(r'function\s+([A-Za-z_$][\w$]*)\s*\(([^)]*)\)\s*{', code):
+        if match.start() > position:
+            break
+        end = matching_brace(code, match.end() - 1)
+        if end > position:
+            best = (match.group(1), [part.split('=')[0].strip() for part in match.group(2).split(',')])
+    return best
+
+
+def call_arguments(code, name):
+    """[(position, [argument source])] of every call of function name in code (declaration excluded)."""
+    calls = []
+    for match in re.finditer(rf'(?<![\w$.]){re.escape(name)}\s*\(', code):
+        if code[max(0, match.start() - 9):match.start()].endswith('function '):
+            continue
+        end = matching_brace(code, match.end() - 1)
+        arguments, depth, current = [], 0, ''
+        for char in code[match.end():end]:
+            depth += char in '([{'
+            depth -= char in ')]}'
+            if char == ',' and depth == 0:
+                arguments.append(current.strip())
+                current = ''
+            else:
+                current += char
+        arguments.append(current.strip())
+        calls.append((match.start(), arguments))
+    return calls
+
+
+def guarded(code, position, depth=0):
+    """Does an exception at position end up in a try block (directly or via every call site)?"""
+    tries = block_spans(code, r'\btry\s*{')
+    if within(position, tries):
+        return True
+    function = enclosing_function(code, position)
+    if function is None or depth > 3:
+        return False
+    calls = [call for call, _ in call_arguments(code, function[0])]
+    return bool(calls) and all(guarded(code, call, depth + 1) for call in calls)
+
+
+def line_of(code, position):
+    return code.count('\n', 0, position) + 1
+
+
+# ============================================================================
+# Graph
+# ============================================================================
+
+def successors(workflow, name):
+    targets = []
+    for output in workflow['connections'].get(name, {}).get('main', []):
+        for connection in output or []:
+            if connection['node'] not in targets:
+                targets.append(connection['node'])
+    return targets
+
+
+def predecessors(workflow, name):
+    return [source for source in workflow['connections'] if name in successors(workflow, source)]
+
+
+def distances(workflow, start):
+    """Hops from start to every node reachable from it."""
+    result = {start: 0}
+    queue = deque([start])
+    while queue:
+        name = queue.popleft()
+        for target in successors(workflow, name):
+            if target not in result:
+                result[target] = result[name] + 1
+                queue.append(target)
+    return result
+
+
+def topological_order(workflow, nodes):
+    order, seen = [], set()
+
+    def visit(name):
+        if name in seen:
+            return
+        seen.add(name)
+        for source in predecessors(workflow, name):
+            visit(source)
+        order.append(name)
+
+    for name in nodes:
+        visit(name)
+    return order
+
+
+def llm_upstream(workflow, nodes, name):
+    """The LLM node whose reply reaches name directly or through Switch nodes, or None."""
+    for source in predecessors(workflow, name):
+        if nodes[source]['type'] in LLM_TYPES:
+            return source
+        if nodes[source]['type'] == SWITCH_TYPE:
+            found = llm_upstream(workflow, nodes, source)
+            if found:
+                return found
+    return None
+
+
+def spread_variables(code):
+    """[(expression, position)] of every `...expression` in code."""
+    return [(match.group(1), match.start()) for match in SPREAD.finditer(code)]
+
+
+def carries_input(node):
+    kind = node['type']
+    if kind in (SWITCH_TYPE, RESPOND_TYPE, REDIS_TYPE):
+        return True
+    if kind != CODE_TYPE:
+        return False
+    code = node['parameters'].get('jsCode', '')
+    return any(expression.startswith(('$input', '$json')) or
+               (re.fullmatch(r'[A-Za-z_$][\w$]*', expression) and read_from_input(code, expression)
+                and not re.search(rf'{re.escape(expression)}\s*=\s*[^;]*\$\(', code))
+               for expression, _ in spread_variables(code))
+
+
+def written_fields(node, fields):
+    code = node['parameters'].get('jsCode', '')
+    return {field for field in fields
+            if re.search(rf"(?<![\w$.])['\"]?{re.escape(field)}['\"]?\s*:(?!:)|\.{re.escape(field)}\s*=(?!=)", code)}
+
+
+def large_fields_out(workflow, nodes):
+    """{node: {large fields in its output}} - what each node writes or carries on from its input."""
+    carried = {}
+    for name in topological_order(workflow, nodes):
+        node = nodes[name]
+        inherited = set()
+        if carries_input(node):
+            for source in predecessors(workflow, name):
+                inherited |= carried.get(source, set())
+        carried[name] = inherited | written_fields(node, LARGE_FIELDS)
+    return carried
+
+
+# ============================================================================
+# Rules
+# ============================================================================
+
+def finding(rule, severity, node, message, cost, line=None):
+    entry = {'rule': rule, 'severity': severity, 'node': node, 'message': message, 'cost': cost}
+    if line is not None:
+        entry['line'] = line
+    return entry
+
+
+def check_redis_ttl(workflow, nodes):
+    for name, node in nodes.items():
+        parameters = node['parameters']
+        if node['type'] != REDIS_TYPE or parameters.get('operation') != 'set':
+            continue
+        if parameters.get('expire') and parameters.get('ttl'):
+            continue
+        yield finding('redis-set-no-ttl', 'error', name,
+                      f"SET {parameters.get('key', '')!r} without expire/ttl: abandoned sessions stay in Redis "
+                      f'(docs/DEPLOYMENT.md expects {SESSION_TTL_SECONDS} s)',
+                      {'bytes_per_key': SESSION_BYTES, 'text': f'~{SESSION_BYTES // 1024} KB per session, never evicted'})
+
+
+def check_json_parse(workflow, nodes):
+    timeout = LATENCY_BUDGET['worst']
+    for name, node in nodes.items():
+        if node['type'] != CODE_TYPE:
+            continue
+        llm = llm_upstream(workflow, nodes, name)
+        if llm is None or node.get('onError') in ('continueRegularOutput', 'continueErrorOutput') \
+                or node.get('continueOnFail'):
+            continue
+        code = node['parameters'].get('jsCode', '')
+        for match in re.finditer(r'JSON\.parse\s*\(', code):
+            if guarded(code, match.start()):
+                continue
+            argument = code[match.end():matching_brace(code, match.end() - 1)].strip()
+            yield finding('unguarded-json-parse', 'error', name,
+                          f'JSON.parse({argument}) of the {llm} reply outside try/catch: '
+                          'a non-JSON reply fails the execution',
+                          {'ms': timeout, 'text': f'failed turn, client waits up to {timeout} ms'},
+                          line_of(code, match.start()))
+
+
+def check_large_constants(workflow, nodes):
+    per_kb = LATENCY_PROFILES['code']['per_kb']
+    for name, node in nodes.items():
+        if node['type'] != CODE_TYPE:
+            continue
+        code = node['parameters'].get('jsCode', '')
+        blocks = [(match.start(), match.end(), match.group(1)) for match in BLOCK.finditer(code)]
+        for match in LITERAL_START.finditer(code):
+            end = matching_brace(code, match.end() - 1)
+            if end < 0:
+                continue
+            body = code[match.end() - 1:end + 1]
+            size = len(body.encode('utf-8'))
+            if size < LARGE_CONSTANT_BYTES or re.search(r'=>|\bfunction\b|\$\(|\$input|\$json', body):
+                continue
+            in_function = bool(match.group(1)) and enclosing_function(code, match.start()) is not None
+            block = next((marker for start, stop, marker in blocks if start <= match.start() <= stop), None)
+            kb = size / 1024
+            cost = {'bytes': size, 'ms': round(kb * per_kb['expected'], 2),
+                    'text': f"{kb:.1f} KB compiled per run (~{kb * per_kb['expected']:.1f}-"
+                            f"{kb * per_kb['worst']:.1f} ms)"}
+            if in_function:
+                cost['text'] += ', rebuilt on every call'
+            if block and not in_function:
+                yield finding('large-constant', 'info', name,
+                              f'{match.group(2)} ({kb:.1f} KB) in block {block.split(" (")[0]}: '
+                              'optimize_workflow.py --preload builds it once per worker', cost,
+                              line_of(code, match.start()))
+            else:
+                yield finding('large-constant', 'warning', name,
+                              f'{match.group(2)} ({kb:.1f} KB) literal '
+                              f'{"inside a function" if in_function else "in jsCode"}: hoist it or move it to a block',
+                              cost, line_of(code, match.start()))
+
+
+def expression_fields(code, expression, position, incoming, carried, depth=0):
+    """Large fields an expression in code may hold: from $input, a $('Node') lookup, or what a parameter is passed."""
+    lookup = re.match(r'\$\(\s*[\'"]([^\'"]+)[\'"]', expression)
+    if lookup:
+        return carried.get(lookup.group(1), set())
+    if expression.startswith(('$input', '$json')):
+        return incoming
+    if depth > 3 or not re.fullmatch(r'[A-Za-z_$][\w$]*', expression):
+        return set()
+    assignment = re.search(rf'(?:const|let|var)\s+{re.escape(expression)}\s*=\s*([^;]*)', code)
+    if assignment:
+        value = assignment.group(1).strip()
+        source = re.search(r'\$\(\s*[\'"][^\'"]+[\'"]\s*\)|\$input|\$json', value)
+        if not source:
+            return set()
+        if value.startswith(('$', '{ ...$', '{...$')):
+            return expression_fields(code, value, position, incoming, carried, depth + 1)
+        # Helper call on lookups (helper($('Load Session1')..., $input...)): what its result spreads
+        fields = set()
+        for node in re.findall(r'\$\(\s*[\'"]([^\'"]+)[\'"]', value):
+            fields |= carried.get(node, set())
+        return fields | (incoming if re.search(r'\$input|\$json', value) else set())
+    function = enclosing_function(code, position)
+    if function is None or expression not in function[1]:
+        return set()
+    # Parameter: whatever the callers pass
+    index = function[1].index(expression)
+    fields = set()
+    for call, arguments in call_arguments(code, function[0]):
+        if index < len(arguments):
+            fields |= expression_fields(code, arguments[index], call, incoming, carried, depth + 1)
+    return fields
+
+
+def check_spreads(workflow, nodes):
+    carried = large_fields_out(workflow, nodes)
+    for name, node in nodes.items():
+        if node['type'] != CODE_TYPE:
+            continue
+        code = node['parameters'].get('jsCode', '')
+        incoming = set()
+        for source in predecessors(workflow, name):
+            incoming |= carried.get(source, set())
+        spreads = {}
+        for expression, position in spread_variables(code):
+            fields = expression_fields(code, expression, position, incoming, carried)
+            # Dropped again before the item leaves the node
+            fields = frozenset(field for field in fields
+                               if not re.search(rf'delete\s+[\w$.]+\.{field}\b|{field}\s*:\s*(?:undefined|null)\b', code))
+            if fields:
+                # One finding per field set: `...loaded` in a helper and `...input` of its result are one copy chain
+                entry = spreads.setdefault(fields, ([], position))
+                if expression not in entry[0]:
+                    entry[0].append(expression)
+        for fields, (expressions, position) in spreads.items():
+            size = sum(LARGE_FIELDS[field] for field in fields)
+            yield finding('spread-large-field', 'warning', name,
+                          f"{', '.join('...' + expression for expression in expressions)} "
+                          f"cop{'ies' if len(expressions) == 1 else 'y'} {', '.join(sorted(fields))} into the output",
+                          {'bytes': size, 'text': f'~{size / 1024:.1f} KB more per item'},
+                          line_of(code, position))
+
+
+def check_cross_lookups(workflow, nodes):
+    carried = large_fields_out(workflow, nodes)
+    for name, node in nodes.items():
+        code = node['parameters'].get('jsCode', '') if node['type'] == CODE_TYPE else ''
+        seen = set()
+        for match in CROSS_LOOKUP.finditer(code):
+            source, accessor = match.groups()
+            if source in seen or source not in nodes:
+                continue
+            seen.add(source)
+            hops = distances(workflow, source).get(name)
+            size = sum(LARGE_FIELDS[field] for field in carried.get(source, set()))
+            text = f'{source} output kept {hops} hop(s) later' if hops else f'{source} output kept'
+            if size:
+                text += f' (~{size / 1024:.1f} KB large fields)'
+            if accessor == 'item':
+                text += ', paired-item lookup per item'
+            yield finding('cross-lookup', 'info' if hops in (None, 1) else 'warning', name,
+                          f"$('{source}').{accessor}() reads a node {hops if hops else '?'} hop(s) back",
+                          {'hops': hops, 'bytes': size, 'text': text}, line_of(code, match.start()))
+
+
+def check_max_tokens(workflow, nodes):
+    per_token = LATENCY_PROFILES['llm']['per_token']['worst']
+    for name, node in nodes.items():
+        if node['type'] not in MAX_TOKENS_TYPES:
+            continue
+        if node['parameters'].get('options', {}).get('maxTokens'):
+            continue
+        worst = MODEL_MAX_OUTPUT_TOKENS * per_token
+        yield finding('llm-no-max-tokens', 'error', name,
+                      f'no options.maxTokens: a runaway reply may run to {MODEL_MAX_OUTPUT_TOKENS} tokens',
+                      {'ms': worst, 'text': f'worst case ~{worst / 1000:.0f} s of output'})
+
+
+def check_fanouts(workflow, nodes):
+    for name, node in nodes.items():
+        targets = successors(workflow, name)
+        if len(targets) < 2:
+            continue
+        reach = [distances(workflow, target) for target in targets]
+        common = set(reach[0]).intersection(*reach[1:])
+        if not common:
+            continue
+        meet = min(common, key=lambda candidate: (max(r[candidate] for r in reach), candidate))
+        latency = node_latency(nodes[meet], LATENCY_PROFILES)
+        size = len(nodes[meet]['parameters'].get('jsCode', '').encode('utf-8'))
+        if nodes[meet]['type'] == CODE_TYPE and size <= TAIL_DUPLICATION_MAX_BYTES:
+            remedy = 'small enough for optimize_workflow.py to copy into each branch'
+        else:
+            remedy = 'every branch pays this hop'
+        exclusive = node['type'] == SWITCH_TYPE
+        outputs = len(workflow['connections'][name]['main'])
+        if exclusive and outputs > len(targets):
+            message = f'{outputs} outputs ({len(targets)} distinct targets) reconverge on {meet}'
+        elif exclusive:
+            message = f'{outputs} outputs reconverge on {meet}'
+        else:
+            message = f'{len(targets)} parallel branches reconverge on {meet}'
+        cost = {'ms': round(latency['expected'], 1), 'text': f"{meet}: ~{latency['expected']:.0f} ms hop, {remedy}"}
+        if not exclusive:
+            # n8n runs parallel branches one after the other
+            serial = sum(node_latency(nodes[target], LATENCY_PROFILES)['expected'] for target in targets)
+            cost = {'ms': round(serial, 1), 'text': f'branches run in series (~{serial:.0f} ms), then {meet}'}
+        yield finding('fan-out-reconverge', 'info' if exclusive else 'warning', name, message, cost)
+
+
+RULES = [check_redis_ttl, check_json_parse, check_large_constants, check_spreads,
+         check_cross_lookups, check_max_tokens, check_fanouts]
+
+
+def lint(workflow):
+    nodes = {node['name']: node for node in workflow['nodes']}
+    findings = []
+    for rule in RULES:
+        findings.extend(rule(workflow, nodes))
+    order = {severity: index for index, severity in enumerate(reversed(SEVERITIES))}
+    findings.sort(key=lambda entry: (order[entry['severity']], -entry['cost'].get('ms', 0),
+                                     -entry['cost'].get('bytes', 0), entry['node']))
+    return findings
+
+
+def print_findings(path, findings):
+    print(f"\n{path}")
+    if not findings:
+        print("  ✓ No findings")
+        return
+    for entry in findings:
+        where = entry['node'] + (f":{entry['line']}" if 'line' in entry else '')
+        print(f"  {entry['severity']:<7} {entry['rule']:<21} {where}")
+        print(f"          {entry['message']}")
+        print(f"          cost: {entry['cost']['text']}")
+    counts = {severity: sum(entry['severity'] == severity for entry in findings) for severity in SEVERITIES}
+    print(f"  {counts['error']} error(s), {counts['warning']} warning(s), {counts['info']} info")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Performance lint for n8n workflow exports')
+    parser.add_argument('files', nargs='*',
+                        help='workflow JSON files (default: production, and backup reported only)')
+    parser.add_argument('--min-severity', choices=SEVERITIES, default='info', help='hide less severe findings')
+    parser.add_argument('--json', metavar='FILE', help='also write the findings as JSON')
+    parser.add_argument('--no-fail', action='store_true', help='exit 0 even with errors')
+    args = parser.parse_args()
+    files = args.files or [WORKFLOW_FILE, BACKUP_FILE]
+    gated = set(args.files or [WORKFLOW_FILE])
+
+    results = {}
+    for path in files:
+        findings = [entry for entry in lint(load_workflow(path))
+                    if SEVERITIES.index(entry['severity']) >= SEVERITIES.index(args.min_severity)]
+        results[path] = findings
+        print_findings(path, findings)
+        if path not in gated:
+            print("  (rollback backup: reported, not gated)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+        print(f"\n✓ Wrote {args.json}")
+
+    errors = sum(entry['severity'] == 'error' for path in gated for entry in results[path])
+    if errors and not args.no_fail:
+        print(f"\n✗ {errors} error(s)")
+        return 1
+    print("\n✓ No errors" if not errors else f"\n  {errors} error(s) (--no-fail)")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Simulate a classroom: many concurrent students against the tutor webhook.
+
+PROBLEM:
+test-scaffolding.sh drives one session with curl, one message after the
+other, and greps the category. It says nothing about a class of 30
+students starting the same problem at once: throughput, how many turns
+fail or time out, which routes get slow, whether later turns (longer
+chat history, bigger session) get slower than the first.
+
+SOLUTION:
+An asyncio load generator (standard library only). Each simulated student
+is one session working through a conversation from exemplars/questions.json:
+
+  scripted    - the question's test_conversation (test_inputs), in order;
+                the expected category is checked
+  randomized  - a seeded walk over the question: common wrong answers,
+                "I don't know", a step answer, the correct answer, then an
+                explanation; off-topic now and then
+
+Students arrive in a burst (everyone at once), spread evenly over --ramp-s,
+or as a Poisson process (--rate students per second), and think between
+turns (lognormal around --think-ms). Requests time out after 10 s, the
+client timeout in docs/INTEGRATION.md.
+
+Reported, and written as JSON for run-to-run comparison (--compare):
+throughput, error rate, p50/p95/p99 latency overall, per route (the
+category in the response metadata) and per turn index, and how latency
+grows with conversation length (least-squares ms per turn, p50 of the
+last turn index vs the first). With --timing the requests set
+include_timing and, against an instrumented workflow (build_timing.py),
+the per-node metadata.timing is summarized per node and per README
+latency stage (build_timing.py --table prints the table).
+
+Target n8n (default, as test-scaffolding.sh: N8N_WEBHOOK_URL) or the
+offline server:
+
+    node benchmarks/headless_run.js --serve 5679 --mock-latency ttft:250,0.4,4 &
+    python3 load_test.py --url http://localhost:5679/webhook/tutor/message --students 30 --think-ms 3000
+    python3 load_test.py --students 100 --arrival poisson --rate 5 --mode randomized --compare load-report.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import time
+from urllib.parse import urlsplit
+
+from build_timing import LATENCY_STAGES
+
+QUESTIONS_FILE = 'exemplars/questions.json'
+REPORT_FILE = 'load-report.json'
+DEFAULT_URL = os.environ.get('N8N_WEBHOOK_URL', 'http://localhost:5678/webhook/tutor/message')
+# docs/INTEGRATION.md client timeout
+TIMEOUT_S = 10.0
+
+HELP_MESSAGES = ["I don't know", "I'm stuck", 'can you help me?']
+EXPLANATIONS = ['I started at the first number and moved along the number line',
+                'I counted the steps one by one to get there']
+OFF_TOPIC = ['I like pizza', "what's for lunch?"]
+
+
+# ============================================================================
+# Conversations
+# ============================================================================
+
+def load_questions(path=QUESTIONS_FILE):
+    """Questions; off_topic_test (no correct_answer) borrows it from the question with the same problem."""
+    with open(path) as f:
+        questions = json.load(f)['questions']
+    answers = {question['problem']: question['correct_answer'] for question in questions if 'correct_answer' in question}
+    return [question if 'correct_answer' in question else {**question, 'correct_answer': answers.get(question['problem'])}
+            for question in questions]
+
+
+def script_of(question):
+    return question.get('test_conversation') or question.get('test_inputs') or []
+
+
+def problem_of(question):
+    return {'id': question['id'], 'text': question['problem'], 'correct_answer': question['correct_answer']}
+
+
+def scripted_turns(question, rng):
+    """[(message, expected category)] of the question's test_conversation (test_inputs for off_topic_test)."""
+    return [(turn['student_input'], turn.get('expected_category')) for turn in script_of(question)]
+
+
+def randomized_turns(question, rng):
+    """A seeded conversation: wrong answers and help requests until the correct answer, then an explanation."""
+    wrong = [error['answer'] for error in question.get('common_errors', [])]
+    turns = []
+    for _ in range(rng.randint(1, 6)):
+        roll = rng.random()
+        if roll < 0.45 and wrong:
+            turns.append((rng.choice(wrong), None))
+        elif roll < 0.75:
+            turns.append((rng.choice(HELP_MESSAGES), None))
+        elif roll < 0.9:
+            # A step answer ("3" on -3 + 5) or another attempt
+            turns.append((str(rng.randint(1, 9)), None))
+        else:
+            turns.append((rng.choice(OFF_TOPIC), None))
+    turns.append((question['correct_answer'], 'correct'))
+    turns.append((rng.choice(EXPLANATIONS), None))
+    return turns
+
+
+CONVERSATIONS = {'scripted': scripted_turns, 'randomized': randomized_turns}
+
+
+# ============================================================================
+# HTTP (asyncio streams; one connection per request, like curl)
+# ============================================================================
+
+async def read_body(reader, headers):
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        body = b''
+        while True:
+            size = int((await reader.readline()).split(b';')[0].strip() or b'0', 16)
+            if size == 0:
+                await reader.readline()
+                return body
+            body += await reader.readexactly(size)
+            await reader.readline()
+    if 'content-length' in headers:
+        return await reader.readexactly(int(headers['content-length']))
+    return await reader.read()
+
+
+async def post_json(url, payload):
+    """(status, decoded JSON body or None) of a POST."""
+    parts = urlsplit(url)
+    port = parts.port or (443 if parts.scheme == 'https' else 80)
+    reader, writer = await asyncio.open_connection(parts.hostname, port, ssl=parts.scheme == 'https' or None)
+    try:
+        data = json.dumps(payload).encode('utf-8')
+        path = parts.path + (f'?{parts.query}' if parts.query else '')
+        writer.write((f'POST {path or "/"} HTTP/1.1\r\nHost: {parts.netloc}\r\n'
+                      'Content-Type: application/json\r\nConnection: close\r\n'
+                      f'Content-Length: {len(data)}\r\n\r\n').encode('latin-1') + data)
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode('latin-1').strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        body = await read_body(reader, headers)
+        try:
+            return status, json.loads(body.decode('utf-8'))
+        except ValueError:
+            return status, None
+    finally:
+        writer.close()
+
+
+# ============================================================================
+# Load
+# ============================================================================
+
+def arrival_offsets(count, arrival, ramp_s, rate, rng):
+    """Start time (s) of each student."""
+    if arrival == 'burst':
+        return [0.0] * count
+    if arrival == 'uniform':
+        return [ramp_s * index / max(count - 1, 1) for index in range(count)]
+    offsets, clock = [], 0.0
+    for _ in range(count):
+        offsets.append(clock)
+        clock += rng.expovariate(rate)
+    return offsets
+
+
+def think_time(rng, think_ms, sigma):
+    return 0.0 if think_ms <= 0 else think_ms * math.exp(rng.gauss(0, sigma)) / 1000
+
+
+async def student(index, url, question, turns, start_s, args, rng, records, started):
+    await asyncio.sleep(max(0.0, started + start_s - time.monotonic()))
+    session_id = f'load_{args.seed}_{index}_{question["id"]}'
+    for turn_index, (message, expected) in enumerate(turns):
+        payload = {'student_id': f'load_student_{index}', 'session_id': session_id,
+                   'message': message, 'current_problem': problem_of(question)}
+        if args.timing:
+            payload['include_timing'] = True
+        record = {'student': index, 'question': question['id'], 'turn': turn_index + 1,
+                  'expected': expected, 'category': None, 'status': None, 'error': None}
+        began = time.monotonic()
+        try:
+            status, body = await asyncio.wait_for(post_json(url, payload), TIMEOUT_S)
+            record['status'] = status
+            if status != 200:
+                record['error'] = f'HTTP {status}'
+            elif not body or 'metadata' not in body:
+                record['error'] = 'invalid body'
+            else:
+                record['category'] = body['metadata'].get('category')
+                record['timing'] = body['metadata'].get('timing')
+        except asyncio.TimeoutError:
+            record['error'] = 'timeout'
+        except (OSError, ValueError, IndexError, asyncio.IncompleteReadError) as error:
+            record['error'] = type(error).__name__
+        record['latency_ms'] = (time.monotonic() - began) * 1000
+        records.append(record)
+        if turn_index < len(turns) - 1:
+            await asyncio.sleep(think_time(rng, args.think_ms, args.think_sigma))
+
+
+async def run_load(args, questions):
+    rng = random.Random(args.seed)
+    pool = [question for question in questions if question['correct_answer'] is not None and
+            (args.mode == 'randomized' or script_of(question))]
+    if args.question:
+        pool = [question for question in pool if question['id'] in args.question]
+    if not pool:
+        raise ValueError('No question with a conversation to run')
+    offsets = arrival_offsets(args.students, args.arrival, args.ramp_s, args.rate, rng)
+    records = []
+    started = time.monotonic()
+    tasks = []
+    for index in range(args.students):
+        question = pool[index % len(pool)]
+        student_rng = random.Random(f'{args.seed}-{index}')
+        turns = CONVERSATIONS[args.mode](question, student_rng)
+        tasks.append(student(index, args.url, question, turns, offsets[index], args, student_rng, records, started))
+    await asyncio.gather(*tasks)
+    return records, time.monotonic() - started
+
+
+# ============================================================================
+# Report
+# ============================================================================
+
+def percentile(values, p):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))], 1)
+
+
+def latency_summary(records):
+    latencies = [record['latency_ms'] for record in records if not record['error']]
+    errors = sum(1 for record in records if record['error'])
+    return {'requests': len(records), 'errors': errors,
+            'error_rate': round(errors / len(records), 4) if records else 0.0,
+            'p50_ms': percentile(latencies, 50), 'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99)}
+
+
+def scaling(records):
+    """Least-squares ms per turn index and p50 of the last turn index over the first."""
+    points = [(record['turn'], record['latency_ms']) for record in records if not record['error']]
+    if len({turn for turn, _ in points}) < 2:
+        return {'ms_per_turn': None, 'last_over_first_p50': None}
+    mean_x = sum(turn for turn, _ in points) / len(points)
+    mean_y = sum(latency for _, latency in points) / len(points)
+    slope = (sum((turn - mean_x) * (latency - mean_y) for turn, latency in points) /
+             sum((turn - mean_x) ** 2 for turn, _ in points))
+    turns = sorted({turn for turn, _ in points})
+    first = percentile([latency for turn, latency in points if turn == turns[0]], 50)
+    last = percentile([latency for turn, latency in points if turn == turns[-1]], 50)
+    return {'ms_per_turn': round(slope, 2), 'first_turn': turns[0], 'last_turn': turns[-1],
+            'last_over_first_p50': round(last / first, 2) if first else None}
+
+
+def timing_summary(records):
+    """p50/p95 per node and per README stage from metadata.timing (None if no response had it)."""
+    timed = [record for record in records if not record['error'] and record.get('timing')]
+    if not timed:
+        return None
+    nodes = {}
+    for record in timed:
+        for node, ms in record['timing']['nodes'].items():
+            nodes.setdefault(node, []).append(ms)
+    stages = {}
+    for label, members in LATENCY_STAGES.items():
+        if members is None:
+            values = [record['latency_ms'] for record in timed]
+        else:
+            values = [sum(record['timing']['nodes'].get(node, 0) for node in members) for record in timed
+                      if any(node in record['timing']['nodes'] for node in members)]
+        stages[label] = {'p50_ms': percentile(values, 50), 'p95_ms': percentile(values, 95)}
+    return {'turns': len(timed),
+            'nodes': {node: {'runs': len(values), 'p50_ms': percentile(values, 50), 'p95_ms': percentile(values, 95)}
+                      for node, values in nodes.items()},
+            'stages': stages}
+
+
+def summarize(records, wall_s, args):
+    ok = [record for record in records if not record['error']]
+    checked = [record for record in ok if record['expected']]
+    by_route, by_turn = {}, {}
+    for record in records:
+        by_route.setdefault(record['category'] or 'error', []).append(record)
+        by_turn.setdefault(record['turn'], []).append(record)
+    return {
+        'config': {key: value for key, value in vars(args).items() if key not in ('compare', 'out')},
+        'wall_s': round(wall_s, 2),
+        'throughput_rps': round(len(ok) / wall_s, 2) if wall_s else None,
+        'overall': latency_summary(records),
+        'expected_category_match': (round(sum(record['category'] == record['expected'] for record in checked) /
+                                          len(checked), 3) if checked else None),
+        'by_route': {route: latency_summary(group) for route, group in sorted(by_route.items())},
+        'by_turn': {str(turn): latency_summary(group) for turn, group in sorted(by_turn.items())},
+        'scaling': scaling(records),
+        'timing': timing_summary(records),
+        'errors': sorted({record['error'] for record in records if record['error']}),
+    }
+
+
+def format_row(label, summary):
+    cell = lambda value: f'{value:>8.1f}' if value is not None else f'{"-":>8}'
+    return (f"  {label:<24} {summary['requests']:>6} {summary['error_rate'] * 100:>6.1f}%"
+            f"{cell(summary['p50_ms'])}{cell(summary['p95_ms'])}{cell(summary['p99_ms'])}")
+
+
+def print_report(report):
+    overall = report['overall']
+    print(f"\n{overall['requests']} requests in {report['wall_s']} s - {report['throughput_rps']} ok/s, "
+          f"{overall['error_rate'] * 100:.1f}% errors {report['errors'] or ''}")
+    if report['expected_category_match'] is not None:
+        print(f"Expected category (scripted turns): {report['expected_category_match'] * 100:.0f}% match")
+    header = f"  {'':<24} {'reqs':>6} {'errors':>7}{'p50 ms':>8}{'p95 ms':>8}{'p99 ms':>8}"
+    print('\nPer route (response category)')
+    print(header)
+    for route, summary in report['by_route'].items():
+        print(format_row(route, summary))
+    print('\nPer turn index')
+    print(header)
+    for turn, summary in report['by_turn'].items():
+        print(format_row(f'turn {turn}', summary))
+    print(format_row('all', overall))
+    growth = report['scaling']
+    if growth['ms_per_turn'] is not None:
+        print(f"\nConversation length: {growth['ms_per_turn']:+.2f} ms per turn; p50 turn {growth['last_turn']} / "
+              f"turn {growth['first_turn']} = {growth['last_over_first_p50']}x")
+    timing = report['timing']
+    if timing:
+        print(f"\nPer node (metadata.timing, {timing['turns']} turns)")
+        print(f"  {'':<36} {'runs':>6}{'p50 ms':>8}{'p95 ms':>8}")
+        for node, summary in timing['nodes'].items():
+            print(f"  {node:<36} {summary['runs']:>6}{summary['p50_ms']:>8.1f}{summary['p95_ms']:>8.1f}")
+
+
+def print_comparison(previous, report):
+    print(f"\nCompared with the previous run")
+    rows = [('throughput ok/s', previous.get('throughput_rps'), report['throughput_rps']),
+            ('error rate %', previous['overall']['error_rate'] * 100, report['overall']['error_rate'] * 100)]
+    rows += [(f'{key[:3]} ms', previous['overall'][key], report['overall'][key]) for key in ('p50_ms', 'p95_ms', 'p99_ms')]
+    for label, before, after in rows:
+        if before is None or after is None:
+            continue
+        change = f'{(after - before) / before * 100:+.1f}%' if before else ''
+        print(f"  {label:<16} {before:>9.1f} → {after:>9.1f}  {change}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent multi-session load test of the tutor webhook')
+    parser.add_argument('--url', default=DEFAULT_URL, help='webhook URL (default: N8N_WEBHOOK_URL or localhost:5678)')
+    parser.add_argument('--students', type=int, default=30, help='concurrent students (sessions)')
+    parser.add_argument('--mode', choices=sorted(CONVERSATIONS), default='scripted')
+    parser.add_argument('--question', action='append', help='question id(s) to use (default: all)')
+    parser.add_argument('--arrival', choices=['burst', 'uniform', 'poisson'], default='burst')
+    parser.add_argument('--ramp-s', type=float, default=10.0, help='uniform arrival: spread over this many seconds')
+    parser.add_argument('--rate', type=float, default=2.0, help='poisson arrival: students per second')
+    parser.add_argument('--think-ms', type=float, default=5000.0, help='median think time between turns (0: none)')
+    parser.add_argument('--think-sigma', type=float, default=0.5, help='lognormal sigma of the think time')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--timing', action='store_true',
+                        help='request include_timing; per-node times need an instrumented workflow (build_timing.py)')
+    parser.add_argument('--out', default=REPORT_FILE, help='JSON report')
+    parser.add_argument('--compare', help='previous JSON report to compare with')
+    args = parser.parse_args()
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+
+    print(f"{args.students} students, {args.mode} conversations, {args.arrival} arrival, "
+          f"think {args.think_ms:.0f} ms → {args.url}")
+    records, wall_s = asyncio.run(run_load(args, load_questions()))
+    report = summarize(records, wall_s, args)
+    print_report(report)
+    if previous:
+        print_comparison(previous, report)
+
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+    print(f"\n✓ Wrote {args.out}")
+    return 1 if report['overall']['requests'] and report['overall']['error_rate'] == 1 else 0
+
+
+if __name__ == '__main__':
+    exit(main())
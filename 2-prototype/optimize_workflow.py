@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Optimize the workflow for deployment: fuse Code nodes, collapse fan-outs.
+
+PROBLEM:
+The workflow is built from small, readable nodes, and every hop costs n8n
+item serialization, execution bookkeeping and a sandbox entry. On every
+route a validator hands its item to "Build Response Context1", which only
+adds chat history and state flags before "Route by Category1" - whose nine
+outputs mostly lead to the same node.
+
+SOLUTION:
+Leave workflow-production-ready.json as the readable source and write a
+leaner, equivalent deployment copy (generated/workflow-optimized.json):
+
+  0. Project fields: every Code node only outputs the fields read
+     downstream (contracts in build_field_projection.py).
+  1. Drop nodes that no trigger can reach.
+  2. Collapse fan-outs: a Switch whose outputs (fallback included) all lead
+     to one node is removed; consecutive rules with the same target are
+     merged into one OR rule (first-match order is kept).
+  3. Fuse Code nodes:
+       - linear: A → B where A's only successor is B and B's only
+         predecessor is A; the fused node keeps B's name
+       - tail duplication: B (small) whose predecessors are all Code nodes
+         with B as their only successor is appended to each predecessor;
+         $('B') references become "whichever of them ran"
+           $(['A1', 'A2'].find(name => $(name).isExecuted))
+     Fused code runs each part in its own async function with $input/$json
+     rebound to the previous part's output, so node code is not edited.
+
+Fusion is skipped when it would change behaviour: per-item mode,
+$input.item / legacy `items`, or a $('A') reference to a node that would
+disappear.
+
+With --preload (self-hosted workers only), the embedded blocks are first
+moved into generated/tutor-runtime/ and each node require()s its unit - see
+build_runtime_module.py - and registry versions published to Redis are
+picked up with the session (build_registry_store.py). The output is then
+generated/workflow-preloaded.json.
+
+    python3 optimize_workflow.py             # write the optimized copy + report
+    python3 optimize_workflow.py --dry-run   # report only
+    python3 optimize_workflow.py --preload   # + per-worker module
+"""
+
+import argparse
+import copy
+import json
+import re
+
+from build_field_projection import NODE_CONTRACTS, project_workflow
+from build_registry_store import REGISTRY_STORE_CONTRACTS, wire_registry_store
+from build_runtime_module import MODULE_DIR, hoist_blocks, write_module
+from workflow_utils import WORKFLOW_FILE, load_workflow, run_node, save_workflow
+
+OUTPUT_FILE = 'generated/workflow-optimized.json'
+REPORT_FILE = 'generated/workflow-optimized.report.json'
+PRELOADED_OUTPUT_FILE = 'generated/workflow-preloaded.json'
+PRELOADED_REPORT_FILE = 'generated/workflow-preloaded.report.json'
+
+CODE_TYPE = 'n8n-nodes-base.code'
+SWITCH_TYPE = 'n8n-nodes-base.switch'
+
+# Larger nodes are not copied into several predecessors
+TAIL_DUPLICATION_MAX_BYTES = 4096
+
+# Code that only works when the node runs by itself
+UNFUSABLE_CODE = re.compile(r'\$input\.item\b|(?<![\w$.])items\b')
+
+
+# ============================================================================
+# Graph helpers
+# ============================================================================
+
+def node_map(workflow):
+    return {node['name']: node for node in workflow['nodes']}
+
+
+def successors(workflow, name):
+    """Distinct successor names over all main outputs."""
+    names = []
+    for output in workflow['connections'].get(name, {}).get('main', []):
+        for connection in output or []:
+            if connection['node'] not in names:
+                names.append(connection['node'])
+    return names
+
+
+def predecessors(workflow, name):
+    return [source for source in workflow['connections']
+            if name in successors(workflow, source)]
+
+
+def is_trigger(node):
+    return 'trigger' in node['type'].lower() or node['type'] == 'n8n-nodes-base.webhook'
+
+
+def references(workflow, name):
+    """Nodes whose parameters reference $('name')."""
+    pattern = re.compile(r"\$\(\s*['\"]" + re.escape(name) + r"['\"]\s*\)")
+    return [node['name'] for node in workflow['nodes']
+            if pattern.search(json.dumps(node['parameters'], ensure_ascii=False)
+                              .replace('\\"', '"'))]
+
+
+def replace_reference(workflow, name, replacement):
+    pattern = re.compile(r"\$\(\s*(['\"])" + re.escape(name) + r"\1\s*\)")
+
+    def rewrite(value):
+        if isinstance(value, str):
+            return pattern.sub(lambda _: replacement, value)
+        if isinstance(value, list):
+            return [rewrite(v) for v in value]
+        if isinstance(value, dict):
+            return {k: rewrite(v) for k, v in value.items()}
+        return value
+
+    for node in workflow['nodes']:
+        node['parameters'] = rewrite(node['parameters'])
+
+
+def remove_node(workflow, name):
+    workflow['nodes'] = [n for n in workflow['nodes'] if n['name'] != name]
+    workflow['connections'].pop(name, None)
+    for outputs in workflow['connections'].values():
+        for output in outputs.get('main', []):
+            if output:
+                output[:] = [c for c in output if c['node'] != name]
+
+
+def redirect(workflow, old, new):
+    """Point every connection into `old` at `new` instead."""
+    for outputs in workflow['connections'].values():
+        for output in outputs.get('main', []):
+            for connection in output or []:
+                if connection['node'] == old:
+                    connection['node'] = new
+
+
+# ============================================================================
+# Passes
+# ============================================================================
+
+def drop_unreachable(workflow, report):
+    nodes = node_map(workflow)
+    reachable = set()
+    frontier = [name for name, node in nodes.items() if is_trigger(node)]
+    while frontier:
+        name = frontier.pop()
+        if name not in reachable:
+            reachable.add(name)
+            frontier.extend(successors(workflow, name))
+    for name in list(nodes):
+        if name in reachable:
+            continue
+        if references(workflow, name):
+            report['kept_unreachable'].append(name)
+            continue
+        remove_node(workflow, name)
+        report['dropped'].append(name)
+
+
+def switch_targets(workflow, name):
+    """Target node per output index (None for an unconnected output)."""
+    targets = []
+    for output in workflow['connections'].get(name, {}).get('main', []):
+        names = sorted({c['node'] for c in output or []})
+        targets.append(names[0] if len(names) == 1 else (None if not names else tuple(names)))
+    return targets
+
+
+def collapse_fanouts(workflow, report, absorbed):
+    for node in list(workflow['nodes']):
+        if node['type'] != SWITCH_TYPE or node['parameters'].get('mode') == 'expression':
+            continue
+        name = node['name']
+        rules = node['parameters'].get('rules', {}).get('values', [])
+        fallback = node['parameters'].get('options', {}).get('fallbackOutput')
+        targets = switch_targets(workflow, name)
+        targets += [None] * (len(rules) + (1 if fallback == 'extra' else 0) - len(targets))
+
+        # Every output, fallback included, goes to one node: the switch is a no-op
+        distinct = set(targets)
+        if len(distinct) == 1 and isinstance(targets[0], str) and not references(workflow, name):
+            redirect(workflow, name, targets[0])
+            remove_node(workflow, name)
+            absorbed[name] = None
+            report['collapsed_switches'].append(name)
+            continue
+
+        merged_rules, merged_targets, merged_keys = [], [], []
+        for rule, target in zip(rules, targets):
+            conditions = rule['conditions']
+            mergeable = (isinstance(target, str) and merged_targets and merged_targets[-1] == target
+                         and len(conditions['conditions']) == 1
+                         and merged_rules[-1]['_single']
+                         and merged_rules[-1]['conditions']['options'] == conditions['options'])
+            if mergeable:
+                previous = merged_rules[-1]
+                previous['conditions']['conditions'] += copy.deepcopy(conditions['conditions'])
+                previous['conditions']['combinator'] = 'or'
+                previous['outputKey'] = previous.get('outputKey', '') + '|' + rule.get('outputKey', '')
+                merged_keys[-1].append(rule.get('outputKey'))
+                continue
+            entry = copy.deepcopy(rule)
+            entry['_single'] = len(conditions['conditions']) == 1 or conditions['combinator'] == 'or'
+            merged_rules.append(entry)
+            merged_targets.append(target)
+            merged_keys.append([rule.get('outputKey')])
+
+        if len(merged_rules) == len(rules):
+            continue
+        for rule in merged_rules:
+            del rule['_single']
+        outputs = workflow['connections'][name]['main']
+        new_outputs = []
+        index = 0
+        for keys in merged_keys:
+            new_outputs.append(outputs[index] if index < len(outputs) else [])
+            index += len(keys)
+        if fallback == 'extra' and len(outputs) > len(rules):
+            new_outputs.append(outputs[len(rules)])
+        node['parameters']['rules']['values'] = merged_rules
+        workflow['connections'][name]['main'] = new_outputs
+        report['merged_rules'].append({
+            'switch': name,
+            'outputs_before': len(rules),
+            'outputs_after': len(merged_rules),
+            'groups': [keys for keys in merged_keys if len(keys) > 1],
+        })
+
+
+def fusable_code(node):
+    return (node['type'] == CODE_TYPE
+            and node['parameters'].get('mode', 'runOnceForAllItems') == 'runOnceForAllItems'
+            and not UNFUSABLE_CODE.search(node['parameters'].get('jsCode', '')))
+
+
+FUSED_PART = """// ---- {name} ----
+const __out{index} = await (async function ($input, $json) {{
+{code}
+}})({input}, {json});
+const __items{index} = (Array.isArray(__out{index}) ? __out{index} : [__out{index}])
+  .map(item => (item && item.json !== undefined ? item : {{ json: item }}));"""
+
+FUSED_INPUT = ('{{ first: () => __items{i}[0], last: () => __items{i}[__items{i}.length - 1], '
+               'all: () => __items{i} }}')
+
+
+def fuse_code(parts):
+    """parts: [(name, jsCode)] in execution order → one Code node body."""
+    lines = [f"// Fused by optimize_workflow.py: {' → '.join(name for name, _ in parts)}"]
+    for index, (name, code) in enumerate(parts):
+        if index == 0:
+            source_input, source_json = '$input', '$json'
+        else:
+            source_input = FUSED_INPUT.format(i=index - 1)
+            source_json = f'__items{index - 1}[0] && __items{index - 1}[0].json'
+        lines.append(FUSED_PART.format(name=name, index=index, code=code,
+                                       input=source_input, json=source_json))
+    lines.append(f'return __items{len(parts) - 1};')
+    return '\n'.join(lines)
+
+
+def fused_parts(node):
+    return node.get('_fused_parts') or [(node['name'], node['parameters']['jsCode'])]
+
+
+def fuse_linear(workflow, report, absorbed):
+    changed = True
+    while changed:
+        changed = False
+        nodes = node_map(workflow)
+        for name, node in nodes.items():
+            following = successors(workflow, name)
+            if len(following) != 1 or not fusable_code(node):
+                continue
+            target = nodes[following[0]]
+            if (not fusable_code(target) or predecessors(workflow, target['name']) != [name]
+                    or references(workflow, name)):
+                continue
+            target['_fused_parts'] = fused_parts(node) + fused_parts(target)
+            redirect(workflow, name, target['name'])
+            remove_node(workflow, name)
+            absorbed[name] = target['name']
+            report['fused'].append({'kind': 'linear', 'nodes': [name, target['name']],
+                                    'into': target['name']})
+            changed = True
+            break
+
+
+def tail_duplicate(workflow, report, absorbed):
+    nodes = node_map(workflow)
+    for name, node in list(nodes.items()):
+        sources = predecessors(workflow, name)
+        if (len(sources) < 2 or not fusable_code(node)
+                or len(node['parameters']['jsCode'].encode('utf-8')) > TAIL_DUPLICATION_MAX_BYTES):
+            continue
+        if not all(fusable_code(nodes[s]) and successors(workflow, s) == [name] for s in sources):
+            continue
+        for source in sources:
+            nodes[source]['_fused_parts'] = fused_parts(nodes[source]) + fused_parts(node)
+            workflow['connections'][source] = copy.deepcopy(workflow['connections'].get(name, {}))
+        replace_reference(workflow, name,
+                          f"$({json.dumps(sources)}.find(name => $(name).isExecuted))")
+        remove_node(workflow, name)
+        absorbed[name] = None
+        report['fused'].append({'kind': 'tail_duplication', 'nodes': [name], 'into': sources})
+
+
+def materialize(workflow):
+    for node in workflow['nodes']:
+        parts = node.pop('_fused_parts', None)
+        if parts:
+            node['parameters']['jsCode'] = fuse_code(parts)
+            node['notes'] = f"Fused: {' + '.join(name for name, _ in parts)} (optimize_workflow.py)"
+
+
+# ============================================================================
+# Report
+# ============================================================================
+
+def route_paths(workflow):
+    """Every trigger-to-sink path, labelled by the branch taken at each Switch."""
+    nodes = node_map(workflow)
+    paths = []
+
+    def walk(name, path, label):
+        path = path + [name]
+        following = successors(workflow, name)
+        if not following:
+            paths.append((' / '.join(label) or 'main', path))
+        for target in following:
+            branch = label + [target] if nodes[name]['type'] == SWITCH_TYPE else label
+            walk(target, path, branch)
+
+    for name, node in nodes.items():
+        if is_trigger(node):
+            walk(name, [], [])
+    return paths
+
+
+def optimized_hops(path, absorbed):
+    """Hops of a source path after fusion (absorbed: name → merged-into, None = previous node)."""
+    mapped = []
+    for name in path:
+        target = name
+        while target in absorbed and absorbed[target] is not None:
+            target = absorbed[target]
+        if target in absorbed:
+            continue  # folded into whatever ran before it
+        if not mapped or mapped[-1] != target:
+            mapped.append(target)
+    return len(mapped) - 1
+
+
+def route_report(source, absorbed):
+    routes = {}
+    for label, path in route_paths(source):
+        before = len(path) - 1
+        after = optimized_hops(path, absorbed)
+        routes[label] = {'hops_before': before, 'hops_after': after, 'removed': before - after}
+    return routes
+
+
+CHECK_SCRIPT = r"""
+const AsyncFunction = Object.getPrototypeOf(async function () {}).constructor;
+const codes = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const errors = {};
+for (const [name, code] of Object.entries(codes)) {
+  try { new AsyncFunction('$input', '$json', '$', code); } catch (error) { errors[name] = error.message; }
+}
+process.stdout.write(JSON.stringify(errors));
+"""
+
+
+def optimize(source, preload=False):
+    workflow = copy.deepcopy(source)
+    workflow['name'] = f"{source.get('name', 'workflow')} ({'preloaded' if preload else 'optimized'})"
+    report = {'dropped': [], 'kept_unreachable': [], 'collapsed_switches': [],
+              'merged_rules': [], 'fused': []}
+    absorbed = {}
+
+    contracts = NODE_CONTRACTS
+    if preload:
+        units = write_module(source)
+        report['preloaded'] = hoist_blocks(workflow, units)
+        report['registry_store'] = wire_registry_store(workflow, units)
+        contracts = {**NODE_CONTRACTS, **REGISTRY_STORE_CONTRACTS}
+    report['projected'] = project_workflow(workflow, contracts)
+    drop_unreachable(workflow, report)
+    collapse_fanouts(workflow, report, absorbed)
+    fuse_linear(workflow, report, absorbed)
+    tail_duplicate(workflow, report, absorbed)
+    fuse_linear(workflow, report, absorbed)
+    materialize(workflow)
+
+    report['nodes_before'] = len(source['nodes'])
+    report['nodes_after'] = len(workflow['nodes'])
+    report['routes'] = route_report(source, absorbed)
+    return workflow, report
+
+
+def print_report(report):
+    print(f"Nodes: {report['nodes_before']} → {report['nodes_after']}")
+    for name, unit in report.get('preloaded', {}).items():
+        print(f"  preloaded: {name} ({unit['bytes'] / 1024:.1f} KB: {', '.join(unit['blocks'])})")
+    for name in report.get('registry_store', []):
+        print(f"  registry store: {name} loads the selected registry version")
+    for name, fields in report['projected'].items():
+        print(f"  projected: {name} ({len(fields)} fields)")
+    for name in report['dropped']:
+        print(f"  dropped unreachable: {name}")
+    for name in report['kept_unreachable']:
+        print(f"  kept unreachable (referenced by name): {name}")
+    for name in report['collapsed_switches']:
+        print(f"  collapsed switch: {name}")
+    for merge in report['merged_rules']:
+        print(f"  {merge['switch']}: {merge['outputs_before']} → {merge['outputs_after']} outputs "
+              f"(merged {', '.join('|'.join(g) for g in merge['groups'])})")
+    for fusion in report['fused']:
+        into = fusion['into'] if isinstance(fusion['into'], str) else ', '.join(fusion['into'])
+        print(f"  fused ({fusion['kind']}): {' + '.join(fusion['nodes'])} → {into}")
+
+    print("\nHops per route (trigger → response):")
+    width = max(len(label) for label in report['routes'])
+    for label, hops in sorted(report['routes'].items()):
+        print(f"  {label:<{width}}  {hops['hops_before']:>2} → {hops['hops_after']:>2}  (-{hops['removed']})")
+    if report.get('registry_store'):
+        print("  (registry store: +2 hops on every route, +1 when the session's version check is due, "
+              "+1 more when a worker fetches a new version)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--input', default=WORKFLOW_FILE)
+    parser.add_argument('--output')
+    parser.add_argument('--dry-run', action='store_true', help='print the report, write nothing')
+    parser.add_argument('--preload', action='store_true',
+                        help=f'move embedded blocks into {MODULE_DIR}/ (self-hosted workers)')
+    args = parser.parse_args()
+    output = args.output or (PRELOADED_OUTPUT_FILE if args.preload else OUTPUT_FILE)
+    report_file = PRELOADED_REPORT_FILE if args.preload else REPORT_FILE
+
+    source = load_workflow(args.input)
+    workflow, report = optimize(source, preload=args.preload)
+    print_report(report)
+
+    generated = {n['name']: n['parameters']['jsCode'] for n in workflow['nodes']
+                 if n['type'] == CODE_TYPE
+                 and n['parameters']['jsCode'].startswith(('// Fused by', '// Field projection'))}
+    errors = run_node(CHECK_SCRIPT, generated)
+    if errors:
+        for name, error in errors.items():
+            print(f"✗ {name}: generated code does not compile: {error}")
+        return 1
+    print(f"\n✓ {len(generated)} fused/projected Code nodes compile")
+
+    if args.dry_run:
+        return 0
+    save_workflow(workflow, output)
+    with open(report_file, 'w') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+    print(f"✓ Wrote {output} and {report_file}")
+    if args.preload:
+        print(f"✓ Wrote {MODULE_DIR}/ - install it on every worker (build_runtime_module.py)")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
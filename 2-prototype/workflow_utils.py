@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the workflow build and patch scripts.
+
+The fix_*/build_* scripts all load workflow-production-ready.json, look up
+nodes by name and splice JavaScript into Code nodes. This module keeps that
+plumbing in one place so new build steps don't copy it again.
+"""
+
+import json
+import os
+import subprocess
+
+WORKFLOW_FILE = 'workflow-production-ready.json'
+REGISTRY_FILE = 'config_registries.js'
+
+
+def load_workflow(path=WORKFLOW_FILE):
+    """Load an n8n workflow export."""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_workflow(workflow, path=WORKFLOW_FILE):
+    """Write an n8n workflow export (same formatting as the other scripts)."""
+    with open(path, 'w') as f:
+        json.dump(workflow, f, indent=2)
+
+
+def find_node(workflow, name):
+    """Return the node called `name`, or None."""
+    for node in workflow['nodes']:
+        if node['name'] == name:
+            return node
+    return None
+
+
+def replace_marked_block(code, marker, body, anchor=None):
+    """
+    Replace the text between `// BEGIN <marker>` and `// END <marker>`.
+
+    If the markers are not present yet, the block is inserted before `anchor`
+    (or prepended when no anchor is given). Returns the new code.
+    """
+    begin = f'// BEGIN {marker}'
+    end = f'// END {marker}'
+    block = f'{begin}\n{body.rstrip()}\n{end}'
+
+    start = code.find(begin)
+    if start != -1:
+        stop = code.find(end, start)
+        if stop == -1:
+            raise ValueError(f'Unterminated block: {marker}')
+        return code[:start] + block + code[stop + len(end):]
+
+    if anchor is None:
+        return block + '\n\n' + code
+    if anchor not in code:
+        raise ValueError(f'Anchor not found for {marker}: {anchor!r}')
+    return code.replace(anchor, block + '\n\n' + anchor, 1)
+
+
+def run_node(script, payload=None, cwd=None):
+    """
+    Run a Node.js snippet, feeding `payload` as JSON on stdin.
+
+    The registries are plain CommonJS, so loading them through Node is the
+    only way to read them without re-implementing a JavaScript parser.
+    Returns the JSON the script prints on stdout.
+    """
+    result = subprocess.run(
+        ['node', '-e', script],
+        input=json.dumps(payload if payload is not None else {}),
+        capture_output=True,
+        text=True,
+        cwd=cwd or os.path.dirname(os.path.abspath(__file__)),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'node failed: {result.stderr.strip()}')
+    return json.loads(result.stdout)
+
+
+# ============================================================================
+# Embedding functions/*.js modules
+# ============================================================================
+
+# Tokens after which "/" starts a regex literal rather than a division
+_REGEX_AFTER_PUNCT = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_AFTER_WORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void',
+                      'throw', 'instanceof', 'yield', 'await'}
+_DECLARATION_WORDS = {'function', 'async', 'const', 'let', 'var', 'class'}
+
+
+def _is_word(char):
+    return char.isalnum() or char in '_$'
+
+
+def _skip_quoted(source, i):
+    """End index (exclusive) of the string literal starting at source[i]."""
+    quote = source[i]
+    j = i + 1
+    while j < len(source) and source[j] != quote:
+        j += 2 if source[j] == '\\' else 1
+    return j + 1
+
+
+def _skip_template(source, i):
+    """End index (exclusive) of the template literal starting at source[i]; ${} may nest."""
+    j = i + 1
+    while j < len(source) and source[j] != '`':
+        if source[j] == '\\':
+            j += 2
+        elif source.startswith('${', j):
+            j = _tokenize(source, j + 2, until_brace=True)[1] + 1
+        else:
+            j += 1
+    return j + 1
+
+
+def _skip_regex(source, i):
+    """End index (exclusive) of the regex literal starting at source[i], flags included."""
+    j = i + 1
+    in_class = False
+    while j < len(source):
+        char = source[j]
+        if char == '\\':
+            j += 2
+            continue
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            break
+        j += 1
+    j += 1
+    while j < len(source) and _is_word(source[j]):
+        j += 1
+    return j
+
+
+def _tokenize(source, i=0, until_brace=False):
+    """[(kind, text)] from source[i:]; kinds: comment, string, regex, word, punct, space.
+
+    With until_brace, stops at the "}" closing a template's ${ and returns its index too.
+    """
+    tokens = []
+    depth = 0
+    previous = None
+    while i < len(source):
+        char = source[i]
+        if char.isspace():
+            j = i
+            while j < len(source) and source[j].isspace():
+                j += 1
+            tokens.append(('space', source[i:j]))
+            i = j
+            continue
+        if source.startswith('//', i):
+            j = source.find('\n', i)
+            j = len(source) if j == -1 else j
+            kind = 'comment'
+        elif source.startswith('/*', i):
+            j = source.find('*/', i + 2) + 2
+            kind = 'comment'
+        elif char in '"\'':
+            j, kind = _skip_quoted(source, i), 'string'
+        elif char == '`':
+            j, kind = _skip_template(source, i), 'string'
+        elif char == '/' and (previous is None or
+                              (previous[0] == 'punct' and previous[1] in _REGEX_AFTER_PUNCT) or
+                              (previous[0] == 'word' and previous[1] in _REGEX_AFTER_WORDS)):
+            j, kind = _skip_regex(source, i), 'regex'
+        elif _is_word(char):
+            j = i
+            while j < len(source) and _is_word(source[j]):
+                j += 1
+            kind = 'word'
+        else:
+            if until_brace:
+                depth += {'{': 1, '}': -1}.get(char, 0)
+                if depth < 0:
+                    return tokens, i
+            j, kind = i + 1, 'punct'
+        tokens.append((kind, source[i:j]))
+        if kind != 'comment':
+            previous = tokens[-1]
+        i = j
+    if until_brace:
+        raise ValueError('Unterminated ${ in template literal')
+    return tokens, i
+
+
+def _top_level_statements(tokens):
+    """Split tokens into top-level statements: [(declared names, referenced words, tokens)]."""
+    statements = []
+    current = []
+    depth = 0
+    significant = [index for index, token in enumerate(tokens) if token[0] not in ('space', 'comment')]
+
+    def next_word(after):
+        return next((tokens[index][1] for index in significant if index > after), None)
+
+    for index, token in enumerate(tokens):
+        current.append(token)
+        kind, text = token
+        if kind != 'punct':
+            continue
+        if text in '([{':
+            depth += 1
+        elif text in ')]}':
+            depth -= 1
+        words = [t for k, t in current if k == 'word']
+        block = words and words[0] in ('function', 'async', 'class', 'if', 'for', 'while', 'try')
+        if depth == 0 and (text == ';' or (text == '}' and block and
+                                             next_word(index) not in ('else', 'catch', 'finally'))):
+            statements.append(current)
+            current = []
+    if any(kind not in ('space', 'comment') for kind, _ in current):
+        statements.append(current)
+
+    result = []
+    for statement in statements:
+        code = [(kind, text) for kind, text in statement if kind not in ('space', 'comment')]
+        declared = set()
+        if code and code[0][1] in _DECLARATION_WORDS:
+            position = 2 if code[0][1] == 'async' else 1
+            if code[0][1] in ('const', 'let', 'var') and code[position][1] in '{[':
+                # Destructuring: every name up to the closing bracket
+                for kind, text in code[position + 1:]:
+                    if text in '}]':
+                        break
+                    if kind == 'word':
+                        declared.add(text)
+            else:
+                declared.add(code[position][1].lstrip('*'))
+        references = {text for position, (kind, text) in enumerate(code)
+                      if kind == 'word' and (position == 0 or code[position - 1][1] != '.')}
+        result.append((declared, references - declared, statement))
+    return result
+
+
+def _render(statement):
+    """Statement source without comments or blank lines."""
+    text = ''
+    for kind, token in statement:
+        if kind == 'comment':
+            # Keep words apart where a block comment separated them
+            text += ' ' if token.startswith('/*') and '\n' not in token else ''
+            continue
+        text += token
+    lines = [line.rstrip() for line in text.split('\n')]
+    return '\n'.join(line for line in lines if line.strip())
+
+
+def load_function_source(path, names):
+    """
+    Read the declarations `names` of a functions/*.js module for embedding into a Code node.
+
+    Only the named top-level declarations and the ones they reference
+    (transitively) are kept, in file order, with comments and blank lines
+    stripped: n8n compiles a Code node's source on every run, and JSDoc,
+    corpus runners and the module.exports section have no use there.
+    A name the module does not declare is an error.
+    """
+    with open(path, 'r') as f:
+        source = f.read()
+    statements = _top_level_statements(_tokenize(source)[0])
+    declared = {name: index for index, (names_declared, _, _) in enumerate(statements) for name in names_declared}
+    missing = [name for name in names if name not in declared]
+    if missing:
+        raise ValueError(f'{path} does not declare {", ".join(missing)}')
+
+    keep = set()
+    pending = [declared[name] for name in names]
+    while pending:
+        index = pending.pop()
+        if index in keep:
+            continue
+        keep.add(index)
+        pending += [declared[word] for word in statements[index][1] if word in declared]
+    return '\n\n'.join(_render(statements[index][2]) for index in sorted(keep)) + '\n'